@@ -0,0 +1,342 @@
+"""
+AES 백엔드 선택 (pycryptodome / cryptography / 순수 파이썬)
+==========================================================
+
+kakaodecrypt, kakao_decrypt_module의 AES/CBC, AES/ECB 복호화를 백엔드 하나로 모읍니다.
+사용 가능한 백엔드 중 시작 시 짧은 자체 벤치마크로 가장 빠른 것을 선택합니다.
+
+- pycryptodome: Crypto.Cipher.AES (기존 의존성)
+- cryptography: OpenSSL (AES-NI / ARMv8 Crypto Extensions 사용 가능)
+- pure: 순수 파이썬 구현 (두 라이브러리가 모두 없을 때만 사용, 느림)
+
+환경 변수 AES_BACKEND=pycryptodome|cryptography|pure 로 강제 선택할 수 있습니다.
+라이브러리 import는 백엔드 선택 시점(첫 복호화)까지 미룹니다.
+
+사용법:
+    import aes_backend
+
+    plain = aes_backend.decrypt_cbc(key, iv, ciphertext)
+    raw = aes_backend.decrypt_ecb(key, blocks)
+    print(aes_backend.get_metrics())  # {"backend": "pycryptodome", "benchmark_us": {...}, ...}
+"""
+
+import os
+import time
+import threading
+
+BENCHMARK_ROUNDS = 200
+BENCHMARK_PAYLOAD = 64  # 바이트 (닉네임/짧은 메시지 크기)
+
+
+# ---------------------------------------------------------------------------
+# 순수 파이썬 AES (복호화 전용)
+# ---------------------------------------------------------------------------
+
+def _xtime(a):
+    a <<= 1
+    return (a ^ 0x11B) if a & 0x100 else a
+
+
+def _gf_mul(a, b):
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        a = _xtime(a)
+        b >>= 1
+    return result
+
+
+def _build_sbox():
+    sbox = [0] * 256
+    for x in range(256):
+        # GF(2^8) 역원 (0의 역원은 0) + affine 변환
+        inverse = 0
+        if x:
+            for y in range(1, 256):
+                if _gf_mul(x, y) == 1:
+                    inverse = y
+                    break
+        s = inverse
+        for shift in range(1, 5):
+            s ^= ((inverse << shift) | (inverse >> (8 - shift))) & 0xFF
+        sbox[x] = s ^ 0x63
+    return sbox
+
+
+_SBOX = None
+_INV_SBOX = None
+_MUL9 = _MUL11 = _MUL13 = _MUL14 = None
+
+
+def _init_pure_tables():
+    global _SBOX, _INV_SBOX, _MUL9, _MUL11, _MUL13, _MUL14
+    if _SBOX is not None:
+        return
+    sbox = _build_sbox()
+    inv_sbox = [0] * 256
+    for i, s in enumerate(sbox):
+        inv_sbox[s] = i
+    _MUL9 = [_gf_mul(i, 9) for i in range(256)]
+    _MUL11 = [_gf_mul(i, 11) for i in range(256)]
+    _MUL13 = [_gf_mul(i, 13) for i in range(256)]
+    _MUL14 = [_gf_mul(i, 14) for i in range(256)]
+    _INV_SBOX = inv_sbox
+    _SBOX = sbox
+
+
+# InvShiftRows: 상태 바이트 i(열 우선)에 들어갈 원래 위치
+_INV_SHIFT = [((i % 4) + 4 * (((i // 4) - (i % 4)) % 4)) for i in range(16)]
+
+
+class _PureAES:
+    """AES 복호화 (키 길이 16/24/32바이트)"""
+
+    def __init__(self, key):
+        _init_pure_tables()
+        if len(key) not in (16, 24, 32):
+            raise ValueError(f"Invalid AES key length: {len(key)}")
+        nk = len(key) // 4
+        self.rounds = nk + 6
+        words = [list(key[4 * i:4 * i + 4]) for i in range(nk)]
+        rcon = 1
+        for i in range(nk, 4 * (self.rounds + 1)):
+            temp = list(words[i - 1])
+            if i % nk == 0:
+                temp = [_SBOX[b] for b in temp[1:] + temp[:1]]
+                temp[0] ^= rcon
+                rcon = _xtime(rcon)
+            elif nk > 6 and i % nk == 4:
+                temp = [_SBOX[b] for b in temp]
+            words.append([words[i - nk][j] ^ temp[j] for j in range(4)])
+        self.round_keys = [sum(words[4 * r:4 * r + 4], []) for r in range(self.rounds + 1)]
+
+    def decrypt_block(self, block):
+        rk = self.round_keys
+        state = [block[i] ^ rk[self.rounds][i] for i in range(16)]
+        inv_sbox = _INV_SBOX
+        m9, m11, m13, m14 = _MUL9, _MUL11, _MUL13, _MUL14
+        for r in range(self.rounds - 1, 0, -1):
+            key = rk[r]
+            state = [inv_sbox[state[_INV_SHIFT[i]]] ^ key[i] for i in range(16)]
+            mixed = []
+            for c in range(0, 16, 4):
+                a0, a1, a2, a3 = state[c:c + 4]
+                mixed.append(m14[a0] ^ m11[a1] ^ m13[a2] ^ m9[a3])
+                mixed.append(m9[a0] ^ m14[a1] ^ m11[a2] ^ m13[a3])
+                mixed.append(m13[a0] ^ m9[a1] ^ m14[a2] ^ m11[a3])
+                mixed.append(m11[a0] ^ m13[a1] ^ m9[a2] ^ m14[a3])
+            state = mixed
+        key = rk[0]
+        return bytes(inv_sbox[state[_INV_SHIFT[i]]] ^ key[i] for i in range(16))
+
+
+class PureBackend:
+    name = "pure"
+
+    @staticmethod
+    def _check_length(data):
+        if len(data) % 16 != 0:
+            raise ValueError("Data must be aligned to block boundary")
+
+    def decrypt_ecb(self, key, data):
+        self._check_length(data)
+        aes = _PureAES(key)
+        return b''.join(aes.decrypt_block(data[i:i + 16]) for i in range(0, len(data), 16))
+
+    def decrypt_cbc(self, key, iv, data):
+        self._check_length(data)
+        aes = _PureAES(key)
+        out = []
+        previous = iv
+        for i in range(0, len(data), 16):
+            block = data[i:i + 16]
+            out.append(bytes(a ^ b for a, b in zip(aes.decrypt_block(block), previous)))
+            previous = block
+        return b''.join(out)
+
+    def decrypt_cbc_into(self, key, iv, data, out):
+        out[:len(data)] = self.decrypt_cbc(key, iv, bytes(data))
+
+
+# ---------------------------------------------------------------------------
+# 라이브러리 백엔드
+# ---------------------------------------------------------------------------
+
+class PycryptodomeBackend:
+    name = "pycryptodome"
+
+    def __init__(self):
+        from Crypto.Cipher import AES
+        self._aes = AES
+
+    def decrypt_ecb(self, key, data):
+        return self._aes.new(key, self._aes.MODE_ECB).decrypt(data)
+
+    def decrypt_cbc(self, key, iv, data):
+        return self._aes.new(key, self._aes.MODE_CBC, iv).decrypt(data)
+
+    def decrypt_cbc_into(self, key, iv, data, out):
+        # 출력 버퍼에 바로 기록 (out이 data와 같은 bytearray여도 됨)
+        self._aes.new(key, self._aes.MODE_CBC, iv).decrypt(data, output=out)
+
+
+class CryptographyBackend:
+    name = "cryptography"
+
+    def __init__(self):
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+        from cryptography.hazmat.backends import default_backend
+        self._cipher = Cipher
+        self._algorithms = algorithms
+        self._modes = modes
+        self._backend = default_backend()
+
+    def _decrypt(self, key, mode, data):
+        decryptor = self._cipher(self._algorithms.AES(key), mode, backend=self._backend).decryptor()
+        return decryptor.update(data) + decryptor.finalize()
+
+    def decrypt_ecb(self, key, data):
+        return self._decrypt(key, self._modes.ECB(), data)
+
+    def decrypt_cbc(self, key, iv, data):
+        return self._decrypt(key, self._modes.CBC(iv), data)
+
+    def decrypt_cbc_into(self, key, iv, data, out):
+        # update_into는 블록 크기만큼 여유 있는 버퍼가 필요하므로 결과를 복사
+        out[:len(data)] = self.decrypt_cbc(key, iv, bytes(data))
+
+
+_BACKEND_CLASSES = {
+    "pycryptodome": PycryptodomeBackend,
+    "cryptography": CryptographyBackend,
+    "pure": PureBackend,
+}
+
+_backend = None
+_metrics = {}
+_lock = threading.Lock()
+
+
+def available_backends():
+    """import 가능한 백엔드 인스턴스 목록 (pure는 항상 포함, 마지막)"""
+    backends = []
+    for name in ("pycryptodome", "cryptography"):
+        try:
+            backends.append(_BACKEND_CLASSES[name]())
+        except ImportError:
+            continue
+    backends.append(PureBackend())
+    return backends
+
+
+def benchmark(backend, rounds=BENCHMARK_ROUNDS, payload=BENCHMARK_PAYLOAD):
+    """CBC 복호화 1회(암호화 객체 생성 포함) 평균 시간 (마이크로초)"""
+    key = bytes(range(32))
+    iv = bytes(16)
+    data = bytes(payload)
+    backend.decrypt_cbc(key, iv, data)  # 워밍업
+    start = time.perf_counter()
+    for _ in range(rounds):
+        backend.decrypt_cbc(key, iv, data)
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def select_backend(name=None):
+    """
+    백엔드 선택 (name 또는 AES_BACKEND 환경 변수 > 자체 벤치마크)
+
+    순수 파이썬 백엔드는 다른 백엔드가 하나도 없거나 모든 벤치마크가 실패했을 때만 사용합니다.
+    """
+    global _backend, _metrics
+    name = name or os.getenv('AES_BACKEND', '').strip().lower() or None
+    backends = available_backends()
+    available = [b.name for b in backends]
+    timings = {}
+
+    if name:
+        chosen = next((b for b in backends if b.name == name), None)
+        if chosen is None:
+            print(f"[AES 백엔드] 요청한 백엔드 사용 불가: {name} (사용 가능: {', '.join(available)})")
+        selected_by = "env"
+    else:
+        chosen = None
+    if chosen is None:
+        candidates = [b for b in backends if b.name != "pure"] or backends
+        if len(candidates) == 1:
+            chosen = candidates[0]
+            selected_by = "only"
+        else:
+            for backend in candidates:
+                try:
+                    timings[backend.name] = round(benchmark(backend), 2)
+                except Exception as e:
+                    print(f"[AES 백엔드] 벤치마크 실패: {backend.name}: {type(e).__name__}: {e}")
+            if timings:
+                chosen = min((b for b in candidates if b.name in timings), key=lambda b: timings[b.name])
+                selected_by = "benchmark"
+            else:
+                # 모든 벤치마크가 실패하면 네이티브 백엔드를 믿을 수 없으므로 순수 파이썬으로
+                chosen = next((b for b in backends if b.name == "pure"), candidates[0])
+                selected_by = "fallback"
+
+    _backend = chosen
+    _metrics = {
+        "backend": chosen.name,
+        "selected_by": selected_by,
+        "available": available,
+        "benchmark_us": timings,
+    }
+    timing_text = ", ".join(f"{n}={t}us" for n, t in timings.items())
+    print(f"[AES 백엔드] 선택: {chosen.name} ({selected_by}{': ' + timing_text if timing_text else ''})")
+    if chosen.name == "pure":
+        print("[AES 백엔드] 경고: 순수 파이썬 AES 사용 중 (느림). pip install pycryptodome 또는 cryptography 권장")
+    return chosen
+
+
+def get_backend():
+    """선택된 백엔드 (첫 호출 시 선택)"""
+    if _backend is None:
+        with _lock:
+            if _backend is None:
+                select_backend()
+    return _backend
+
+
+def decrypt_cbc(key, iv, data):
+    """AES/CBC/NoPadding 복호화"""
+    return get_backend().decrypt_cbc(key, iv, data)
+
+
+def decrypt_cbc_into(key, iv, data, out):
+    """AES/CBC/NoPadding 복호화 결과를 out(bytearray/memoryview, len(data) 이상)에 기록"""
+    if len(data) % 16 != 0:
+        raise ValueError("Data must be aligned to block boundary")
+    get_backend().decrypt_cbc_into(key, iv, data, out)
+
+
+def decrypt_ecb(key, data):
+    """AES/ECB/NoPadding 복호화"""
+    return get_backend().decrypt_ecb(key, data)
+
+
+class CbcDecryptor:
+    """AES.new(key, AES.MODE_CBC, iv)와 같은 형태의 1회용 복호화 객체"""
+
+    def __init__(self, key, iv):
+        self.key = key
+        self.iv = iv
+
+    def decrypt(self, data):
+        if len(data) % 16 != 0:
+            raise ValueError("Data must be padded to 16 byte boundary in CBC mode")
+        plain = decrypt_cbc(self.key, self.iv, data)
+        if data:
+            self.iv = data[-16:]
+        return plain
+
+
+def get_metrics():
+    """선택된 백엔드와 벤치마크 결과"""
+    get_backend()
+    return dict(_metrics)
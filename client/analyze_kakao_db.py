@@ -12,6 +12,8 @@ import sys
 from datetime import datetime
 from collections import defaultdict
 
+from db_snapshot import DbSnapshot, DB_SNAPSHOT_ENABLED
+
 # 분석할 DB 파일 경로
 DB_PATH = None
 DB_PATH2 = None
@@ -586,6 +588,16 @@ def main():
         print(f"[DB 파일2] {DB_PATH2}")
     print("")
     
+    # DB_SNAPSHOT=1: 실행 중인 카카오톡 DB를 잠그지 않도록 백업 API로 복사한 뒤 복사본 분석
+    snapshot = None
+    if DB_SNAPSHOT_ENABLED:
+        snapshot = DbSnapshot(DB_PATH, DB_PATH2)
+        if snapshot.refresh():
+            DB_PATH = snapshot.snapshot_path
+            if DB_PATH2 and os.path.exists(DB_PATH2):
+                DB_PATH2 = snapshot.snapshot_path2
+        print("")
+    
     ensure_output_dir()
     
     # KakaoTalk.db 분석
@@ -603,6 +615,9 @@ def main():
         db2_analysis = analyze_all_tables(conn2, "main")
         conn2.close()
     
+    if snapshot is not None:
+        snapshot.stop()
+    
     # JSON 결과 저장
     output_data = {
         'main_db': main_analysis,
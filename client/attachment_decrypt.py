@@ -3,11 +3,16 @@ Attachment 복호화 모듈 (Phase 2)
 Iris ObserverHelper.kt 방식 기반 attachment 필드 복호화
 """
 
+import re
 import json
+import binascii
+
+from ciphertext_classifier import classify, has_base64_prefix, JSON
 
 # 복호화 모듈 import
 try:
-    from kakaodecrypt import KakaoDecrypt
+    from kakaodecrypt import KakaoDecrypt, KAKAO_IV
+    import aes_backend
     KAKAODECRYPT_AVAILABLE = True
 except ImportError:
     KAKAODECRYPT_AVAILABLE = False
@@ -80,12 +85,8 @@ def decrypt_attachment(attachment, enc_type, my_user_id, message_type=None, mess
     # 암호화되어 있는지 확인 (base64 형태)
     if isinstance(attachment, str):
         attachment_str = attachment.strip()
-        # base64로 보이는지 확인 (길이 > 10, base64 문자만 포함)
-        is_base64_like = (
-            len(attachment_str) > 10 and
-            not attachment_str.startswith('{') and
-            all(c in 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=' for c in attachment_str[:100])
-        )
+        # base64로 보이는지 확인 (길이 > 10, 앞 100자가 base64 문자 - 기존 조건 유지)
+        is_base64_like = has_base64_prefix(attachment_str)
         
         if is_base64_like and KAKAODECRYPT_AVAILABLE and my_user_id:
             try:
@@ -126,3 +127,155 @@ def decrypt_attachment(attachment, enc_type, my_user_id, message_type=None, mess
     
     return None
 
+
+# 이미지 URL이 들어 있을 수 있는 표식 (is_image_url 조건: '://' 패턴 또는 이미지 확장자, JSON 이스케이프 포함)
+_URL_HINT_RE = re.compile(r'://|:\\/\\/|\\u|\.(?:jpe?g|png|gif|webp|bmp|svg)', re.IGNORECASE)
+
+
+class AttachmentView:
+    """
+    복호화된 attachment JSON 텍스트 (필요할 때만 파싱)
+    
+    - text: 복호화된 JSON 문자열 (서버 payload에 재직렬화 없이 그대로 사용)
+    - get()/as_dict(): 처음 호출될 때 한 번만 json.loads
+    - may_contain(): 파싱 전에 키/값이 있을 수 있는지 문자열 검색으로 확인
+    """
+    
+    __slots__ = ('text', '_parsed')
+    
+    def __init__(self, text):
+        self.text = text
+        self._parsed = None
+    
+    def __bool__(self):
+        return bool(self.text)
+    
+    def __len__(self):
+        return len(self.text)
+    
+    @property
+    def parsed(self):
+        return self._parsed is not None
+    
+    def as_dict(self):
+        """파싱된 dict (JSON이 dict가 아니거나 파싱 실패 시 None)"""
+        if self._parsed is None:
+            try:
+                parsed = json.loads(self.text)
+            except json.JSONDecodeError:
+                parsed = False
+            self._parsed = parsed if isinstance(parsed, dict) else False
+        return self._parsed or None
+    
+    def get(self, key, default=None):
+        parsed = self.as_dict()
+        return parsed.get(key, default) if parsed else default
+    
+    def may_contain(self, *needles):
+        """needles 중 하나라도 텍스트에 있거나 유니코드 이스케이프가 있으면 True (파싱 필요)"""
+        text = self.text
+        return '\\u' in text or any(needle in text for needle in needles)
+    
+    def may_contain_url(self):
+        """이미지 URL이 들어 있을 수 있는지 (없으면 파싱 없이 건너뜀)"""
+        return _URL_HINT_RE.search(self.text) is not None
+    
+    def is_embeddable(self, ensure_ascii=False):
+        """
+        JSON 텍스트를 payload에 그대로 삽입해도 되는지
+        
+        json.loads로 파싱에 성공한 객체(as_dict, 결과는 캐시)만 삽입합니다.
+        ensure_ascii=True이면 json.dumps와 같은 결과가 되도록 ASCII 텍스트만 삽입합니다.
+        """
+        if ensure_ascii and not self.text.isascii():
+            return False
+        return self.as_dict() is not None
+
+
+def decrypt_attachment_view(attachment, enc_type, my_user_id, message_type=None, message_id=None, debug=False):
+    """
+    attachment 복호화 (zero-copy 경로)
+    
+    decrypt_attachment()와 같은 조건으로 복호화하지만, 복호화 결과를 json.loads하지 않고
+    AttachmentView(JSON 텍스트)로 반환합니다.
+    base64 디코딩 결과를 미리 할당한 bytearray에 바로 복호화하고,
+    패딩은 memoryview 길이로만 제거한 뒤 UTF-8 디코딩 1회로 문자열을 만듭니다.
+    
+    Returns:
+        AttachmentView 또는 None
+    """
+    if not attachment or attachment == "{}":
+        if debug:
+            print(f"[attachment 복호화] ❌ {DECRYPT_FAIL_REASON['EMPTY']}: msg_id={message_id}")
+        return None
+    
+    # Iris 방식: 선물 메시지(type 71)는 복호화하지 않음
+    if (message_type == "71" or message_type == 71) and "선물" in str(attachment):
+        if debug:
+            print(f"[attachment 복호화] 선물 메시지 타입 71, 복호화 스킵: msg_id={message_id}")
+        return None
+    
+    if not isinstance(attachment, str):
+        return None
+    attachment_str = attachment.strip()
+    kind = classify(attachment_str)
+    if kind == JSON:
+        # 이미 복호화된 JSON
+        return AttachmentView(attachment_str)
+    is_base64_like = has_base64_prefix(attachment_str)
+    if not is_base64_like or not KAKAODECRYPT_AVAILABLE or not my_user_id:
+        if debug:
+            reason = DECRYPT_FAIL_REASON["NOT_BASE64"] if not is_base64_like else ("kakaodecrypt_unavailable" if not KAKAODECRYPT_AVAILABLE else "my_user_id_missing")
+            print(f"[attachment 복호화] ❌ 실패: msg_id={message_id}, reason={reason}, enc={enc_type}")
+        return None
+    
+    try:
+        key = KakaoDecrypt.get_key(int(my_user_id), enc_type)
+        ciphertext = binascii.a2b_base64(attachment_str)
+        buffer = bytearray(len(ciphertext))
+        aes_backend.decrypt_cbc_into(key, KAKAO_IV, ciphertext, buffer)
+        del ciphertext
+        pad = buffer[-1]
+        if pad <= 0 or pad > 16:
+            raise ValueError(f"bad padding: {pad}")
+        text = str(memoryview(buffer)[:len(buffer) - pad], 'utf-8')
+    except (ValueError, TypeError, binascii.Error) as e:
+        # ValueError에는 잘못된 enc, 패딩, UTF-8 디코딩 오류가 포함됨
+        if debug:
+            print(f"[attachment 복호화] ❌ {DECRYPT_FAIL_REASON['DECRYPT_API_FAIL']}: msg_id={message_id}, enc={enc_type}, 오류={type(e).__name__}: {e}")
+        return None
+    
+    view = attachment_view(text)
+    if view is None:
+        if debug:
+            print(f"[attachment 복호화] ❌ {DECRYPT_FAIL_REASON['JSON_PARSE_FAIL']}: msg_id={message_id}, 샘플={text[:100]}")
+        return None
+    
+    if debug:
+        print(f"[attachment 복호화] ✅ 성공: msg_id={message_id}, enc={enc_type}, 길이={len(text)}")
+    return view
+
+
+def attachment_view(text):
+    """복호화된 평문 -> AttachmentView (JSON 텍스트가 아니면 None, 잘못된 키로 나온 평문 제외)"""
+    if not isinstance(text, str) or classify(text) != JSON:
+        return None
+    return AttachmentView(text)
+
+
+def dumps_payload(payload, ensure_ascii=False):
+    """
+    서버 payload 직렬화
+    
+    payload["json"]["attachment_decrypted"]가 AttachmentView이면 dict를 재직렬화하지 않고
+    복호화된 JSON 텍스트를 그대로 삽입합니다. (is_embeddable()이 아니면 dict로 변환하여 직렬화)
+    """
+    json_part = payload.get("json") if isinstance(payload, dict) else None
+    view = json_part.get("attachment_decrypted") if isinstance(json_part, dict) else None
+    if not isinstance(view, AttachmentView):
+        return json.dumps(payload, ensure_ascii=ensure_ascii)
+    if not view.is_embeddable(ensure_ascii):
+        return json.dumps(dict(payload, json=dict(json_part, attachment_decrypted=view.as_dict())), ensure_ascii=ensure_ascii)
+    token = f"__attachment_decrypted_{id(view)}__"
+    serialized = json.dumps(dict(payload, json=dict(json_part, attachment_decrypted=token)), ensure_ascii=ensure_ascii)
+    return serialized.replace(f'"{token}"', view.text, 1)
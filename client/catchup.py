@@ -0,0 +1,94 @@
+"""
+캐치업 모드 (대량 백로그 처리)
+==============================
+
+평상시 get_new_messages는 한 번에 NEW_MESSAGE_BATCH_LIMIT(10)개만 조회합니다.
+다운타임 이후 chat_logs의 MAX(_id)와 마지막 처리 ID 차이가 크면 캐치업 모드로 전환하여
+_id > ? 키셋 페이지네이션으로 큰 페이지(CATCHUP_PAGE_SIZE)를 대기 없이 연속 조회하고,
+진행률(처리 수, 속도, 남은 시간)을 보고합니다. 백로그가 threshold 이하로 줄면 평상시 루프로 돌아갑니다.
+
+사용법:
+    tracker = CatchupTracker(log=print)
+    limit = tracker.plan(last_id, latest_id)      # 이번 조회의 LIMIT
+    rows = fetch(last_id, limit)
+    tracker.advance(len(rows), rows[-1][0], latest_id)
+"""
+
+import os
+import time
+
+CATCHUP_THRESHOLD = int(os.getenv('CATCHUP_THRESHOLD', '200'))  # 이 이상 밀리면 캐치업 모드
+CATCHUP_PAGE_SIZE = int(os.getenv('CATCHUP_PAGE_SIZE', '500'))
+CATCHUP_FETCH_SIZE = int(os.getenv('CATCHUP_FETCH_SIZE', '100'))  # cursor.fetchmany 크기
+CATCHUP_PROGRESS_INTERVAL = float(os.getenv('CATCHUP_PROGRESS_INTERVAL_SEC', '5'))
+
+
+class CatchupTracker:
+    """평상시/캐치업 모드 전환과 진행률 보고"""
+
+    def __init__(self, steady_limit=10, threshold=CATCHUP_THRESHOLD, page_size=CATCHUP_PAGE_SIZE,
+                 progress_interval=CATCHUP_PROGRESS_INTERVAL, log=print, clock=time.monotonic):
+        self.steady_limit = steady_limit
+        self.threshold = threshold
+        self.page_size = max(page_size, steady_limit)
+        self.progress_interval = progress_interval
+        self.log = log
+        self._clock = clock
+        self.active = False
+        self.sessions = 0
+        self._started_at = None
+        self._start_backlog = 0
+        self._processed = 0
+        self._last_report = None
+
+    def plan(self, last_id, latest_id):
+        """
+        이번 조회에 사용할 LIMIT (모드 전환 포함)
+
+        Args:
+            last_id: 마지막 처리 메시지 ID (키셋 커서)
+            latest_id: chat_logs의 MAX(_id) (None이면 평상시 모드 유지)
+        """
+        backlog = (latest_id - last_id) if latest_id is not None and last_id is not None else 0
+        if not self.active and backlog > self.threshold:
+            self.active = True
+            self.sessions += 1
+            self._started_at = self._clock()
+            self._last_report = self._started_at
+            self._start_backlog = backlog
+            self._processed = 0
+            self.log(f"[캐치업] 시작: 백로그 약 {backlog}개 (last_id={last_id}, 최신 ID={latest_id}), 페이지 {self.page_size}개씩 대기 없이 조회")
+        elif self.active and backlog <= self.threshold:
+            self._finish(backlog)
+        return self.page_size if self.active else self.steady_limit
+
+    def advance(self, fetched, last_id, latest_id):
+        """페이지 처리 후 호출: 진행률 보고 (progress_interval마다)"""
+        if not self.active:
+            return
+        self._processed += fetched
+        now = self._clock()
+        if now - self._last_report < self.progress_interval:
+            return
+        self._last_report = now
+        elapsed = max(now - self._started_at, 1e-9)
+        rate = self._processed / elapsed
+        remaining = max((latest_id or 0) - (last_id or 0), 0)
+        eta = remaining / rate if rate > 0 else float('inf')
+        self.log(f"[캐치업] 진행: {self._processed}개 처리, 남은 백로그 약 {remaining}개, "
+                 f"{rate:.0f}개/초, 예상 {eta:.0f}초")
+
+    def _finish(self, backlog):
+        elapsed = self._clock() - self._started_at
+        rate = self._processed / elapsed if elapsed > 0 else 0.0
+        self.log(f"[캐치업] 완료: {self._processed}개 처리, {elapsed:.1f}초 ({rate:.0f}개/초), "
+                 f"남은 백로그 {backlog}개 -> 평상시 폴링으로 전환")
+        self.active = False
+
+    def stats(self):
+        return {
+            "active": self.active,
+            "sessions": self.sessions,
+            "processed": self._processed,
+            "start_backlog": self._start_backlog,
+        }
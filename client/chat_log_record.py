@@ -0,0 +1,239 @@
+"""
+chat_logs 행 레코드 (__slots__)
+==============================
+
+poll_messages는 메시지마다 get_column_index 클로저를 새로 만들고 list.index로 컬럼 위치를 다시 찾았으며,
+v 필드는 isMine/enc, origin, 채팅방 enc, 본문 enc 확인에서 json.loads를 여러 번,
+attachment는 답장 ID/이미지 URL 확인에서 여러 번 파싱했습니다.
+
+- ColumnMap: SELECT 컬럼 목록 -> 필드별 인덱스 (컬럼 구조가 정해질 때 1회 생성)
+- ChatLogRecord: 행마다 1회 생성, v/attachment는 처음 접근할 때 한 번만 파싱하고 결과를 보관
+- is_image_url / find_image_url_in_dict: attachment 이미지 URL 탐색 (poll_messages 내부 클로저였던 것)
+
+사용법:
+    column_map = ColumnMap(select_columns)
+    records = [ChatLogRecord(row, column_map) for row in rows]
+    record.msg_id, record.is_mine, record.origin, record.body_enc_type
+    record.attachment_json               # 원본 attachment가 평문 JSON이면 dict (1회 파싱)
+"""
+
+import json
+
+BASE_COLUMNS = ["_id", "chat_id", "user_id", "message", "created_at"]
+
+# SELECT 컬럼 이름 -> ChatLogRecord 속성
+_FIELDS = (
+    ("_id", "msg_id"),
+    ("chat_id", "chat_id"),
+    ("user_id", "user_id"),
+    ("message", "message"),
+    ("created_at", "created_at"),
+    ("v", "v_raw"),
+    ("userId", "kakao_user_id_raw"),
+    ("encType", "db_enc_type"),
+    ("type", "msg_type"),
+    ("attachment", "attachment"),
+    ("referer", "referer"),
+    ("supplement", "supplement"),
+)
+
+DEFAULT_ENC_TYPE = 31
+
+_UNPARSED = object()
+
+
+class ColumnMap:
+    """SELECT 컬럼 목록의 필드별 인덱스 (없는 컬럼은 -1)"""
+
+    __slots__ = ('columns', 'index', 'fields')
+
+    def __init__(self, columns=None):
+        self.columns = list(columns) if columns else list(BASE_COLUMNS)
+        self.index = {name: i for i, name in enumerate(self.columns)}
+        self.fields = tuple((attr, self.index.get(name, -1)) for name, attr in _FIELDS)
+
+    def __contains__(self, name):
+        return name in self.index
+
+
+class ChatLogRecord:
+    """chat_logs 한 행 (컬럼은 이름으로 접근, v/attachment는 지연 파싱 후 캐시)"""
+
+    __slots__ = ('row', 'msg_id', 'chat_id', 'user_id', 'message', 'created_at', 'v_raw', 'kakao_user_id_raw',
+                 'db_enc_type', 'msg_type', 'attachment', 'referer', 'supplement', '_v', '_attachment_json')
+
+    def __init__(self, row, column_map):
+        self.row = row
+        size = len(row)
+        for attr, idx in column_map.fields:
+            setattr(self, attr, row[idx] if 0 <= idx < size else None)
+        self._v = None
+        self._attachment_json = _UNPARSED
+
+    @classmethod
+    def from_dict(cls, data):
+        """컬럼 이름 -> 값 dict로 생성 (예: send_to_server의 message_data)"""
+        return cls(tuple(data.values()), ColumnMap(data.keys()))
+
+    def __repr__(self):
+        return f"ChatLogRecord(_id={self.msg_id}, chat_id={self.chat_id}, type={self.msg_type})"
+
+    @property
+    def v(self):
+        """v 필드 JSON (dict, 없거나 파싱 실패 시 빈 dict)"""
+        if self._v is None:
+            v_raw = self.v_raw
+            parsed = None
+            if isinstance(v_raw, dict):
+                parsed = v_raw
+            elif isinstance(v_raw, str) and v_raw:
+                try:
+                    parsed = json.loads(v_raw)
+                except (json.JSONDecodeError, TypeError):
+                    parsed = None
+            self._v = parsed if isinstance(parsed, dict) else {}
+        return self._v
+
+    @property
+    def is_mine(self):
+        """v.isMine (자신이 보낸 메시지)"""
+        return self.v.get("isMine", False)
+
+    @property
+    def origin(self):
+        """v.origin (MSG, SYNCMSG, SYNCDLMSG 등 - 메시지 삭제 감지용)"""
+        return self.v.get("origin")
+
+    @property
+    def enc_type(self):
+        """encType 컬럼 (없거나 NULL이면 31) - attachment 복호화 / 서버 전송용"""
+        return self.db_enc_type if self.db_enc_type is not None else DEFAULT_ENC_TYPE
+
+    @property
+    def body_enc_type(self):
+        """본문 복호화 enc: v.enc가 있으면 우선, 없으면 enc_type (decrypt_message와 동일)"""
+        v_enc = self.v.get("enc")
+        return v_enc if v_enc is not None else self.enc_type
+
+    @property
+    def room_enc_hint(self):
+        """채팅방 이름 복호화 enc 힌트 (v.enc, 없거나 0이면 None)"""
+        return self.v.get("enc") or None
+
+    @property
+    def attachment_json(self):
+        """원본 attachment가 평문 JSON 객체이면 dict, 아니면 None (1회만 파싱)"""
+        if self._attachment_json is _UNPARSED:
+            parsed = None
+            attachment = self.attachment
+            if isinstance(attachment, dict):
+                parsed = attachment
+            elif isinstance(attachment, str) and attachment.lstrip()[:1] == "{":
+                try:
+                    parsed = json.loads(attachment)
+                except (json.JSONDecodeError, TypeError):
+                    parsed = None
+            self._attachment_json = parsed if isinstance(parsed, dict) else None
+        return self._attachment_json
+
+
+# ---------------------------------------------------------------------------
+# attachment 이미지 URL 탐색
+# ---------------------------------------------------------------------------
+
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.svg']
+IMAGE_URL_PATTERNS = ['http://', 'https://', 'file://', 'content://']
+
+# 우선순위 1: Iris Rhino 기준 이미지 URL 키
+# type=2: attachment.url, type=27: attachment.imageUrls (배열)
+IMAGE_PRIORITY_KEYS = [
+    'url',  # ⚠️ 최우선: type=2일 때 원본 이미지 URL
+    'imageUrls',  # ⚠️ 최우선: type=27일 때 원본 이미지 URL 배열
+    'thumbnailUrl', 'thumbnailUrls',  # 썸네일 URL
+    'uri', 'imageUri', 'contentUri', 'image_uri', 'content_uri',  # 알림에서 사용
+    'path', 'path_1',  # 일반적인 이미지 키
+    'xl', 'l', 'm', 's',  # 썸네일 크기별 키
+    'imageUrl', 'image_url', 'photoUrl', 'photo_url',  # 이미지 URL 키
+    'filePath', 'file_path', 'localPath', 'local_path',  # 로컬 파일 경로
+    'originalUrl', 'original_url', 'fullUrl', 'full_url'  # 원본 이미지 URL
+]
+
+
+def is_image_url(value):
+    """값이 이미지 URL인지 확인 (확장자 또는 URL 패턴 기반)
+    참고: 카카오톡 알림에서 사용하는 URI 패턴 (content://, file:// 등)
+    """
+    if not isinstance(value, str) or len(value) < 5:
+        return False
+    value_lower = value.lower()
+
+    # URL 패턴 확인 (content://, file:// 등)
+    if any(pattern in value_lower for pattern in IMAGE_URL_PATTERNS):
+        # 확장자 확인
+        if any(ext in value_lower for ext in IMAGE_EXTENSIONS):
+            return True
+        # URL 패턴이 있으면 이미지로 간주 (확장자가 없어도)
+        if 'http' in value_lower:
+            return True
+        # content:// 또는 file:// 패턴도 이미지로 간주 (카카오톡 알림에서 사용)
+        if 'content://' in value_lower or 'file://' in value_lower:
+            return True
+
+    # 확장자만 있는 경우 (상대 경로)
+    if any(value_lower.endswith(ext) for ext in IMAGE_EXTENSIONS):
+        return True
+
+    return False
+
+
+def find_image_url_in_dict(data_dict, depth=0, max_depth=5, log=print):
+    """딕셔너리에서 이미지 URL 재귀적으로 찾기
+    참고: 카카오톡 알림에서 사용하는 키 이름 (uri, imageUri, contentUri 등)
+    """
+    if depth > max_depth:
+        return None
+
+    if not isinstance(data_dict, dict):
+        return None
+
+    for key in IMAGE_PRIORITY_KEYS:
+        value = data_dict.get(key)
+        if value:
+            # ⚠️ 중요: imageUrls는 배열이므로 첫 번째 요소 반환 (Iris Rhino 문서 참고)
+            if key == 'imageUrls' and isinstance(value, list) and len(value) > 0:
+                # type=27 (묶어보내기): 첫 번째 이미지 URL 반환
+                first_url = value[0]
+                if isinstance(first_url, str) and is_image_url(first_url):
+                    log(f"[이미지 URI 발견] 키='{key}' (배열 첫 번째), URI={first_url[:80]}...")
+                    return first_url
+            else:
+                # 문자열로 변환하여 확인
+                value_str = str(value)
+                if is_image_url(value_str):
+                    log(f"[이미지 URI 발견] 키='{key}', URI={value_str[:80]}...")
+                    return value_str
+
+    # 우선순위 2: 모든 키-값 쌍 확인 (더 깊이 탐색)
+    for key, value in data_dict.items():
+        if isinstance(value, str):
+            # 문자열 값이 이미지 URL인지 확인
+            if is_image_url(value):
+                log(f"[이미지 URI 발견] 키='{key}', URI={value[:80]}...")
+                return value
+        elif isinstance(value, dict):
+            # 재귀적으로 딕셔너리 내부 확인 (깊이 증가)
+            found = find_image_url_in_dict(value, depth + 1, max_depth, log)
+            if found:
+                return found
+        elif isinstance(value, list):
+            # 리스트 내부 확인
+            for item in value:
+                if isinstance(item, dict):
+                    found = find_image_url_in_dict(item, depth + 1, max_depth, log)
+                    if found:
+                        return found
+                elif isinstance(item, str) and is_image_url(item):
+                    log(f"[이미지 URI 발견] 리스트 항목, URI={item[:80]}...")
+                    return item
+
+    return None
@@ -0,0 +1,257 @@
+"""
+체크포인트 저장소 (마지막 처리 메시지 ID)
+=========================================
+
+기존에는 get_new_messages가 호출될 때마다 ~/last_message_id.txt를 읽고 sent_message_ids를
+set(range(last_id - 1000, last_id + 1))로 다시 만들었습니다.
+이 모듈은 체크포인트를 메모리에 두고, 옆 SQLite 파일(~/kakao_poller_state.db)에 묶어서 저장합니다.
+
+- 커밋: SQLite 트랜잭션(원자적) + synchronous=FULL(fsync), 재시작 시 정확히 이어서 처리
+- 묶음 저장: 마지막 커밋 후 commit_interval 경과 또는 commit_every개 처리 시 커밋
+  (그 사이 비정상 종료 시 최대 그만큼 다시 전송될 수 있음, 건너뛰지는 않음)
+- 최초 실행 시 기존 last_message_id.txt 값을 가져옴
+- state(선택): 체크포인트와 같은 트랜잭션에 저장할 객체 (to_bytes/load_bytes/advance_to/version,
+  예: SeenIds - 체크포인트 위에서 이미 전달된 ID를 재시작 후에도 다시 보내지 않음)
+- SendRetryBudget: 체크포인트는 첫 실패 직전에서 멈추므로, 같은 메시지가 계속 실패하면
+  (예: payload 오류) 그 뒤 메시지가 영영 조회되지 않음 -> 메시지별 재시도 횟수를 세고 상한을 넘으면 포기
+
+환경 변수:
+    MESSAGE_MAX_RETRIES=5    전송 실패 메시지 재시도 상한 (연결이 살아 있는데 실패한 경우만 셈)
+
+사용법:
+    store = CheckpointStore(path, legacy_file=STATE_FILE)
+    last_id = store.last_id             # 메모리 값 (파일 읽기 없음)
+    store.advance(msg_id)               # 전달 완료된 위치까지 전진 (필요 시 커밋)
+    store.close()                       # 남은 값 커밋
+
+    retries = SendRetryBudget()
+    if retries.failed(msg_id):          # True: 다시 시도 (체크포인트 유지), False: 포기 (체크포인트 전진)
+        failed_ids.append(msg_id)
+"""
+
+import os
+import time
+import sqlite3
+import threading
+
+CHECKPOINT_DB = os.getenv('CHECKPOINT_DB', os.path.expanduser('~/kakao_poller_state.db'))
+CHECKPOINT_COMMIT_INTERVAL = int(os.getenv('CHECKPOINT_COMMIT_INTERVAL_MS', '500')) / 1000.0
+CHECKPOINT_COMMIT_EVERY = int(os.getenv('CHECKPOINT_COMMIT_EVERY', '100'))
+
+MESSAGE_MAX_RETRIES = int(os.getenv('MESSAGE_MAX_RETRIES', '5'))
+
+CHECKPOINT_NAME = "chat_logs"
+
+
+class CheckpointStore:
+    """메모리 체크포인트 + SQLite 묶음 커밋"""
+
+    def __init__(self, path=CHECKPOINT_DB, legacy_file=None, commit_interval=CHECKPOINT_COMMIT_INTERVAL,
+                 commit_every=CHECKPOINT_COMMIT_EVERY, name=CHECKPOINT_NAME, state=None, clock=time.monotonic, log=print):
+        self.path = path
+        self.legacy_file = legacy_file
+        self.commit_interval = commit_interval
+        self.commit_every = commit_every
+        self.name = name
+        self.state = state
+        self._state_version = None  # 마지막으로 커밋한 state.version
+        self.log = log
+        self._clock = clock
+        self._conn = None
+        self._lock = threading.Lock()
+        self._last_id = None
+        self.committed_id = None
+        self._pending = 0
+        self._last_commit = clock()
+        self.commits = 0
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS checkpoint (
+                name TEXT PRIMARY KEY,
+                last_id INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS checkpoint_state (
+                name TEXT PRIMARY KEY,
+                data BLOB NOT NULL
+            )
+        """)
+        self._conn = conn
+
+    def _load(self):
+        self._open()
+        row = self._conn.execute("SELECT last_id FROM checkpoint WHERE name = ?", (self.name,)).fetchone()
+        if row is not None:
+            self._last_id = self.committed_id = int(row[0])
+            self._load_state()
+            return
+        last_id = self._read_legacy()
+        self._last_id = last_id
+        if last_id:
+            self._commit(last_id)
+            self.log(f"[체크포인트] 기존 상태 파일에서 가져옴: {self.legacy_file} -> last_id={last_id}")
+        else:
+            self.committed_id = 0
+        self._load_state()
+
+    def _load_state(self):
+        if self.state is None:
+            return
+        row = self._conn.execute("SELECT data FROM checkpoint_state WHERE name = ?", (self.name,)).fetchone()
+        if row is not None:
+            try:
+                self.state.load_bytes(bytes(row[0]))
+            except Exception as e:
+                self.log(f"[체크포인트] 상태 복원 실패 (무시): {type(e).__name__}: {e}")
+        self.state.advance_to(self._last_id)
+        self._state_version = self.state.version
+
+    def _read_legacy(self):
+        if not self.legacy_file:
+            return 0
+        try:
+            with open(self.legacy_file, 'r') as f:
+                content = f.read().strip()
+            return int(content) if content else 0
+        except (OSError, ValueError):
+            return 0
+
+    @property
+    def last_id(self):
+        """메모리 체크포인트 (최초 접근 시 한 번만 로드)"""
+        with self._lock:
+            if self._last_id is None:
+                self._load()
+            return self._last_id
+
+    @property
+    def dirty(self):
+        if self._last_id is None:
+            return False
+        return (self._last_id != self.committed_id or
+                (self.state is not None and self.state.version != self._state_version))
+
+    def advance(self, msg_id, count=1):
+        """
+        체크포인트 전진 (뒤로 가지 않음)
+
+        Args:
+            msg_id: 이 ID까지(포함) 모두 전달/처리 완료
+            count: 이번에 처리한 메시지 수 (commit_every 계산용)
+        """
+        with self._lock:
+            if self._last_id is None:
+                self._load()
+            if msg_id is None or msg_id <= self._last_id:
+                return False
+            self._last_id = msg_id
+            self._pending += count
+            if self._pending >= self.commit_every or self._clock() - self._last_commit >= self.commit_interval:
+                self._commit(msg_id)
+            return True
+
+    def commit_if_due(self):
+        """대기 전에 호출: 커밋 주기가 지났으면 남은 값 커밋"""
+        with self._lock:
+            if self.dirty and self._clock() - self._last_commit >= self.commit_interval:
+                self._commit(self._last_id)
+
+    def flush(self):
+        with self._lock:
+            if self.dirty:
+                self._commit(self._last_id)
+
+    def _commit(self, last_id):
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoint (name, last_id, updated_at) VALUES (?, ?, ?)",
+                (self.name, last_id, time.time()))
+            state_version = None
+            if self.state is not None:
+                state_version = self.state.version
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO checkpoint_state (name, data) VALUES (?, ?)",
+                    (self.name, self.state.to_bytes()))
+            self._conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            try:
+                self._conn.execute("ROLLBACK")
+            except sqlite3.Error:
+                pass
+            self.log(f"[체크포인트] 저장 실패: {e}")
+            return
+        self.committed_id = last_id
+        self._state_version = state_version
+        self._pending = 0
+        self._last_commit = self._clock()
+        self.commits += 1
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self):
+        return {
+            "last_id": self._last_id,
+            "committed_id": self.committed_id,
+            "pending": self._pending,
+            "commits": self.commits,
+        }
+
+
+class SendRetryBudget:
+    """전송 실패 메시지별 재시도 횟수 (상한 초과 시 포기 -> 체크포인트가 지나갈 수 있게 함)"""
+
+    def __init__(self, max_retries=MESSAGE_MAX_RETRIES, max_given_up=1000, log=print):
+        self.max_retries = max_retries
+        self.max_given_up = max_given_up
+        self.log = log
+        self._failures = {}  # msg_id -> 실패 횟수
+        self.given_up = []  # 최근 포기한 msg_id (최대 max_given_up개)
+        self.given_up_count = 0
+
+    def failed(self, msg_id, counted=True):
+        """
+        전송 실패 기록
+
+        Args:
+            counted: False면 횟수에 넣지 않음 (예: 서버 연결 끊김 - 메시지 문제가 아니므로 계속 재시도)
+
+        Returns:
+            bool: True면 다시 시도 (체크포인트를 이 메시지 앞에 둠), False면 포기
+        """
+        if not counted:
+            return True
+        failures = self._failures.get(msg_id, 0) + 1
+        if failures < self.max_retries:
+            self._failures[msg_id] = failures
+            return True
+        self._failures.pop(msg_id, None)
+        self.given_up.append(msg_id)
+        del self.given_up[:-self.max_given_up]
+        self.given_up_count += 1
+        self.log(f"[전송 포기] msg_id={msg_id}: {failures}회 실패, 건너뛰고 체크포인트 전진")
+        return False
+
+    def succeeded(self, msg_id):
+        self._failures.pop(msg_id, None)
+
+    def stats(self):
+        return {
+            "retrying": len(self._failures),
+            "given_up": self.given_up_count,
+            "recent_given_up": self.given_up[-5:],
+        }
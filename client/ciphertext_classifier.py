@@ -0,0 +1,83 @@
+"""
+암호문 판별기 (공용)
+====================
+
+메시지 본문, 닉네임, 채팅방 이름, attachment가 암호화된 값인지 판별합니다.
+기존에는 호출부마다 all(c in 'ABC...+/=' for c in s) 문자 단위 루프와
+서로 다른 길이/% 4 조건을 사용했기 때문에, 미리 컴파일한 정규식 하나로 통일합니다.
+
+판별 결과:
+    EMPTY       None / 빈 문자열 / 공백
+    JSON        '{' 또는 '['로 시작 (이미 복호화된 attachment 등)
+    CIPHERTEXT  base64 문자만 포함, 길이 % 4 == 0, 디코딩 길이가 16바이트(AES 블록) 배수
+    PLAINTEXT   그 외
+
+looks_like_base64 / has_base64_prefix는 기존 호출부의 느슨한 조건을 그대로 유지합니다.
+(발신자 이름: 서버에 암호화된 이름으로 보낼지, attachment: 복호화를 시도할지 -
+ 블록 길이가 맞지 않는 값도 기존처럼 처리)
+
+사용법:
+    from ciphertext_classifier import classify, is_ciphertext, CIPHERTEXT
+
+    if is_ciphertext(message):
+        ...
+"""
+
+import re
+
+EMPTY = "empty"
+JSON = "json"
+CIPHERTEXT = "ciphertext"
+PLAINTEXT = "plaintext"
+
+AES_BLOCK_SIZE = 16
+
+# base64 본문 + 끝의 '=' 패딩 0~2개
+_BASE64_RE = re.compile(r'[A-Za-z0-9+/]+={0,2}')
+# 문자 집합만 확인 (패딩 위치 무관)
+_BASE64_CHARSET_RE = re.compile(r'[A-Za-z0-9+/=]+')
+LEGACY_MIN_LENGTH = 11  # 기존 판별식: len > 10
+ATTACHMENT_PREFIX_CHARS = 100  # 기존 attachment 판별식: 앞 100자만 문자 검사
+
+
+def classify(value):
+    """문자열 분류 (EMPTY / JSON / CIPHERTEXT / PLAINTEXT)"""
+    if value is None:
+        return EMPTY
+    if not isinstance(value, str):
+        value = str(value)
+    value = value.strip()
+    if not value:
+        return EMPTY
+    first = value[0]
+    if first == '{' or first == '[':
+        return JSON
+    length = len(value)
+    if length % 4 != 0 or _BASE64_RE.fullmatch(value) is None:
+        return PLAINTEXT
+    decoded_length = length // 4 * 3 - (2 if value.endswith('==') else 1 if value.endswith('=') else 0)
+    if decoded_length == 0 or decoded_length % AES_BLOCK_SIZE != 0:
+        return PLAINTEXT
+    return CIPHERTEXT
+
+
+def is_ciphertext(value):
+    """base64로 인코딩된 AES 암호문 형태인지"""
+    return classify(value) == CIPHERTEXT
+
+
+def looks_like_base64(value):
+    """기존 판별식: 길이 > 10, 길이 % 4 == 0, base64 문자만 (디코딩 길이는 보지 않음)"""
+    return (isinstance(value, str) and len(value) >= LEGACY_MIN_LENGTH and len(value) % 4 == 0 and
+            _BASE64_CHARSET_RE.fullmatch(value) is not None)
+
+
+def has_base64_prefix(value, prefix_chars=ATTACHMENT_PREFIX_CHARS):
+    """기존 attachment 판별식: 길이 > 10, '{'로 시작하지 않고 앞 prefix_chars자가 base64 문자"""
+    return (isinstance(value, str) and len(value) >= LEGACY_MIN_LENGTH and not value.startswith('{') and
+            _BASE64_CHARSET_RE.fullmatch(value, 0, prefix_chars) is not None)
+
+
+def is_base64_text(value):
+    """base64 문자만으로 이루어졌는지 (복호화 결과가 여전히 base64인지 검사할 때 사용)"""
+    return isinstance(value, str) and _BASE64_CHARSET_RE.fullmatch(value) is not None
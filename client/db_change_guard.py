@@ -0,0 +1,108 @@
+"""
+DB 변경 감지 가드 (PRAGMA data_version + WAL 파일 크기/mtime)
+=============================================================
+
+poll_reaction_updates는 REACTION_CHECK_INTERVAL(20초)마다 최대 1200행을 읽고 v를 모두 json.loads하며,
+백필도 주기마다 48시간 범위를 다시 읽습니다. 카카오톡이 그 사이 아무것도 쓰지 않았어도 마찬가지입니다.
+이 모듈은 전용 장기 연결의 PRAGMA main/db2.data_version(다른 연결이 커밋하면 바뀜)과
+DB/WAL 파일의 (크기, mtime)을 합친 변경 토큰을 작업(consumer)별로 기억해, 마지막 실행 이후
+바뀐 것이 없으면 그 작업을 건너뛰게 합니다.
+
+- data_version은 연결마다 따로 증가하므로 가드 전용 연결(DbConnectionManager)에서만 읽음
+  (연결이 새로 열리면 opens가 바뀌어 토큰도 달라짐 -> 한 번 실행)
+- WAL 파일 stat: 체크포인트 전 WAL 추가 기록, 롤백 저널 모드의 본 파일 변경도 감지
+- 읽기 실패 시에는 항상 실행 (건너뛰지 않음)
+- 토큰은 작업 실행 전에 기록하므로 작업이 실패하면 reset()으로 지워야 다음 주기에 다시 실행됨
+- 스냅샷(복사본)을 읽는 작업은 source에 스냅샷 갱신 횟수를 넘김: 원본 변경이 토큰을 소비한 뒤
+  아직 갱신 전인 스냅샷을 읽었어도, 스냅샷이 갱신되면 다시 실행
+- stats(): 작업별 실행/건너뜀 횟수
+
+환경 변수:
+    DB_CHANGE_GUARD=1                poller에서 사용 (0이면 항상 실행)
+
+사용법:
+    guard = DbChangeGuard(DB_PATH, DB_PATH2)
+    if guard.should_run("reaction_scan"):
+        scan()
+    guard.reset("reaction_scan")     # 다음 호출은 변경이 없어도 실행 (예: 스로틀로 보류된 이벤트, 작업 실패)
+    guard.should_run("reaction_scan", source=snapshot.refreshes)  # 스냅샷을 읽는 작업: 스냅샷 갱신도 변경으로 봄
+"""
+
+import os
+import sqlite3
+import threading
+from collections import Counter
+
+from db_connection import DbConnectionManager
+
+DB_CHANGE_GUARD_ENABLED = os.getenv('DB_CHANGE_GUARD', '1') == '1'
+
+
+def file_signature(path):
+    """(크기, mtime_ns) 또는 None (파일 없음)"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+class DbChangeGuard:
+    """작업별 "마지막 실행 이후 DB가 바뀌었는지" 판단"""
+
+    def __init__(self, db_path, db_path2=None, log=print):
+        self.paths = [db_path, db_path + "-wal"]
+        if db_path2:
+            self.paths += [db_path2, db_path2 + "-wal"]
+        # 가드 전용 연결 (data_version 비교는 같은 연결에서만 의미가 있음), 캐시는 최소로
+        self._db = DbConnectionManager(db_path, db_path2, mmap_size=0, cache_size_kb=64, log=log)
+        self.log = log
+        self._lock = threading.Lock()
+        self._last = {}  # 작업 이름 -> 마지막 실행 시 토큰
+        self.executed = Counter()
+        self.skipped = Counter()
+
+    def token(self):
+        """현재 변경 토큰 (data_version을 읽지 못하면 None)"""
+        try:
+            conn = self._db.connect()
+            try:
+                versions = (conn.execute("PRAGMA main.data_version").fetchone()[0],
+                            conn.execute("PRAGMA db2.data_version").fetchone()[0] if conn.db2_attached else None)
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return None
+        return (self._db.opens, versions, tuple(file_signature(path) for path in self.paths))
+
+    def should_run(self, name, source=None):
+        """
+        name 작업을 실행해야 하는지 (마지막 실행 이후 변경이 있거나 처음이면 True)
+
+        Args:
+            source: 작업이 읽는 복사본의 버전 (예: 스냅샷 갱신 횟수) - 원본이 그대로여도 바뀌면 실행
+        """
+        token = self.token()
+        if token is not None:
+            token = (token, source)
+        with self._lock:
+            if token is not None and self._last.get(name) == token:
+                self.skipped[name] += 1
+                return False
+            if token is not None:
+                self._last[name] = token
+            self.executed[name] += 1
+            return True
+
+    def reset(self, name):
+        """name 작업의 기억 토큰 삭제 (다음 should_run은 True)"""
+        with self._lock:
+            self._last.pop(name, None)
+
+    def close(self):
+        self._db.close()
+
+    def stats(self):
+        with self._lock:
+            names = sorted(set(self.executed) | set(self.skipped))
+            return {name: {"executed": self.executed[name], "skipped": self.skipped[name]} for name in names}
@@ -0,0 +1,227 @@
+"""
+읽기 전용 SQLite 연결 관리자
+============================
+
+get_name_of_user_id, get_chat_room_data, get_new_messages 등은 호출마다
+sqlite3.connect(DB_PATH)를 열고, 이름/채팅방 조회는 매번 KakaoTalk2.db를 ATTACH합니다.
+이 모듈은 스레드별로 오래 유지되는 읽기 전용 연결(mode=ro URI)을 만들고 db2는 연결당 한 번만 attach합니다.
+
+- PRAGMA: query_only, busy_timeout, mmap_size, cache_size (main/db2 모두)
+- 트랜잭션을 짧게 유지: 자동 커밋 모드(isolation_level=None) + 반납 시 빌려간 커서를 모두 닫아
+  읽기 스냅샷을 해제 (카카오톡의 WAL 체크포인트를 막지 않음)
+- DB 파일이 교체되면(inode 변경) 다음 connect()에서 자동 재연결
+- 한 번만 실행되는 백그라운드 스레드는 끝날 때 release_thread()로 자기 연결을 닫음
+  (닫지 않으면 스레드가 끝나도 close()까지 연결과 mmap이 남음)
+
+사용법:
+    db = DbConnectionManager(DB_PATH, DB_PATH2, log=print)
+
+    conn = db.connect()          # 기존 sqlite3.connect(DB_PATH) 자리
+    cursor = conn.cursor()
+    cursor.execute("SELECT name, enc FROM db2.friends WHERE id = ?", (user_id,))
+    row = cursor.fetchone()
+    conn.close()                 # 연결은 유지하고 커서/스냅샷만 반납
+    db.release_thread()          # 스레드 종료 전: 이 스레드의 연결 닫기
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from urllib.parse import quote
+
+DB_MMAP_SIZE = int(os.getenv('DB_MMAP_SIZE', str(64 * 1024 * 1024)))  # 바이트
+DB_CACHE_SIZE_KB = int(os.getenv('DB_CACHE_SIZE_KB', '8192'))
+DB_BUSY_TIMEOUT_MS = int(os.getenv('DB_BUSY_TIMEOUT_MS', '2000'))
+
+
+def file_identity(path):
+    """(st_dev, st_ino) 또는 None (파일 없음)"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+def read_only_uri(path):
+    return f"file:{quote(os.path.abspath(path))}?mode=ro"
+
+
+class LeasedConnection:
+    """
+    관리자가 빌려준 연결
+
+    sqlite3.Connection과 같은 형태로 cursor()/execute()를 제공하며,
+    close()는 연결을 닫지 않고 이 임대에서 만든 커서만 닫습니다.
+    """
+
+    def __init__(self, connection, db2_attached):
+        self._connection = connection
+        self._cursors = []
+        self.db2_attached = db2_attached
+
+    def cursor(self):
+        cursor = self._connection.cursor()
+        self._cursors.append(cursor)
+        return cursor
+
+    def execute(self, sql, parameters=()):
+        cursor = self.cursor()
+        cursor.execute(sql, parameters)
+        return cursor
+
+    def close(self):
+        """반납: 진행 중인 문장을 끝내 읽기 스냅샷 해제 (연결은 유지)"""
+        for cursor in self._cursors:
+            try:
+                cursor.close()
+            except sqlite3.Error:
+                pass
+        self._cursors = []
+        try:
+            if self._connection.in_transaction:
+                self._connection.rollback()
+        except sqlite3.Error:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class _ThreadConnection:
+    __slots__ = ('connection', 'db2_attached', 'identity', 'opened_at')
+
+    def __init__(self, connection, db2_attached, identity):
+        self.connection = connection
+        self.db2_attached = db2_attached
+        self.identity = identity
+        self.opened_at = time.time()
+
+
+class DbConnectionManager:
+    """스레드별 장기 읽기 전용 연결 (db2 1회 attach, inode 변경 시 재연결)"""
+
+    def __init__(self, db_path, db_path2=None, mmap_size=DB_MMAP_SIZE, cache_size_kb=DB_CACHE_SIZE_KB,
+                 busy_timeout_ms=DB_BUSY_TIMEOUT_MS, log=print):
+        self.db_path = db_path
+        self.db_path2 = db_path2
+        self.mmap_size = mmap_size
+        self.cache_size_kb = cache_size_kb
+        self.busy_timeout_ms = busy_timeout_ms
+        self.log = log
+        self._local = threading.local()
+        self._all = []
+        self._lock = threading.Lock()
+        self.opens = 0
+        self.reconnects = 0
+        self.attaches = 0
+        self.leases = 0
+        self.read_only = None  # mode=ro로 열렸는지 (일반 모드 fallback이면 False)
+
+    def _identity(self):
+        return (file_identity(self.db_path), file_identity(self.db_path2) if self.db_path2 else None)
+
+    def _open(self, identity):
+        timeout = self.busy_timeout_ms / 1000.0
+        try:
+            conn = sqlite3.connect(read_only_uri(self.db_path), uri=True, timeout=timeout,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+            read_only = True
+        except sqlite3.OperationalError as e:
+            # WAL 파일(-shm)에 접근할 수 없는 환경 등: 일반 모드 + query_only로 연결
+            self.log(f"[DB 연결] 읽기 전용(mode=ro) 열기 실패, 일반 모드로 연결: {e}")
+            conn = sqlite3.connect(self.db_path, timeout=timeout, isolation_level=None, check_same_thread=False)
+            read_only = False
+        self.read_only = read_only
+
+        conn.execute("PRAGMA query_only = 1")
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        schemas = ["main"]
+
+        db2_attached = False
+        if identity[1] is not None:
+            try:
+                target = read_only_uri(self.db_path2) if read_only else self.db_path2
+                conn.execute("ATTACH DATABASE ? AS db2", (target,))
+                db2_attached = True
+                schemas.append("db2")
+                self.attaches += 1
+            except sqlite3.OperationalError as e:
+                self.log(f"[DB 연결] db2 attach 실패: {e}")
+
+        for schema in schemas:
+            conn.execute(f"PRAGMA {schema}.mmap_size = {int(self.mmap_size)}").fetchall()
+            conn.execute(f"PRAGMA {schema}.cache_size = {-int(self.cache_size_kb)}")
+
+        self.opens += 1
+        return _ThreadConnection(conn, db2_attached, identity)
+
+    def connect(self):
+        """
+        현재 스레드의 연결 임대 (없거나 DB 파일이 교체되었으면 새로 연결)
+
+        Raises:
+            sqlite3.OperationalError: DB 파일이 없거나 열 수 없음
+        """
+        identity = self._identity()
+        if identity[0] is None:
+            raise sqlite3.OperationalError(f"unable to open database file: {self.db_path}")
+
+        current = getattr(self._local, 'current', None)
+        if current is not None and current.identity != identity:
+            self.log(f"[DB 연결] DB 파일 변경 감지 (inode 변경), 재연결: {self.db_path}")
+            self._close_one(current)
+            current = None
+            self.reconnects += 1
+        if current is None:
+            current = self._open(identity)
+            self._local.current = current
+            with self._lock:
+                self._all.append(current)
+        self.leases += 1
+        return LeasedConnection(current.connection, current.db2_attached)
+
+    def _close_one(self, current):
+        with self._lock:
+            if current in self._all:
+                self._all.remove(current)
+        try:
+            current.connection.close()
+        except sqlite3.Error:
+            pass
+
+    def release_thread(self):
+        """현재 스레드의 연결 닫기 (없으면 무시, 다시 connect()하면 새로 연결)"""
+        current = getattr(self._local, 'current', None)
+        if current is not None:
+            self._local.current = None
+            self._close_one(current)
+
+    def close(self):
+        """모든 스레드의 연결 닫기"""
+        with self._lock:
+            connections, self._all = self._all, []
+        for current in connections:
+            try:
+                current.connection.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    def stats(self):
+        with self._lock:
+            open_count = len(self._all)
+        return {
+            "open": open_count,
+            "opens": self.opens,
+            "reconnects": self.reconnects,
+            "attaches": self.attaches,
+            "leases": self.leases,
+            "read_only": self.read_only,
+        }
@@ -0,0 +1,211 @@
+"""
+KakaoTalk DB 스냅샷 (SQLite 백업 API)
+=====================================
+
+반응 스캔/백필/분석 도구가 카카오톡이 쓰고 있는 DB를 직접 읽으면 `database is locked` 오류가 나고,
+카카오톡도 우리 읽기가 끝날 때까지 기다리게 됩니다.
+이 모듈은 백그라운드 스레드에서 sqlite3.Connection.backup으로 KakaoTalk.db/KakaoTalk2.db의
+비공개 복사본을 tmpfs(/dev/shm)에 주기적으로 만들고, 무거운 조회는 그 복사본에서 합니다.
+(저지연이 필요한 새 메시지 조회는 계속 원본 DB 사용)
+
+- 점진 백업: 한 단계에 pages 페이지씩 복사하고 단계 사이에 step_sleep만큼 쉼 (원본 잠금을 짧게 유지)
+- 복사 중 원본이 바뀌면 SQLite가 백업을 처음부터 다시 시작함 (진행 없는 단계로 집계) -> max_restarts회를 넘으면
+  한 번에 전체 복사(pages=-1)로 전환
+- 임시 파일에 복사한 뒤 os.replace로 원자적 교체 -> 스냅샷 연결(DbConnectionManager)은 inode 변경을 보고 재연결
+- stats(): 스냅샷 나이, 마지막 복사 시간/페이지/단계/재시작 (페이지 수 조정용)
+
+환경 변수:
+    DB_SNAPSHOT=1                    poller에서 스냅샷 모드 사용
+    DB_SNAPSHOT_DIR                  복사본 위치 (기본 /dev/shm, 없으면 임시 디렉터리)
+    DB_SNAPSHOT_INTERVAL_SEC=30      갱신 주기
+    DB_SNAPSHOT_PAGES=256            백업 단계당 페이지 수
+    DB_SNAPSHOT_STEP_SLEEP_MS=2      단계 사이 대기
+    DB_SNAPSHOT_MAX_RESTARTS=5       이 횟수를 넘게 재시작하면 한 번에 전체 복사
+
+사용법:
+    snapshot = DbSnapshot(DB_PATH, DB_PATH2, log=print)
+    snapshot.start()                 # 첫 복사 후 interval마다 갱신
+    if snapshot.ready:
+        conn = snapshot.connect()    # DbConnectionManager.connect()와 같음 (db2 attach 포함)
+    snapshot.stop()
+"""
+
+import os
+import time
+import sqlite3
+import tempfile
+import threading
+
+from db_connection import DbConnectionManager, read_only_uri
+
+DB_SNAPSHOT_ENABLED = os.getenv('DB_SNAPSHOT', '0') == '1'
+DB_SNAPSHOT_DIR = os.getenv('DB_SNAPSHOT_DIR', '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir())
+DB_SNAPSHOT_INTERVAL = float(os.getenv('DB_SNAPSHOT_INTERVAL_SEC', '30'))
+DB_SNAPSHOT_PAGES = int(os.getenv('DB_SNAPSHOT_PAGES', '256'))
+DB_SNAPSHOT_STEP_SLEEP = int(os.getenv('DB_SNAPSHOT_STEP_SLEEP_MS', '2')) / 1000.0
+DB_SNAPSHOT_MAX_RESTARTS = int(os.getenv('DB_SNAPSHOT_MAX_RESTARTS', '5'))
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+def backup_database(source_path, dest_path, pages=DB_SNAPSHOT_PAGES, step_sleep=DB_SNAPSHOT_STEP_SLEEP,
+                    max_restarts=DB_SNAPSHOT_MAX_RESTARTS):
+    """
+    source_path를 dest_path로 온라인 백업 (임시 파일에 복사 후 원자적 교체)
+
+    Returns:
+        dict: duration, pages, steps, restarts, bytes, full_copy(재시작이 많아 한 번에 복사했는지)
+    """
+    tmp_path = dest_path + ".tmp"
+    started = time.perf_counter()
+    info = {"pages": 0, "steps": 0, "restarts": 0, "full_copy": False}
+    last_remaining = [None]
+
+    def progress(status, remaining, total):
+        info["steps"] += 1
+        info["pages"] = total
+        if last_remaining[0] is not None and remaining >= last_remaining[0]:
+            # 진행 없음: 복사 도중 원본이 변경되어 처음부터 다시 시작됨 (또는 원본이 잠겨 대기)
+            info["restarts"] += 1
+            if info["restarts"] > max_restarts and not info["full_copy"]:
+                raise _TooManyRestarts()
+        last_remaining[0] = remaining
+
+    try:
+        source = sqlite3.connect(read_only_uri(source_path), uri=True)
+        source.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+    except sqlite3.OperationalError:
+        source = sqlite3.connect(source_path)
+    try:
+        for attempt_pages in (pages, -1):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            dest = sqlite3.connect(tmp_path)
+            try:
+                source.backup(dest, pages=attempt_pages, progress=progress, sleep=step_sleep)
+                # 복사본은 단일 파일로 (원본이 WAL이어도 -wal/-shm 없이 읽기)
+                dest.execute("PRAGMA journal_mode=DELETE").fetchall()
+                break
+            except _TooManyRestarts:
+                info["full_copy"] = True
+                last_remaining[0] = None
+            finally:
+                dest.close()
+    finally:
+        source.close()
+
+    os.replace(tmp_path, dest_path)
+    info["bytes"] = os.path.getsize(dest_path)
+    info["duration"] = time.perf_counter() - started
+    return info
+
+
+class DbSnapshot:
+    """tmpfs에 유지하는 KakaoTalk DB 비공개 복사본"""
+
+    def __init__(self, db_path, db_path2=None, directory=DB_SNAPSHOT_DIR, interval=DB_SNAPSHOT_INTERVAL,
+                 pages=DB_SNAPSHOT_PAGES, step_sleep=DB_SNAPSHOT_STEP_SLEEP, max_restarts=DB_SNAPSHOT_MAX_RESTARTS,
+                 log=print):
+        self.db_path = db_path
+        self.db_path2 = db_path2
+        self.directory = directory
+        self.interval = interval
+        self.pages = pages
+        self.step_sleep = step_sleep
+        self.max_restarts = max_restarts
+        self.log = log
+        prefix = f"kakao_snapshot_{os.getpid()}_"
+        self.snapshot_path = os.path.join(directory, prefix + os.path.basename(db_path))
+        self.snapshot_path2 = os.path.join(directory, prefix + os.path.basename(db_path2)) if db_path2 else None
+        self.db = DbConnectionManager(self.snapshot_path, self.snapshot_path2, log=log)
+        self._thread = None
+        self._stop = threading.Event()
+        self.refreshed_at = None  # 마지막 갱신 시작 시각 (복사본은 이 시점 이후의 원본 상태)
+        self.refreshes = 0
+        self.failures = 0
+        self.last = {}  # 마지막 갱신 비용
+
+    @property
+    def ready(self):
+        return self.refreshed_at is not None
+
+    def age(self):
+        """스냅샷 나이(초), 아직 없으면 None"""
+        if self.refreshed_at is None:
+            return None
+        return time.time() - self.refreshed_at
+
+    def refresh(self):
+        """원본 DB들을 복사본으로 백업 (실패 시 기존 복사본 유지)"""
+        started_at = time.time()
+        total = {"duration": 0.0, "pages": 0, "steps": 0, "restarts": 0, "bytes": 0, "full_copy": False}
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            sources = [(self.db_path, self.snapshot_path)]
+            if self.db_path2 and os.path.exists(self.db_path2):
+                sources.append((self.db_path2, self.snapshot_path2))
+            for source_path, dest_path in sources:
+                info = backup_database(source_path, dest_path, self.pages, self.step_sleep, self.max_restarts)
+                for key in ("duration", "pages", "steps", "restarts", "bytes"):
+                    total[key] += info[key]
+                total["full_copy"] = total["full_copy"] or info["full_copy"]
+        except (sqlite3.Error, OSError) as e:
+            self.failures += 1
+            self.log(f"[DB 스냅샷] 갱신 실패 (기존 복사본 유지): {e}")
+            return False
+
+        self.refreshed_at = started_at
+        self.refreshes += 1
+        self.last = total
+        self.log(f"[DB 스냅샷] 갱신: {total['bytes'] / 1024 / 1024:.1f}MB, {total['pages']}페이지, "
+                 f"{total['steps']}단계, 재시작 {total['restarts']}회"
+                 f"{' (전체 복사 전환)' if total['full_copy'] else ''}, {total['duration']:.2f}초")
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """백그라운드 갱신 시작 (첫 복사도 백그라운드에서, 준비 전에는 ready=False)"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="db-snapshot", daemon=True)
+        self._thread.start()
+
+    def stop(self, remove=True):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        self.db.close()
+        if remove:
+            for path in (self.snapshot_path, self.snapshot_path2):
+                for candidate in (path, path and path + ".tmp"):
+                    if candidate and os.path.exists(candidate):
+                        try:
+                            os.remove(candidate)
+                        except OSError:
+                            pass
+
+    def connect(self):
+        """복사본 연결 임대 (DbConnectionManager.connect와 같음)"""
+        return self.db.connect()
+
+    def stats(self):
+        age = self.age()
+        return {
+            "age_sec": round(age, 1) if age is not None else None,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "last_duration_sec": round(self.last.get("duration", 0.0), 3),
+            "last_pages": self.last.get("pages", 0),
+            "last_steps": self.last.get("steps", 0),
+            "last_restarts": self.last.get("restarts", 0),
+            "last_bytes": self.last.get("bytes", 0),
+            "pages_per_step": self.pages,
+        }
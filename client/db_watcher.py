@@ -0,0 +1,203 @@
+"""
+DB 변경 감시 (inotify)
+======================
+
+poll_messages는 매 반복 끝에서 time.sleep(1.0)을 하므로 새 메시지 감지 지연이 평균 500ms이고,
+대기 중에도 하루 86,400번 깨어납니다.
+이 모듈은 inotify(Linux/Termux, ctypes)로 KakaoTalk.db, KakaoTalk.db-wal, KakaoTalk2.db-wal의
+변경을 감시하여 변경이 있을 때만 폴링 루프를 깨웁니다.
+
+- 디렉터리 단위로 감시 (WAL 파일이 삭제/재생성되어도 계속 감지), 파일 이름으로 필터
+  (읽기 연결이 건드리는 -shm 파일은 감시 대상 아님)
+- 디바운스: 첫 이벤트 후 DEBOUNCE초 동안 조용해질 때까지(최대 MAX_DEBOUNCE초) 이벤트를 모아 한 번만 깨움
+- inotify를 사용할 수 없으면(비 Linux, 디렉터리 없음 등) 기존과 같은 고정 간격 대기로 동작
+
+사용법:
+    watcher = DbWatcher([DB_PATH, DB_PATH + "-wal", DB_PATH2 + "-wal"])
+    while True:
+        poll_once()
+        watcher.wait(timeout=5.0)   # 변경 시 즉시 "change", 없으면 timeout 후 "timeout"
+"""
+
+import os
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+
+DB_WATCH_DEBOUNCE = float(os.getenv('DB_WATCH_DEBOUNCE_MS', '15')) / 1000.0
+DB_WATCH_MAX_DEBOUNCE = float(os.getenv('DB_WATCH_MAX_DEBOUNCE_MS', '100')) / 1000.0
+DB_WATCH_FALLBACK = float(os.getenv('DB_WATCH_FALLBACK_SEC', '5'))  # inotify 사용 시 최대 대기
+DB_WATCH_POLL_INTERVAL = 1.0  # inotify 없을 때 대기 간격 (기존 폴링 간격)
+
+CHANGE = "change"
+TIMEOUT = "timeout"
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+def _load_libc():
+    for name in (None, ctypes.util.find_library('c'), 'libc.so'):
+        try:
+            libc = ctypes.CDLL(name, use_errno=True)
+            libc.inotify_init1
+            libc.inotify_add_watch
+            return libc
+        except (OSError, AttributeError, TypeError):
+            continue
+    return None
+
+
+class DbWatcher:
+    """KakaoTalk DB/WAL 변경 시 깨어나는 대기 객체"""
+
+    def __init__(self, paths, debounce=DB_WATCH_DEBOUNCE, max_debounce=DB_WATCH_MAX_DEBOUNCE,
+                 poll_interval=DB_WATCH_POLL_INTERVAL, log=print):
+        self.debounce = debounce
+        self.max_debounce = max_debounce
+        self.poll_interval = poll_interval
+        self.log = log
+        self._fd = None
+        self._watches = {}  # wd -> (디렉터리, 감시할 파일 이름 집합)
+        self.changes = 0
+        self.timeouts = 0
+        self.events = 0
+
+        targets = {}
+        for path in paths:
+            if path:
+                directory, name = os.path.split(os.path.abspath(path))
+                targets.setdefault(directory, set()).add(name)
+        self._start(targets)
+
+    @property
+    def available(self):
+        return self._fd is not None
+
+    @property
+    def backend(self):
+        return "inotify" if self._fd is not None else "timer"
+
+    def _start(self, targets):
+        libc = _load_libc()
+        if libc is None:
+            self.log("[DB 감시] inotify 사용 불가 (libc 로드 실패), 고정 간격 폴링 사용")
+            return
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            self.log(f"[DB 감시] inotify 사용 불가 ({os.strerror(ctypes.get_errno())}), 고정 간격 폴링 사용")
+            return
+        for directory, names in targets.items():
+            wd = libc.inotify_add_watch(fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                self.log(f"[DB 감시] 감시 등록 실패: {directory} ({os.strerror(ctypes.get_errno())})")
+                continue
+            self._watches[wd] = (directory, {os.fsencode(n) for n in names})
+        if not self._watches:
+            os.close(fd)
+            self.log("[DB 감시] 감시할 디렉터리 없음, 고정 간격 폴링 사용")
+            return
+        self._fd = fd
+        watched = ", ".join(f"{d}/{{{','.join(sorted(os.fsdecode(n) for n in names))}}}" for d, names in self._watches.values())
+        self.log(f"[DB 감시] inotify 감시 시작: {watched}")
+
+    def _drain(self):
+        """대기 중인 이벤트를 모두 읽고 감시 대상 파일의 변경이 있었는지 반환"""
+        changed = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            except OSError as e:
+                if e.errno == errno.EINTR:
+                    continue
+                raise
+            if not data:
+                return changed
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                name = data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length].rstrip(b'\0')
+                offset += _EVENT_HEADER.size + length
+                self.events += 1
+                if mask & IN_Q_OVERFLOW:
+                    changed = True
+                elif mask & IN_IGNORED:
+                    # 디렉터리가 삭제/언마운트됨: 이 감시는 더 이상 이벤트를 보내지 않음
+                    directory, _ = self._watches.pop(wd, (None, None))
+                    self.log(f"[DB 감시] 감시 해제됨: {directory}")
+                    changed = True
+                else:
+                    watch = self._watches.get(wd)
+                    if watch is not None and name in watch[1]:
+                        changed = True
+
+    def _select(self, timeout):
+        try:
+            readable, _, _ = select.select([self._fd], [], [], max(timeout, 0))
+        except InterruptedError:
+            return False
+        return bool(readable)
+
+    def wait(self, timeout=DB_WATCH_FALLBACK):
+        """
+        변경이 있거나 timeout초가 지날 때까지 대기
+
+        Returns:
+            CHANGE (감시 파일 변경, 디바운스 완료) 또는 TIMEOUT
+        """
+        if self._fd is None or not self._watches:
+            time.sleep(max(min(timeout, self.poll_interval), 0))
+            self.timeouts += 1
+            return TIMEOUT
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if not self._select(remaining):
+                if remaining <= 0 or time.monotonic() >= deadline:
+                    self.timeouts += 1
+                    return TIMEOUT
+                continue
+            if self._drain():
+                break
+
+        # 디바운스: 연속 쓰기(WAL 프레임 여러 개 + 커밋)가 끝날 때까지 모음
+        burst_end = time.monotonic() + self.max_debounce
+        while True:
+            quiet = min(self.debounce, burst_end - time.monotonic())
+            if quiet <= 0 or not self._select(quiet):
+                break
+            self._drain()
+        self.changes += 1
+        return CHANGE
+
+    def close(self):
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
+            self._watches = {}
+
+    def stats(self):
+        return {
+            "backend": self.backend,
+            "changes": self.changes,
+            "timeouts": self.timeouts,
+            "events": self.events,
+        }
@@ -0,0 +1,124 @@
+"""
+복호화 결과 메모 (LRU + 실패 캐시)
+==================================
+
+같은 닉네임(open_chat_member.nickname), 채팅방 이름(private_meta.name)은 메시지마다
+다시 복호화되고, 모든 enc 후보가 실패하는 암호문은 매번 다시 시도됩니다.
+AES/CBC는 IV가 고정이므로 (암호문, user_id, enc)가 같으면 결과도 항상 같습니다.
+이 모듈은 (암호문, user_id, enc) 다이제스트를 키로 복호화 결과를 기억합니다.
+
+- 성공 결과: LRU 상한까지 유지
+- 실패 결과(None/예외): negative_ttl초 동안만 유지 후 다시 시도
+
+사용법:
+    memo = DecryptMemo()
+    decrypted = memo.decrypt(ciphertext, user_id, enc, KakaoDecrypt.decrypt)
+    # KakaoDecrypt.decrypt(user_id, enc, ciphertext)와 동일한 결과 (두 번째부터 AES 없음)
+"""
+
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_SIZE = 4096
+DEFAULT_NEGATIVE_TTL = 600  # 초
+
+_MISS = object()
+
+
+class DecryptMemo:
+    """(암호문, user_id, enc) -> 복호화 결과 LRU 메모"""
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, negative_ttl=DEFAULT_NEGATIVE_TTL, clock=time.monotonic):
+        self.max_size = max_size
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (plaintext 또는 None, 실패 만료 시각 또는 None)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(ciphertext, user_id, enc):
+        """키: (암호문, user_id, enc) blake2b 다이제스트 (긴 attachment도 16바이트로 보관)"""
+        if isinstance(ciphertext, str):
+            ciphertext = ciphertext.encode('utf-8')
+        digest = hashlib.blake2b(ciphertext, digest_size=16)
+        digest.update(f"\0{user_id}\0{enc}".encode('ascii'))
+        return digest.digest()
+
+    def get(self, ciphertext, user_id, enc):
+        """
+        메모 조회
+
+        Returns:
+            (hit, plaintext): hit=False이면 메모 없음, hit=True이고 plaintext=None이면 알려진 실패
+        """
+        key = self.make_key(ciphertext, user_id, enc)
+        with self._lock:
+            entry = self._entries.get(key, _MISS)
+            if entry is _MISS:
+                self.misses += 1
+                return False, None
+            plaintext, expires_at = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            if plaintext is None:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return True, plaintext
+
+    def put(self, ciphertext, user_id, enc, plaintext):
+        """결과 저장 (plaintext가 None이면 negative_ttl 동안 실패로 기억)"""
+        key = self.make_key(ciphertext, user_id, enc)
+        expires_at = self._clock() + self.negative_ttl if plaintext is None else None
+        with self._lock:
+            self._entries[key] = (plaintext, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def decrypt(self, ciphertext, user_id, enc, decrypt_func):
+        """
+        메모 우선 복호화
+
+        Args:
+            decrypt_func: decrypt_func(user_id, enc, ciphertext) (KakaoDecrypt.decrypt와 같은 인자 순서)
+
+        Returns:
+            복호화 결과 또는 None (예외도 실패로 기억)
+        """
+        hit, plaintext = self.get(ciphertext, user_id, enc)
+        if hit:
+            return plaintext
+        try:
+            plaintext = decrypt_func(user_id, enc, ciphertext)
+        except Exception:
+            plaintext = None
+        self.put(ciphertext, user_id, enc, plaintext or None)
+        return plaintext or None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.negative_hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.negative_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "hit_rate": ((self.hits + self.negative_hits) / total) if total else 0.0,
+            }
@@ -0,0 +1,123 @@
+"""
+복호화 프로세스 풀 (catch-up 백로그 처리용)
+==========================================
+
+폰이 오프라인이었다가 돌아오면 chat_logs에 수만 건의 백로그가 쌓입니다.
+이 모듈은 kakao_decrypt_module.decrypt_many()를 ProcessPoolExecutor로 분산하여
+모든 CPU 코어에서 복호화하고, 입력 순서(= 채팅방별 순서)를 그대로 유지한 결과를 반환합니다.
+
+- 항목 수가 threshold 미만이면(정상 상태) 프로세스 풀 없이 인라인으로 decrypt_many() 실행
+- 프로세스 풀 생성/실행 실패 시(예: Termux에서 sem_open 미지원) 자동으로 인라인 복호화로 폴백
+
+사용법:
+    from decrypt_pool import DecryptPool
+
+    pool = DecryptPool(threshold=200)
+    results = pool.decrypt([(ciphertext, user_id, enc_type), ...])
+    # results: [(plaintext, fail_reason), ...] (입력 순서 유지)
+"""
+
+import os
+import time
+
+from kakao_decrypt_module import decrypt_many
+
+DEFAULT_THRESHOLD = 200
+DEFAULT_CHUNK_SIZE = 256
+
+
+def _decrypt_chunk(items):
+    """워커 프로세스에서 실행 (pickle 가능하도록 모듈 최상위 함수)"""
+    return decrypt_many(items)
+
+
+class DecryptPool:
+    """decrypt_many()를 여러 프로세스로 분산하는 복호화 스테이지"""
+
+    def __init__(self, max_workers=None, threshold=DEFAULT_THRESHOLD, chunk_size=DEFAULT_CHUNK_SIZE, log=print):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.threshold = threshold
+        self.chunk_size = chunk_size
+        self._log = log
+        self._executor = None
+        self._disabled_reason = None
+        self.pool_batches = 0
+        self.pool_items = 0
+        self.inline_batches = 0
+        self.inline_items = 0
+        self.last_pool_duration = 0.0
+
+    def _ensure_executor(self):
+        """프로세스 풀을 지연 생성 (실패 시 이후 호출은 모두 인라인)"""
+        if self._executor is not None:
+            return True
+        if self._disabled_reason is not None or self.max_workers < 2:
+            return False
+        try:
+            from concurrent.futures import ProcessPoolExecutor
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            self._log(f"[복호화 풀] 프로세스 풀 시작: workers={self.max_workers}, threshold={self.threshold}")
+            return True
+        except Exception as e:
+            self._disabled_reason = f"{type(e).__name__}: {e}"
+            self._log(f"[복호화 풀] 프로세스 풀 사용 불가, 인라인 복호화 사용: {self._disabled_reason}")
+            return False
+
+    def decrypt(self, items):
+        """
+        복호화 (항목 수가 threshold 이상이면 프로세스 풀, 아니면 인라인)
+
+        Args:
+            items: (ciphertext, user_id, enc_type) 튜플 리스트
+
+        Returns:
+            입력 순서와 같은 (plaintext, fail_reason) 튜플 리스트
+        """
+        items = list(items)
+        if not items:
+            return []
+        if len(items) < self.threshold or not self._ensure_executor():
+            self.inline_batches += 1
+            self.inline_items += len(items)
+            return decrypt_many(items)
+
+        start = time.time()
+        chunks = [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+        results = []
+        try:
+            # executor.map은 입력 순서대로 결과를 돌려주므로 채팅방별 순서가 유지됨
+            for chunk_result in self._executor.map(_decrypt_chunk, chunks):
+                results.extend(chunk_result)
+        except Exception as e:
+            self._log(f"[복호화 풀] 프로세스 풀 오류, 인라인 복호화로 전환: {type(e).__name__}: {e}")
+            self._disabled_reason = f"{type(e).__name__}: {e}"
+            self.shutdown()
+            self.inline_batches += 1
+            self.inline_items += len(items)
+            return decrypt_many(items)
+
+        self.last_pool_duration = time.time() - start
+        self.pool_batches += 1
+        self.pool_items += len(items)
+        return results
+
+    def shutdown(self):
+        if self._executor is not None:
+            try:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            except Exception:
+                pass
+            self._executor = None
+
+    def stats(self):
+        return {
+            "workers": self.max_workers,
+            "threshold": self.threshold,
+            "active": self._executor is not None,
+            "disabled_reason": self._disabled_reason,
+            "pool_batches": self.pool_batches,
+            "pool_items": self.pool_items,
+            "inline_batches": self.inline_batches,
+            "inline_items": self.inline_items,
+            "last_pool_duration": self.last_pool_duration,
+        }
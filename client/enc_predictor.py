@@ -0,0 +1,128 @@
+"""
+enc 타입 예측기
+===============
+
+send_to_server / get_name_of_user_id / 채팅방 이름 복호화는 [enc_type, 31, 30, 32] 같은
+고정 후보를 순서대로 모두 복호화해 봤습니다. 이 모듈은 출처(message/nickname/room/attachment)와
+채팅방별로 마지막으로 성공한 enc를 기억해 먼저 시도하도록 후보 순서를 정하고,
+같은 키가 되는 후보는 한 번만 시도합니다.
+
+- 일반적인 경우: 후보 1개 = AES 1회
+- 실패 시에도 실제로 다른 키가 되는 후보만 시도 (salt = prefix + user_id이므로
+  prefix가 같은 enc 0/1, 2/7은 같은 키)
+- enc 32: KAKAO_PREFIXES 범위 밖이라 decrypt_kakaotalk_message가 0 salt 키로 복호화하는 기존 폴백.
+  이 폴백을 지원하는 메시지 본문(decrypt_message 경로)에서만 후보로 사용
+
+사용법:
+    predictor = EncPredictor()
+    for enc in predictor.candidates("nickname", room=chat_id, hint=db_enc):
+        decrypted = KakaoDecrypt.decrypt(my_user_id, enc, ciphertext)
+        if decrypted:
+            predictor.record("nickname", chat_id, enc, True)
+            break
+    else:
+        predictor.record_failure("nickname", chat_id)
+"""
+
+import threading
+from collections import OrderedDict
+
+from kakaodecrypt import KAKAO_PREFIXES
+
+# genSalt가 허용하는 enc 범위: 0~31
+ENC_TYPE_COUNT = len(KAKAO_PREFIXES)
+# 범위 밖 enc는 0 salt 키 (decrypt_kakaotalk_message 폴백), 후보로는 32 하나로 대표
+ZERO_SALT_ENC = ENC_TYPE_COUNT
+DEFAULT_CANDIDATES = (31, 30)
+# 0 salt 폴백을 지원하는 복호화 경로를 쓰는 출처 (기존 메시지 후보 [enc_type, 31, 30, 32])
+ZERO_SALT_SOURCES = frozenset({"message"})
+MAX_ROOM_ENTRIES = 4096
+
+
+def is_valid_enc(enc):
+    return isinstance(enc, int) and not isinstance(enc, bool) and 0 <= enc <= ZERO_SALT_ENC
+
+
+def key_identity(enc):
+    """같은 AES 키가 되는 enc끼리 같은 값 (salt = prefix + user_id, 범위 밖은 0 salt)"""
+    return KAKAO_PREFIXES[enc] if enc < ENC_TYPE_COUNT else None
+
+
+class EncPredictor:
+    """(source, room)별 마지막 성공 enc 기억 + 후보별 적중 통계"""
+
+    def __init__(self, default_candidates=DEFAULT_CANDIDATES, max_room_entries=MAX_ROOM_ENTRIES,
+                 zero_salt_sources=ZERO_SALT_SOURCES):
+        self.default_candidates = tuple(default_candidates)
+        self.zero_salt_sources = frozenset(zero_salt_sources)
+        self.max_room_entries = max_room_entries
+        self._lock = threading.Lock()
+        self._last_by_room = OrderedDict()  # (source, room) -> enc
+        self._last_by_source = {}  # source -> enc
+        self._hits = {}  # (source, enc) -> 성공 횟수
+        self._attempts = 0
+        self._first_try_hits = 0
+        self._failures = 0
+
+    def candidates(self, source, room=None, hint=None):
+        """
+        시도할 enc 후보 (같은 키/무효 제거, 성공 가능성 높은 순)
+
+        순서: hint(DB/v 필드의 enc) -> 이 채팅방에서 마지막 성공 -> 이 출처에서 마지막 성공
+              -> 이 출처의 적중 횟수 순 -> 기본 후보 -> enc 32 (0 salt, zero_salt_sources만)
+        """
+        zero_salt = source in self.zero_salt_sources
+        with self._lock:
+            ordered = [hint, self._last_by_room.get((source, room)), self._last_by_source.get(source)]
+            by_hits = sorted(
+                ((count, enc) for (src, enc), count in self._hits.items() if src == source),
+                reverse=True
+            )
+            ordered.extend(enc for _, enc in by_hits)
+        ordered.extend(self.default_candidates)
+        if zero_salt:
+            ordered.append(ZERO_SALT_ENC)
+
+        result = []
+        keys = set()
+        for enc in ordered:
+            if not is_valid_enc(enc) or (enc == ZERO_SALT_ENC and not zero_salt):
+                continue
+            key = key_identity(enc)
+            if key not in keys:
+                keys.add(key)
+                result.append(enc)
+        return result
+
+    def record(self, source, room, enc, first_try=False):
+        """복호화 성공 기록 (first_try: 첫 번째 후보로 성공했는지)"""
+        if not is_valid_enc(enc):
+            return
+        with self._lock:
+            key = (source, room)
+            self._last_by_room[key] = enc
+            self._last_by_room.move_to_end(key)
+            while len(self._last_by_room) > self.max_room_entries:
+                self._last_by_room.popitem(last=False)
+            self._last_by_source[source] = enc
+            self._hits[(source, enc)] = self._hits.get((source, enc), 0) + 1
+            self._attempts += 1
+            if first_try:
+                self._first_try_hits += 1
+
+    def record_failure(self, source, room=None):
+        """모든 후보 실패 기록"""
+        with self._lock:
+            self._attempts += 1
+            self._failures += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "attempts": self._attempts,
+                "first_try_hits": self._first_try_hits,
+                "failures": self._failures,
+                "first_try_rate": (self._first_try_hits / self._attempts) if self._attempts else 0.0,
+                "rooms": len(self._last_by_room),
+                "hits": {f"{src}:{enc}": count for (src, enc), count in sorted(self._hits.items())},
+            }
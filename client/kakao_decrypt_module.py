@@ -17,9 +17,12 @@
 
 import json
 import base64
+import binascii
 import hashlib
 import math
-from Crypto.Cipher import AES
+
+import aes_backend
+from ciphertext_classifier import is_base64_text
 
 # 카카오톡 복호화 상수 (Java 코드에서 가져옴)
 # IV: signed byte 배열을 unsigned로 변환 (-36 -> 220, -11 -> 245, -32 -> 224, -31 -> 225)
@@ -63,12 +66,9 @@ try:
 except ImportError:
     KAKAODECRYPT_AVAILABLE = False
 
-# Crypto 모듈 확인
-try:
-    from Crypto.Cipher import AES
-    CRYPTO_AVAILABLE = True
-except ImportError:
-    CRYPTO_AVAILABLE = False
+# AES 백엔드 (aes_backend: pycryptodome / cryptography / 순수 파이썬 폴백 중 가장 빠른 것 사용)
+# 순수 파이썬 폴백이 항상 있으므로 복호화는 항상 가능. 백엔드 import/선택은 첫 복호화(get_backend) 시점
+CRYPTO_AVAILABLE = True
 
 def generate_salt(user_id, enc_type):
     """
@@ -147,6 +147,145 @@ def generate_secret_key(salt):
     
     return bytes(dKey)
 
+def get_secret_key(user_id, enc_type):
+    """
+    (user_id, enc_type)에 대한 SecretKey 조회
+    
+    키 캐시는 kakaodecrypt의 KakaoDecrypt.get_key 하나만 사용합니다 (같은 키를 두 번 유도/캐시하지 않음).
+    enc_type이 범위 밖이면(zero salt) 캐시 없이 KakaoDecrypt.pkcs12_key_fast로 유도하고,
+    kakaodecrypt를 쓸 수 없으면 기존 방식(generate_salt + generate_secret_key)으로 유도합니다.
+    
+    Returns:
+        Secret key 바이트 배열 (32바이트)
+    """
+    if not KAKAODECRYPT_AVAILABLE:
+        return generate_secret_key(generate_salt(user_id, enc_type))
+    try:
+        return KakaoDecrypt.get_key(user_id, enc_type)
+    except ValueError:
+        return KakaoDecrypt.pkcs12_key_fast(KAKAO_PASSWORD, generate_salt(user_id, enc_type))
+
+def new_cipher(user_id, enc_type):
+    """캐시된 SecretKey로 AES/CBC 복호화 객체 생성 (CBC는 상태가 있으므로 호출마다 새 객체)"""
+    return aes_backend.CbcDecryptor(get_secret_key(user_id, enc_type), KAKAO_IV)
+
+def key_cache_stats():
+    """
+    키 캐시 통계 (kakaodecrypt 키 캐시, 사용할 수 없으면 None)
+    
+    Returns:
+        {"size", "max_size", "hits", "misses", "hit_rate"} 또는 None
+    """
+    return KakaoDecrypt.key_cache_stats() if KAKAODECRYPT_AVAILABLE else None
+
+# decrypt_many() 항목별 실패 사유
+DECRYPT_MANY_FAIL_REASON = {
+    "EMPTY": "empty_ciphertext",
+    "NO_USER_ID": "user_id_missing",
+    "INVALID_ENC": "invalid_enc",
+    "NOT_BASE64": "not_base64",
+    "BAD_LENGTH": "bad_block_length",
+    "BAD_PADDING": "bad_padding",
+    "NOT_UTF8": "invalid_utf8",
+    "CRYPTO_UNAVAILABLE": "crypto_unavailable",
+}
+
+def is_valid_plaintext(text):
+    """
+    복호화 결과가 텍스트로 보이는지 (decrypt_kakaotalk_message와 같은 기준: 제어 문자 10% 이하)
+    
+    잘못된 키로도 패딩이 우연히 맞으면 decrypt_many는 평문을 돌려주므로, 결과를 그대로 쓰기 전에 확인합니다.
+    """
+    if not text:
+        return False
+    control_char_count = sum(1 for c in text if ord(c) < 32 and c not in '\n\r\t')
+    return control_char_count <= len(text) * 0.1
+
+def _get_batch_key(user_id, enc_type):
+    """decrypt_many용 키 조회 (공용 키 캐시, 잘못된 enc면 None)"""
+    if enc_type < 0 or enc_type >= len(KAKAO_PREFIXES):
+        return None
+    return get_secret_key(user_id, enc_type)
+
+def decrypt_many(items):
+    """
+    여러 암호문을 한 번에 복호화
+    
+    (user_id, enc_type)별로 묶어서 키를 한 번만 유도하고, 같은 키의 암호문들은
+    하나의 AES 호출로 처리합니다 (ECB로 전체 블록 복호화 후 CBC 체인을 한 번에 XOR).
+    
+    Args:
+        items: (ciphertext, user_id, enc_type) 튜플의 리스트
+               ciphertext는 base64 문자열 또는 raw bytes, enc_type은 int로 변환 (실패 시 그 항목만 invalid_enc)
+    
+    Returns:
+        입력 순서와 같은 (plaintext, fail_reason) 튜플 리스트
+        성공 시 fail_reason=None, 실패 시 plaintext=None
+    """
+    items = list(items)
+    results = [None] * len(items)
+    
+    if not CRYPTO_AVAILABLE:
+        return [(None, DECRYPT_MANY_FAIL_REASON["CRYPTO_UNAVAILABLE"])] * len(items)
+    
+    # 1. 입력 검증 + base64 디코딩, (user_id, enc_type)별 그룹화
+    groups = {}
+    for index, (ciphertext, user_id, enc_type) in enumerate(items):
+        if not ciphertext:
+            results[index] = (None, DECRYPT_MANY_FAIL_REASON["EMPTY"])
+            continue
+        try:
+            user_id_int = int(user_id)
+        except (TypeError, ValueError):
+            results[index] = (None, DECRYPT_MANY_FAIL_REASON["NO_USER_ID"])
+            continue
+        # v.enc 값을 그대로 받으므로 None/문자열도 올 수 있음 (한 항목 때문에 배치 전체가 실패하지 않도록)
+        try:
+            enc_int = int(enc_type)
+        except (TypeError, ValueError):
+            results[index] = (None, DECRYPT_MANY_FAIL_REASON["INVALID_ENC"])
+            continue
+        if isinstance(ciphertext, (bytes, bytearray, memoryview)):
+            ct = bytes(ciphertext)
+        else:
+            try:
+                ct = binascii.a2b_base64(ciphertext)
+            except (binascii.Error, ValueError, TypeError):
+                results[index] = (None, DECRYPT_MANY_FAIL_REASON["NOT_BASE64"])
+                continue
+        if len(ct) == 0 or len(ct) % 16 != 0:
+            results[index] = (None, DECRYPT_MANY_FAIL_REASON["BAD_LENGTH"])
+            continue
+        groups.setdefault((user_id_int, enc_int), []).append((index, ct))
+    
+    # 2. 그룹별 키 1회 유도 + 일괄 복호화
+    for (user_id_int, enc_type), entries in groups.items():
+        key = _get_batch_key(user_id_int, enc_type)
+        if key is None:
+            for index, _ in entries:
+                results[index] = (None, DECRYPT_MANY_FAIL_REASON["INVALID_ENC"])
+            continue
+        
+        blob = b''.join(ct for _, ct in entries)
+        chain = b''.join(KAKAO_IV + ct[:-16] for _, ct in entries)
+        raw = aes_backend.decrypt_ecb(key, blob)
+        plain = (int.from_bytes(raw, 'big') ^ int.from_bytes(chain, 'big')).to_bytes(len(raw), 'big')
+        
+        offset = 0
+        for index, ct in entries:
+            padded = plain[offset:offset + len(ct)]
+            offset += len(ct)
+            pad = padded[-1]
+            if pad <= 0 or pad > 16:
+                results[index] = (None, DECRYPT_MANY_FAIL_REASON["BAD_PADDING"])
+                continue
+            try:
+                results[index] = (padded[:-pad].decode('utf-8'), None)
+            except UnicodeDecodeError:
+                results[index] = (None, DECRYPT_MANY_FAIL_REASON["NOT_UTF8"])
+    
+    return results
+
 def decrypt_kakaotalk_message(encrypted_text, user_id, enc_type=31, debug=False):
     """
     카카오톡 메시지 복호화 (테스트된 kakaodecrypt 모듈 사용)
@@ -207,18 +346,13 @@ def decrypt_kakaotalk_message(encrypted_text, user_id, enc_type=31, debug=False)
         if debug:
             print(f"[복호화] 자체 구현 사용: user_id={user_id}, enc_type={enc_type}, 텍스트 길이={len(encrypted_text)}")
         
-        # Salt 생성
-        salt = generate_salt(user_id, enc_type)
-        if debug:
-            print(f"[복호화] Salt 생성 완료: {salt.hex()[:16]}...")
-        
-        # SecretKey 생성 (PKCS12 키 유도 방식 - Iris KakaoDecrypt.kt 기반)
-        secret_key = generate_secret_key(salt)
+        # SecretKey 조회 (PKCS12 키 유도 방식 - Iris KakaoDecrypt.kt 기반, 캐시 사용)
+        secret_key = get_secret_key(user_id, enc_type)
         if debug:
-            print(f"[복호화] SecretKey 생성 완료: {secret_key.hex()[:16]}...")
+            print(f"[복호화] SecretKey 준비 완료: {secret_key.hex()[:16]}...")
         
         # AES/CBC/NoPadding 복호화 (Iris 방식)
-        cipher = AES.new(secret_key, AES.MODE_CBC, KAKAO_IV)
+        cipher = aes_backend.CbcDecryptor(secret_key, KAKAO_IV)
         
         # Base64 디코딩
         decoded_bytes = base64.b64decode(encrypted_text)
@@ -360,7 +494,7 @@ def decrypt_message(encrypted_message, v_field=None, user_id=None, enc_type=31,
             try:
                 decrypted = decoded_bytes.decode('utf-8')
                 # 유효한 텍스트인지 확인 (base64만 있는 경우 제외)
-                if decrypted and not all(c in 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=' for c in decrypted[:50]):
+                if decrypted and not is_base64_text(decrypted[:50]):
                     return decrypted
             except UnicodeDecodeError:
                 pass
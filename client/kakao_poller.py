@@ -4,20 +4,22 @@
 카카오톡 DB를 직접 폴링하여 서버로 메시지 전송 (WebSocket 사용)
 자체 복호화 로직 사용 (Iris KakaoDecrypt.kt 기반)
 """
-import sqlite3
 import time
+_PROCESS_START = time.perf_counter()  # --startup-timing 기준 시각
+import sqlite3
 import json
 import os
 import threading
+import importlib.util
 from datetime import datetime
 import base64
 import hashlib
 
 # 필수 의존성: websocket (WebSocket 통신용)
-try:
-    import websocket
+# 설치 여부만 먼저 확인하고 실제 import는 첫 연결 시 (connect_websocket)
+if importlib.util.find_spec("websocket") is not None:
     WEBSOCKET_AVAILABLE = True
-except ImportError:
+else:
     WEBSOCKET_AVAILABLE = False
     print("[오류] websocket 모듈이 설치되지 않았습니다.")
     print("[설치] pip install websocket-client")
@@ -31,6 +33,12 @@ except ImportError:
 ATTACHMENT_DECRYPT_AVAILABLE = False
 decrypt_attachment = None
 ATTACHMENT_DECRYPT_WHITELIST = set()
+decrypt_attachment_view = None
+attachment_view = None
+AttachmentView = ()  # 모듈 로드 실패 시 isinstance(x, AttachmentView)가 항상 False
+
+def dumps_payload(payload, ensure_ascii=False):
+    return json.dumps(payload, ensure_ascii=ensure_ascii)
 
 try:
     import sys
@@ -39,7 +47,7 @@ try:
     script_dir = os.path.dirname(os.path.abspath(__file__))
     if script_dir not in sys.path:
         sys.path.insert(0, script_dir)
-    from kakao_decrypt_module import decrypt_message, decrypt_kakaotalk_message, CRYPTO_AVAILABLE, KAKAODECRYPT_AVAILABLE
+    from kakao_decrypt_module import decrypt_message, decrypt_kakaotalk_message, is_valid_plaintext, CRYPTO_AVAILABLE, KAKAODECRYPT_AVAILABLE
     # kakaodecrypt 모듈도 import (채팅방 이름 복호화에 사용)
     try:
         from kakaodecrypt import KakaoDecrypt
@@ -51,19 +59,42 @@ try:
         ATTACHMENT_DECRYPT_AVAILABLE = True
         decrypt_attachment = _decrypt_attachment
         ATTACHMENT_DECRYPT_WHITELIST = _ATTACHMENT_DECRYPT_WHITELIST
+        # zero-copy 경로: 복호화된 JSON 텍스트를 필요할 때만 파싱, payload에는 재직렬화 없이 삽입
+        from attachment_decrypt import decrypt_attachment_view, attachment_view, AttachmentView, dumps_payload
         print("[✓] attachment 복호화 모듈 로드 성공 (attachment_decrypt.py)")
     except ImportError as e:
         ATTACHMENT_DECRYPT_AVAILABLE = False
         decrypt_attachment = None
         ATTACHMENT_DECRYPT_WHITELIST = set()
         print(f"[경고] attachment 복호화 모듈 로드 실패: {e}")
+    # catch-up 백로그용 복호화 프로세스 풀
+    try:
+        from decrypt_pool import DecryptPool
+        DECRYPT_POOL_AVAILABLE = True
+    except ImportError as e:
+        DECRYPT_POOL_AVAILABLE = False
+        DecryptPool = None
+        print(f"[경고] 복호화 풀 모듈 로드 실패: {e}")
+    # MY_USER_ID 시험 복호화 스코어러
+    try:
+        from user_id_scorer import find_my_user_id as score_my_user_id, save_score as save_user_id_score, load_score as load_user_id_score
+        USER_ID_SCORER_AVAILABLE = True
+    except ImportError as e:
+        USER_ID_SCORER_AVAILABLE = False
+        print(f"[경고] user_id 스코어러 로드 실패: {e}")
     print("[✓] 복호화 모듈 로드 성공 (kakao_decrypt_module.py)")
+    # AES 백엔드 선택(자체 벤치마크)은 시작 진단 스레드에서 (run_startup_diagnostics)
+    import aes_backend
 except ImportError as e:
     print(f"[✗] 복호화 모듈 로드 실패: {e}")
     print("[경고] 복호화 기능이 제한될 수 있습니다.")
     CRYPTO_AVAILABLE = False
     KAKAODECRYPT_AVAILABLE = False
     KakaoDecrypt = None
+    DECRYPT_POOL_AVAILABLE = False
+    DecryptPool = None
+    USER_ID_SCORER_AVAILABLE = False
+    aes_backend = None
     # ATTACHMENT_DECRYPT_AVAILABLE은 이미 위에서 False로 초기화됨
     # 폴백 함수 정의 (에러 방지)
     def decrypt_message(*args, **kwargs):
@@ -71,6 +102,44 @@ except ImportError as e:
     def decrypt_kakaotalk_message(*args, **kwargs):
         return None
 
+# enc 타입 예측기 (출처/채팅방별 마지막 성공 enc 우선 시도)
+from enc_predictor import EncPredictor
+# 공용 암호문 판별기 (base64 문자 단위 루프 대체)
+from ciphertext_classifier import is_ciphertext, looks_like_base64
+# 복호화 결과 메모 (반복되는 닉네임/채팅방 이름/메시지 암호문, 실패 결과 TTL 캐시)
+from decrypt_memo import DecryptMemo
+# 읽기 전용 SQLite 연결 관리자 (스레드별 장기 연결, db2 1회 attach)
+from db_connection import DbConnectionManager
+# DB/WAL 변경 감시 (inotify, 고정 1초 sleep 대체)
+from db_watcher import DbWatcher
+# 대량 백로그 캐치업 모드 (키셋 페이지네이션, 진행률 보고)
+from catchup import CatchupTracker, CATCHUP_FETCH_SIZE
+# 체크포인트 (메모리 + SQLite 묶음 커밋, 전달 완료된 위치까지만 전진)
+from checkpoint_store import CheckpointStore, SendRetryBudget, CHECKPOINT_DB
+# 처리한 메시지 ID 집합 (워터마크 + 비트맵, set + min() 대체)
+from seen_ids import SeenIds
+# 반응 스캔/백필용 DB 스냅샷 (SQLite 백업 API, tmpfs 복사본)
+from db_snapshot import DbSnapshot, DB_SNAPSHOT_ENABLED
+# 빠른 재시작 (schema_version 기준 DB 구조 캐시, 시작 시간 측정)
+from startup_cache import StartupCache, StartupTimer, schema_key
+# chat_logs 행 레코드 (컬럼 이름 접근, v/attachment 1회 파싱) 및 이미지 URL 탐색
+from chat_log_record import ChatLogRecord, ColumnMap, is_image_url, find_image_url_in_dict
+# 배치 단위 발신자 이름 조회 (IN (...) 조회 + 닉네임 일괄 복호화)
+from sender_names import fetch_sender_rows, decrypt_sender_names
+# 멤버 디렉터리 (복호화된 이름 메모리 상주, db2.data_version 변경 시 증분 갱신)
+from member_directory import MemberDirectory, MEMBER_DIRECTORY_ENABLED
+# 채팅방 메타데이터 캐시 (chat_rooms 일괄 로드, data_version/행 해시 기반 갱신)
+from room_cache import RoomCache, ROOM_CACHE_ENABLED
+# MY_USER_ID 빈도 기반 추정 (isMine 빠른 경로 + 단일 스트리밍 패스, 시간 예산)
+from user_id_guess import guess_user_id
+# DB 변경 감지 가드 (data_version + WAL 크기/mtime, 변경 없으면 반응 스캔/백필/캐시 갱신 생략)
+from db_change_guard import DbChangeGuard, DB_CHANGE_GUARD_ENABLED
+# 반응 스캔 시간 창 -> _id 하한 (created_at 정렬 대신 기본 키 범위 탐색)
+from reaction_window import (RowidWindow, RECENT_WINDOW_WHERE, RANGE_WINDOW_WHERE, query_plan,
+                             MAX_ROWID, REACTION_ROWID_WINDOW_ENABLED)
+# 반응 카운트 추출 (json_extract로 카운트 > 0인 행만, JSON1이 없으면 v 지문 + Python 파싱)
+from reaction_counts import ReactionCountReader, reaction_count_sql
+
 class KakaoPoller:
     """카카오톡 메시지 폴링 클래스"""
     
@@ -89,13 +158,16 @@ class KakaoPoller:
         # [제거됨] Iris HTTP API 설정
         # 이제 Bridge APK가 메시지 전송을 담당하므로 클라이언트는 메시지 수신만 수행합니다.
 
-        # 마지막 처리한 메시지 ID 추적 (파일로 저장)
+        # 마지막 처리한 메시지 ID 추적 (메모리 + 옆 SQLite 파일, STATE_FILE은 최초 1회 가져오기용)
         self.STATE_FILE = os.path.expanduser("~/last_message_id.txt")
+        # 전송한 메시지 ID 추적 (중복 방지): 체크포인트 이하 전체 + 그 위에서 먼저 전달된 ID (체크포인트와 함께 저장)
+        self.sent_message_ids = SeenIds()
+        self.checkpoint = CheckpointStore(CHECKPOINT_DB, legacy_file=self.STATE_FILE, state=self.sent_message_ids, log=self.log_print)
+        # 계속 실패하는 메시지가 체크포인트를 영구히 막지 않도록 메시지별 재시도 상한 (MESSAGE_MAX_RETRIES)
+        self.send_retries = SendRetryBudget(log=self.log_print)
         # 자신의 user_id 저장 (복호화에 사용)
         self.MY_USER_ID_FILE = os.path.expanduser("~/my_user_id.txt")
         self.MY_USER_ID = None
-        # 전송한 메시지 ID 추적 (중복 방지)
-        self.sent_message_ids = set()
 
         # 반응 카운트 확인용 경량 캐시 (경량 버전: count만 저장)
         # 키: (chat_id, kakao_log_id) -> last_count
@@ -152,17 +224,79 @@ class KakaoPoller:
         self.CLIENT_LOG_MAX_LINES = 50  # 최대 50줄 전송
         self.last_log_send_time = 0  # 마지막 로그 전송 시간
 
+        # DB 연결: 호출마다 connect/ATTACH 대신 읽기 전용 장기 연결 재사용 (conn.close()는 반납)
+        self.db = DbConnectionManager(self.DB_PATH, self.DB_PATH2, log=self.log_print)
+        # DB_SNAPSHOT=1: 반응 스캔/백필은 주기적으로 백업한 복사본에서 조회 (새 메시지 조회는 원본 DB)
+        self.snapshot = DbSnapshot(self.DB_PATH, self.DB_PATH2, log=self.log_print) if DB_SNAPSHOT_ENABLED else None
+        # 폴링 대기: DB/WAL 변경 시 즉시 깨어남 (변경이 없으면 최대 DB_WATCH_FALLBACK_SEC초마다 확인)
+        self.DB_WATCH_FALLBACK = float(os.getenv('DB_WATCH_FALLBACK_SEC', '5'))
+        self.NEW_MESSAGE_BATCH_LIMIT = 10  # get_new_messages 1회 조회 상한 (가득 차면 대기 없이 다시 조회)
+        self.db_watcher = None
+        # 백로그가 CATCHUP_THRESHOLD개를 넘으면 CATCHUP_PAGE_SIZE개 페이지를 대기 없이 연속 조회
+        self.catchup = CatchupTracker(steady_limit=self.NEW_MESSAGE_BATCH_LIMIT, log=self.log_print)
+        self._last_fetch_full = False  # 마지막 조회가 LIMIT만큼 찼는지 (남은 행이 있을 수 있음)
+        self._last_fetch_max_id = None  # 마지막 조회의 최대 _id (키셋 커서)
+        self._latest_id_in_db = None  # get_new_messages에서 조회한 MAX(_id) (폴링 1회에 1번만 조회)
+
         # DB 구조 캐시 초기화
         self._db_structure_cache = None
         self._select_columns_cache = None
+        self._column_map = None  # _select_columns_cache의 필드별 인덱스 (ChatLogRecord 생성용)
+        self._has_open_chat_member = None  # db2.open_chat_member 존재 여부 (최초 1회 확인)
+        # 시작 캐시: schema_version이 같으면 이전 실행의 구조 확인 결과 사용 (전체 구조 출력 생략)
+        self.startup_cache = StartupCache(log=self.log_print)
+        self.STARTUP_TIMING = False  # --startup-timing: 첫 폴링 후 단계별 시작 시간 출력
+        self.startup_timer = StartupTimer(start=_PROCESS_START)
+        self.startup_timer.mark("모듈 import")
+        self.WS_CONNECT_TIMEOUT = float(os.getenv('WS_CONNECT_TIMEOUT_SEC', '1'))  # 연결 성공 시 바로 반환
         
         # 복호화 모듈 설정
         self.ATTACHMENT_DECRYPT_AVAILABLE = ATTACHMENT_DECRYPT_AVAILABLE
         self.decrypt_attachment = decrypt_attachment
+        self.decrypt_attachment_view = decrypt_attachment_view
         self.ATTACHMENT_DECRYPT_WHITELIST = ATTACHMENT_DECRYPT_WHITELIST
         self.KakaoDecrypt = KakaoDecrypt if 'KakaoDecrypt' in globals() else None
         self.KAKAODECRYPT_AVAILABLE = KAKAODECRYPT_AVAILABLE if 'KAKAODECRYPT_AVAILABLE' in globals() else False
 
+        # catch-up 백로그 복호화 프로세스 풀 (배치가 threshold 이상일 때만 프로세스 사용)
+        self.DECRYPT_POOL_THRESHOLD = int(os.getenv('DECRYPT_POOL_THRESHOLD', '200'))
+        self.DECRYPT_POOL_WORKERS = int(os.getenv('DECRYPT_POOL_WORKERS', '0')) or None  # 0이면 CPU 코어 수
+        self.decrypt_pool = DecryptPool(
+            max_workers=self.DECRYPT_POOL_WORKERS,
+            threshold=self.DECRYPT_POOL_THRESHOLD,
+            log=self.log_print
+        ) if DECRYPT_POOL_AVAILABLE else None
+
+        # enc 후보 예측기: [enc_type, 31, 30, 32] 고정 순차 시도 대신 마지막 성공 enc부터 시도
+        self.enc_predictor = EncPredictor()
+        # 복호화 결과 메모: (암호문, user_id, enc) -> 평문 (실패는 TTL 동안만 기억)
+        self.DECRYPT_MEMO_SIZE = int(os.getenv('DECRYPT_MEMO_SIZE', '4096'))
+        self.DECRYPT_MEMO_NEGATIVE_TTL = int(os.getenv('DECRYPT_MEMO_NEGATIVE_TTL_SEC', '600'))  # 기본 10분
+        self.decrypt_memo = DecryptMemo(max_size=self.DECRYPT_MEMO_SIZE, negative_ttl=self.DECRYPT_MEMO_NEGATIVE_TTL)
+        # DB 변경 감지 가드: 마지막 실행 이후 DB가 그대로면 반응 스캔/백필/캐시 갱신을 건너뜀
+        self.change_guard = DbChangeGuard(self.DB_PATH, self.DB_PATH2, log=self.log_print) if DB_CHANGE_GUARD_ENABLED else None
+        # 반응 스캔 _id 하한: 기준 시각을 주기마다 이진 탐색(지난 결과에서 시작)해 기본 키만 따라 읽음
+        self.reaction_window = RowidWindow() if REACTION_ROWID_WINDOW_ENABLED else None
+        self._reaction_plan_logged = False
+        self.reaction_counts = ReactionCountReader(max_fingerprints=self.MAX_CACHE_ITEMS, log=self.log_print)
+        self._reaction_positive = {}  # 반응 폴링 창에서 카운트 > 0으로 본 (chat_id, kakao_log_id) -> created_at
+        # 멤버 디렉터리: 평상시 발신자 이름은 dict 조회 (MEMBER_DIRECTORY=0이면 배치 IN (...) 조회만)
+        self.member_directory = MemberDirectory(
+            self.db, decrypt_names=self._decrypt_sender_rows, changed=self._guard_check("member_directory"),
+            log=self.log_print
+        ) if MEMBER_DIRECTORY_ENABLED else None
+        # 채팅방 캐시: 채팅방 이름/enc/복호화된 이름은 dict 조회 (ROOM_CACHE=0이면 메시지마다 DB 조회)
+        self.room_cache = RoomCache(
+            self.db, decrypt_name=self._decrypt_room_name, changed=self._guard_check("room_cache"),
+            log=self.log_print
+        ) if ROOM_CACHE_ENABLED else None
+        self.startup_timer.mark("초기화")
+
+    @staticmethod
+    def _decrypt_message_body(user_id, enc_type, message):
+        """decrypt_memo용 메시지 본문 복호화 (KakaoDecrypt.decrypt와 같은 인자 순서, v_field 미사용)"""
+        return decrypt_message(message, None, user_id, enc_type, debug=True)
+
     @staticmethod
     def incept(n):
         """
@@ -186,30 +320,19 @@ class KakaoPoller:
         return word1 + '.' + word2
 
     def load_last_message_id(self):
-        """마지막 메시지 ID 로드"""
+        """마지막 메시지 ID (메모리 체크포인트, 파일은 최초 1회만 읽음)"""
         try:
-            if os.path.exists(self.STATE_FILE):
-                with open(self.STATE_FILE, 'r') as f:
-                    content = f.read().strip()
-                    if content:
-                        last_id = int(content)
-                        # 전송한 메시지 ID 세트 초기화 (이미 처리된 메시지)
-                        # 너무 많은 메시지를 세트에 추가하지 않도록 제한 (최근 1000개만)
-                        if last_id > 1000:
-                            self.sent_message_ids = set(range(last_id - 1000, last_id + 1))
-                        else:
-                            self.sent_message_ids = set(range(1, last_id + 1))
-                        return last_id
+            return self.checkpoint.last_id
         except Exception as e:
-            self.log_print(f"[경고] 상태 파일 로드 오류: {e}")
+            self.log_print(f"[경고] 체크포인트 로드 오류: {e}")
         return 0
 
-    def save_last_message_id(self, msg_id):
-        """마지막 메시지 ID 저장"""
+    def save_last_message_id(self, msg_id, count=1):
+        """마지막 메시지 ID 전진 (묶음 커밋: CHECKPOINT_COMMIT_INTERVAL_MS / CHECKPOINT_COMMIT_EVERY)"""
         try:
-            os.makedirs(os.path.dirname(self.STATE_FILE), exist_ok=True)
-            with open(self.STATE_FILE, 'w') as f:
-                f.write(str(msg_id))
+            if self.checkpoint.advance(msg_id, count):
+                # 체크포인트 이하의 ID는 다시 조회되지 않으므로 워터마크로 합침
+                self.sent_message_ids.advance_to(msg_id)
         except Exception as e:
             self.log_print(f"[경고] 상태 저장 오류: {e}")
 
@@ -217,10 +340,11 @@ class KakaoPoller:
         """
         자신의 user_id 추정 (제공된 코드의 KakaoDbGuessUserId 로직)
         1. open_profile 테이블에서 user_id 가져오기 시도 (제공된 코드 방식)
-        2. 실패 시 chat_rooms의 members와 chat_logs의 user_id를 비교하여 자신의 user_id 찾기
+        2. 최근 메시지의 v.isMine으로 찾기 (json_extract)
+        3. 실패 시 chat_rooms의 members와 chat_logs의 user_id를 비교하여 자신의 user_id 찾기 (단일 스트리밍 패스)
         """
         try:
-            conn = sqlite3.connect(self.DB_PATH)
+            conn = self.db.connect()
             cursor = conn.cursor()
             
             # 방법 1: open_profile 테이블에서 user_id 가져오기 시도 (제공된 코드 방식)
@@ -237,88 +361,38 @@ class KakaoPoller:
                 # open_profile 테이블이 없을 수 있음
                 pass
             
-            # 방법 1-2: friends 테이블에서 자신의 user_id 찾기 시도
-            # 제공된 글: "친구 테이블에 본인의 정보가 들어가 있어"
-            # friends 테이블의 id 컬럼이 user_id일 가능성이 높음
-            try:
-                # friends 테이블에서 가장 자주 나타나는 user_id 찾기
-                # (본인의 메시지가 가장 많을 가능성이 높음)
-                cursor.execute('''
-                    SELECT user_id, COUNT(*) as cnt 
-                    FROM chat_logs 
-                    WHERE user_id IS NOT NULL 
-                    GROUP BY user_id 
-                    ORDER BY cnt DESC 
-                    LIMIT 5
-                ''')
-                candidates = cursor.fetchall()
-                if candidates:
-                    self.log_print(f"[정보] user_id 후보 (메시지 수 기준):")
-                    for user_id, cnt in candidates:
-                        self.log_print(f"  - user_id={user_id}, 메시지 수={cnt}")
-                        # 가장 많은 메시지를 보낸 user_id가 자신의 user_id일 가능성이 높음
-                        most_active_user_id = candidates[0][0]
-                        self.log_print(f"[정보] 가장 활발한 user_id (추정): {most_active_user_id}")
-                        # 하지만 이것이 정확하지 않을 수 있으므로, 다른 방법도 시도
-            except sqlite3.OperationalError:
-                pass
-            
-            # 방법 2: chat_rooms의 members와 chat_logs의 user_id를 비교하여 자신의 user_id 찾기
+            # 방법 2: 최근 행의 v.isMine (빠른 경로), 없으면 chat_logs를 한 번만 읽으며
+            # chat_rooms의 members에 없는 발신자를 집계 (채팅방마다 NOT IN 쿼리 대체)
             try:
-                cursor.execute('SELECT id, members FROM chat_rooms')
-                chat_members = {}
-                for row in cursor.fetchall():
-                    chat_id = row[0]
-                    members_json = row[1]
-                    if members_json:
-                        try:
-                            members = json.loads(members_json)
-                            chat_members[chat_id] = members if isinstance(members, list) else []
-                        except (json.JSONDecodeError, TypeError):
-                            chat_members[chat_id] = []
-                    else:
-                        chat_members[chat_id] = []
+                result = guess_user_id(cursor, log=self.log_print)
             except sqlite3.OperationalError as e:
-                self.log_print(f"[경고] chat_rooms 테이블 조회 실패: {e}")
+                self.log_print(f"[경고] chat_rooms/chat_logs 조회 실패: {e}")
                 conn.close()
                 return None
+            conn.close()
             
-            # 각 채팅방에서 members에 없는 user_id 찾기 (제공된 코드 방식)
-            # 제공된 코드: KakaoDbGuessUserId.run()
-            found = []
-            for chat_id in chat_members:
-                if len(chat_members[chat_id]) > 0:
-                    # members에 있는 user_id들을 제외하고 chat_logs에서 user_id 찾기
-                    # 제공된 코드: exclude = ','.join(list(map(str, chat_members[chat_id])))
-                    exclude = ','.join([str(mid) for mid in chat_members[chat_id]])
-                    try:
-                        # 제공된 코드: cur.execute('SELECT DISTINCT user_id FROM chat_logs WHERE chat_id = %d AND user_id NOT IN (%s)' % (chat_id, exclude))
-                        query = f'SELECT DISTINCT user_id FROM chat_logs WHERE chat_id = {chat_id} AND user_id NOT IN ({exclude})'
-                        cursor.execute(query)
-                        for row in cursor.fetchall():
-                            if row[0] is not None:
-                                found.append(row[0])
-                    except sqlite3.OperationalError:
-                        continue
+            if result["top_senders"]:
+                self.log_print(f"[정보] user_id 후보 (메시지 수 기준):")
+                for user_id, cnt in result["top_senders"]:
+                    self.log_print(f"  - user_id={user_id}, 메시지 수={cnt}")
             
-            conn.close()
+            my_user_id = result["user_id"]
+            if my_user_id is not None and result["method"] == "isMine":
+                self.log_print(f"[정보] 최근 메시지의 isMine으로 자신의 user_id 발견: {my_user_id} "
+                               f"(isMine 메시지 {result['candidates'][0][1]}/{result['total']}개)")
+                return my_user_id
             
-            total = len(found)
-            if total > 0:
-                # 제공된 코드 방식: Counter를 사용하여 확률 계산
-                from collections import Counter
-                counter = Counter(found)
-                
-                # 모든 후보 출력 (제공된 코드 방식)
-                self.log_print(f"[정보] 가능한 user_id 후보 (총 {total}개):")
-                for user_id, count in counter.most_common():
+            total = result["total"]
+            if my_user_id is not None and total > 0:
+                # 모든 후보 출력 (제공된 코드 방식: 멤버 목록에 없는 채팅방 수 기준 확률)
+                self.log_print(f"[정보] 가능한 user_id 후보 (총 {total}개, {result['rows']:,}행 확인"
+                               f"{'' if result['complete'] else ', 시간 예산으로 일부만'}):")
+                for user_id, count in result["candidates"]:
                     prob = count * 100 / total
                     self.log_print(f"  user_id={user_id:20d} (확률: {prob:5.2f}%)")
                 
                 # 가장 많이 나타나는 user_id가 자신의 user_id일 가능성이 높음
-                most_common = counter.most_common(1)[0]
-                my_user_id = most_common[0]
-                probability = most_common[1] * 100 / total
+                probability = result["candidates"][0][1] * 100 / total
                 
                 self.log_print(f"\n[정보] 추정된 자신의 user_id: {my_user_id} (확률: {probability:.2f}%)")
                 self.log_print(f"[정보] 추정된 user_id가 잘못되었을 수 있습니다. 복호화 실패 시 다음을 시도하세요:")
@@ -347,14 +421,33 @@ class KakaoPoller:
                     if content:
                         self.MY_USER_ID = int(content)
                         self.log_print(f"[정보] 저장된 자신의 user_id 사용: {self.MY_USER_ID}")
-                        self.log_print(f"[정보] 이 user_id가 잘못되었을 수 있습니다. 복호화 실패 시:")
-                        self.log_print(f"  1. guess_user_id.py 실행하여 모든 후보 확인")
-                        self.log_print(f"  2. 다른 후보를 수동으로 테스트: echo 'USER_ID' > {self.MY_USER_ID_FILE}")
+                        score = load_user_id_score(self.MY_USER_ID_FILE) if USER_ID_SCORER_AVAILABLE else None
+                        if score and score.get("user_id") == self.MY_USER_ID:
+                            self.log_print(f"[정보] 시험 복호화 검증된 user_id (성공률: {score.get('success_rate', 0) * 100:.1f}%, 신뢰도: {score.get('confidence', 0):.2f})")
+                        else:
+                            self.log_print(f"[정보] 이 user_id가 잘못되었을 수 있습니다. 복호화 실패 시:")
+                            self.log_print(f"  1. guess_user_id.py 실행하여 모든 후보 확인")
+                            self.log_print(f"  2. 다른 후보를 수동으로 테스트: echo 'USER_ID' > {self.MY_USER_ID_FILE}")
                         return self.MY_USER_ID
         except Exception as e:
             self.log_print(f"[경고] user_id 파일 로드 오류: {e}")
         
-        # 파일이 없으면 추정 시도
+        # 파일이 없으면 시험 복호화 스코어러로 결정 (후보 x 샘플 암호문 시험 복호화)
+        if USER_ID_SCORER_AVAILABLE and CRYPTO_AVAILABLE:
+            self.log_print("[정보] 시험 복호화로 자신의 user_id 탐색 중...")
+            try:
+                result = score_my_user_id(self.DB_PATH, self.DB_PATH2, pool=self.decrypt_pool, log=self.log_print)
+                if result and result["accepted"]:
+                    self.MY_USER_ID = result["user_id"]
+                    save_user_id_score(self.MY_USER_ID_FILE, result)
+                    self.log_print(f"[정보] 시험 복호화로 결정된 user_id 저장: {self.MY_USER_ID} (신뢰도: {result['confidence']:.2f})")
+                    return self.MY_USER_ID
+                elif result:
+                    self.log_print(f"[경고] 시험 복호화 성공률이 낮음 ({result['success_rate'] * 100:.1f}%), 빈도 기반 추정으로 전환")
+            except Exception as e:
+                self.log_print(f"[경고] 시험 복호화 user_id 탐색 오류: {e}")
+        
+        # 스코어러 실패 시 빈도 기반 추정
         self.log_print("[정보] 자신의 user_id 추정 중...")
         self.MY_USER_ID = self.guess_my_user_id()
         
@@ -397,8 +490,8 @@ class KakaoPoller:
                 self.log_print("2. Termux에서 직접 실행 (Ubuntu/proot 환경 아님)")
                 return False
             
-            # DB 연결 테스트
-            conn = sqlite3.connect(self.DB_PATH)
+            # DB 연결 테스트 (읽기 전용 연결을 미리 열어 둠)
+            conn = self.db.connect()
             conn.close()
             return True
             
@@ -412,7 +505,7 @@ class KakaoPoller:
     def get_latest_message_id(self):
         """DB에서 최신 메시지 ID 조회 (검증용)"""
         try:
-            conn = sqlite3.connect(self.DB_PATH)
+            conn = self.db.connect()
             cursor = conn.cursor()
             cursor.execute("SELECT MAX(_id) FROM chat_logs")
             result = cursor.fetchone()
@@ -435,28 +528,24 @@ class KakaoPoller:
         if not user_id:
             return None
         
+        # 멤버 디렉터리에 있으면 DB 조회/복호화 없이 반환 (알려진 "없음" 포함)
+        if self.member_directory is not None:
+            found, name = self.member_directory.lookup(user_id)
+            if found:
+                return name
+        
         try:
             user_id_str = str(user_id)
-            conn = sqlite3.connect(self.DB_PATH)
+            conn = self.db.connect()
             cursor = conn.cursor()
             
-            # Iris 방식: KakaoTalk2.db를 db2로 attach
-            db2_attached = False
-            try:
-                if os.path.exists(self.DB_PATH2):
-                    cursor.execute(f"ATTACH DATABASE '{self.DB_PATH2}' AS db2")
-                    db2_attached = True
-            except Exception as e:
-                self.log_print(f"[발신자] db2 attach 실패: {e}")
+            # Iris 방식: KakaoTalk2.db를 db2로 attach (연결 관리자가 연결당 1회 attach)
+            db2_attached = conn.db2_attached
             
-            # Iris 코드: checkNewDb() - open_chat_member 테이블 존재 확인
-            has_open_chat_member = False
-            if db2_attached:
-                try:
-                    cursor.execute("SELECT name FROM db2.sqlite_master WHERE type='table' AND name='open_chat_member'")
-                    has_open_chat_member = cursor.fetchone() is not None
-                except:
-                    pass
+            # Iris 코드: checkNewDb() - open_chat_member 테이블 존재 확인 (시작 캐시 또는 최초 1회)
+            if self._has_open_chat_member is None:
+                self._has_open_chat_member = self._check_open_chat_member(cursor, db2_attached)
+            has_open_chat_member = db2_attached and self._has_open_chat_member
             
             # Iris 코드: getNameOfUserId - 신규 DB 방식 (open_chat_member 우선)
             # 중요: 각 테이블에서 개별 조회하여 더 긴 문자열을 선택
@@ -529,19 +618,12 @@ class KakaoPoller:
                         # 암호화되어 있으면 복호화 시도 (Iris: KakaoDecrypt.decrypt(enc, encryptedName, Configurable.botId))
                         # 복호화 시도 조건: MY_USER_ID가 있고, 암호화된 문자열인 경우
                         # base64로 보이는 경우 암호화된 것으로 간주
-                        # 짧은 문자열도 암호화일 수 있으므로 len > 5로 완화
-                        is_base64_like = (isinstance(encrypted_name, str) and 
-                                    len(encrypted_name) > 5 and
-                                    all(c in 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=' for c in encrypted_name))
+                        # (ciphertext_classifier: 디코딩 길이가 AES 블록 배수인지로 판별하므로 짧은 닉네임도 처리)
+                        is_base64_like = is_ciphertext(encrypted_name)
                         
                         if self.KAKAODECRYPT_AVAILABLE and self.MY_USER_ID and is_base64_like:
-                            # enc 후보: DB에서 조회한 enc가 있으면 우선 사용, 없으면 31, 30, 32 시도
-                            enc_candidates = []
-                            if enc > 0:
-                                enc_candidates.append(enc)
-                            # 기본 후보 추가 (enc가 없거나 실패 시)
-                            enc_candidates.extend([31, 30, 32])
-                            enc_candidates = list(dict.fromkeys(enc_candidates))  # 중복 제거
+                            # enc 후보: DB에서 조회한 enc 우선, 이후 닉네임에서 마지막으로 성공한 enc, 기본 후보 (중복/무효 제거)
+                            enc_candidates = self.enc_predictor.candidates("nickname", hint=enc if enc > 0 else None)
                             
                             # 복호화 관련 로그 주석 처리 (복호화 완료되었으므로)
                             # print(f"[발신자] 복호화 시도: user_id={user_id}, MY_USER_ID={MY_USER_ID}, 암호화된 이름=\"{encrypted_name}\", enc 후보={enc_candidates}")
@@ -552,7 +634,7 @@ class KakaoPoller:
                                     if decrypt_user_id_int > 0:
                                         # KakaoDecrypt.decrypt(user_id, enc, cipher_b64)
                                         if self.KakaoDecrypt:
-                                            decrypted = self.KakaoDecrypt.decrypt(decrypt_user_id_int, enc_try, encrypted_name)
+                                            decrypted = self.decrypt_memo.decrypt(encrypted_name, decrypt_user_id_int, enc_try, self.KakaoDecrypt.decrypt)
                                         else:
                                             decrypted = None
                                         
@@ -562,6 +644,7 @@ class KakaoPoller:
                                             
                                             # 복호화 결과가 너무 짧거나 제어 문자가 많으면 실패로 간주
                                             if not has_control_chars and len(decrypted) > 0:
+                                                self.enc_predictor.record("nickname", None, enc_try, first_try=(enc_try == enc_candidates[0]))
                                                 # print(f"[발신자] ✅ 복호화 성공: user_id={user_id}, enc={enc_try}, \"{encrypted_name}\" -> \"{decrypted}\"")
                                                 # print(f"[발신자] 복호화 결과 검증: 길이={len(decrypted)}, 제어문자={has_control_chars}")
                                                 conn.close()
@@ -573,6 +656,7 @@ class KakaoPoller:
                                     continue
                             
                             # 모든 enc 후보 실패 시 로그 출력 (서버에서 복호화 시도 예정)
+                            self.enc_predictor.record_failure("nickname")
                             self.log_print(f"[발신자] ❌ 클라이언트 복호화 실패 (모든 enc 후보 시도 완료), 서버로 암호화된 이름 전송: user_id={user_id}, DB에서 조회한 enc={enc}, MY_USER_ID={self.MY_USER_ID}")
                             self.log_print(f"[발신자] 시도한 enc 후보: {enc_candidates}, 암호화된 이름=\"{encrypted_name}\" (서버에서 복호화 시도 예정)")
                         else:
@@ -621,18 +705,12 @@ class KakaoPoller:
                             # 암호화되어 있으면 복호화 시도
                             if self.KAKAODECRYPT_AVAILABLE and self.MY_USER_ID:
                                 try:
-                                    # base64로 보이는 경우 암호화된 것으로 간주 (길이 조건 완화)
-                                    is_base64_like = (isinstance(encrypted_name, str) and 
-                                                    len(encrypted_name) > 5 and
-                                                    all(c in 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=' for c in encrypted_name))
+                                    # base64 암호문 형태인 경우 암호화된 것으로 간주 (ciphertext_classifier)
+                                    is_base64_like = is_ciphertext(encrypted_name)
                                     
                                     if is_base64_like:
-                                        # enc 후보: DB에서 조회한 enc가 있으면 우선 사용, 없으면 31, 30, 32 시도
-                                        enc_candidates = []
-                                        if enc > 0:
-                                            enc_candidates.append(enc)
-                                        enc_candidates.extend([31, 30, 32])
-                                        enc_candidates = list(dict.fromkeys(enc_candidates))
+                                        # enc 후보: DB에서 조회한 enc 우선, 이후 닉네임에서 마지막으로 성공한 enc, 기본 후보 (중복/무효 제거)
+                                        enc_candidates = self.enc_predictor.candidates("nickname", hint=enc if enc > 0 else None)
                                         
                                         self.log_print(f"[발신자] 복호화 시도 (friends): user_id={user_id}, MY_USER_ID={self.MY_USER_ID}, 암호화된 이름=\"{encrypted_name}\", enc 후보={enc_candidates}")
                                         
@@ -642,7 +720,7 @@ class KakaoPoller:
                                                 if decrypt_user_id_int > 0:
                                                     # KakaoDecrypt.decrypt(user_id, enc, cipher_b64)
                                                     if self.KakaoDecrypt:
-                                                        decrypted = self.KakaoDecrypt.decrypt(decrypt_user_id_int, enc_try, encrypted_name)
+                                                        decrypted = self.decrypt_memo.decrypt(encrypted_name, decrypt_user_id_int, enc_try, self.KakaoDecrypt.decrypt)
                                                     else:
                                                         decrypted = None
                                                     
@@ -651,6 +729,7 @@ class KakaoPoller:
                                                         has_control_chars = any(ord(c) < 32 and c not in '\n\r\t' for c in decrypted)
                                                         
                                                         if not has_control_chars and len(decrypted) > 0:
+                                                            self.enc_predictor.record("nickname", None, enc_try, first_try=(enc_try == enc_candidates[0]))
                                                             self.log_print(f"[발신자] ✅ 복호화 성공 (friends): user_id={user_id}, enc={enc_try}, \"{encrypted_name}\" -> \"{decrypted}\"")
                                                             conn.close()
                                                             return decrypted
@@ -661,6 +740,7 @@ class KakaoPoller:
                                                 continue
                                         
                                         # 모든 enc 후보 실패 시 로그 출력 (서버에서 복호화 시도 예정)
+                                        self.enc_predictor.record_failure("nickname")
                                         self.log_print(f"[발신자] ❌ 클라이언트 복호화 실패 (friends, 모든 enc 후보 시도 완료), 서버로 암호화된 이름 전송: user_id={user_id}, DB에서 조회한 enc={enc}, MY_USER_ID={self.MY_USER_ID}")
                                         self.log_print(f"[발신자] 시도한 enc 후보: {enc_candidates}, 암호화된 이름=\"{encrypted_name}\" (서버에서 복호화 시도 예정)")
                                     else:
@@ -682,23 +762,105 @@ class KakaoPoller:
             self.log_print(f"[발신자] 이름 조회 실패: user_id={user_id}, 오류={e}")
             return None
 
-    def get_chat_room_data(self, chat_id):
-        """채팅방 ID로 채팅방 데이터 조회 (Iris 방식: private_meta에서 name 추출)"""
+    def resolve_sender_names(self, user_ids):
+        """
+        배치 단위 발신자 이름 조회 (get_name_of_user_id를 메시지마다 호출하는 대신 배치당 1회)
+        
+        멤버 디렉터리가 있으면 메모리 조회 (db2가 바뀌었을 때만 갱신, 없는 user_id만 DB 조회),
+        없으면 서로 다른 user_id를 모아 open_chat_member/friends를 IN (...) 조회 1회씩으로 가져오고
+        닉네임을 한 번에 복호화합니다. 선택/복호화 규칙은 get_name_of_user_id와 같습니다.
+        
+        Args:
+            user_ids: 배치의 user_id들 (중복 허용)
+        
+        Returns:
+            dict: user_id(str) -> 이름 (복호화된 이름, 복호화 실패 시 암호화된 이름, 행이 없으면 None)
+            조회 자체가 실패한 user_id는 빠짐 (send_to_server가 get_name_of_user_id로 개별 조회)
+        """
+        ids = list(dict.fromkeys(str(user_id) for user_id in user_ids if user_id))
+        if not ids:
+            return {}
+        
+        if self.member_directory is not None:
+            return self.member_directory.resolve(ids)
+        
         try:
-            conn = sqlite3.connect(self.DB_PATH)
-            cursor = conn.cursor()
+            conn = self.db.connect()
+            try:
+                if not conn.db2_attached:
+                    return {}
+                cursor = conn.cursor()
+                if self._has_open_chat_member is None:
+                    self._has_open_chat_member = self._check_open_chat_member(cursor, True)
+                rows = fetch_sender_rows(cursor, ids, self._has_open_chat_member)
+            finally:
+                conn.close()
+        except Exception as e:
+            self.log_print(f"[발신자] 배치 이름 조회 실패 (메시지별 조회로 대체): {e}")
+            return {}
         
-            # Iris 방식: KakaoTalk2.db를 db2로 attach
-            db2_attached = False
+        names, failed = self._decrypt_sender_rows(rows)
+        self.log_print(f"[발신자] 배치 이름 조회: user_id {len(ids)}개, 조회 성공 {len(rows)}개, 복호화 실패 {len(failed)}개")
+        return {user_id: names.get(user_id) for user_id in ids}
+
+    def _decrypt_sender_rows(self, rows):
+        """fetch_sender_rows() 결과 일괄 복호화 (MY_USER_ID/KakaoDecrypt가 없으면 원본 이름 그대로)"""
+        my_user_id_int = None
+        if self.KAKAODECRYPT_AVAILABLE and self.KakaoDecrypt and self.MY_USER_ID:
             try:
-                if os.path.exists(self.DB_PATH2):
-                    cursor.execute(f"ATTACH DATABASE '{self.DB_PATH2}' AS db2")
-                    db2_attached = True
-                    self.log_print(f"[채팅방] db2 attach 성공: {self.DB_PATH2}")
-                else:
-                    self.log_print(f"[채팅방] db2 파일 없음: {self.DB_PATH2}")
-            except Exception as e:
-                self.log_print(f"[채팅방] db2 attach 실패: {e}")
+                my_user_id_int = int(self.MY_USER_ID)
+            except (ValueError, TypeError):
+                my_user_id_int = None
+        
+        names, failed = decrypt_sender_names(
+            rows,
+            my_user_id_int if my_user_id_int and my_user_id_int > 0 else None,
+            self.KakaoDecrypt.decrypt if self.KakaoDecrypt else None,
+            self.decrypt_memo,
+            self.enc_predictor,
+            batch_decrypt=self.decrypt_pool.decrypt if self.decrypt_pool else None
+        )
+        if failed:
+            self.log_print(f"[발신자] ❌ 클라이언트 복호화 실패 {len(failed)}명 (서버에서 복호화 시도 예정): user_id={failed[:10]}")
+        return names, failed
+
+    def _decrypt_room_name(self, room_name_raw, chat_id, enc_hint=None):
+        """채팅방 이름 복호화 (private_meta/v의 enc -> 이 채팅방에서 마지막 성공 enc -> 기본 후보), 실패 시 None"""
+        if not (self.KAKAODECRYPT_AVAILABLE and self.KakaoDecrypt and self.MY_USER_ID):
+            return None
+        try:
+            decrypt_user_id_int = int(self.MY_USER_ID)
+        except (ValueError, TypeError):
+            return None
+        if decrypt_user_id_int <= 0:
+            return None
+        
+        enc_candidates = self.enc_predictor.candidates("room", room=chat_id, hint=enc_hint)
+        for enc_try in enc_candidates:
+            decrypted = self.decrypt_memo.decrypt(room_name_raw, decrypt_user_id_int, enc_try, self.KakaoDecrypt.decrypt)
+            if decrypted and decrypted != room_name_raw:
+                # 유효한 텍스트인지 확인
+                if not any(ord(c) < 32 and c not in '\n\r\t' for c in decrypted):
+                    self.enc_predictor.record("room", chat_id, enc_try, first_try=(enc_try == enc_candidates[0]))
+                    return decrypted
+        self.enc_predictor.record_failure("room", chat_id)
+        return None
+
+    def get_chat_room_data(self, chat_id, enc_hint=None):
+        """채팅방 ID로 채팅방 데이터 조회 (Iris 방식: private_meta에서 name 추출)
+        
+        채팅방 캐시가 있으면 dict 조회 결과 (name, name_column, enc, name_decrypted)를 반환합니다.
+        enc_hint: 메시지 v.enc (캐시된 이름 복호화가 실패한 경우 이 힌트로 다시 시도)
+        """
+        if self.room_cache is not None:
+            return self.room_cache.resolve(chat_id, enc_hint=enc_hint)
+        
+        try:
+            conn = self.db.connect()
+            cursor = conn.cursor()
+        
+            # Iris 방식: KakaoTalk2.db를 db2로 attach (연결 관리자가 연결당 1회 attach)
+            db2_attached = conn.db2_attached
             
             # Iris 방식: chat_rooms 테이블의 private_meta 컬럼에서 name 추출
             try:
@@ -791,19 +953,100 @@ class KakaoPoller:
             self.log_print(f"[채팅방] DB 연결 오류: chat_id={chat_id}, 오류={e}")
             return None
 
+    def _select_columns_from(self, available_columns):
+        """chat_logs 컬럼 목록 -> get_new_messages SELECT 컬럼 (선택적 컬럼은 있을 때만)"""
+        # 기본 필수 컬럼
+        base_columns = ["_id", "chat_id", "user_id", "message", "created_at"]
+        
+        # 선택적 컬럼 추가
+        select_columns = base_columns.copy()
+        if "v" in available_columns:
+            select_columns.append("v")
+        if "userId" in available_columns:
+            select_columns.append("userId")
+        if "encType" in available_columns:
+            select_columns.append("encType")
+        if "type" in available_columns:
+            select_columns.append("type")  # 메시지 타입 (반응 감지용)
+            self.log_print(f"[DB 구조] ✅ type 컬럼 사용 가능")
+        else:
+            self.log_print(f"[DB 구조] ⚠️ type 컬럼 없음 - 반응 감지 불가능")
+        if "attachment" in available_columns:
+            select_columns.append("attachment")  # 첨부 정보 (반응 정보 포함 가능)
+            self.log_print(f"[DB 구조] ✅ attachment 컬럼 사용 가능")
+        else:
+            self.log_print(f"[DB 구조] ⚠️ attachment 컬럼 없음 - 반응/이미지 감지 불가능")
+        if "referer" in available_columns:
+            select_columns.append("referer")  # 답장 메시지 ID (referer 필드)
+            self.log_print(f"[DB 구조] ✅ referer 컬럼 사용 가능")
+        else:
+            self.log_print(f"[DB 구조] ⚠️ referer 컬럼 없음 - 답장 감지 불가능")
+        if "supplement" in available_columns:
+            select_columns.append("supplement")  # 반응 상세 정보 (supplement 필드)
+            self.log_print(f"[DB 구조] ✅ supplement 컬럼 사용 가능")
+        else:
+            self.log_print(f"[DB 구조] ⚠️ supplement 컬럼 없음 - 반응 상세 정보 확인 불가능")
+        
+        return select_columns
+
+    def _check_open_chat_member(self, cursor, db2_attached):
+        if not db2_attached:
+            return False
+        try:
+            cursor.execute("SELECT name FROM db2.sqlite_master WHERE type='table' AND name='open_chat_member'")
+            return cursor.fetchone() is not None
+        except sqlite3.Error:
+            return False
+
+    def load_db_schema(self):
+        """
+        chat_logs 컬럼 / db2 기능 확인 (schema_version이 같으면 시작 캐시 사용)
+
+        Returns:
+            bool: 캐시 사용 여부 (False면 새로 확인하고 저장함)
+        """
+        conn = self.db.connect()
+        try:
+            cursor = conn.cursor()
+            key = schema_key(conn, conn.db2_attached)
+            schema = self.startup_cache.load(self.DB_PATH, key)
+            if schema is not None:
+                available_columns = schema["chat_logs_columns"]
+                self._has_open_chat_member = schema["has_open_chat_member"]
+                self.log_print(f"[DB 구조] 시작 캐시 사용 (schema_version={key[0]}/{key[1]}, "
+                               f"chat_logs 컬럼 {len(available_columns)}개)")
+            else:
+                cursor.execute("PRAGMA table_info(chat_logs)")
+                available_columns = [col[1] for col in cursor.fetchall()]
+                if not available_columns:
+                    return False
+                self._has_open_chat_member = self._check_open_chat_member(cursor, conn.db2_attached)
+                self.startup_cache.save(self.DB_PATH, key, {
+                    "chat_logs_columns": available_columns,
+                    "has_open_chat_member": self._has_open_chat_member,
+                })
+            self._db_structure_cache = available_columns
+            self._select_columns_cache = self._select_columns_from(available_columns)
+            return schema is not None
+        finally:
+            conn.close()
+
     def get_new_messages(self):
         """새 메시지 조회 (중복 방지)"""
         last_id = self.load_last_message_id()
         
-        # 검증: 최신 메시지 ID 확인 (로그 최소화)
+        # 검증: 최신 메시지 ID 확인 (로그 최소화, poll_messages에서 재사용)
         latest_id_in_db = self.get_latest_message_id()
+        self._latest_id_in_db = latest_id_in_db
         if latest_id_in_db is not None:
             if latest_id_in_db < last_id:
                 # last_id가 DB의 최신 ID보다 큼 (비정상) - 이 경우만 경고
                 self.log_print(f"[경고] last_message_id({last_id})가 DB 최신 ID({latest_id_in_db})보다 큼. 초기화 필요할 수 있음.")
         
+        self._last_fetch_full = False
+        self._last_fetch_max_id = None
         try:
-            conn = sqlite3.connect(self.DB_PATH)
+            conn = self.db.connect()
             cursor = conn.cursor()
             
             # DB 구조 캐시 사용 (최초 1회만 확인)
@@ -815,39 +1058,7 @@ class KakaoPoller:
                     available_columns = [col[1] for col in columns_info]
                     self._db_structure_cache = available_columns
                     
-                    # 기본 필수 컬럼
-                    base_columns = ["_id", "chat_id", "user_id", "message", "created_at"]
-                    
-                    # 선택적 컬럼 추가
-                    select_columns = base_columns.copy()
-                    if "v" in available_columns:
-                        select_columns.append("v")
-                    if "userId" in available_columns:
-                        select_columns.append("userId")
-                    if "encType" in available_columns:
-                        select_columns.append("encType")
-                    if "type" in available_columns:
-                        select_columns.append("type")  # 메시지 타입 (반응 감지용)
-                        self.log_print(f"[DB 구조] ✅ type 컬럼 사용 가능")
-                    else:
-                        self.log_print(f"[DB 구조] ⚠️ type 컬럼 없음 - 반응 감지 불가능")
-                    if "attachment" in available_columns:
-                        select_columns.append("attachment")  # 첨부 정보 (반응 정보 포함 가능)
-                        self.log_print(f"[DB 구조] ✅ attachment 컬럼 사용 가능")
-                    else:
-                        self.log_print(f"[DB 구조] ⚠️ attachment 컬럼 없음 - 반응/이미지 감지 불가능")
-                    if "referer" in available_columns:
-                        select_columns.append("referer")  # 답장 메시지 ID (referer 필드)
-                        self.log_print(f"[DB 구조] ✅ referer 컬럼 사용 가능")
-                    else:
-                        self.log_print(f"[DB 구조] ⚠️ referer 컬럼 없음 - 답장 감지 불가능")
-                    if "supplement" in available_columns:
-                        select_columns.append("supplement")  # 반응 상세 정보 (supplement 필드)
-                        self.log_print(f"[DB 구조] ✅ supplement 컬럼 사용 가능")
-                    else:
-                        self.log_print(f"[DB 구조] ⚠️ supplement 컬럼 없음 - 반응 상세 정보 확인 불가능")
-                    
-                    self._select_columns_cache = select_columns
+                    self._select_columns_cache = self._select_columns_from(available_columns)
                 except Exception as e:
                     # 테이블 정보 조회 실패 시 기본 쿼리 사용
                     self.log_print(f"[경고] 테이블 구조 확인 실패: {e}, 기본 쿼리 사용")
@@ -855,6 +1066,9 @@ class KakaoPoller:
             
             # 캐시된 컬럼 사용
             select_columns = self._select_columns_cache
+            if self._column_map is None or self._column_map.columns != select_columns:
+                self._column_map = ColumnMap(select_columns)
+            column_map = self._column_map
             
             # 쿼리 생성
             columns_str = ", ".join(select_columns)
@@ -863,11 +1077,20 @@ class KakaoPoller:
                 FROM chat_logs
                 WHERE _id > ?
                 ORDER BY _id ASC
-                LIMIT 10
+                LIMIT ?
             """
             
-            cursor.execute(query, (last_id,))
-            messages = cursor.fetchall()
+            # 평상시 NEW_MESSAGE_BATCH_LIMIT개, 캐치업 모드에서는 큰 페이지 (_id > last_id 키셋 페이지네이션)
+            fetch_limit = self.catchup.plan(last_id, latest_id_in_db)
+            cursor.execute(query, (last_id, fetch_limit))
+            messages = []
+            while True:
+                rows = cursor.fetchmany(CATCHUP_FETCH_SIZE)
+                if not rows:
+                    break
+                messages.extend(ChatLogRecord(row, column_map) for row in rows)
+            self._last_fetch_full = len(messages) >= fetch_limit
+            self._last_fetch_max_id = messages[-1].msg_id if messages else None
             
             # 로그: 메시지가 있을 때만 출력
             if len(messages) > 0:
@@ -875,20 +1098,12 @@ class KakaoPoller:
             
             conn.close()
             
+            if messages:
+                self.catchup.advance(len(messages), self._last_fetch_max_id, latest_id_in_db)
+            
             # 중복 메시지 필터링 (try 블록 안에서 처리)
-            new_messages = []
-            for msg in messages:
-                msg_id = msg[0]
-                # 이미 전송한 메시지는 제외
-                if msg_id not in self.sent_message_ids:
-                    new_messages.append(msg)
-                    # 전송 예정으로 표시 (중복 방지) - 세트 크기 제한
-                    self.sent_message_ids.add(msg_id)
-                    # 세트 크기가 너무 커지지 않도록 제한 (최근 2000개만 유지)
-                    if len(self.sent_message_ids) > 2000:
-                        # 가장 오래된 메시지 ID 제거
-                        min_id = min(self.sent_message_ids)
-                        self.sent_message_ids.discard(min_id)
+            # 처리 완료 표시는 poll_messages에서 전송/스킵 시 (체크포인트 이후 ID만 세트에 남음)
+            new_messages = [record for record in messages if record.msg_id not in self.sent_message_ids]
             
             # 로그: 새 메시지가 있을 때만 상세 로그 출력
             if new_messages:
@@ -913,6 +1128,85 @@ class KakaoPoller:
             self.log_print(f"[경고] DB 조회 실패: {e}")
             return []
 
+    def predecrypt_batch(self, messages):
+        """
+        배치 단위 선(先)복호화 (메시지 본문 + attachment)
+        
+        catch-up 백로그(DECRYPT_POOL_THRESHOLD개 이상)를 decrypt_pool로 한 번에 복호화합니다 (여러 프로세스로 분산).
+        정상 상태의 작은 배치는 선복호화하지 않고 메시지별 경로(enc 후보 + 복호화 메모)를 그대로 사용합니다.
+        본문은 is_valid_plaintext()를 통과한 것만 사용합니다 (잘못된 키로 패딩이 우연히 맞은 결과 제외).
+        
+        Args:
+            messages: get_new_messages() 결과 (ChatLogRecord 리스트)
+        
+        Returns:
+            (message_map, attachment_map): msg_id -> 복호화된 본문 / 복호화된 attachment (AttachmentView)
+            성공한 항목만 포함되며, 실패한 항목은 기존 메시지별 경로(send_to_server 등)에서 재시도됩니다.
+        """
+        if not self.decrypt_pool or not self.MY_USER_ID or len(messages) < self.DECRYPT_POOL_THRESHOLD:
+            return {}, {}
+        try:
+            my_user_id_int = int(self.MY_USER_ID)
+        except (ValueError, TypeError):
+            return {}, {}
+        
+        attachment_types = set(str(t) for t in self.ATTACHMENT_DECRYPT_WHITELIST) | {"2", "27"}
+        keys = []
+        items = []
+        for record in messages:
+            msg_id = record.msg_id
+            message = record.message
+            enc_type = record.enc_type
+            
+            # 본문: decrypt_message()와 동일하게 v.enc가 있으면 우선 사용 (v는 레코드에서 1회 파싱)
+            if is_ciphertext(message):
+                keys.append(("message", msg_id))
+                items.append((message, my_user_id_int, record.body_enc_type))
+            
+            # attachment: whitelist 타입만 (선물 메시지 type 71은 기존 경로에서 처리)
+            msg_type = record.msg_type
+            attachment = record.attachment
+            if (self.ATTACHMENT_DECRYPT_AVAILABLE and attachment and isinstance(attachment, str) and
+                    str(msg_type) in attachment_types and str(msg_type) != "71"):
+                attachment_str = attachment.strip()
+                if is_ciphertext(attachment_str):
+                    keys.append(("attachment", msg_id))
+                    items.append((attachment_str, my_user_id_int, enc_type))
+        
+        if not items:
+            return {}, {}
+        
+        message_map = {}
+        attachment_map = {}
+        results = self.decrypt_pool.decrypt(items)
+        for (kind, msg_id), (plaintext, fail_reason) in zip(keys, results):
+            if plaintext is None:
+                continue
+            if kind == "message":
+                # 텍스트로 보이지 않으면 제외 (send_to_server의 enc 후보 경로에서 다시 시도)
+                if is_valid_plaintext(plaintext):
+                    message_map[msg_id] = plaintext
+            else:
+                # 파싱하지 않고 JSON 텍스트 그대로 보관 (필요한 필드를 읽을 때만 파싱)
+                # decrypt_attachment_view()와 같이 JSON이 아닌 평문은 제외 (개별 경로에서 다시 시도)
+                view = attachment_view(plaintext)
+                if view is not None:
+                    attachment_map[msg_id] = view
+        
+        self.log_print(f"[복호화 풀] 배치 선복호화: 항목={len(items)}개, 본문 성공={len(message_map)}개, attachment 성공={len(attachment_map)}개")
+        return message_map, attachment_map
+
+    def decrypt_cache_stats(self):
+        """복호화 관련 캐시/예측기 통계 (메모 크기/적중률, enc 예측 적중률, 복호화 풀, AES 백엔드)"""
+        return {
+            "memo": self.decrypt_memo.stats(),
+            "enc_predictor": self.enc_predictor.stats(),
+            "decrypt_pool": self.decrypt_pool.stats() if self.decrypt_pool else None,
+            "aes_backend": aes_backend.get_metrics() if aes_backend else None,
+            "member_directory": self.member_directory.stats() if self.member_directory else None,
+            "room_cache": self.room_cache.stats() if self.room_cache else None,
+        }
+
     def log_print(self, *args, **kwargs):
         """로그를 버퍼에 저장하면서 원래 print 함수도 실행"""
         # 원래 print 함수 실행
@@ -964,6 +1258,8 @@ class KakaoPoller:
 
     def connect_websocket(self):
         """WebSocket 연결"""
+        settled = threading.Event()  # 연결 성공 또는 실패(종료) 시 설정
+        
         def on_message(ws, message):
             """서버로부터 메시지 수신 (로깅만 수행, 전송은 Bridge APK가 담당)"""
             try:
@@ -995,6 +1291,7 @@ class KakaoPoller:
         def on_close(ws, close_status_code, close_msg):
             """WebSocket 연결 종료 - 재연결 시도"""
             self.log_print(f"[WebSocket 연결 종료] code={close_status_code}, msg={close_msg}")
+            settled.set()
             self.ws_connection = None
             
             # 재연결 스레드가 이미 실행 중이면 중복 실행 방지
@@ -1033,12 +1330,14 @@ class KakaoPoller:
         
         def on_open(ws):
             """WebSocket 연결 성공"""
+            settled.set()
             self.log_print("[✓] WebSocket 연결 성공")
             self.ws_reconnect_attempts = 0  # 연결 성공 시 재연결 카운터 리셋
             # 연결 메시지 전송
             ws.send(json.dumps({"type": "connect"}))
         
         try:
+            import websocket
             ws = websocket.WebSocketApp(
                 self.WS_URL,
                 on_message=on_message,
@@ -1054,8 +1353,8 @@ class KakaoPoller:
             ws_thread = threading.Thread(target=run_ws, daemon=True)
             ws_thread.start()
             
-            # 연결 대기
-            time.sleep(1)
+            # 연결 대기 (연결/실패가 확정되면 바로, 최대 WS_CONNECT_TIMEOUT_SEC초)
+            settled.wait(self.WS_CONNECT_TIMEOUT)
             self.ws_connection = ws
             return True
         except Exception as e:
@@ -1078,12 +1377,15 @@ class KakaoPoller:
 # 이제 Bridge APK가 메시지 전송을 담당하므로 클라이언트에서는 전송 로직이 필요 없습니다.
 # Bridge APK가 서버로부터 type: "send" 메시지를 받아서 카카오톡으로 전송합니다.
 
-    def send_to_server(self, message_data, is_reaction=False):
+    def send_to_server(self, message_data, is_reaction=False, predecrypted_message=None, record=None, sender_names=None):
         """서버로 메시지 전송 (WebSocket)
         
         Args:
             message_data: 전송할 메시지 데이터
             is_reaction: 반응 메시지 여부 (기본값: False)
+            predecrypted_message: predecrypt_batch()에서 이미 복호화한 본문 (있으면 복호화 생략)
+            record: poll_messages의 ChatLogRecord (v 필드 파싱 결과 재사용, 없으면 message_data로 생성)
+            sender_names: resolve_sender_names()의 배치 결과 (user_id가 있으면 get_name_of_user_id 생략)
         """
         # msg_id 추출 (kakao_log_id용)
         msg_id = message_data.get("_id") if isinstance(message_data, dict) else None
@@ -1155,14 +1457,15 @@ class KakaoPoller:
             sender_name_decrypted = None  # 클라이언트에서 복호화한 이름
             
             if user_id:
-                # Iris 원본 코드: getChatInfo에서 getNameOfUserId 호출
-                sender_name = self.get_name_of_user_id(user_id)
+                # Iris 원본 코드: getChatInfo에서 getNameOfUserId 호출 (배치에서 이미 조회했으면 그 결과 사용)
+                if sender_names is not None and str(user_id) in sender_names:
+                    sender_name = sender_names[str(user_id)]
+                else:
+                    sender_name = self.get_name_of_user_id(user_id)
                 if sender_name:
                     # sender_name이 암호화된 형태인지 확인 (복호화 실패한 경우)
-                    is_encrypted_name = (isinstance(sender_name, str) and 
-                                       len(sender_name) > 10 and 
-                                       len(sender_name) % 4 == 0 and
-                                       all(c in 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=' for c in sender_name))
+                    # (기존 조건 유지: 길이 > 10, % 4 == 0, base64 문자 - 블록 길이가 안 맞아도 서버에서 복호화 시도)
+                    is_encrypted_name = looks_like_base64(sender_name)
                     
                     if is_encrypted_name:
                         # 복호화 실패 - 암호화된 원본 저장 (서버에서 복호화 시도)
@@ -1191,10 +1494,11 @@ class KakaoPoller:
             sender_id_for_transmission = str(user_id) if user_id else None
             
             message = str(message_data.get("message", ""))
-            v_field = message_data.get("v")
+            if record is None:
+                record = ChatLogRecord.from_dict(message_data)
             
-            # 채팅방 데이터 조회 및 복호화
-            room_data = self.get_chat_room_data(chat_id) if chat_id else None
+            # 채팅방 데이터 조회 및 복호화 (채팅방 캐시가 있으면 복호화된 이름까지 dict 조회)
+            room_data = self.get_chat_room_data(chat_id, enc_hint=record.room_enc_hint) if chat_id else None
             room_name_raw = room_data.get('name') if room_data else None
             room_name_column = room_data.get('name_column') if room_data else None
             
@@ -1202,60 +1506,58 @@ class KakaoPoller:
             room_name_decrypted = None
             room_name_encrypted = None
             
-            if room_name_raw:
+            if room_data is not None and 'name_decrypted' in room_data:
+                # 채팅방 캐시: 이름이 바뀌었을 때만 다시 복호화됨
+                room_name_decrypted = room_data['name_decrypted']
+                if room_name_decrypted is None or room_name_decrypted != room_name_raw:
+                    room_name_encrypted = room_name_raw
+                if room_name_decrypted is None:
+                    self.log_print(f"[✗ 채팅방] 복호화 실패 (캐시): 서버로 암호화된 원본 전송")
+            elif room_name_raw:
                 print(f"[채팅방] 이름 조회 성공: chat_id={chat_id}, 길이={len(room_name_raw) if isinstance(room_name_raw, str) else 'N/A'}")
                 
                 # base64로 보이는 경우 암호화된 것으로 간주
-                is_base64_like = (isinstance(room_name_raw, str) and 
-                             len(room_name_raw) > 10 and 
-                             len(room_name_raw) % 4 == 0 and
-                                 all(c in 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=' for c in room_name_raw))
+                is_base64_like = is_ciphertext(room_name_raw)
                 
                 if is_base64_like and self.KAKAODECRYPT_AVAILABLE and self.MY_USER_ID:
                     self.log_print(f"[채팅방] 암호화된 이름 확인, 복호화 시도: chat_id={chat_id}")
                     # enc 후보 추출
-                enc_type_room = 31
-                if v_field:
-                    try:
-                        if isinstance(v_field, str):
-                            v_parsed = json.loads(v_field)
-                            if isinstance(v_parsed, dict) and "enc" in v_parsed:
-                                enc_type_room = v_parsed["enc"] or 31
-                    except:
-                        pass
-                
-                # private_meta에서 enc 정보 확인
-                if room_data and room_data.get('raw_data'):
-                    raw_data = room_data.get('raw_data')
-                    if 'private_meta_parsed' in raw_data:
-                        private_meta = raw_data.get('private_meta_parsed')
-                        if isinstance(private_meta, dict) and 'enc' in private_meta:
-                            enc_type_room = private_meta['enc'] or 31
-                
-                # 복호화 시도
-                enc_candidates = [enc_type_room, 31, 30]
-                enc_candidates = list(dict.fromkeys(enc_candidates))
-                
-                for enc_try in enc_candidates:
-                    try:
-                        decrypt_user_id_int = int(self.MY_USER_ID)
-                        if decrypt_user_id_int > 0:
-                            if self.KakaoDecrypt:
-                                decrypted = self.KakaoDecrypt.decrypt(decrypt_user_id_int, enc_try, room_name_raw)
-                            else:
-                                decrypted = None
-                            if decrypted and decrypted != room_name_raw:
-                                # 유효한 텍스트인지 확인
-                                has_control_chars = any(ord(c) < 32 and c not in '\n\r\t' for c in decrypted)
-                                if not has_control_chars:
-                                    room_name_decrypted = decrypted
-                                    room_name_encrypted = room_name_raw
-                                    self.log_print(f"[✓ 채팅방] 복호화 성공: \"{decrypted}\" (enc={enc_try})")
-                                    break
-                    except Exception as e:
-                        continue
-                
+                    enc_type_room = record.room_enc_hint
+                    
+                    # private_meta에서 enc 정보 확인
+                    if room_data and room_data.get('raw_data'):
+                        raw_data = room_data.get('raw_data')
+                        if 'private_meta_parsed' in raw_data:
+                            private_meta = raw_data.get('private_meta_parsed')
+                            if isinstance(private_meta, dict) and 'enc' in private_meta:
+                                enc_type_room = private_meta['enc'] or None
+                    
+                    # 복호화 시도 (private_meta/v의 enc -> 이 채팅방에서 마지막 성공 enc -> 기본 후보)
+                    enc_candidates = self.enc_predictor.candidates("room", room=chat_id, hint=enc_type_room)
+                    
+                    for enc_try in enc_candidates:
+                        try:
+                            decrypt_user_id_int = int(self.MY_USER_ID)
+                            if decrypt_user_id_int > 0:
+                                if self.KakaoDecrypt:
+                                    decrypted = self.decrypt_memo.decrypt(room_name_raw, decrypt_user_id_int, enc_try, self.KakaoDecrypt.decrypt)
+                                else:
+                                    decrypted = None
+                                if decrypted and decrypted != room_name_raw:
+                                    # 유효한 텍스트인지 확인
+                                    has_control_chars = any(ord(c) < 32 and c not in '\n\r\t' for c in decrypted)
+                                    if not has_control_chars:
+                                        room_name_decrypted = decrypted
+                                        room_name_encrypted = room_name_raw
+                                        self.enc_predictor.record("room", chat_id, enc_try, first_try=(enc_try == enc_candidates[0]))
+                                        self.log_print(f"[✓ 채팅방] 복호화 성공: \"{decrypted}\" (enc={enc_try})")
+                                        break
+                        except Exception as e:
+                            continue
+                    
+                    # 모든 후보가 실패했을 때 한 번만 기록 (후보마다 기록하면 first_try_rate가 왜곡됨)
                     if not room_name_decrypted:
+                        self.enc_predictor.record_failure("room", chat_id)
                         room_name_encrypted = room_name_raw
                         self.log_print(f"[✗ 채팅방] 복호화 실패: 서버로 암호화된 원본 전송")
                 else:
@@ -1299,12 +1601,11 @@ class KakaoPoller:
             enc_type = message_data.get("encType", 31)
             
             # base64로 보이는 메시지는 암호화된 메시지일 가능성이 높음
-            is_base64_like = (isinstance(message, str) and 
-                             len(message) > 10 and 
-                             len(message) % 4 == 0 and
-                             all(c in 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=' for c in message))
+            is_base64_like = is_ciphertext(message)
             
-            if self.DECRYPT_ENABLED and decrypt_user_id and is_base64_like:
+            if predecrypted_message:
+                decrypted_message = predecrypted_message
+            elif self.DECRYPT_ENABLED and decrypt_user_id and is_base64_like:
                 try:
                     # 숫자로 변환 시도 (큰 숫자도 처리)
                     try:
@@ -1313,17 +1614,21 @@ class KakaoPoller:
                         decrypt_user_id_int = None
                     
                     if decrypt_user_id_int and decrypt_user_id_int > 0:
-                        # 여러 enc_type 시도 (31, 30, 32 순서)
-                        enc_candidates = [enc_type, 31, 30, 32]
-                        enc_candidates = list(dict.fromkeys(enc_candidates))  # 중복 제거
+                        # enc 후보: v.enc(없으면 encType 컬럼) -> 이 채팅방에서 마지막 성공 enc -> 기본 후보
+                        # decrypt_message()는 v_field가 있으면 enc를 덮어쓰므로 v_field 대신 enc를 직접 전달
+                        v_enc = record.v.get("enc")
+                        message_enc = v_enc if v_enc is not None else enc_type
+                        enc_candidates = self.enc_predictor.candidates("message", room=chat_id, hint=message_enc)
                         
                         for enc_try in enc_candidates:
-                            decrypted_message = decrypt_message(message, v_field, decrypt_user_id_int, enc_try, debug=True)
+                            decrypted_message = self.decrypt_memo.decrypt(message, decrypt_user_id_int, enc_try, self._decrypt_message_body)
                             if decrypted_message:
+                                self.enc_predictor.record("message", chat_id, enc_try, first_try=(enc_try == enc_candidates[0]))
                                 print(f"[✓] 메시지 복호화 성공: user_id={decrypt_user_id_int}, enc_type={enc_try}")
                                 break
                         
                         if not decrypted_message:
+                            self.enc_predictor.record_failure("message", chat_id)
                             print(f"[✗] 메시지 복호화 실패: user_id={decrypt_user_id_int}, 시도한 enc_type={enc_candidates}")
                             print(f"[디버그] MY_USER_ID={self.MY_USER_ID}, message_data.myUserId={message_data.get('myUserId')}")
                             print(f"[디버그] message 길이={len(message)}, base64 형태={is_base64_like}")
@@ -1387,10 +1692,13 @@ class KakaoPoller:
                     print("[✗] WebSocket 재연결 실패")
                     return False
             
+            # 직렬화는 한 번만 (복호화된 attachment JSON 텍스트는 재직렬화 없이 삽입)
+            payload_str = dumps_payload(payload, ensure_ascii=False)
+            
             # WebSocket 연결 상태 확인
             if self.ws_connection:
                 sock_connected = self.ws_connection.sock and self.ws_connection.sock.connected if self.ws_connection.sock else False
-                print(f"[전송] WebSocket 상태: 연결={sock_connected}, payload 길이={len(json.dumps(payload))}")
+                print(f"[전송] WebSocket 상태: 연결={sock_connected}, payload 길이={len(payload_str)}")
             else:
                 print("[전송] WebSocket 상태: 연결 없음")
             
@@ -1398,7 +1706,6 @@ class KakaoPoller:
             with self.ws_lock:
                 if self.ws_connection and self.ws_connection.sock and self.ws_connection.sock.connected:
                     try:
-                        payload_str = json.dumps(payload, ensure_ascii=False)
                         print(f"[전송] WebSocket 전송: room=\"{room}\", sender={sender}, message 길이={len(final_message)}")
                         self.ws_connection.send(payload_str)
                         print(f"[✓] 전송 성공")
@@ -1414,7 +1721,6 @@ class KakaoPoller:
                     self.ws_connection = None
                     if self.connect_websocket():
                         try:
-                            payload_str = json.dumps(payload, ensure_ascii=False)
                             print(f"[디버그] 재연결 후 WebSocket 전송 시도: payload 길이={len(payload_str)}")
                             self.ws_connection.send(payload_str)
                             print(f"[✓] 재연결 후 WebSocket 전송 성공")
@@ -1449,21 +1755,37 @@ class KakaoPoller:
             self.log_print(f"자신의 user_id: {self.MY_USER_ID}")
         self.log_print("=" * 60)
         
+        self.startup_timer.mark("user_id 로드")
+        
         # DB 접근 확인
         if not self.check_db_access():
             self.log_print("\n[중지] DB 접근 불가. 위의 해결 방법을 참고하세요.")
             return
+        self.startup_timer.mark("DB 접근 확인")
         
-        # DB 구조 확인
-        if not self.check_db_structure():
-            self.log_print("\n[경고] DB 구조 확인 실패. 계속 진행합니다...")
+        # DB 구조 확인: chat_logs 컬럼/db2 기능만 (schema_version이 같으면 캐시),
+        # 전체 테이블 구조 출력은 스키마가 바뀌었을 때만 백그라운드에서
+        try:
+            schema_cached = self.load_db_schema()
+        except Exception as e:
+            self.log_print(f"\n[경고] DB 구조 확인 실패: {e}. 계속 진행합니다...")
+            schema_cached = False
+        self.startup_timer.mark("DB 구조 확인")
+        self.start_background_task(self.run_startup_diagnostics, not schema_cached, name="startup-diagnostics")
+        # 멤버 디렉터리 미리 읽기 (백그라운드, 완료 전에는 배치별 IN (...) 조회로 채움)
+        if self.member_directory is not None:
+            self.start_background_task(self.member_directory.load, name="member-directory")
+        # 채팅방 캐시 미리 읽기 (백그라운드, 완료 전에는 채팅방별 조회로 채움)
+        if self.room_cache is not None:
+            self.start_background_task(self.room_cache.load, name="room-cache")
         
         # 마지막 메시지 ID 로드 (전송한 메시지 세트 초기화)
         last_id = self.load_last_message_id()
         latest_id_in_db = self.get_latest_message_id()
+        self.startup_timer.mark("체크포인트 로드")
         
         self.log_print(f"\n[시작] 마지막 처리한 메시지 ID: {last_id}")
-        self.log_print(f"[시작] 이미 처리한 메시지 수: {len(self.sent_message_ids)}개")
+        self.log_print(f"[시작] 체크포인트 이후 이미 처리한 메시지 수: {len(self.sent_message_ids)}개")
         if latest_id_in_db is not None:
             self.log_print(f"[검증] DB 최신 메시지 ID: {latest_id_in_db}")
             if latest_id_in_db > last_id:
@@ -1477,6 +1799,7 @@ class KakaoPoller:
         self.log_print("\n[WebSocket 연결 시도...]")
         if not self.connect_websocket():
             self.log_print("[경고] WebSocket 연결 실패. 계속 진행하지만 메시지 전송이 실패할 수 있습니다.")
+        self.startup_timer.mark("WebSocket 연결")
         
         self.log_print("\n[폴링 시작] (Ctrl+C로 중지)")
         self.log_print("[참고] 같은 메시지는 한 번만 전송됩니다.\n")
@@ -1487,8 +1810,17 @@ class KakaoPoller:
         # 클라이언트 로그 전송 주기 (10초마다)
         self.last_log_send_time = time.time()
         
+        # DB 변경 감시 (WAL 파일은 없다가 생길 수 있으므로 디렉터리 단위로 감시)
+        self.db_watcher = DbWatcher([self.DB_PATH, self.DB_PATH + "-wal", self.DB_PATH2 + "-wal"], log=self.log_print)
+        
+        if self.snapshot is not None:
+            self.log_print(f"[DB 스냅샷] 사용: {self.snapshot.snapshot_path} (갱신 주기 {self.snapshot.interval:.0f}초, "
+                           f"단계당 {self.snapshot.pages}페이지)")
+            self.snapshot.start()
+        
         while True:
             try:
+                batch_failed = False  # 전송 실패가 있으면 체크포인트를 실패 지점 앞에서 멈추고 대기 후 재시도
                 messages = self.get_new_messages()
                 
                 current_time = time.time()
@@ -1510,28 +1842,17 @@ class KakaoPoller:
                 
                 if messages:
                     self.log_print(f"[poll_messages] ✅ {len(messages)}개 메시지 처리 시작")
-                    # 중요: DB의 실제 최신 ID를 확인하여 last_message_id를 업데이트
-                    # (조회된 배치의 최대 ID가 아닌 실제 DB 최신 ID 사용)
-                    db_latest_id = self.get_latest_message_id()
-                    current_last_id = self.load_last_message_id()
-                    queried_max_id = max(msg[0] for msg in messages)
-                    
-                    # DB 최신 ID가 있으면 그것을 사용, 없으면 조회된 최대 ID 사용
-                    target_id = db_latest_id if db_latest_id is not None else queried_max_id
-                    
-                    # target_id가 현재 last_id보다 크면 즉시 업데이트 (로그 최소화)
-                    if target_id > current_last_id:
-                        self.save_last_message_id(target_id)
-                        # 로그 제거: 새 메시지 발견 시에만 출력
+                    # 체크포인트는 배치 처리 후 전달 완료된 위치까지만 전진 (아래 참고)
+                    last_id = self.load_last_message_id()
+                    failed_ids = []
                     
                     # 실제로 새 메시지인지 확인 (중복 필터링)
                     new_messages = []
                     skipped_count_debug = 0
-                    for msg in messages:
-                        msg_id = msg[0]
+                    for record in messages:
                         # 이미 전송한 메시지는 제외
-                        if msg_id not in self.sent_message_ids:
-                            new_messages.append(msg)
+                        if record.msg_id not in self.sent_message_ids:
+                            new_messages.append(record)
                         else:
                             skipped_count_debug += 1
                     
@@ -1542,164 +1863,86 @@ class KakaoPoller:
                     elif skipped_count_debug > 0:
                         self.log_print(f"[{datetime.now().strftime('%H:%M:%S')}] ⚠️ 모든 메시지 이미 처리됨 (조회: {len(messages)}개, 스킵: {skipped_count_debug}개)")
                     elif len(messages) == 0:
-                        db_latest_id = self.get_latest_message_id()
-                        self.log_print(f"[{datetime.now().strftime('%H:%M:%S')}] 📭 새 메시지 없음 (DB 최신 ID: {db_latest_id}, 마지막 처리 ID: {last_id})")
+                        self.log_print(f"[{datetime.now().strftime('%H:%M:%S')}] 📭 새 메시지 없음 (DB 최신 ID: {self._latest_id_in_db}, 마지막 처리 ID: {last_id})")
                     
                     if new_messages:
+                        # 배치 단위 선복호화 (큰 백로그는 프로세스 풀로 분산)
+                        predecrypted_messages, predecrypted_attachments = self.predecrypt_batch(new_messages)
+                        # 배치 단위 발신자 이름 조회 (테이블당 IN (...) 조회 1회, 메시지별 조회 대체)
+                        sender_names = self.resolve_sender_names(record.user_id for record in new_messages)
                         
                         max_id = 0
                         sent_count = 0
                         skipped_count = 0
                         
-                        for msg in new_messages:
-                            # 필드 개수에 따라 동적으로 처리
-                            msg_id = msg[0]
-                            chat_id = msg[1]
-                            user_id = msg[2]
-                            message = msg[3]
-                            created_at = msg[4]
-                            
-                            # ⚠️ 중요: 인덱스를 먼저 계산 (isMine 체크에서 사용하기 위해)
-                            select_columns = self._select_columns_cache if self._select_columns_cache else ["_id", "chat_id", "user_id", "message", "created_at"]
-                            
-                            # 컬럼 이름으로 인덱스 찾기 함수 (먼저 정의)
-                            def get_column_index(col_name):
-                                try:
-                                    return select_columns.index(col_name)
-                                except ValueError:
-                                    return -1
-                            
-                            # 모든 인덱스를 먼저 계산
-                            type_idx = get_column_index("type")
-                            attachment_idx = get_column_index("attachment")
+                        for record in new_messages:
+                            # 컬럼은 이름으로 접근 (컬럼 인덱스는 ColumnMap에서 1회 계산, 없는 컬럼은 None)
+                            msg_id = record.msg_id
+                            chat_id = record.chat_id
+                            user_id = record.user_id
+                            message = record.message
+                            created_at = record.created_at
                             
                             # 선택적 필드 처리
-                            v_field = None
-                            kakao_user_id = None
-                            enc_type = 31  # 기본값
-                            is_mine = False  # 자신이 보낸 메시지 여부
-                            msg_type = None  # 메시지 타입
-                            attachment = None  # 첨부 정보
+                            v_field = record.v_raw
+                            msg_type = record.msg_type  # 메시지 타입
+                            attachment = record.attachment  # 첨부 정보
+                            referer = record.referer
+                            supplement = record.supplement
+                            enc_type = record.enc_type  # encType 컬럼 (없으면 기본값 31)
                             
-                            if len(msg) >= 6:
-                                v_field = msg[5]
-                                # v 필드를 JSON 파싱하여 enc 추출 및 isMine 확인
-                                if v_field:
-                                    try:
-                                        if isinstance(v_field, str):
-                                            v_json = json.loads(v_field)
-                                            if isinstance(v_json, dict):
-                                                # isMine 필드 확인 (자신이 보낸 메시지)
-                                                is_mine = v_json.get("isMine", False)
-                                                
-                                                # ⚠️ 중요: 이미지 메시지는 자신이 보낸 메시지여도 처리 (이미지 감지용)
-                                                # 먼저 type과 attachment 확인
-                                                msg_type_check = None
-                                                attachment_check = None
-                                                if type_idx >= 0 and len(msg) > type_idx:
-                                                    msg_type_check = msg[type_idx]
-                                                if attachment_idx >= 0 and len(msg) > attachment_idx:
-                                                    attachment_check = msg[attachment_idx]
-                                                
-                                                is_image_msg = (msg_type_check in [2, 27] or 
-                                                              (attachment_check and isinstance(attachment_check, str) and len(attachment_check) > 10))
-                                                
-                                                if is_mine:
-                                                    if is_image_msg:
-                                                        print(f"[필터링] ⚠️ 자신이 보낸 메시지지만 이미지 메시지로 판단되어 처리: ID={msg_id}, sender={user_id}, msg_type={msg_type_check}")
-                                                        # 이미지 메시지는 처리 계속
-                                                    else:
-                                                        self.log_print(f"[필터링] ⚠️ 자신이 보낸 메시지 스킵: ID={msg_id}, sender={user_id}")
-                                                        skipped_count += 1
-                                                        self.sent_message_ids.add(msg_id)  # 이미 처리된 것으로 표시
-                                                        continue  # 자신이 보낸 메시지는 서버로 전송하지 않음
-                                                else:
-                                                    print(f"[필터링] ✅ 타인이 보낸 메시지 (isMine=False): ID={msg_id}, sender={user_id}")
-                                                # enc 추출
-                                                if "enc" in v_json:
-                                                    enc_type = v_json["enc"]
-                                                    if enc_type is None:
-                                                        enc_type = 31  # 기본값
-                                    except (json.JSONDecodeError, TypeError, KeyError):
-                                        # JSON 파싱 실패 시 기본값 사용
-                                        pass
+                            # v 필드(레코드에서 1회 파싱)로 isMine 확인
+                            if record.v:
+                                is_mine = record.is_mine  # 자신이 보낸 메시지 여부
+                                
+                                # ⚠️ 중요: 이미지 메시지는 자신이 보낸 메시지여도 처리 (이미지 감지용)
+                                is_image_msg = (msg_type in [2, 27] or 
+                                              (attachment and isinstance(attachment, str) and len(attachment) > 10))
+                                
+                                if is_mine:
+                                    if is_image_msg:
+                                        print(f"[필터링] ⚠️ 자신이 보낸 메시지지만 이미지 메시지로 판단되어 처리: ID={msg_id}, sender={user_id}, msg_type={msg_type}")
+                                        # 이미지 메시지는 처리 계속
+                                    else:
+                                        self.log_print(f"[필터링] ⚠️ 자신이 보낸 메시지 스킵: ID={msg_id}, sender={user_id}")
+                                        skipped_count += 1
+                                        self.sent_message_ids.add(msg_id)  # 이미 처리된 것으로 표시
+                                        continue  # 자신이 보낸 메시지는 서버로 전송하지 않음
+                                else:
+                                    print(f"[필터링] ✅ 타인이 보낸 메시지 (isMine=False): ID={msg_id}, sender={user_id}")
                             
                             # v 필드에서 origin 추출 (메시지 삭제 감지용)
-                            origin = None
-                            if v_field:
-                                try:
-                                    if isinstance(v_field, str):
-                                        v_json = json.loads(v_field)
-                                        if isinstance(v_json, dict):
-                                            origin = v_json.get("origin")
-                                    elif isinstance(v_field, dict):
-                                        origin = v_field.get("origin")
-                                except (json.JSONDecodeError, TypeError, KeyError):
-                                    pass
+                            origin = record.origin
                             
-                            if len(msg) >= 7:
-                                kakao_user_id_raw = msg[6]
-                                # userId=1 같은 잘못된 값 필터링 (1000보다 큰 값만 유효)
-                                if kakao_user_id_raw and (isinstance(kakao_user_id_raw, (int, str)) and 
-                                    (isinstance(kakao_user_id_raw, int) and kakao_user_id_raw > 1000) or
-                                    (isinstance(kakao_user_id_raw, str) and kakao_user_id_raw.isdigit() and int(kakao_user_id_raw) > 1000)):
-                                    kakao_user_id = kakao_user_id_raw
-                                else:
-                                    kakao_user_id = None
-                                    if kakao_user_id_raw:
-                                        print(f"[경고] 잘못된 kakao_user_id 값 무시: {kakao_user_id_raw} (ID={msg_id})")
-                            # ⚠️ 중요: 나머지 인덱스 계산 (이미 type_idx, attachment_idx는 위에서 계산됨)
-                            enc_type_idx = get_column_index("encType")
-                            referer_idx = get_column_index("referer")
-                            supplement_idx = get_column_index("supplement")
+                            kakao_user_id = None
+                            kakao_user_id_raw = record.kakao_user_id_raw
+                            # userId=1 같은 잘못된 값 필터링 (1000보다 큰 값만 유효)
+                            if kakao_user_id_raw and (isinstance(kakao_user_id_raw, (int, str)) and 
+                                (isinstance(kakao_user_id_raw, int) and kakao_user_id_raw > 1000) or
+                                (isinstance(kakao_user_id_raw, str) and kakao_user_id_raw.isdigit() and int(kakao_user_id_raw) > 1000)):
+                                kakao_user_id = kakao_user_id_raw
+                            elif kakao_user_id_raw:
+                                print(f"[경고] 잘못된 kakao_user_id 값 무시: {kakao_user_id_raw} (ID={msg_id})")
                             
                             # 디버그: 첫 메시지만 상세 로그 출력 (무한 로그 방지)
+                            column_map = self._column_map
                             if not hasattr(self, '_first_msg_logged'):
-                                print(f"[필드 인덱스] msg 길이={len(msg)}, select_columns={select_columns}")
-                                print(f"[필드 인덱스] 인덱스 매핑: type_idx={type_idx}, attachment_idx={attachment_idx}, enc_type_idx={enc_type_idx}")
+                                print(f"[필드 인덱스] msg 길이={len(record.row)}, select_columns={column_map.columns}")
                                 print(f"[필드 인덱스] 사용 가능한 필드:")
-                                for i, val in enumerate(msg):
-                                    if i < len(select_columns):
-                                        col_name = select_columns[i] if i < len(select_columns) else f"unknown[{i}]"
-                                        val_str = str(val)[:50] if val else 'None'
-                                        print(f"  [{i}] {col_name}={val_str}")
+                                for i, (col_name, val) in enumerate(zip(column_map.columns, record.row)):
+                                    val_str = str(val)[:50] if val else 'None'
+                                    print(f"  [{i}] {col_name}={val_str}")
                                 self._first_msg_logged = True
                             
-                            # encType 인덱스
-                            if enc_type_idx >= 0 and len(msg) > enc_type_idx:
-                                db_enc_type = msg[enc_type_idx]
-                                if db_enc_type is not None:
-                                    enc_type = db_enc_type
-                                else:
-                                    enc_type = 31  # 기본값
-                            else:
-                                enc_type = 31  # 기본값
-                            
-                            # type 인덱스
-                            if type_idx >= 0 and len(msg) > type_idx:
-                                msg_type = msg[type_idx]
-                                print(f"[필드 인덱스] ✅ type 컬럼 발견: 인덱스={type_idx}, 값={msg_type}")
+                            if "type" in column_map:
+                                print(f"[필드 인덱스] ✅ type 컬럼 발견: 인덱스={column_map.index['type']}, 값={msg_type}")
                             else:
-                                msg_type = None
-                                print(f"[필드 인덱스] ⚠️⚠️⚠️ type 컬럼이 쿼리에 포함되지 않음! select_columns={select_columns}, type_idx={type_idx}")
+                                print(f"[필드 인덱스] ⚠️⚠️⚠️ type 컬럼이 쿼리에 포함되지 않음! select_columns={column_map.columns}")
                             
-                            # attachment 인덱스
-                            if attachment_idx >= 0 and len(msg) > attachment_idx:
-                                attachment = msg[attachment_idx]
-                                print(f"[필드 인덱스] ✅ attachment 컬럼 발견: 인덱스={attachment_idx}, 값 존재={bool(attachment)}")
+                            if "attachment" in column_map:
+                                print(f"[필드 인덱스] ✅ attachment 컬럼 발견: 인덱스={column_map.index['attachment']}, 값 존재={bool(attachment)}")
                             else:
-                                attachment = None
-                                print(f"[필드 인덱스] ⚠️⚠️⚠️ attachment 컬럼이 쿼리에 포함되지 않음! select_columns={select_columns}, attachment_idx={attachment_idx}")
-                            
-                            # referer 인덱스
-                            referer = None
-                            if referer_idx >= 0 and len(msg) > referer_idx:
-                                referer = msg[referer_idx]
-                            
-                            # supplement 인덱스
-                            supplement = None
-                            if supplement_idx >= 0 and len(msg) > supplement_idx:
-                                supplement = msg[supplement_idx]
+                                print(f"[필드 인덱스] ⚠️⚠️⚠️ attachment 컬럼이 쿼리에 포함되지 않음! select_columns={column_map.columns}")
                             
                             # Phase 2: attachment 복호화 (whitelist 기반)
                             attachment_decrypted = None
@@ -1713,27 +1956,28 @@ class KakaoPoller:
                             if is_image_type_for_decrypt:
                                 print(f"[attachment 복호화] 🔍 이미지 메시지 감지: msg_id={msg_id}, msg_type={msg_type_str_for_decrypt}, ATTACHMENT_DECRYPT_AVAILABLE={self.ATTACHMENT_DECRYPT_AVAILABLE}, decrypt_attachment={bool(self.decrypt_attachment)}, MY_USER_ID={bool(self.MY_USER_ID)}, enc_type={enc_type}")
                             
-                            if self.ATTACHMENT_DECRYPT_AVAILABLE and self.decrypt_attachment:
+                            if self.ATTACHMENT_DECRYPT_AVAILABLE and self.decrypt_attachment_view:
                                 is_in_whitelist = msg_type_str_for_decrypt in self.ATTACHMENT_DECRYPT_WHITELIST or msg_type in self.ATTACHMENT_DECRYPT_WHITELIST
                                 
                                 if is_in_whitelist or is_image_type_for_decrypt:
                                     if is_image_type_for_decrypt:
                                         print(f"[attachment 복호화] ⚠️ 이미지 메시지 복호화 시도: msg_id={msg_id}, msg_type={msg_type_str_for_decrypt}, attachment 존재={bool(attachment)}, attachment 길이={len(str(attachment)) if attachment else 0}, MY_USER_ID={self.MY_USER_ID}, enc_type={enc_type}")
                                     
-                                    attachment_decrypted = self.decrypt_attachment(
-                                        attachment,
-                                        enc_type,
-                                        self.MY_USER_ID,
-                                        msg_type_str_for_decrypt,
-                                        msg_id,
-                                        debug=True
-                                    )
+                                    if msg_id in predecrypted_attachments:
+                                        attachment_decrypted = predecrypted_attachments[msg_id]
+                                    else:
+                                        attachment_decrypted = self.decrypt_attachment_view(
+                                            attachment,
+                                            enc_type,
+                                            self.MY_USER_ID,
+                                            msg_type_str_for_decrypt,
+                                            msg_id,
+                                            debug=True
+                                        )
                                     
                                     if is_image_type_for_decrypt:
                                         if attachment_decrypted:
-                                            print(f"[attachment 복호화] ✅ 이미지 메시지 복호화 성공: msg_id={msg_id}, 타입={type(attachment_decrypted)}")
-                                            if isinstance(attachment_decrypted, dict):
-                                                print(f"[attachment 복호화] 복호화된 키: {list(attachment_decrypted.keys())[:20]}")
+                                            print(f"[attachment 복호화] ✅ 이미지 메시지 복호화 성공: msg_id={msg_id}, JSON 길이={len(attachment_decrypted)}")
                                         else:
                                             print(f"[attachment 복호화] ❌ 이미지 메시지 복호화 실패: msg_id={msg_id}, attachment 길이={len(str(attachment)) if attachment else 0}, enc_type={enc_type}, MY_USER_ID={self.MY_USER_ID}")
                                 else:
@@ -1758,49 +2002,30 @@ class KakaoPoller:
                             
                             # 2순위: 복호화된 attachment에서 src_message 확인 (type 26 답장 메시지)
                             if not reply_to_message_id and attachment_decrypted:
-                                if isinstance(attachment_decrypted, dict):
-                                    # src_message 또는 logId 확인
+                                # 관련 키가 텍스트에 있을 때만 파싱 (대부분의 attachment는 파싱 없이 통과)
+                                if attachment_decrypted.may_contain('"src_message"', '"logId"', '"src_logId"'):
                                     src_message_id = attachment_decrypted.get("src_message") or attachment_decrypted.get("logId") or attachment_decrypted.get("src_logId")
                                     if src_message_id:
                                         try:
                                             reply_to_message_id = int(src_message_id) if src_message_id else None
                                             if reply_to_message_id:
-                                                print(f"[답장 ID] 복호화된 attachment에서 추출: {reply_to_message_id}, keys={list(attachment_decrypted.keys())[:10]}")
+                                                print(f"[답장 ID] 복호화된 attachment에서 추출: {reply_to_message_id}")
                                         except (ValueError, TypeError):
                                             pass
-                                elif isinstance(attachment_decrypted, str):
-                                    # 복호화된 attachment가 문자열인 경우 파싱 시도
-                                    try:
-                                        attachment_json = json.loads(attachment_decrypted)
-                                        if isinstance(attachment_json, dict):
-                                            src_message_id = attachment_json.get("src_message") or attachment_json.get("logId") or attachment_json.get("src_logId")
-                                            if src_message_id:
-                                                try:
-                                                    reply_to_message_id = int(src_message_id) if src_message_id else None
-                                                    if reply_to_message_id:
-                                                        print(f"[답장 ID] 복호화된 attachment(문자열)에서 추출: {reply_to_message_id}")
-                                                except (ValueError, TypeError):
-                                                    pass
-                                    except (json.JSONDecodeError, TypeError, KeyError):
-                                        pass
                             
                             # 3순위: fallback - 복호화되지 않은 attachment에서 확인 (기존 방식)
                             if not reply_to_message_id and attachment and not attachment_decrypted:
-                                try:
-                                    if isinstance(attachment, str):
-                                        attachment_json = json.loads(attachment)
-                                        if isinstance(attachment_json, dict):
-                                            # src_message 또는 logId 확인
-                                            src_message_id = attachment_json.get("src_message") or attachment_json.get("logId") or attachment_json.get("src_logId")
-                                            if src_message_id:
-                                                try:
-                                                    reply_to_message_id = int(src_message_id) if src_message_id else None
-                                                    if reply_to_message_id:
-                                                        print(f"[답장 ID] 원본 attachment에서 추출: {reply_to_message_id}")
-                                                except (ValueError, TypeError):
-                                                    pass
-                                except (json.JSONDecodeError, TypeError, KeyError):
-                                    pass
+                                attachment_json = record.attachment_json  # 평문 JSON이면 1회 파싱 후 재사용
+                                if attachment_json is not None:
+                                    # src_message 또는 logId 확인
+                                    src_message_id = attachment_json.get("src_message") or attachment_json.get("logId") or attachment_json.get("src_logId")
+                                    if src_message_id:
+                                        try:
+                                            reply_to_message_id = int(src_message_id) if src_message_id else None
+                                            if reply_to_message_id:
+                                                print(f"[답장 ID] 원본 attachment에서 추출: {reply_to_message_id}")
+                                        except (ValueError, TypeError):
+                                            pass
                             
                             max_id = max(max_id, msg_id)
                             
@@ -1870,106 +2095,14 @@ class KakaoPoller:
                             has_image = False
                             image_url = None
                             
-                            # 이미지 확장자 목록
-                            IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.svg']
-                            IMAGE_URL_PATTERNS = ['http://', 'https://', 'file://', 'content://']
-                            
-                            def is_image_url(value):
-                                """값이 이미지 URL인지 확인 (확장자 또는 URL 패턴 기반)
-                                참고: 카카오톡 알림에서 사용하는 URI 패턴 (content://, file:// 등)
-                                """
-                                if not isinstance(value, str) or len(value) < 5:
-                                    return False
-                                value_lower = value.lower()
-                                
-                                # URL 패턴 확인 (제공된 코드 참고: content://, file:// 등)
-                                if any(pattern in value_lower for pattern in IMAGE_URL_PATTERNS):
-                                    # 확장자 확인
-                                    if any(ext in value_lower for ext in IMAGE_EXTENSIONS):
-                                        return True
-                                    # URL 패턴이 있으면 이미지로 간주 (확장자가 없어도)
-                                    if 'http' in value_lower:
-                                        return True
-                                    # content:// 또는 file:// 패턴도 이미지로 간주 (카카오톡 알림에서 사용)
-                                    if 'content://' in value_lower or 'file://' in value_lower:
-                                        return True
-                                
-                                # 확장자만 있는 경우 (상대 경로)
-                                if any(value_lower.endswith(ext) for ext in IMAGE_EXTENSIONS):
-                                    return True
-                                
-                                return False
-                            
-                            def find_image_url_in_dict(data_dict, depth=0, max_depth=5):
-                                """딕셔너리에서 이미지 URL 재귀적으로 찾기
-                                참고: 카카오톡 알림에서 사용하는 키 이름 (uri, imageUri, contentUri 등)
-                                """
-                                if depth > max_depth:
-                                    return None
-                                
-                                if not isinstance(data_dict, dict):
-                                    return None
-                                
-                                # 우선순위 1: Iris Rhino 기준 이미지 URL 키 (제공된 문서 참고)
-                                # type=2: attachment.url
-                                # type=27: attachment.imageUrls (배열)
-                                priority_keys = [
-                                    'url',  # ⚠️ 최우선: type=2일 때 원본 이미지 URL
-                                    'imageUrls',  # ⚠️ 최우선: type=27일 때 원본 이미지 URL 배열
-                                    'thumbnailUrl', 'thumbnailUrls',  # 썸네일 URL
-                                    'uri', 'imageUri', 'contentUri', 'image_uri', 'content_uri',  # 알림에서 사용
-                                    'path', 'path_1',  # 일반적인 이미지 키
-                                    'xl', 'l', 'm', 's',  # 썸네일 크기별 키
-                                    'imageUrl', 'image_url', 'photoUrl', 'photo_url',  # 이미지 URL 키
-                                    'filePath', 'file_path', 'localPath', 'local_path',  # 로컬 파일 경로
-                                    'originalUrl', 'original_url', 'fullUrl', 'full_url'  # 원본 이미지 URL
-                                ]
-                                
-                                for key in priority_keys:
-                                    value = data_dict.get(key)
-                                    if value:
-                                        # ⚠️ 중요: imageUrls는 배열이므로 첫 번째 요소 반환 (Iris Rhino 문서 참고)
-                                        if key == 'imageUrls' and isinstance(value, list) and len(value) > 0:
-                                            # type=27 (묶어보내기): 첫 번째 이미지 URL 반환
-                                            first_url = value[0]
-                                            if isinstance(first_url, str) and is_image_url(first_url):
-                                                print(f"[이미지 URI 발견] 키='{key}' (배열 첫 번째), URI={first_url[:80]}...")
-                                                return first_url
-                                        else:
-                                            # 문자열로 변환하여 확인
-                                            value_str = str(value)
-                                            if is_image_url(value_str):
-                                                print(f"[이미지 URI 발견] 키='{key}', URI={value_str[:80]}...")
-                                                return value_str
-                                
-                                # 우선순위 2: 모든 키-값 쌍 확인 (더 깊이 탐색)
-                                for key, value in data_dict.items():
-                                    if isinstance(value, str):
-                                        # 문자열 값이 이미지 URL인지 확인
-                                        if is_image_url(value):
-                                            print(f"[이미지 URI 발견] 키='{key}', URI={value[:80]}...")
-                                            return value
-                                    elif isinstance(value, dict):
-                                        # 재귀적으로 딕셔너리 내부 확인 (깊이 증가)
-                                        found = find_image_url_in_dict(value, depth + 1, max_depth)
-                                        if found:
-                                            return found
-                                    elif isinstance(value, list):
-                                        # 리스트 내부 확인
-                                        for item in value:
-                                            if isinstance(item, dict):
-                                                found = find_image_url_in_dict(item, depth + 1, max_depth)
-                                                if found:
-                                                    return found
-                                            elif isinstance(item, str) and is_image_url(item):
-                                                print(f"[이미지 URI 발견] 리스트 항목, URI={item[:80]}...")
-                                                return item
-                                
-                                return None
+                            # 이미지 URL 탐색: chat_log_record.is_image_url / find_image_url_in_dict
                             
                             # attachment가 있으면 항상 이미지 URL 추출 시도 (msg_type과 무관)
                             # 참고: 제공된 코드에서 onNotificationPosted에서 uri를 추출하는 방식과 유사하게 처리
                             attachment_to_check = attachment_decrypted if attachment_decrypted else attachment
+                            if isinstance(attachment_to_check, AttachmentView):
+                                # URL/이미지 확장자 흔적이 있을 때만 파싱 (없으면 이미지 URL 추출 대상 아님)
+                                attachment_to_check = attachment_to_check.as_dict() if attachment_to_check.may_contain_url() else None
                             if attachment_to_check:
                                 print(f"[이미지 체크] attachment 확인: msg_id={msg_id}, attachment 존재={True}, 타입={type(attachment_to_check)}, attachment_decrypted={bool(attachment_decrypted)}, attachment={bool(attachment)}")
                                 
@@ -2005,18 +2138,18 @@ class KakaoPoller:
                                         has_image = True
                                         print(f"[이미지 감지] ✅ 감지 (직접 URI 문자열): url={image_url[:80]}..., msg_id={msg_id}, msg_type={msg_type_str}")
                                     else:
-                                        try:
-                                            attach_json = json.loads(attachment_to_check)
-                                            if isinstance(attach_json, dict):
-                                                print(f"[이미지 체크] 파싱된 attachment dict keys: {list(attach_json.keys())[:20]}")
-                                                image_url = find_image_url_in_dict(attach_json)
-                                                if image_url:
-                                                    has_image = True
-                                                    print(f"[이미지 감지] ✅ 감지 (문자열 파싱, URI 패턴): url={image_url[:80] if image_url else None}..., msg_id={msg_id}, msg_type={msg_type_str}")
-                                                else:
-                                                    print(f"[이미지 체크] ⚠️ 이미지 URL 없음 (문자열 파싱): keys={list(attach_json.keys())[:20]}")
-                                        except (json.JSONDecodeError, TypeError) as e:
-                                            print(f"[이미지 체크] attachment 문자열 파싱 실패: {e}, 샘플: {attachment_to_check[:200]}...")
+                                        # 문자열은 복호화되지 않은 원본 attachment -> 레코드의 파싱 결과 재사용
+                                        attach_json = record.attachment_json
+                                        if attach_json is not None:
+                                            print(f"[이미지 체크] 파싱된 attachment dict keys: {list(attach_json.keys())[:20]}")
+                                            image_url = find_image_url_in_dict(attach_json)
+                                            if image_url:
+                                                has_image = True
+                                                print(f"[이미지 감지] ✅ 감지 (문자열 파싱, URI 패턴): url={image_url[:80] if image_url else None}..., msg_id={msg_id}, msg_type={msg_type_str}")
+                                            else:
+                                                print(f"[이미지 체크] ⚠️ 이미지 URL 없음 (문자열 파싱): keys={list(attach_json.keys())[:20]}")
+                                        else:
+                                            print(f"[이미지 체크] attachment 문자열 파싱 실패 (JSON 객체 아님), 샘플: {attachment_to_check[:200]}...")
                             else:
                                 print(f"[이미지 체크] attachment 없음: msg_id={msg_id}, attachment_decrypted={bool(attachment_decrypted)}, attachment={bool(attachment)}")
                                 # ⚠️ 중요: attachment가 없어도 msg_type이 2 또는 27이면 이미지 메시지로 처리
@@ -2073,18 +2206,14 @@ class KakaoPoller:
                                                 has_image = True
                                                 print(f"[이미지 강제 감지] ✅ attachment 문자열 자체가 URI: url={image_url[:80]}...")
                                             else:
-                                                # JSON 파싱 재시도
-                                                try:
-                                                    attach_json = json.loads(attachment_to_check)
-                                                    if isinstance(attach_json, dict):
-                                                        found_url = find_image_url_in_dict(attach_json)
-                                                        if found_url:
-                                                            image_url = found_url
-                                                            has_image = True
-                                                            print(f"[이미지 강제 감지] ✅ msg_type={msg_type_str}에서 url 발견 (문자열 파싱, 확장자 필터링): url={found_url[:80]}...")
-                                                except:
-                                                    # JSON 파싱 실패는 이미 위에서 처리됨
-                                                    pass
+                                                # 레코드의 attachment 파싱 결과 재사용 (JSON 파싱 실패는 이미 위에서 처리됨)
+                                                attach_json = record.attachment_json
+                                                if attach_json is not None:
+                                                    found_url = find_image_url_in_dict(attach_json)
+                                                    if found_url:
+                                                        image_url = found_url
+                                                        has_image = True
+                                                        print(f"[이미지 강제 감지] ✅ msg_type={msg_type_str}에서 url 발견 (문자열 파싱, 확장자 필터링): url={found_url[:80]}...")
                                 
                                 # 이미지 타입 확인 로그
                                 print(f"[이미지 최종] msg_id={msg_id}, msg_type={msg_type_str}, has_image={has_image}, image_url={image_url[:80] if image_url else 'None'}...")
@@ -2110,8 +2239,8 @@ class KakaoPoller:
                                 "reply_to_message_id": reply_to_message_id,  # 답장 메시지 ID (referer 또는 attachment.src_message)
                                 "origin": origin,  # 메시지 출처 (MSG, SYNCMSG, SYNCDLMSG 등) - 삭제 감지용
                                 "msg_type": msg_type,  # 메시지 타입 (Feed 감지용)
-                                "attachment": json.dumps(attachment_decrypted) if attachment_decrypted else attachment,  # Phase 2: 복호화된 attachment 우선
-                                "attachment_decrypted": attachment_decrypted,  # Phase 2: dict 형태 (서버에서 사용)
+                                "attachment": attachment_decrypted.text if attachment_decrypted else attachment,  # Phase 2: 복호화된 attachment 우선 (JSON 텍스트 그대로)
+                                "attachment_decrypted": attachment_decrypted,  # Phase 2: AttachmentView (dumps_payload가 JSON 객체로 삽입, 서버에서 사용)
                                 "has_image": has_image,  # Phase 2: 이미지 여부
                                 "image_url": image_url,  # Phase 2: 이미지 URL
                                 "enc_type": enc_type,  # ⚠️ 중요: 서버에서 복호화 시도용
@@ -2132,33 +2261,82 @@ class KakaoPoller:
                             
                             # 서버로 전송
                             self.log_print(f"[전송 시도] msg_id={msg_id}, message 길이={len(str(message)) if message else 0}")
-                            send_result = self.send_to_server(message_data)
+                            send_result = self.send_to_server(message_data, predecrypted_message=predecrypted_messages.get(msg_id), record=record, sender_names=sender_names)
                             self.log_print(f"[전송 결과] msg_id={msg_id}, 결과={send_result}")
                             if send_result:
                                 sent_count += 1
-                                # 전송 성공한 메시지는 sent_message_ids에 추가 (이미 추가되어 있지만 확실히)
+                                # 전송 성공한 메시지는 sent_message_ids에 추가 (체크포인트가 멈춰도 다시 보내지 않음)
                                 self.sent_message_ids.add(msg_id)
+                                self.send_retries.succeeded(msg_id)
                                 self.log_print(f"[✅] 메시지 전송 성공: ID={msg_id}")
-                            else:
+                            elif self.send_retries.failed(msg_id, counted=self.ws_connection is not None):
                                 # 전송 실패한 메시지는 sent_message_ids에서 제거하여 재시도 가능하게 함
+                                # (연결이 끊겨 실패한 경우는 재시도 횟수에 넣지 않음)
                                 self.sent_message_ids.discard(msg_id)
+                                failed_ids.append(msg_id)
                                 self.log_print(f"[❌] 메시지 전송 실패: ID={msg_id}, chat_id={chat_id}")
+                            else:
+                                # 재시도 상한 초과: 포기하고 다시 조회되어도 건너뜀 (체크포인트가 지나감)
+                                self.sent_message_ids.add(msg_id)
+                                skipped_count += 1
+                    
+                    # 체크포인트 전진: 조회한 행 중 전달(또는 의도적 스킵) 완료된 연속 구간의 끝까지
+                    # (실패가 있으면 첫 실패 직전까지만 -> 다음 조회에서 실패 메시지부터 다시 처리, 성공분은 sent_message_ids로 스킵)
+                    done_upto = self._last_fetch_max_id
+                    if failed_ids:
+                        batch_failed = True
+                        done_upto = min(failed_ids) - 1
+                    self.save_last_message_id(done_upto, count=len(messages))
                     
                     # 메시지 전송 완료 로그
-                    # 참고: last_message_id는 이미 위(565-572줄)에서 조회된 메시지의 최대 ID로 업데이트됨
                     if sent_count > 0:
                         log_msg = f"[완료] {sent_count}개 메시지 전송 완료"
                         if skipped_count > 0:
                             log_msg += f", {skipped_count}개 스킵"
                         print(log_msg)
-                else:
-                    # 메시지 없음 (로그 출력 안 함)
-                    pass
+                elif self._last_fetch_max_id is not None:
+                    # 조회된 행이 모두 이미 처리됨 (예: 처리 도중 오류 후 재조회): 체크포인트만 전진
+                    self.save_last_message_id(self._last_fetch_max_id, count=0)
+                
+                if not self.startup_timer.reported:
+                    self.startup_timer.mark("첫 폴링 완료" + (f" (메시지 {len(messages)}개 처리)" if messages else ""))
+                    if self.STARTUP_TIMING:
+                        self.startup_timer.report(self.log_print)
+                    else:
+                        self.startup_timer.reported = True
                 
-                # 폴링 간격 증가 (1초로 변경하여 로그 최소화)
-                time.sleep(1.0)
+                # 다음 폴링까지 대기: 조회 상한만큼 가져왔으면(캐치업 포함) 남은 메시지가 있으므로 바로 다시 조회,
+                # 아니면 DB/WAL 변경 또는 다음 주기 작업(반응 확인, 로그 전송) 시각까지 대기
+                if self._last_fetch_full and not batch_failed:
+                    continue
+                self.checkpoint.commit_if_due()
+                now = time.time()
+                next_periodic = min(last_reaction_check + self.REACTION_CHECK_INTERVAL,
+                                    self.last_log_send_time + self.CLIENT_LOG_SEND_INTERVAL)
+                wait_timeout = min(self.DB_WATCH_FALLBACK, next_periodic - now)
+                if self.checkpoint.dirty:
+                    # 커밋 대기 중인 체크포인트는 CHECKPOINT_COMMIT_INTERVAL_MS 안에 저장
+                    wait_timeout = min(wait_timeout, self.checkpoint.commit_interval)
+                self.db_watcher.wait(timeout=max(0.0, wait_timeout))
             except KeyboardInterrupt:
                 print("\n\n[폴링 중지]")
+                if self.member_directory is not None:
+                    self.log_print(f"[멤버 디렉터리] {self.member_directory.stats()}")
+                if self.room_cache is not None:
+                    self.log_print(f"[채팅방 캐시] {self.room_cache.stats()}")
+                if self.change_guard is not None:
+                    self.log_print(f"[변경 감지] 작업별 실행/건너뜀: {self.change_guard.stats()}")
+                    self.change_guard.close()
+                if self.reaction_window is not None:
+                    self.log_print(f"[반응 폴링] _id 하한 탐색: {self.reaction_window.stats()}")
+                self.log_print(f"[반응 폴링] 카운트 추출: {self.reaction_counts.stats()}")
+                self.db_watcher.close()
+                if self.snapshot is not None:
+                    self.snapshot.stop()
+                if self.send_retries.given_up_count:
+                    self.log_print(f"[전송 포기] {self.send_retries.stats()}")
+                self.checkpoint.close()
+                self.db.close()
                 break
             except Exception as e:
                 print(f"\n[폴링 오류] {e}")
@@ -2166,10 +2344,37 @@ class KakaoPoller:
                 traceback.print_exc()
                 time.sleep(1)
 
+    def start_background_task(self, target, *args, name=None):
+        """
+        한 번만 실행되는 백그라운드 작업 시작
+        
+        작업이 끝나면 그 스레드의 DB 연결을 닫습니다. (스레드별 연결이 종료까지 mmap을 잡고 남지 않도록)
+        """
+        def run():
+            try:
+                target(*args)
+            finally:
+                self.db.release_thread()
+        
+        thread = threading.Thread(target=run, name=name, daemon=True)
+        thread.start()
+        return thread
+
+    def run_startup_diagnostics(self, full_dump):
+        """시작 진단 (백그라운드): AES 백엔드 선택, 연결 통계, 스키마가 바뀐 경우에만 전체 구조 출력"""
+        try:
+            if aes_backend is not None:
+                aes_backend.get_backend()
+            self.log_print(f"[DB 연결] {self.db.stats()}")
+            if full_dump and not self.check_db_structure():
+                self.log_print("\n[경고] DB 구조 확인 실패. 계속 진행합니다...")
+        except Exception as e:
+            self.log_print(f"[시작 진단] 오류: {e}")
+
     def check_db_structure(self):
         """카카오톡 DB 구조 확인"""
         try:
-            conn = sqlite3.connect(self.DB_PATH)
+            conn = self.db.connect()
             cursor = conn.cursor()
             
             # 테이블 목록 조회
@@ -2224,6 +2429,67 @@ class KakaoPoller:
         if expired_keys or remove_count > 0:
             print(f"[반응 캐시] 정리: TTL={len(expired_keys)}개, LRU={remove_count}개")
 
+    def _guard_check(self, name):
+        """캐시 갱신용 변경 감지 함수 (가드가 없으면 None = 항상 data_version 확인)"""
+        if self.change_guard is None:
+            return None
+        return lambda: self.change_guard.should_run(name)
+
+    def _reaction_low_id(self, cursor, timestamp):
+        """created_at >= timestamp(여유 포함)인 첫 행의 _id (비활성/실패 시 0 = 전체 범위)"""
+        if self.reaction_window is None:
+            return 0
+        try:
+            return self.reaction_window.lower_bound(cursor, timestamp)
+        except sqlite3.Error as e:
+            self.log_print(f"[반응 폴링] _id 하한 탐색 실패, 전체 범위 사용: {e}")
+            return 0
+
+    def _reaction_id_range(self, cursor, window, start, end):
+        """created_at [start, end) 구간을 덮는 _id [하한, 상한) (비활성/실패 시 전체 범위)"""
+        if window is None:
+            return 0, MAX_ROWID
+        try:
+            low_id = window.lower_bound(cursor, start)
+            high_id = window.lower_bound(cursor, end, slack=-window.slack)
+            return low_id, high_id
+        except sqlite3.Error as e:
+            self.log_print(f"[반응 백필] _id 범위 탐색 실패, 전체 범위 사용: {e}")
+            return 0, MAX_ROWID
+
+    def _reset_vanished_reactions(self, rows, time_threshold, current_timestamp):
+        """지난 주기에 카운트 > 0이던 창 안의 메시지가 이번 조회에 없으면 캐시 카운트를 0으로
+        
+        카운트 0인 행은 더 이상 조회되지 않으므로, 기존처럼 반응이 모두 취소된 뒤 다시 붙으면 이벤트가 나가도록 함.
+        LIMIT에 걸려 잘렸으면 가장 오래된 반환 행 이후만 판단.
+        """
+        seen = {(chat_id, msg_id): created_at for msg_id, chat_id, created_at, _ in rows}
+        if self.reaction_counts.last_row_count < self.REACTION_QUERY_LIMIT:
+            covered_from = time_threshold
+        else:
+            covered_from = rows[-1][2] if rows else None
+        for cache_key, created_at in list(self._reaction_positive.items()):
+            if cache_key in seen:
+                continue
+            if created_at is None or created_at <= time_threshold:
+                del self._reaction_positive[cache_key]  # 창을 벗어남 (기존에도 더 이상 갱신하지 않음)
+            elif covered_from is not None and created_at >= covered_from:
+                del self._reaction_positive[cache_key]
+                self._reaction_count_cache[cache_key] = {'count': 0, 'last_seen': current_timestamp}
+        self._reaction_positive.update(seen)
+
+    def scan_source(self):
+        """스캔이 스냅샷을 읽으면 스냅샷 갱신 횟수 (변경 감지 토큰에 포함), 원본이면 None"""
+        if self.snapshot is not None and self.snapshot.ready:
+            return self.snapshot.refreshes
+        return None
+
+    def scan_db(self):
+        """무거운 스캔용 연결 관리자 (스냅샷이 준비되었으면 복사본, 아니면 원본 DB)"""
+        if self.snapshot is not None and self.snapshot.ready:
+            return self.snapshot.db
+        return self.db
+
     def poll_reaction_updates(self):
         """반응 카운트 업데이트 전용 폴링 함수 (경량 버전)
         
@@ -2234,61 +2500,44 @@ class KakaoPoller:
             # 캐시 정리
             self.cleanup_reaction_count_cache()
             
+            # 마지막 스캔 이후 DB 변경이 없으면 같은 결과이므로 건너뜀
+            if self.change_guard is not None and not self.change_guard.should_run("reaction_scan", source=self.scan_source()):
+                return 0
+            
             # DB 연결
-            conn = sqlite3.connect(self.DB_PATH)
+            conn = self.scan_db().connect()
             cursor = conn.cursor()
             
             # 최근 윈도우 이내 메시지 조회 (최적화된 쿼리)
             current_time = int(time.time())
             time_threshold = current_time - self.REACTION_TIME_RANGE
             
-            query = """
-                SELECT id, chat_id, v, created_at
-                FROM chat_logs
-                WHERE v IS NOT NULL
-                  AND v != ''
-                  AND created_at > ?
-                ORDER BY created_at DESC
-                LIMIT ?
-            """
-            
-            cursor.execute(query, (time_threshold, self.REACTION_QUERY_LIMIT))
-            rows = cursor.fetchall()
+            # created_at에는 인덱스가 없으므로 _id 하한부터 기본 키 역순으로 읽음 (정렬 없음)
+            params = (self._reaction_low_id(cursor, time_threshold), time_threshold, self.REACTION_QUERY_LIMIT)
+            # 카운트는 SQL에서 추출, 카운트 > 0인 행만 반환
+            rows = self.reaction_counts.query(cursor, RECENT_WINDOW_WHERE, params)
+            if not self._reaction_plan_logged:
+                self._reaction_plan_logged = True
+                plan = query_plan(cursor, reaction_count_sql(RECENT_WINDOW_WHERE, self.reaction_counts.json1), params)
+                self.log_print(f"[반응 폴링] 쿼리 계획: {' / '.join(plan)}")
             conn.close()
             
-            if not rows:
-                return 0
-            
             update_count = 0
             scanned_count = 0
             changed_count = 0
-            parse_fail_count = 0
+            parse_fail_count = self.reaction_counts.last_parse_failed
+            throttled_count = 0
             current_timestamp = time.time()
             
-            for row in rows:
-                msg_id, chat_id, v_field, created_at = row
+            # 이번 창에서 카운트가 0이 된(조회되지 않은) 메시지는 캐시를 0으로 (다시 반응이 붙으면 이벤트)
+            self._reset_vanished_reactions(rows, time_threshold, current_timestamp)
+            
+            if not rows:
+                return 0
+            
+            for msg_id, chat_id, created_at, current_count in rows:
                 scanned_count += 1
                 
-                # v 필드 파싱 (supplement 사용 안 함)
-                current_count = 0
-                try:
-                    if v_field:
-                        if isinstance(v_field, str):
-                            v_data = json.loads(v_field)
-                        elif isinstance(v_field, dict):
-                            v_data = v_field
-                        else:
-                            continue
-                        
-                        if isinstance(v_data, dict):
-                            # defaultEmoticonsCount만 추출
-                            current_count = int(v_data.get('defaultEmoticonsCount', 0) or 0)
-                except (json.JSONDecodeError, TypeError, ValueError) as e:
-                    parse_fail_count += 1
-                    if parse_fail_count <= 3:  # 처음 3번만 로그
-                        print(f"[반응 파싱 실패] msg_id={msg_id}: {e}")
-                    continue
-                
                 # 캐시 키: (chat_id, kakao_log_id)
                 cache_key = (chat_id, msg_id)
                 old_count = self._reaction_count_cache.get(cache_key, {}).get('count', 0)
@@ -2298,6 +2547,7 @@ class KakaoPoller:
                     # 스로틀링: 동일 메시지에 대해 MIN_EVENT_GAP_SEC 내 중복 전송 방지
                     last_event_time = self._last_event_times.get(cache_key, 0)
                     if current_timestamp - last_event_time < self.MIN_EVENT_GAP_SEC:
+                        throttled_count += 1
                         continue
                     
                     changed_count += 1
@@ -2333,6 +2583,10 @@ class KakaoPoller:
                     'last_seen': current_timestamp
                 }
             
+            # 스로틀로 보류된 변화가 있으면 DB 변경이 없어도 다음 주기에 다시 스캔
+            if throttled_count and self.change_guard is not None:
+                self.change_guard.reset("reaction_scan")
+            
             # 요약 로그 (1분에 1회 수준)
             if update_count > 0 or (int(current_timestamp) % 60 < self.REACTION_CHECK_INTERVAL):
                 print(f"[반응 폴링] scanned={scanned_count}, changed={changed_count}, sent={update_count}, parse_fail={parse_fail_count}")
@@ -2341,6 +2595,9 @@ class KakaoPoller:
             
         except Exception as e:
             print(f"[반응 업데이트] 오류: {e}")
+            # 실패한 스캔이 변경 토큰을 소비하지 않도록 (DB 변경이 없어도 다음 주기에 다시 실행)
+            if self.change_guard is not None:
+                self.change_guard.reset("reaction_scan")
             import traceback
             traceback.print_exc()
             return 0
@@ -2355,10 +2612,17 @@ class KakaoPoller:
         
         self._last_backfill_time = current_time
         
+        # 마지막 백필 이후 DB 변경이 없으면 건너뜀
+        if self.change_guard is not None and not self.change_guard.should_run("reaction_backfill", source=self.scan_source()):
+            return 0
+        
         try:
-            print(f"[반응 백필] 시작: 최근 {self.REACTION_BACKFILL_WINDOW // 3600}시간 범위")
+            source = "원본 DB"
+            if self.snapshot is not None and self.snapshot.ready:
+                source = f"스냅샷 ({self.snapshot.age():.0f}초 전)"
+            print(f"[반응 백필] 시작: 최근 {self.REACTION_BACKFILL_WINDOW // 3600}시간 범위, {source}")
             
-            conn = sqlite3.connect(self.DB_PATH)
+            conn = self.scan_db().connect()
             cursor = conn.cursor()
             
             # 48시간을 6시간 단위로 분할하여 처리
@@ -2368,40 +2632,19 @@ class KakaoPoller:
             
             total_updated = 0
             
+            # 구간 경계를 _id로 변환 (백필 전용 탐색기: 반응 폴링의 캐시된 하한을 건드리지 않음)
+            backfill_window = RowidWindow() if self.reaction_window is not None else None
+            
             for chunk_start in range(time_threshold, int(current_time), chunk_seconds):
                 chunk_end = min(chunk_start + chunk_seconds, int(current_time))
+                # 여유(slack)만큼 넓힌 _id 범위를 기본 키로 읽고 created_at 조건으로 정확히 자름
+                low_id, high_id = self._reaction_id_range(cursor, backfill_window, chunk_start, chunk_end)
                 
-                query = """
-                    SELECT id, chat_id, v, created_at
-                    FROM chat_logs
-                    WHERE v IS NOT NULL
-                      AND v != ''
-                      AND created_at >= ?
-                      AND created_at < ?
-                    ORDER BY created_at DESC
-                    LIMIT ?
-                """
+                rows = self.reaction_counts.query(
+                    cursor, RANGE_WINDOW_WHERE, (low_id, high_id, chunk_start, chunk_end, self.REACTION_QUERY_LIMIT)
+                )
                 
-                cursor.execute(query, (chunk_start, chunk_end, self.REACTION_QUERY_LIMIT))
-                rows = cursor.fetchall()
-                
-                for row in rows:
-                    msg_id, chat_id, v_field, created_at = row
-                    
-                    # 카운트 추출
-                    current_count = 0
-                    try:
-                        if v_field:
-                            if isinstance(v_field, str):
-                                v_data = json.loads(v_field)
-                            elif isinstance(v_field, dict):
-                                v_data = v_field
-                            
-                            if isinstance(v_data, dict):
-                                current_count = int(v_data.get('defaultEmoticonsCount', 0) or 0)
-                    except:
-                        continue
-                    
+                for msg_id, chat_id, created_at, current_count in rows:
                     # 변화가 있을 때만 전송
                     cache_key = (chat_id, msg_id)
                     old_count = self._reaction_count_cache.get(cache_key, {}).get('count', 0)
@@ -2436,6 +2679,8 @@ class KakaoPoller:
             
         except Exception as e:
             print(f"[반응 백필] 오류: {e}")
+            if self.change_guard is not None:
+                self.change_guard.reset("reaction_backfill")
             import traceback
             traceback.print_exc()
             return 0
@@ -2584,6 +2829,8 @@ def create_reaction_event(msg_id, chat_id, user_id, created_at, msg_type, old_co
     return event_data
 
 if __name__ == "__main__":
+    import sys
     poller = KakaoPoller()
+    poller.STARTUP_TIMING = "--startup-timing" in sys.argv[1:]
     poller.poll_messages()
 
@@ -3,7 +3,10 @@
 import base64
 import hashlib
 import math
-from Crypto.Cipher import AES
+import threading
+from collections import OrderedDict
+
+import aes_backend
 
 
 def incept(n):
@@ -28,6 +31,58 @@ KAKAO_PREFIXES = ["", "", "12", "24", "18", "30", "36", "12", "48", "7", "35", "
                   "isabel", "kale", "sulli", "van", "merry", "kyle", "james", "maddux", "tony", "hayden",
                   "paul", "elijah", "dorothy", "sally", "bran", incept(830819), "veil"]
 
+# 파생 키 캐시 최대 크기 ((user_id, enc) 조합 수)
+KEY_CACHE_MAX_SIZE = 256
+
+
+class _KeyCache:
+    """(user_id, enc) -> PKCS12 파생 키 LRU 캐시 (스레드 안전, hit/miss 카운터 포함)"""
+
+    def __init__(self, max_size=KEY_CACHE_MAX_SIZE):
+        self.max_size = max_size
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id, enc, derive):
+        cache_key = (user_id, enc)
+        with self._lock:
+            key = self._keys.get(cache_key)
+            if key is not None:
+                self._keys.move_to_end(cache_key)
+                self.hits += 1
+                return key
+            self.misses += 1
+        # 키 유도는 락 밖에서 수행 (동시 miss 시 중복 계산은 허용, 결과는 동일)
+        key = derive()
+        with self._lock:
+            self._keys[cache_key] = key
+            self._keys.move_to_end(cache_key)
+            while len(self._keys) > self.max_size:
+                self._keys.popitem(last=False)
+        return key
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._keys),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+
+_KEY_CACHE = _KeyCache()
+
 
 class KakaoDecrypt:
     @staticmethod
@@ -88,11 +143,60 @@ class KakaoDecrypt:
                 dKey[start:start + write_len] = A[:write_len]
         return bytes(dKey)
 
+    @staticmethod
+    def pkcs12_key_fast(password, salt, iterations=2, dkeySize=32):
+        """pkcs12_key와 비트 단위로 동일한 고속 구현.
+        S/P는 슬라이스 반복으로 만들고, pkcs16adjust(블록 + B + 1, 캐리 포함)는 64바이트 big-int 덧셈으로 처리."""
+        password = (password + b'\0').decode('ascii').encode('utf-16-be')
+        v, u = 64, 20
+        D = b'\1' * v
+
+        def repeat(data, length):
+            if not data:
+                return b''
+            return (data * (length // len(data) + 1))[:length]
+
+        I = repeat(salt, v * math.ceil(len(salt) / v)) + repeat(password, v * math.ceil(len(password) / v))
+        mask = (1 << (v * 8)) - 1
+        blocks = math.ceil(dkeySize / u)
+        dKey = b''
+        for i in range(blocks):
+            A = hashlib.sha1(D + I).digest()
+            for _ in range(1, iterations):
+                A = hashlib.sha1(A).digest()
+            dKey += A
+            if i + 1 < blocks:
+                # 마지막 블록 이후의 I 갱신은 결과에 영향이 없으므로 생략
+                b = int.from_bytes(repeat(A, v), 'big') + 1
+                I = b''.join(((int.from_bytes(I[j:j + v], 'big') + b) & mask).to_bytes(v, 'big')
+                             for j in range(0, len(I), v))
+        return dKey[:dkeySize]
+
+    @staticmethod
+    def get_key(user_id, enc):
+        """(user_id, enc)에 대한 AES 키 (캐시 사용, 최초 1회만 PKCS12 유도)"""
+        return _KEY_CACHE.get(
+            user_id, enc,
+            lambda: KakaoDecrypt.pkcs12_key_fast(KAKAO_PASSWORD, KakaoDecrypt.genSalt(user_id, enc), iterations=2, dkeySize=32))
+
+    @staticmethod
+    def new_cipher(user_id, enc):
+        """캐시된 키로 AES/CBC 복호화 객체 생성 (CBC는 상태가 있으므로 호출마다 새 객체)"""
+        return aes_backend.CbcDecryptor(KakaoDecrypt.get_key(user_id, enc), KAKAO_IV)
+
+    @staticmethod
+    def key_cache_stats():
+        """키 캐시 통계 (size, hits, misses, hit_rate)"""
+        return _KEY_CACHE.stats()
+
+    @staticmethod
+    def clear_key_cache():
+        _KEY_CACHE.clear()
+
     @staticmethod
     def decrypt(user_id, enc, cipher_b64):
         """Decrypt KakaoTalk message"""
-        salt = KakaoDecrypt.genSalt(user_id, enc)
-        key = KakaoDecrypt.pkcs12_key(KAKAO_PASSWORD, salt, iterations=2, dkeySize=32)
+        key = KakaoDecrypt.get_key(user_id, enc)
         # Handle both base64 string, raw bytes, and string with escape sequences
         if isinstance(cipher_b64, bytes):
             ct = cipher_b64
@@ -111,9 +215,8 @@ class KakaoDecrypt:
         # AES/CBC/NoPadding: ciphertext 길이는 16의 배수여야 함
         if len(ct) == 0 or len(ct) % 16 != 0:
             return None
-        aes = AES.new(key, AES.MODE_CBC, KAKAO_IV)
         try:
-            padded = aes.decrypt(ct)
+            padded = aes_backend.decrypt_cbc(key, KAKAO_IV, ct)
         except ValueError:
             return None
         pad = padded[-1]
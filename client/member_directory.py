@@ -0,0 +1,230 @@
+"""
+멤버 디렉터리 (user_id -> 복호화된 이름, 메모리 상주)
+====================================================
+
+닉네임은 거의 바뀌지 않는데 메시지마다 DB 조회와 복호화를 했고, 이름이 없는 user_id는 매번 다시 조회했습니다.
+이 모듈은 시작 시 db2.open_chat_member / db2.friends 전체를 읽어 복호화된 이름을 메모리에 두고,
+평상시 발신자 이름 조회를 dict 조회로 끝냅니다.
+
+- 갱신: PRAGMA db2.data_version(다른 연결이 db2에 커밋하면 바뀜)이 달라졌을 때만 전체 행을 다시 읽고,
+  (이름, enc)가 바뀐 행만 다시 복호화 (증분 갱신)
+- 없는 user_id: negative_ttl초 동안 "없음"으로 기억 (db2가 바뀌면 즉시 무효)
+- 디렉터리에 없는 user_id는 fetch_sender_rows로 IN (...) 조회 후 추가
+- stats(): 항목 수, 로드/갱신 횟수와 소요 시간, 적중률
+
+환경 변수:
+    MEMBER_DIRECTORY=1                     poller에서 사용 (0이면 배치 조회만)
+    MEMBER_NEGATIVE_TTL_SEC=300            "없음" 기억 시간
+
+사용법:
+    directory = MemberDirectory(db, decrypt_names=lambda rows: decrypt_sender_names(rows, ...), log=print)
+    directory.load()                               # 시작 시 1회 (전체 미리 읽기)
+    names = directory.resolve([user_id, ...])      # user_id(str) -> 이름 또는 None
+"""
+
+import os
+import time
+import sqlite3
+import threading
+
+from sender_names import fetch_sender_rows, fetch_all_sender_rows
+
+MEMBER_DIRECTORY_ENABLED = os.getenv('MEMBER_DIRECTORY', '1') == '1'
+MEMBER_NEGATIVE_TTL = int(os.getenv('MEMBER_NEGATIVE_TTL_SEC', '300'))
+
+
+def has_open_chat_member_table(cursor):
+    cursor.execute("SELECT 1 FROM db2.sqlite_master WHERE type='table' AND name='open_chat_member'")
+    return cursor.fetchone() is not None
+
+
+class MemberDirectory:
+    """db2 멤버 이름 디렉터리 (data_version 기반 무효화 + 없음 캐시)"""
+
+    def __init__(self, db, decrypt_names, negative_ttl=MEMBER_NEGATIVE_TTL, clock=time.monotonic, changed=None,
+                 log=print):
+        """
+        Args:
+            db: DbConnectionManager (db2 attach 필요)
+            decrypt_names: rows -> (names, failed) (sender_names.decrypt_sender_names에 키/메모를 묶은 함수)
+            changed: 변경 감지 함수 (예: DbChangeGuard.should_run), False를 반환하면 data_version 확인도 생략
+        """
+        self.db = db
+        self.decrypt_names = decrypt_names
+        self.changed = changed
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self.log = log
+        self._lock = threading.Lock()
+        self._rows = {}  # user_id(str) -> (원본 이름, enc)
+        self._names = {}  # user_id(str) -> 이름 (복호화 실패 시 암호화된 이름)
+        self._negative = {}  # user_id(str) -> 만료 시각
+        self._data_version = None
+        self._has_open_chat_member = None
+        self.loaded = False
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.refreshes = 0
+        self.last_load_duration = 0.0
+        self.last_refresh_duration = 0.0
+        self.last_refresh_changed = 0
+
+    def __len__(self):
+        return len(self._names)
+
+    def _data_version_of(self, conn):
+        return conn.execute("PRAGMA db2.data_version").fetchone()[0]
+
+    def _reload(self, conn):
+        """전체 행을 다시 읽어 바뀐 행만 복호화 (반환: 바뀐/추가된 행 수)"""
+        cursor = conn.cursor()
+        if self._has_open_chat_member is None:
+            self._has_open_chat_member = has_open_chat_member_table(cursor)
+        rows = fetch_all_sender_rows(cursor, self._has_open_chat_member)
+        changed = {user_id: row for user_id, row in rows.items() if self._rows.get(user_id) != row}
+        names, _ = self.decrypt_names(changed) if changed else ({}, [])
+        for user_id in set(self._rows) - set(rows):
+            self._names.pop(user_id, None)
+        self._rows = rows
+        self._names.update(names)
+        self._negative.clear()
+        return len(changed)
+
+    def load(self):
+        """전체 미리 읽기 (db2가 없으면 False)"""
+        started = time.perf_counter()
+        try:
+            conn = self.db.connect()
+            try:
+                if not conn.db2_attached:
+                    return False
+                with self._lock:
+                    self._data_version = self._data_version_of(conn)
+                    self._reload(conn)
+                    self.loaded = True
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            self.log(f"[멤버 디렉터리] 로드 실패: {e}")
+            return False
+        self.loads += 1
+        self.last_load_duration = time.perf_counter() - started
+        self.log(f"[멤버 디렉터리] 로드: {len(self._names)}명, {self.last_load_duration * 1000:.1f}ms")
+        return True
+
+    def refresh_if_changed(self):
+        """db2.data_version이 바뀌었으면 증분 갱신 (반환: 갱신했는지)"""
+        if not self.loaded:
+            return False
+        if self.changed is not None and not self.changed():
+            return False
+        started = time.perf_counter()
+        try:
+            conn = self.db.connect()
+            try:
+                with self._lock:
+                    version = self._data_version_of(conn)
+                    if version == self._data_version:
+                        return False
+                    self._data_version = version
+                    self.last_refresh_changed = self._reload(conn)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            self.log(f"[멤버 디렉터리] 갱신 실패: {e}")
+            return False
+        self.refreshes += 1
+        self.last_refresh_duration = time.perf_counter() - started
+        self.log(f"[멤버 디렉터리] 갱신: 변경 {self.last_refresh_changed}명, 전체 {len(self._names)}명, "
+                 f"{self.last_refresh_duration * 1000:.1f}ms")
+        return True
+
+    def lookup(self, user_id):
+        """
+        메모리에서만 조회
+
+        Returns:
+            (found, name): found=False이면 디렉터리에 없음, found=True이고 name=None이면 알려진 "없음"
+        """
+        user_id = str(user_id)
+        with self._lock:
+            name = self._names.get(user_id)
+            if name is not None:
+                self.hits += 1
+                return True, name
+            expires_at = self._negative.get(user_id)
+            if expires_at is not None:
+                if expires_at > self._clock():
+                    self.negative_hits += 1
+                    return True, None
+                del self._negative[user_id]
+            self.misses += 1
+            return False, None
+
+    def resolve(self, user_ids):
+        """
+        배치의 user_id들 이름 (db2 변경 확인 1회 + 디렉터리에 없는 user_id만 IN (...) 조회)
+
+        Returns:
+            dict: user_id(str) -> 이름 또는 None (조회 실패한 user_id는 제외)
+        """
+        ids = list(dict.fromkeys(str(user_id) for user_id in user_ids if user_id))
+        if not ids:
+            return {}
+        self.refresh_if_changed()
+
+        result = {}
+        missing = []
+        for user_id in ids:
+            found, name = self.lookup(user_id)
+            if found:
+                result[user_id] = name
+            else:
+                missing.append(user_id)
+        if not missing:
+            return result
+
+        try:
+            conn = self.db.connect()
+            try:
+                if not conn.db2_attached:
+                    return result
+                cursor = conn.cursor()
+                if self._has_open_chat_member is None:
+                    self._has_open_chat_member = has_open_chat_member_table(cursor)
+                rows = fetch_sender_rows(cursor, missing, self._has_open_chat_member)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            self.log(f"[멤버 디렉터리] 조회 실패: {e}")
+            return result
+
+        names, _ = self.decrypt_names(rows) if rows else ({}, [])
+        expires_at = self._clock() + self.negative_ttl
+        with self._lock:
+            for user_id in missing:
+                if user_id in rows:
+                    self._rows[user_id] = rows[user_id]
+                    self._names[user_id] = names.get(user_id)
+                else:
+                    self._negative[user_id] = expires_at
+                result[user_id] = names.get(user_id)
+        return result
+
+    def stats(self):
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "entries": len(self._names),
+            "negative_entries": len(self._negative),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.negative_hits) / lookups, 3) if lookups else 0.0,
+            "loads": self.loads,
+            "refreshes": self.refreshes,
+            "last_load_ms": round(self.last_load_duration * 1000, 1),
+            "last_refresh_ms": round(self.last_refresh_duration * 1000, 1),
+            "last_refresh_changed": self.last_refresh_changed,
+        }
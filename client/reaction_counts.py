@@ -0,0 +1,156 @@
+"""
+반응 카운트 추출 (SQLite json_extract + v 지문)
+===============================================
+
+반응 폴링은 최근 행(최대 REACTION_QUERY_LIMIT=1200개)의 v JSON 전체를 매 주기 Python에서 json.loads하고
+defaultEmoticonsCount 하나만 읽었습니다. 대부분의 행은 반응이 없어 카운트가 0입니다.
+
+- JSON1 사용 가능: instr(v, 'defaultEmoticonsCount')로 먼저 거르고 json_extract로 카운트를 SQL에서 계산,
+  카운트가 0보다 큰 행만 반환 (Python 파싱 없음, 깨진 JSON은 json_valid로 제외)
+- JSON1 없음: 같은 instr 사전 필터로 키가 있는 행만 가져와 Python에서 파싱
+  (행별 v 지문(길이, hash)이 지난 주기와 같으면 파싱 없이 지난 카운트 재사용)
+- JSON1 지원 여부는 처음 조회할 때 한 번 확인
+
+환경 변수:
+    REACTION_FINGERPRINT_SIZE=50000    v 지문 최대 개수 (오래된 것부터 제거)
+
+사용법:
+    reader = ReactionCountReader()
+    for msg_id, chat_id, created_at, count in reader.query(cursor, RECENT_WINDOW_WHERE, params):
+        ...  # count > 0인 행만
+"""
+
+import os
+import json
+import sqlite3
+from collections import OrderedDict
+
+REACTION_FINGERPRINT_SIZE = int(os.getenv('REACTION_FINGERPRINT_SIZE', '50000'))
+REACTION_COUNT_KEY = 'defaultEmoticonsCount'
+
+# 키 문자열이 없는 행은 JSON 파싱 전에 제외 (대부분의 행)
+_PREFILTER = f"instr(v, '{REACTION_COUNT_KEY}') > 0"
+_COUNT_EXPR = f"CAST(CASE WHEN json_valid(v) THEN json_extract(v, '$.{REACTION_COUNT_KEY}') END AS INTEGER)"
+
+
+def has_json1(cursor):
+    """SQLite JSON1(json_extract) 사용 가능 여부"""
+    try:
+        cursor.execute("""SELECT json_extract('{"a": 1}', '$.a')""")
+        return cursor.fetchone()[0] == 1
+    except sqlite3.OperationalError:
+        return False
+
+
+def reaction_count_sql(window_where, json1=True):
+    """
+    반응 카운트 조회 SQL (행: id, chat_id, created_at, 카운트, v)
+
+    JSON1 경로는 카운트 > 0인 행만, v는 NULL. 폴백 경로는 카운트 NULL, v 원문.
+    """
+    if json1:
+        columns = f"{_COUNT_EXPR} AS reaction_count, NULL"
+        count_filter = "AND reaction_count > 0"
+    else:
+        columns = "NULL, v"
+        count_filter = ""
+    return f"""
+        SELECT id, chat_id, created_at, {columns}
+        FROM chat_logs
+        WHERE {window_where}
+          AND v IS NOT NULL
+          AND {_PREFILTER}
+          {count_filter}
+        ORDER BY _id DESC
+        LIMIT ?
+    """
+
+
+def fingerprint(v_field):
+    """v 지문 (길이, hash): 같으면 같은 텍스트로 봄"""
+    return (len(v_field), hash(v_field))
+
+
+class ReactionCountReader:
+    """반응 카운트 > 0인 행 조회 (JSON1이면 SQL에서 추출, 아니면 지문 + Python 파싱)"""
+
+    def __init__(self, max_fingerprints=REACTION_FINGERPRINT_SIZE, log=print):
+        self.max_fingerprints = max_fingerprints
+        self.log = log
+        self.json1 = None
+        self._fingerprints = OrderedDict()  # (chat_id, msg_id) -> (지문, 카운트)
+        self.rows = 0
+        self.parsed = 0
+        self.fingerprint_hits = 0
+        self.parse_failed = 0
+        self.last_parse_failed = 0
+        self.last_row_count = 0  # 마지막 조회에서 SQLite가 반환한 행 수 (LIMIT 비교용)
+
+    def query(self, cursor, window_where, params):
+        """
+        Args:
+            window_where: reaction_window의 RECENT_WINDOW_WHERE / RANGE_WINDOW_WHERE
+            params: window_where 파라미터 + LIMIT
+
+        Returns:
+            list: [(msg_id, chat_id, created_at, count), ...] (count > 0, _id 역순)
+        """
+        if self.json1 is None:
+            self.json1 = has_json1(cursor)
+            mode = "json_extract" if self.json1 else "instr 사전 필터 + Python 파싱 (JSON1 없음)"
+            self.log(f"[반응 폴링] 카운트 추출: {mode}")
+        cursor.execute(reaction_count_sql(window_where, self.json1), params)
+        return self.counts(cursor.fetchall())
+
+    def counts(self, rows):
+        """조회 결과 행 -> [(msg_id, chat_id, created_at, count), ...] (count > 0)"""
+        result = []
+        self.last_parse_failed = 0
+        self.last_row_count = len(rows)
+        for msg_id, chat_id, created_at, count, v_field in rows:
+            self.rows += 1
+            if count is None:
+                count = self._parse_count((chat_id, msg_id), v_field)
+                if count is None:
+                    continue
+            if count > 0:
+                result.append((msg_id, chat_id, created_at, int(count)))
+        return result
+
+    def _parse_count(self, key, v_field):
+        """폴백 경로: v가 지난번과 같으면 지난 카운트, 아니면 json.loads (실패 시 None)"""
+        if not isinstance(v_field, str):
+            return None
+        fp = fingerprint(v_field)
+        cached = self._fingerprints.get(key)
+        if cached is not None and cached[0] == fp:
+            self.fingerprint_hits += 1
+            self._fingerprints.move_to_end(key)
+            return cached[1]
+
+        self.parsed += 1
+        try:
+            v_data = json.loads(v_field)
+            count = int(v_data.get(REACTION_COUNT_KEY, 0) or 0) if isinstance(v_data, dict) else 0
+        except (json.JSONDecodeError, TypeError, ValueError) as e:
+            self.parse_failed += 1
+            self.last_parse_failed += 1
+            if self.parse_failed <= 3:  # 처음 3번만 로그
+                self.log(f"[반응 파싱 실패] msg_id={key[1]}: {e}")
+            return None
+
+        self._fingerprints[key] = (fp, count)
+        self._fingerprints.move_to_end(key)
+        while len(self._fingerprints) > self.max_fingerprints:
+            self._fingerprints.popitem(last=False)
+        return count
+
+    def stats(self):
+        return {
+            "json1": self.json1,
+            "rows": self.rows,
+            "parsed": self.parsed,
+            "fingerprint_hits": self.fingerprint_hits,
+            "parse_failed": self.parse_failed,
+            "fingerprints": len(self._fingerprints),
+        }
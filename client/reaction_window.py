@@ -0,0 +1,135 @@
+"""
+반응 스캔 시간 창 -> _id 범위 변환
+==================================
+
+poll_reaction_updates / poll_reaction_backfill은
+`WHERE v IS NOT NULL AND v != '' AND created_at > ? ORDER BY created_at DESC LIMIT ?`로 조회했습니다.
+chat_logs.created_at에는 우리가 만들 수 있는 인덱스가 없으므로 SQLite가 20초마다 테이블 대부분을 읽고 정렬합니다.
+_id(INTEGER PRIMARY KEY)는 삽입 순서 = 시간 순서이므로, 기준 시각을 _id 하한으로 바꿔(이진 탐색) 기본 키만 따라 읽습니다.
+
+- lower_bound(t): created_at >= t인 첫 행의 _id (없으면 MAX(_id) + 1), 기본 키 점 조회 약 log2(N)회
+- 캐시: 시간 창은 주기마다 조금씩만 앞으로 가므로 지난 결과를 탐색 시작점으로 사용 (바로 앞 행으로 검증,
+  DB가 바뀌었거나 순서가 맞지 않으면 전체 탐색)
+- 동기화로 늦게 들어온 과거 메시지(_id는 크지만 created_at은 작음)를 위해 slack초 만큼 넓게 잡고,
+  조회에는 기존 created_at 조건도 그대로 둠
+- query_plan(): EXPLAIN QUERY PLAN 결과 (기본 키 범위 탐색인지, 임시 정렬이 없는지 확인용)
+
+환경 변수:
+    REACTION_ROWID_WINDOW=1          poller에서 사용 (0이면 _id 하한 없이 기본 키 역순 전체 범위)
+    REACTION_WINDOW_SLACK_SEC=600    _id 하한을 잡을 때 기준 시각에서 더 뺄 여유
+
+사용법:
+    window = RowidWindow()
+    low_id = window.lower_bound(cursor, time.time() - 3600)
+    cursor.execute(RECENT_REACTION_SQL, (low_id, threshold, limit))
+"""
+
+import os
+import time
+
+REACTION_ROWID_WINDOW_ENABLED = os.getenv('REACTION_ROWID_WINDOW', '1') == '1'
+REACTION_WINDOW_SLACK = int(os.getenv('REACTION_WINDOW_SLACK_SEC', '600'))
+MAX_ROWID = 2 ** 63 - 1  # SQLite INTEGER 최대값 (상한 없음)
+
+# 시간 창 조건: _id 범위로 기본 키를 좁히고 created_at 조건은 필터로만 적용
+RECENT_WINDOW_WHERE = "_id >= ? AND created_at > ?"
+RANGE_WINDOW_WHERE = "_id >= ? AND _id < ? AND created_at >= ? AND created_at < ?"
+
+# 기본 키 역순으로 걸음 (임시 정렬 없음)
+RECENT_REACTION_SQL = f"""
+    SELECT id, chat_id, v, created_at
+    FROM chat_logs
+    WHERE {RECENT_WINDOW_WHERE}
+      AND v IS NOT NULL
+      AND v != ''
+    ORDER BY _id DESC
+    LIMIT ?
+"""
+
+RANGE_REACTION_SQL = f"""
+    SELECT id, chat_id, v, created_at
+    FROM chat_logs
+    WHERE {RANGE_WINDOW_WHERE}
+      AND v IS NOT NULL
+      AND v != ''
+    ORDER BY _id DESC
+    LIMIT ?
+"""
+
+
+def _first_at_or_after(cursor, rowid):
+    """_id >= rowid인 첫 행의 created_at (없으면 None)"""
+    cursor.execute("SELECT created_at FROM chat_logs WHERE _id >= ? ORDER BY _id LIMIT 1", (rowid,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def query_plan(cursor, sql, params):
+    """EXPLAIN QUERY PLAN detail 문자열 리스트"""
+    cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+    return [row[-1] for row in cursor.fetchall()]
+
+
+class RowidWindow:
+    """기준 시각 -> _id 하한 (이진 탐색 + 지난 결과 캐시)"""
+
+    def __init__(self, slack=REACTION_WINDOW_SLACK, clock=time.perf_counter):
+        self.slack = slack
+        self._clock = clock
+        self._cached = None  # (기준 시각, _id 하한)
+        self.searches = 0
+        self.cached_searches = 0
+        self.probes = 0
+        self.last_duration = 0.0
+
+    def lower_bound(self, cursor, timestamp, slack=None):
+        """
+        created_at >= timestamp - slack인 첫 행의 _id (created_at이 _id 순서를 따른다고 가정)
+
+        Returns:
+            int: _id 하한 (해당 행이 없으면 MAX(_id) + 1, 테이블이 비었으면 0)
+        """
+        started = self._clock()
+        target = timestamp - (self.slack if slack is None else slack)
+        # MIN/MAX를 한 쿼리로 묻으면 SQLite가 전체 스캔하므로 따로 조회 (각각 기본 키 끝 한 번)
+        min_id = cursor.execute("SELECT MIN(_id) FROM chat_logs").fetchone()[0]
+        max_id = cursor.execute("SELECT MAX(_id) FROM chat_logs").fetchone()[0]
+        if min_id is None:
+            return 0
+        lo, hi = min_id, max_id + 1
+
+        # 지난 결과가 이번 기준 시각 이하이면 그 위치부터 탐색 (바로 앞 행이 기준보다 이전인지 검증)
+        if self._cached is not None and self._cached[0] <= target and lo < self._cached[1] <= hi:
+            cursor.execute("SELECT created_at FROM chat_logs WHERE _id < ? ORDER BY _id DESC LIMIT 1",
+                           (self._cached[1],))
+            row = cursor.fetchone()
+            if row is None or row[0] is None or row[0] < target:
+                lo = self._cached[1]
+                self.cached_searches += 1
+
+        while lo < hi:
+            mid = (lo + hi) // 2
+            created_at = _first_at_or_after(cursor, mid)
+            self.probes += 1
+            if created_at is not None and created_at >= target:
+                hi = mid
+            else:
+                lo = mid + 1
+
+        # _id 구멍에 걸린 값이면 실제 첫 행의 _id로 맞춤
+        if lo <= max_id:
+            cursor.execute("SELECT _id FROM chat_logs WHERE _id >= ? ORDER BY _id LIMIT 1", (lo,))
+            lo = cursor.fetchone()[0]
+
+        self._cached = (target, lo)
+        self.searches += 1
+        self.last_duration = self._clock() - started
+        return lo
+
+    def stats(self):
+        return {
+            "searches": self.searches,
+            "cached_searches": self.cached_searches,
+            "probes": self.probes,
+            "last_ms": round(self.last_duration * 1000, 2),
+        }
@@ -0,0 +1,273 @@
+"""
+채팅방 메타데이터 캐시 (chat_id -> 이름/enc/복호화된 이름)
+==========================================================
+
+get_chat_room_data는 메시지마다, 그리고 poll_reaction_updates/poll_reaction_backfill의 반응 변경마다
+private_meta 조회 + json.loads, db2.open_link 폴백, PRAGMA table_info(chat_rooms)를 실행했고,
+채팅방 이름은 매번 다시 복호화했습니다.
+이 모듈은 chat_rooms 전체(+ db2.open_link 이름)를 조회 1회로 읽어 채팅방별 이름/enc/복호화된 이름을 보관합니다.
+
+- 이름 규칙은 get_chat_room_data와 같음: private_meta.name -> db2.open_link.name -> chat_rooms.name 컬럼
+- 갱신: check_interval초마다 PRAGMA main/db2.data_version만 확인하고, 바뀌었을 때 전체 행을 다시 읽되
+  (private_meta, open_link 이름, name 컬럼) 해시가 바뀐 채팅방만 다시 파싱/복호화
+  (chat_logs와 같은 DB라 data_version은 메시지마다 바뀌므로, 확인 주기로 재조회 빈도를 제한)
+- 캐시에 없는 chat_id(새 채팅방)는 그 채팅방만 조회해서 추가
+- 평상시 resolve()는 dict 조회
+
+환경 변수:
+    ROOM_CACHE=1                     poller에서 사용 (0이면 기존 get_chat_room_data 조회)
+    ROOM_CACHE_CHECK_SEC=1.0         data_version 확인 주기
+
+사용법:
+    rooms = RoomCache(db, decrypt_name=lambda raw, chat_id, enc: ..., log=print)
+    rooms.load()
+    entry = rooms.resolve(chat_id, enc_hint=v_enc)
+    entry["name"], entry["name_column"], entry["enc"], entry["name_decrypted"]
+"""
+
+import os
+import time
+import json
+import sqlite3
+import threading
+
+from ciphertext_classifier import is_ciphertext
+
+ROOM_CACHE_ENABLED = os.getenv('ROOM_CACHE', '1') == '1'
+ROOM_CACHE_CHECK_INTERVAL = float(os.getenv('ROOM_CACHE_CHECK_SEC', '1.0'))
+
+
+def parse_private_meta(private_meta_value):
+    """private_meta JSON -> (이름, enc) (Iris: name.jsonPrimitive.content), 없거나 파싱 실패 시 (None, None)"""
+    if not private_meta_value or not str(private_meta_value).strip():
+        return None, None
+    try:
+        private_meta = json.loads(str(private_meta_value))
+    except (json.JSONDecodeError, TypeError):
+        return None, None
+    if not isinstance(private_meta, dict):
+        return None, None
+    enc = private_meta.get('enc') or None
+    name_element = private_meta.get('name')
+    if name_element is None:
+        return None, enc
+    if isinstance(name_element, str):
+        name = name_element
+    elif isinstance(name_element, dict):
+        # JsonPrimitive의 content 속성
+        name = name_element.get('content') or name_element.get('value') or str(name_element)
+    else:
+        name = str(name_element)
+    return (str(name) if name else None), enc
+
+
+def make_room_entry(private_meta_value, name_value, link_name):
+    """조회 행 -> 캐시 항목 (이름이 없으면 None)"""
+    name, enc = parse_private_meta(private_meta_value)
+    if name:
+        return {'name': name, 'name_column': 'private_meta.name', 'enc': enc}
+    if link_name:
+        return {'name': link_name, 'name_column': 'db2.open_link.name', 'enc': enc}
+    if name_value:
+        return {'name': name_value, 'name_column': 'name', 'enc': enc}
+    return None
+
+
+class RoomCache:
+    """chat_rooms 메타데이터 캐시 (data_version + 행 해시 기반 갱신)"""
+
+    def __init__(self, db, decrypt_name=None, check_interval=ROOM_CACHE_CHECK_INTERVAL, clock=time.monotonic,
+                 changed=None, log=print):
+        """
+        Args:
+            db: DbConnectionManager
+            decrypt_name: (암호화된 이름, chat_id, enc 힌트) -> 복호화된 이름 또는 None
+            changed: 변경 감지 함수 (예: DbChangeGuard.should_run), False를 반환하면 data_version 확인도 생략
+        """
+        self.db = db
+        self.decrypt_name = decrypt_name
+        self.changed = changed
+        self.check_interval = check_interval
+        self._clock = clock
+        self.log = log
+        self._lock = threading.Lock()
+        self._entries = {}  # chat_id(str) -> 항목 dict
+        self._hashes = {}  # chat_id(str) -> 행 해시
+        self._versions = None
+        self._checked_at = None
+        self._sql = None
+        self.loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.refreshes = 0
+        self.reparsed = 0
+        self.last_load_duration = 0.0
+        self.last_refresh_duration = 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _build_sql(self, conn):
+        """chat_rooms/open_link 컬럼 확인 후 조회 SQL (로드 시 1회, 기존 PRAGMA table_info per 메시지 대체)"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(chat_rooms)").fetchall()}
+        private_meta = "r.private_meta" if "private_meta" in columns else "NULL"
+        name = "r.name" if "name" in columns else "NULL"
+        link_name = "NULL"
+        join = ""
+        if conn.db2_attached and "link_id" in columns:
+            has_open_link = conn.execute(
+                "SELECT 1 FROM db2.sqlite_master WHERE type='table' AND name='open_link'").fetchone()
+            if has_open_link:
+                link_name = "ol.name"
+                join = " LEFT JOIN db2.open_link ol ON ol.id = r.link_id"
+        return f"SELECT r.id, {private_meta}, {name}, {link_name} FROM chat_rooms r{join}"
+
+    def _versions_of(self, conn):
+        versions = [conn.execute("PRAGMA main.data_version").fetchone()[0], None]
+        if conn.db2_attached:
+            versions[1] = conn.execute("PRAGMA db2.data_version").fetchone()[0]
+        return versions
+
+    def _decrypt(self, entry, chat_id, enc_hint=None):
+        """항목의 이름 복호화 (평문이면 그대로, 실패 시 None)"""
+        name = entry['name']
+        if not is_ciphertext(name):
+            entry['name_decrypted'] = name
+        elif self.decrypt_name is not None:
+            entry['name_decrypted'] = self.decrypt_name(name, chat_id, enc_hint if enc_hint else entry['enc'])
+        else:
+            entry['name_decrypted'] = None
+
+    def _apply_rows(self, rows, full):
+        """조회 행 반영 (해시가 바뀐 채팅방만 파싱/복호화), full이면 없어진 채팅방 제거 (반환: 다시 파싱한 수)"""
+        changed = 0
+        seen = set()
+        for room_id, private_meta_value, name_value, link_name in rows:
+            chat_id = str(room_id)
+            seen.add(chat_id)
+            row_hash = hash((private_meta_value, name_value, link_name))
+            if self._hashes.get(chat_id) == row_hash:
+                continue
+            entry = make_room_entry(private_meta_value, name_value, link_name)
+            if entry is not None:
+                self._decrypt(entry, chat_id)
+                self._entries[chat_id] = entry
+            else:
+                self._entries.pop(chat_id, None)
+            self._hashes[chat_id] = row_hash
+            changed += 1
+        if full:
+            for chat_id in set(self._hashes) - seen:
+                self._hashes.pop(chat_id, None)
+                self._entries.pop(chat_id, None)
+        self.reparsed += changed
+        return changed
+
+    def load(self):
+        """chat_rooms 전체 미리 읽기"""
+        started = time.perf_counter()
+        try:
+            conn = self.db.connect()
+            try:
+                with self._lock:
+                    self._sql = self._build_sql(conn)
+                    self._versions = self._versions_of(conn)
+                    self._checked_at = self._clock()
+                    self._apply_rows(conn.execute(self._sql).fetchall(), full=True)
+                    self.loaded = True
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            self.log(f"[채팅방 캐시] 로드 실패: {e}")
+            return False
+        self.loads += 1
+        self.last_load_duration = time.perf_counter() - started
+        self.log(f"[채팅방 캐시] 로드: {len(self._entries)}개, {self.last_load_duration * 1000:.1f}ms")
+        return True
+
+    def refresh_if_changed(self, force=False):
+        """확인 주기가 지났고 data_version이 바뀌었으면 전체 행 재조회 (반환: 다시 파싱한 채팅방 수 또는 None)"""
+        if not self.loaded:
+            return None
+        now = self._clock()
+        if not force and self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return None
+        if not force and self.changed is not None and not self.changed():
+            self._checked_at = now
+            return None
+        started = time.perf_counter()
+        try:
+            conn = self.db.connect()
+            try:
+                with self._lock:
+                    self._checked_at = now
+                    versions = self._versions_of(conn)
+                    if versions == self._versions:
+                        return None
+                    self._versions = versions
+                    changed = self._apply_rows(conn.execute(self._sql).fetchall(), full=True)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            self.log(f"[채팅방 캐시] 갱신 실패: {e}")
+            return None
+        self.refreshes += 1
+        self.last_refresh_duration = time.perf_counter() - started
+        if changed:
+            self.log(f"[채팅방 캐시] 갱신: 변경 {changed}개, 전체 {len(self._entries)}개, "
+                     f"{self.last_refresh_duration * 1000:.1f}ms")
+        return changed
+
+    def _load_one(self, chat_id):
+        """캐시에 없는 채팅방 1개 조회 (새 채팅방)"""
+        try:
+            conn = self.db.connect()
+            try:
+                with self._lock:
+                    if self._sql is None:
+                        self._sql = self._build_sql(conn)
+                    rows = conn.execute(self._sql + " WHERE r.id = ?", (chat_id,)).fetchall()
+                    self._apply_rows(rows, full=False)
+                    # 행이 없으면 다음 전체 갱신까지 "없음"으로 기억
+                    self._hashes.setdefault(str(chat_id), None)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            self.log(f"[채팅방 캐시] 조회 실패: chat_id={chat_id}, 오류={e}")
+
+    def resolve(self, chat_id, enc_hint=None):
+        """
+        채팅방 항목 (name, name_column, enc, name_decrypted), 이름이 없으면 None
+
+        Args:
+            enc_hint: 메시지 v.enc (캐시된 이름 복호화가 실패한 경우에만 이 힌트로 다시 시도)
+        """
+        if not chat_id:
+            return None
+        key = str(chat_id)
+        self.refresh_if_changed()
+        entry = self._entries.get(key)
+        if entry is None and key not in self._hashes:
+            self.misses += 1
+            self._load_one(chat_id)
+            entry = self._entries.get(key)
+        else:
+            self.hits += 1
+        if entry is not None and entry['name_decrypted'] is None and enc_hint and enc_hint != entry['enc']:
+            self._decrypt(entry, key, enc_hint)
+        return entry
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "loads": self.loads,
+            "refreshes": self.refreshes,
+            "reparsed": self.reparsed,
+            "last_load_ms": round(self.last_load_duration * 1000, 1),
+            "last_refresh_ms": round(self.last_refresh_duration * 1000, 1),
+        }
@@ -0,0 +1,141 @@
+"""
+처리한 메시지 ID 집합 (워터마크 + 비트맵)
+=========================================
+
+sent_message_ids는 set이었고 2000개를 넘으면 삽입마다 min()으로 가장 오래된 ID를 찾아 지웠습니다(O(n)).
+chat_logs._id는 단조 증가하므로 다음 구조로 대체합니다.
+
+- watermark: 이 값 이하의 ID는 모두 처리됨
+- 비트맵(window비트 링 버퍼): watermark 위에서 순서가 어긋나게 처리된 ID
+  (예: 앞 메시지 전송 실패 후 뒤 메시지들만 성공)
+
+포함 확인/삽입 O(1), 메모리 고정(window / 8 바이트), 체크포인트 저장용 직렬화(to_bytes/from_bytes) 지원.
+window는 한 번에 조회하는 페이지(CATCHUP_PAGE_SIZE)보다 커야 합니다.
+watermark + window를 넘는 ID가 들어오면 watermark를 강제로 올리고 그 아래는 처리된 것으로 간주합니다.
+
+사용법:
+    seen = SeenIds(watermark=last_id)
+    if msg_id not in seen:
+        ...전송...
+        seen.add(msg_id)
+    seen.advance_to(checkpoint_id)   # 체크포인트 이하 정리
+"""
+
+import os
+import struct
+
+SEEN_IDS_WINDOW = int(os.getenv('SEEN_IDS_WINDOW', '4096'))
+
+_HEADER = struct.Struct('<qI')  # watermark, window
+
+
+class SeenIds:
+    """워터마크 + 링 비트맵 기반 처리 ID 집합"""
+
+    __slots__ = ('watermark', 'window', '_bits', '_count', 'version', 'forced_advances')
+
+    def __init__(self, watermark=0, window=SEEN_IDS_WINDOW):
+        window = max(8, (int(window) + 7) // 8 * 8)
+        self.watermark = int(watermark)
+        self.window = window
+        self._bits = bytearray(window // 8)
+        self._count = 0  # watermark 위에 설정된 비트 수
+        self.version = 0  # 변경 횟수 (체크포인트 저장 필요 여부 판단용)
+        self.forced_advances = 0
+
+    def __contains__(self, msg_id):
+        if msg_id <= self.watermark:
+            return True
+        if msg_id > self.watermark + self.window:
+            return False
+        index = msg_id % self.window
+        return bool(self._bits[index >> 3] & (1 << (index & 7)))
+
+    def __len__(self):
+        """watermark 위에서 처리된 ID 수"""
+        return self._count
+
+    def _clear(self, msg_id):
+        index = msg_id % self.window
+        byte, mask = index >> 3, 1 << (index & 7)
+        if self._bits[byte] & mask:
+            self._bits[byte] &= ~mask & 0xFF
+            self._count -= 1
+
+    def _compact(self):
+        """watermark 바로 위가 연속으로 처리되었으면 watermark 전진"""
+        bits, window = self._bits, self.window
+        while self._count:
+            index = (self.watermark + 1) % window
+            byte, mask = index >> 3, 1 << (index & 7)
+            if not bits[byte] & mask:
+                break
+            bits[byte] &= ~mask & 0xFF
+            self._count -= 1
+            self.watermark += 1
+
+    def add(self, msg_id):
+        if msg_id <= self.watermark:
+            return
+        if msg_id > self.watermark + self.window:
+            # 고정 메모리 유지: 창 밖으로 밀려난 ID는 처리된 것으로 간주
+            self.forced_advances += 1
+            self.advance_to(msg_id - self.window)
+        index = msg_id % self.window
+        byte, mask = index >> 3, 1 << (index & 7)
+        if not self._bits[byte] & mask:
+            self._bits[byte] |= mask
+            self._count += 1
+            self.version += 1
+            self._compact()
+
+    def discard(self, msg_id):
+        """watermark 위의 ID만 제거 가능 (이하 ID는 체크포인트로 확정됨)"""
+        if self.watermark < msg_id <= self.watermark + self.window:
+            count = self._count
+            self._clear(msg_id)
+            if count != self._count:
+                self.version += 1
+
+    def advance_to(self, msg_id):
+        """msg_id 이하를 모두 처리된 것으로 표시 (체크포인트 전진)"""
+        if msg_id is None or msg_id <= self.watermark:
+            return
+        if msg_id - self.watermark >= self.window or not self._count:
+            self._bits[:] = bytes(len(self._bits))
+            self._count = 0
+        else:
+            for i in range(self.watermark + 1, msg_id + 1):
+                self._clear(i)
+        self.watermark = msg_id
+        self.version += 1
+        self._compact()
+
+    def pending_ids(self):
+        """watermark 위에서 처리된 ID 목록 (오름차순)"""
+        return [i for i in range(self.watermark + 1, self.watermark + self.window + 1) if i in self]
+
+    def to_bytes(self):
+        return _HEADER.pack(self.watermark, self.window) + bytes(self._bits)
+
+    @classmethod
+    def from_bytes(cls, data, window=None):
+        """직렬화된 값 복원 (window가 다르면 워터마크 위 ID를 새 창으로 옮김)"""
+        watermark, stored_window = _HEADER.unpack_from(data)
+        stored = cls(watermark, stored_window)
+        stored._bits[:] = data[_HEADER.size:_HEADER.size + stored_window // 8]
+        stored._count = sum(bin(b).count('1') for b in stored._bits)
+        if window is None or window == stored_window:
+            return stored
+        restored = cls(watermark, window)
+        for msg_id in stored.pending_ids():
+            restored.add(msg_id)
+        return restored
+
+    def load_bytes(self, data):
+        """체크포인트에서 읽은 값으로 현재 객체 갱신 (CheckpointStore 상태 인터페이스)"""
+        restored = SeenIds.from_bytes(data, self.window)
+        self.watermark = restored.watermark
+        self._bits = restored._bits
+        self._count = restored._count
+        self.version += 1
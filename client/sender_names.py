@@ -0,0 +1,151 @@
+"""
+배치 단위 발신자 이름 조회
+==========================
+
+send_to_server는 메시지마다 get_name_of_user_id를 호출해 연결 임대, open_chat_member 확인,
+open_chat_member/friends 단건 조회 2회를 반복했습니다 (배치 N건이면 SQL 약 4N회).
+이 모듈은 get_new_messages() 배치의 서로 다른 user_id를 모아 테이블마다 IN (...) 조회 1회로
+이름 행을 가져오고, 닉네임 복호화도 한 번에 처리합니다.
+
+- 선택 규칙은 get_name_of_user_id와 같음: open_chat_member.nickname과 friends.name 중 더 긴 문자열
+  (같으면 open_chat_member), 구 DB(open_chat_member 없음)는 friends만
+- 복호화: 첫 번째 enc 후보는 batch_decrypt(decrypt_pool.decrypt)로 한 번에, 실패한 이름만 나머지 후보를
+  decrypt_memo로 시도 (첫 후보 결과는 메모에 넣어 두므로 다시 AES 하지 않음)
+- IN 목록은 SQLite 변수 개수 제한(기본 999) 아래로 chunk_size씩 나눠 조회
+
+사용법:
+    rows = fetch_sender_rows(cursor, user_ids, has_open_chat_member=True)   # user_id(str) -> (이름, enc)
+    names = decrypt_sender_names(rows, my_user_id, KakaoDecrypt.decrypt, memo, predictor,
+                                 batch_decrypt=pool.decrypt)                  # user_id(str) -> 이름 또는 None
+"""
+
+import os
+
+from ciphertext_classifier import is_ciphertext
+
+SENDER_NAME_CHUNK = int(os.getenv('SENDER_NAME_CHUNK', '500'))
+
+
+def _chunks(values, size):
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def _query_names(cursor, sql, user_ids, chunk_size):
+    """user_id IN (...) 조회 -> user_id(str) -> (이름, enc) (이름이 비어 있으면 제외)"""
+    result = {}
+    for chunk in _chunks(user_ids, chunk_size):
+        placeholders = ",".join("?" * len(chunk))
+        cursor.execute(sql.format(placeholders=placeholders), chunk)
+        for user_id, name, enc in cursor.fetchall():
+            if name:
+                result[str(user_id)] = (name, enc if enc is not None else 0)
+    return result
+
+
+def fetch_sender_rows(cursor, user_ids, has_open_chat_member, chunk_size=SENDER_NAME_CHUNK):
+    """
+    배치의 user_id들의 이름 행 조회 (db2가 attach된 연결의 cursor)
+
+    Returns:
+        dict: user_id(str) -> (암호화된 또는 평문 이름, enc) - 행이 없는 user_id는 제외
+    """
+    ids = list(dict.fromkeys(str(user_id) for user_id in user_ids if user_id))
+    if not ids:
+        return {}
+
+    friends = _query_names(cursor, "SELECT id, name, enc FROM db2.friends WHERE id IN ({placeholders})",
+                           ids, chunk_size)
+    if not has_open_chat_member:
+        return friends
+
+    members = _query_names(cursor, "SELECT user_id, nickname, enc FROM db2.open_chat_member "
+                                   "WHERE user_id IN ({placeholders})", ids, chunk_size)
+    return _merge_rows(ids, members, friends)
+
+
+def fetch_all_sender_rows(cursor, has_open_chat_member):
+    """open_chat_member/friends 전체 이름 행 (멤버 디렉터리 미리 읽기/갱신용, 선택 규칙은 fetch_sender_rows와 같음)"""
+    friends = _query_all(cursor, "SELECT id, name, enc FROM db2.friends")
+    if not has_open_chat_member:
+        return friends
+    members = _query_all(cursor, "SELECT user_id, nickname, enc FROM db2.open_chat_member")
+    return _merge_rows(dict.fromkeys(list(members) + list(friends)), members, friends)
+
+
+def _query_all(cursor, sql):
+    cursor.execute(sql)
+    return {str(user_id): (name, enc if enc is not None else 0) for user_id, name, enc in cursor.fetchall() if name}
+
+
+def _merge_rows(ids, members, friends):
+    rows = {}
+    for user_id in ids:
+        member = members.get(user_id)
+        friend = friends.get(user_id)
+        if member and friend:
+            # 더 긴 문자열 선택 (복호화 성공률 높이기 위해)
+            rows[user_id] = member if len(str(member[0])) >= len(str(friend[0])) else friend
+        elif member or friend:
+            rows[user_id] = member or friend
+    return rows
+
+
+def is_valid_name(decrypted, ciphertext):
+    """복호화 결과가 유효한 이름인지 (비어 있지 않고, 원문과 다르고, 제어 문자 없음)"""
+    if not decrypted or decrypted == ciphertext:
+        return False
+    return not any(ord(c) < 32 and c not in '\n\r\t' for c in decrypted)
+
+
+def decrypt_sender_names(rows, my_user_id, decrypt_func, memo, predictor, batch_decrypt=None):
+    """
+    이름 일괄 복호화
+
+    Args:
+        rows: fetch_sender_rows() 결과
+        my_user_id: 복호화 키 user_id (int)
+        decrypt_func: decrypt_func(user_id, enc, ciphertext) (KakaoDecrypt.decrypt)
+        memo: DecryptMemo
+        predictor: EncPredictor ("nickname" 출처)
+        batch_decrypt: [(ciphertext, user_id, enc), ...] -> [(plaintext, fail_reason), ...] (없으면 메모로 하나씩)
+
+    Returns:
+        (names, failed): user_id(str) -> 복호화된 이름 (평문 이름은 그대로, 복호화 실패 시 암호화된 이름),
+                         failed = 모든 enc 후보가 실패한 user_id 리스트
+    """
+    names = {}
+    pending = []  # (user_id, 암호문, enc 후보)
+    for user_id, (name, enc) in rows.items():
+        if my_user_id and is_ciphertext(name):
+            pending.append((user_id, name, predictor.candidates("nickname", hint=enc if enc > 0 else None)))
+        else:
+            names[user_id] = name
+
+    # 1. 첫 번째 후보: 메모에 없는 암호문만 한 번에 복호화 후 메모에 저장
+    if batch_decrypt and pending:
+        items = []
+        queued = set()
+        for user_id, name, candidates in pending:
+            key = (name, my_user_id, candidates[0])
+            if key not in queued and not memo.get(*key)[0]:
+                queued.add(key)
+                items.append(key)
+        if items:
+            for (name, _, enc), (plaintext, _) in zip(items, batch_decrypt(items)):
+                memo.put(name, my_user_id, enc, plaintext if is_valid_name(plaintext, name) else None)
+
+    # 2. 후보 순서대로 (첫 후보는 메모 적중), 실패한 이름만 다음 후보 AES
+    failed = []
+    for user_id, name, candidates in pending:
+        for enc_try in candidates:
+            decrypted = memo.decrypt(name, my_user_id, enc_try, decrypt_func)
+            if is_valid_name(decrypted, name):
+                predictor.record("nickname", None, enc_try, first_try=(enc_try == candidates[0]))
+                names[user_id] = decrypted
+                break
+        else:
+            predictor.record_failure("nickname")
+            names[user_id] = name
+            failed.append(user_id)
+    return names, failed
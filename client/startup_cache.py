@@ -0,0 +1,113 @@
+"""
+빠른 재시작용 캐시 / 시작 시간 측정
+==================================
+
+재시작할 때마다 chat_logs 컬럼 구조(PRAGMA table_info)와 db2의 open_chat_member 테이블 유무를
+다시 확인하고, 채팅/로그 테이블 전체 구조를 출력했습니다.
+이 모듈은 확인 결과를 SQLite schema_version(main, db2)을 키로 JSON 파일에 저장해 두고,
+스키마가 그대로면 다음 시작 때 그대로 사용합니다. (카카오톡 업데이트로 스키마가 바뀌면 키가 달라져 다시 확인)
+
+- StartupCache: ~/kakao_poller_startup.json (원자적 저장: 임시 파일 + os.replace)
+- StartupTimer: --startup-timing 보고용 단계별 경과 시간 (프로세스 시작 ~ 첫 메시지 전송)
+
+사용법:
+    cache = StartupCache()
+    key = schema_key(conn)                     # [main schema_version, db2 schema_version 또는 None]
+    schema = cache.load(DB_PATH, key)          # 스키마가 같으면 dict, 아니면 None
+    if schema is None:
+        schema = {"chat_logs_columns": [...], "has_open_chat_member": True}
+        cache.save(DB_PATH, key, schema)
+"""
+
+import os
+import json
+import time
+import sqlite3
+
+STARTUP_CACHE_FILE = os.getenv('STARTUP_CACHE_FILE', os.path.expanduser('~/kakao_poller_startup.json'))
+
+CACHE_FORMAT = 1
+
+
+def schema_key(conn, db2_attached=False):
+    """main/db2의 PRAGMA schema_version (DDL이 실행될 때마다 증가)"""
+    key = [conn.execute("PRAGMA main.schema_version").fetchone()[0], None]
+    if db2_attached:
+        try:
+            key[1] = conn.execute("PRAGMA db2.schema_version").fetchone()[0]
+        except sqlite3.Error:
+            pass
+    return key
+
+
+class StartupCache:
+    """schema_version을 키로 저장하는 DB 구조 확인 결과"""
+
+    def __init__(self, path=STARTUP_CACHE_FILE, log=print):
+        self.path = path
+        self.log = log
+        self.hits = 0
+        self.misses = 0
+
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("format") != CACHE_FORMAT:
+            return {}
+        return data
+
+    def load(self, db_path, key):
+        """저장된 구조 (db_path와 schema_version이 모두 같을 때만), 없으면 None"""
+        entry = self._read().get("databases", {}).get(db_path)
+        if not entry or entry.get("schema_key") != list(key):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.get("schema")
+
+    def save(self, db_path, key, schema):
+        data = self._read() or {"format": CACHE_FORMAT}
+        data.setdefault("databases", {})[db_path] = {
+            "schema_key": list(key),
+            "schema": schema,
+            "saved_at": int(time.time()),
+        }
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.log(f"[시작 캐시] 저장 실패: {e}")
+            return False
+        return True
+
+
+class StartupTimer:
+    """시작 단계별 경과 시간 (--startup-timing)"""
+
+    def __init__(self, start=None, clock=time.perf_counter):
+        self._clock = clock
+        self.start = start if start is not None else clock()
+        self.marks = []  # [(단계, 시작 기준 경과 초)]
+        self.reported = False
+
+    def mark(self, name):
+        self.marks.append((name, self._clock() - self.start))
+
+    def elapsed(self):
+        return self._clock() - self.start
+
+    def report(self, log=print):
+        """단계별 소요/누적 시간 출력 (1회)"""
+        if self.reported:
+            return
+        self.reported = True
+        log("[시작 시간] 단계별 소요 (누적)")
+        previous = 0.0
+        for name, at in self.marks:
+            log(f"[시작 시간]   {name}: {(at - previous) * 1000:.1f}ms ({at * 1000:.1f}ms)")
+            previous = at
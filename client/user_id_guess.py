@@ -0,0 +1,163 @@
+"""
+MY_USER_ID 빈도 기반 추정 (단일 스트리밍 패스)
+==============================================
+
+guess_my_user_id()는 채팅방마다
+`SELECT DISTINCT user_id FROM chat_logs WHERE chat_id = X AND user_id NOT IN (<멤버 전체>)` 문자열을 만들어 실행했고
+(수 GB DB에서 채팅방 수만큼 chat_logs 전체 스캔), 후보 출력용으로 전체 GROUP BY도 한 번 더 했습니다.
+
+- 빠른 경로: 최근 recent_rows개 행에서 json_extract(v, '$.isMine') = 1인 user_id (대부분 여기서 결정)
+- 스트리밍 패스: chat_logs (chat_id, user_id)를 최신 행부터 한 번만 읽으면서,
+  채팅방 멤버(Python set)에 없는 (채팅방, user_id) 쌍을 메모리에서 집계 (기존 NOT IN 쿼리와 같은 의미:
+  user_id마다 "멤버 목록에 없는 채팅방 수")
+- 시간 예산: time_budget초를 넘으면 그때까지 읽은 행으로 결정 (최신 행부터 읽으므로 최근 활동 기준)
+- 진행 보고: progress_every행마다 읽은 행 수 / 추정 전체 행 수(MAX(_id))
+
+환경 변수:
+    USER_ID_GUESS_RECENT_ROWS=5000      isMine 빠른 경로에서 볼 최근 행 수
+    USER_ID_GUESS_BUDGET_SEC=30         스트리밍 패스 시간 예산
+    USER_ID_GUESS_PROGRESS_ROWS=200000  진행 보고 간격 (행)
+
+사용법:
+    result = guess_user_id(cursor, log=print)
+    result["user_id"], result["method"], result["candidates"]  # [(user_id, 점수), ...]
+"""
+
+import os
+import json
+import time
+import sqlite3
+from collections import Counter
+
+GUESS_RECENT_ROWS = int(os.getenv('USER_ID_GUESS_RECENT_ROWS', '5000'))
+GUESS_TIME_BUDGET = float(os.getenv('USER_ID_GUESS_BUDGET_SEC', '30'))
+GUESS_PROGRESS_ROWS = int(os.getenv('USER_ID_GUESS_PROGRESS_ROWS', '200000'))
+FETCH_SIZE = 5000
+IS_MINE_MIN_ROWS = 3  # 빠른 경로 채택 최소 isMine 행 수
+IS_MINE_MIN_SHARE = 0.9  # isMine 행 중 최다 user_id의 비율이 이 값 이상이어야 채택
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def guess_from_is_mine(cursor, recent_rows=GUESS_RECENT_ROWS):
+    """
+    최근 행의 v.isMine으로 추정
+
+    Returns:
+        (user_id, isMine 행 수, 전체 isMine 행 수) 또는 None (JSON1 미지원, isMine 행 부족/불일치)
+    """
+    try:
+        cursor.execute('''
+            SELECT user_id, COUNT(*) AS cnt
+            FROM (SELECT user_id, v FROM chat_logs ORDER BY _id DESC LIMIT ?)
+            WHERE user_id IS NOT NULL
+              AND CASE WHEN json_valid(v) THEN json_extract(v, '$.isMine') END = 1
+            GROUP BY user_id
+            ORDER BY cnt DESC
+        ''', (recent_rows,))
+        rows = cursor.fetchall()
+    except sqlite3.OperationalError:
+        return None
+    total = sum(cnt for _, cnt in rows)
+    if not rows or rows[0][1] < IS_MINE_MIN_ROWS or rows[0][1] < total * IS_MINE_MIN_SHARE:
+        return None
+    return rows[0][0], rows[0][1], total
+
+
+def load_room_members(cursor):
+    """chat_rooms.members JSON -> {chat_id: set(user_id)} (멤버가 없는 채팅방은 제외, 기존 방식과 같음)"""
+    cursor.execute('SELECT id, members FROM chat_rooms')
+    room_members = {}
+    for chat_id, members_json in cursor.fetchall():
+        if not members_json:
+            continue
+        try:
+            members = json.loads(members_json)
+        except (json.JSONDecodeError, TypeError):
+            continue
+        if isinstance(members, list) and members:
+            room_members[chat_id] = {_as_int(member) for member in members}
+    return room_members
+
+
+def count_non_member_senders(cursor, room_members, time_budget=GUESS_TIME_BUDGET,
+                             progress_every=GUESS_PROGRESS_ROWS, clock=time.monotonic, log=print):
+    """
+    chat_logs 단일 패스: 채팅방 멤버 목록에 없는 발신자를 (채팅방, user_id) 쌍 단위로 집계
+
+    Returns:
+        dict: counter(user_id -> 멤버가 아닌 채팅방 수), messages(user_id -> 메시지 수), rows, complete, duration
+    """
+    started = clock()
+    try:
+        cursor.execute('SELECT MAX(_id) FROM chat_logs')
+        estimated_rows = cursor.fetchone()[0] or 0
+    except sqlite3.OperationalError:
+        estimated_rows = 0
+
+    counter = Counter()
+    messages = Counter()
+    seen_pairs = set()
+    rows = 0
+    complete = True
+    next_progress = progress_every
+    cursor.execute('SELECT chat_id, user_id FROM chat_logs ORDER BY _id DESC')
+    while True:
+        batch = cursor.fetchmany(FETCH_SIZE)
+        if not batch:
+            break
+        for chat_id, user_id in batch:
+            if user_id is None:
+                continue
+            messages[user_id] += 1
+            members = room_members.get(chat_id)
+            if members is not None and user_id not in members and (chat_id, user_id) not in seen_pairs:
+                seen_pairs.add((chat_id, user_id))
+                counter[user_id] += 1
+        rows += len(batch)
+        elapsed = clock() - started
+        if rows >= next_progress:
+            next_progress += progress_every
+            percent = f", {min(rows / estimated_rows, 1.0) * 100:.0f}%" if estimated_rows else ""
+            log(f"[user_id 추정] 진행: {rows:,}행{percent}, {elapsed:.1f}초, 후보 {len(counter)}개")
+        if time_budget and elapsed >= time_budget:
+            complete = False
+            log(f"[user_id 추정] 시간 예산 {time_budget:.0f}초 초과: 최근 {rows:,}행 기준으로 결정")
+            break
+
+    return {"counter": counter, "messages": messages, "rows": rows, "complete": complete,
+            "duration": clock() - started}
+
+
+def guess_user_id(cursor, recent_rows=GUESS_RECENT_ROWS, time_budget=GUESS_TIME_BUDGET,
+                  progress_every=GUESS_PROGRESS_ROWS, clock=time.monotonic, log=print):
+    """
+    MY_USER_ID 추정 (isMine 빠른 경로 -> 멤버 비교 스트리밍 패스)
+
+    Returns:
+        dict: user_id(없으면 None), method("isMine" / "members"), candidates([(user_id, 점수), ...]),
+              top_senders([(user_id, 메시지 수), ...]), rows, complete
+    """
+    fast = guess_from_is_mine(cursor, recent_rows)
+    if fast:
+        user_id, count, total = fast
+        return {"user_id": user_id, "method": "isMine", "candidates": [(user_id, count)], "total": total,
+                "top_senders": [], "rows": 0, "complete": True}
+
+    room_members = load_room_members(cursor)
+    scan = count_non_member_senders(cursor, room_members, time_budget, progress_every, clock, log)
+    candidates = scan["counter"].most_common()
+    return {
+        "user_id": candidates[0][0] if candidates else None,
+        "method": "members",
+        "candidates": candidates,
+        "total": sum(scan["counter"].values()),
+        "top_senders": scan["messages"].most_common(5),
+        "rows": scan["rows"],
+        "complete": scan["complete"],
+    }
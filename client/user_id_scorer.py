@@ -0,0 +1,241 @@
+"""
+MY_USER_ID 시험 복호화 스코어러
+===============================
+
+guess_my_user_id()의 빈도 기반 추정 대신, 실제 암호문(메시지 본문 + 닉네임)을
+후보 user_id마다 시험 복호화하여 정상 UTF-8로 풀리는 비율이 가장 높은 후보를 선택합니다.
+
+- 후보: open_profile.user_id + 최근 chat_logs 행(기본 5000개, _id 역순)에서 메시지가 많은 user_id 상위 N개
+  (전체 테이블 GROUP BY는 수백만 행에서 수 분 걸리므로 기본 키 끝에서 최근 행만 읽음)
+- 샘플: chat_logs의 암호화된 메시지 N개 + db2.open_chat_member / db2.friends의 암호화된 닉네임
+- 복호화: decrypt_many() (고속 PKCS12 + (user_id, enc)별 키 1회 유도),
+  후보 x 샘플 항목이 많으면 DecryptPool로 여러 프로세스에 분산
+- 결과: MY_USER_ID_FILE에는 기존과 같이 user_id만 저장 (다른 스크립트 호환),
+  신뢰도는 옆 파일(~/my_user_id.score.json)에 저장
+
+사용법:
+    from user_id_scorer import find_my_user_id, save_score
+
+    result = find_my_user_id(DB_PATH, DB_PATH2)
+    if result and result["accepted"]:
+        save_score(MY_USER_ID_FILE, result)
+"""
+
+import os
+import json
+import time
+import sqlite3
+
+from kakao_decrypt_module import decrypt_many
+from kakaodecrypt import KAKAO_PREFIXES
+from ciphertext_classifier import is_ciphertext
+
+try:
+    from decrypt_pool import DecryptPool
+    DECRYPT_POOL_AVAILABLE = True
+except ImportError:
+    DecryptPool = None
+    DECRYPT_POOL_AVAILABLE = False
+
+SAMPLE_LIMIT = int(os.getenv('USER_ID_SCORER_SAMPLES', '64'))
+CANDIDATE_LIMIT = int(os.getenv('USER_ID_SCORER_CANDIDATES', '50'))
+CANDIDATE_SCAN_ROWS = int(os.getenv('USER_ID_SCORER_SCAN_ROWS', '5000'))
+MIN_SUCCESS_RATE = 0.5  # 최고 후보의 성공률이 이 값 미만이면 채택하지 않음
+MIN_SAMPLES = 4
+
+
+def score_path(my_user_id_file):
+    """MY_USER_ID_FILE 옆에 저장되는 신뢰도 파일 경로 (~/my_user_id.txt -> ~/my_user_id.score.json)"""
+    return os.path.splitext(my_user_id_file)[0] + '.score.json'
+
+
+def collect_candidates(cursor, limit=CANDIDATE_LIMIT, scan_rows=CANDIDATE_SCAN_ROWS):
+    """후보 user_id 수집 (open_profile 우선, 이후 최근 scan_rows개 행의 메시지 수 내림차순)"""
+    candidates = []
+    try:
+        cursor.execute('SELECT user_id FROM open_profile LIMIT 1')
+        row = cursor.fetchone()
+        if row and row[0] is not None:
+            candidates.append(int(row[0]))
+    except (sqlite3.OperationalError, ValueError, TypeError):
+        pass
+
+    try:
+        cursor.execute('''
+            SELECT user_id, COUNT(*) as cnt
+            FROM (
+                SELECT user_id
+                FROM chat_logs
+                WHERE user_id IS NOT NULL
+                ORDER BY _id DESC
+                LIMIT ?
+            )
+            GROUP BY user_id
+            ORDER BY cnt DESC
+            LIMIT ?
+        ''', (scan_rows, limit))
+        for user_id, _ in cursor.fetchall():
+            try:
+                user_id = int(user_id)
+            except (ValueError, TypeError):
+                continue
+            if user_id > 0 and user_id not in candidates:
+                candidates.append(user_id)
+    except sqlite3.OperationalError:
+        pass
+    return candidates[:limit]
+
+
+def collect_samples(cursor, limit=SAMPLE_LIMIT, db2_attached=False):
+    """
+    시험 복호화용 암호문 샘플 수집
+
+    Returns:
+        (ciphertext, enc_type, source) 튜플 리스트 (source: "message" / "nickname")
+    """
+    samples = []
+    try:
+        cursor.execute('''
+            SELECT message, v
+            FROM chat_logs
+            WHERE message IS NOT NULL AND v LIKE '%"enc"%'
+            ORDER BY _id DESC
+            LIMIT ?
+        ''', (limit * 4,))
+        for message, v_field in cursor.fetchall():
+            if not is_ciphertext(message):
+                continue
+            try:
+                enc_type = json.loads(v_field).get("enc")
+            except (json.JSONDecodeError, TypeError, AttributeError):
+                continue
+            if isinstance(enc_type, int) and 0 <= enc_type < len(KAKAO_PREFIXES):
+                samples.append((message, enc_type, "message"))
+                if len(samples) >= limit:
+                    break
+    except sqlite3.OperationalError:
+        pass
+
+    if db2_attached:
+        nickname_limit = max(limit // 2, MIN_SAMPLES)
+        for query in ('SELECT nickname, enc FROM db2.open_chat_member WHERE enc > 0 LIMIT ?',
+                      'SELECT name, enc FROM db2.friends WHERE enc > 0 LIMIT ?'):
+            try:
+                cursor.execute(query, (nickname_limit * 2,))
+                added = 0
+                for name, enc_type in cursor.fetchall():
+                    if added >= nickname_limit:
+                        break
+                    if is_ciphertext(name) and isinstance(enc_type, int) and enc_type < len(KAKAO_PREFIXES):
+                        samples.append((name, enc_type, "nickname"))
+                        added += 1
+            except sqlite3.OperationalError:
+                continue
+    return samples
+
+
+def score_candidates(candidates, samples, pool=None):
+    """
+    후보별 시험 복호화 성공률 계산
+
+    Args:
+        candidates: 후보 user_id 리스트
+        samples: collect_samples() 결과
+        pool: DecryptPool (None이면 인라인 decrypt_many)
+
+    Returns:
+        [(user_id, success_rate, success_count), ...] 성공률 내림차순
+    """
+    if not candidates or not samples:
+        return []
+    items = [(ciphertext, user_id, enc_type) for user_id in candidates for ciphertext, enc_type, _ in samples]
+    results = pool.decrypt(items) if pool is not None else decrypt_many(items)
+
+    sample_count = len(samples)
+    scores = []
+    for index, user_id in enumerate(candidates):
+        chunk = results[index * sample_count:(index + 1) * sample_count]
+        success = sum(1 for plaintext, _ in chunk if plaintext)
+        scores.append((user_id, success / sample_count, success))
+    scores.sort(key=lambda s: s[1], reverse=True)
+    return scores
+
+
+def find_my_user_id(db_path, db_path2=None, sample_limit=SAMPLE_LIMIT, candidate_limit=CANDIDATE_LIMIT, pool=None, log=print):
+    """
+    DB에서 후보와 샘플을 수집하여 MY_USER_ID를 결정
+
+    Returns:
+        결과 dict (user_id, confidence, success_rate, runner_up, ...) 또는 None (후보/샘플 없음)
+        result["accepted"]가 False이면 성공률이 낮아 채택하지 않은 것
+    """
+    start = time.time()
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.cursor()
+        db2_attached = False
+        if db_path2 and os.path.exists(db_path2):
+            try:
+                cursor.execute("ATTACH DATABASE ? AS db2", (db_path2,))
+                db2_attached = True
+            except sqlite3.OperationalError as e:
+                log(f"[user_id 스코어] db2 attach 실패: {e}")
+        candidates = collect_candidates(cursor, candidate_limit)
+        samples = collect_samples(cursor, sample_limit, db2_attached)
+    finally:
+        conn.close()
+
+    if not candidates or len(samples) < MIN_SAMPLES:
+        log(f"[user_id 스코어] 후보/샘플 부족: 후보={len(candidates)}개, 샘플={len(samples)}개")
+        return None
+
+    if pool is None and DECRYPT_POOL_AVAILABLE:
+        pool = DecryptPool(log=log)
+        own_pool = True
+    else:
+        own_pool = False
+    try:
+        scores = score_candidates(candidates, samples, pool)
+    finally:
+        if own_pool:
+            pool.shutdown()
+
+    best_user_id, best_rate, best_success = scores[0]
+    runner_up_rate = scores[1][1] if len(scores) > 1 else 0.0
+    result = {
+        "user_id": best_user_id,
+        "success_rate": round(best_rate, 4),
+        # 신뢰도: 1위와 2위 성공률 차이 (정답 키만 대부분 풀리고 나머지는 거의 0%)
+        "confidence": round(best_rate - runner_up_rate, 4),
+        "success_count": best_success,
+        "sample_count": len(samples),
+        "candidate_count": len(candidates),
+        "runner_up": [{"user_id": u, "success_rate": round(r, 4)} for u, r, _ in scores[1:4]],
+        "accepted": best_rate >= MIN_SUCCESS_RATE,
+        "duration": round(time.time() - start, 3),
+        "scored_at": int(time.time()),
+    }
+    log(f"[user_id 스코어] 후보 {len(candidates)}개 x 샘플 {len(samples)}개 시험 복호화 "
+        f"({result['duration']:.2f}초): user_id={best_user_id}, 성공률={best_rate * 100:.1f}%, "
+        f"신뢰도={result['confidence']:.2f}")
+    return result
+
+
+def save_score(my_user_id_file, result):
+    """MY_USER_ID_FILE(user_id만)과 신뢰도 파일 저장"""
+    directory = os.path.dirname(my_user_id_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(my_user_id_file, 'w') as f:
+        f.write(str(result["user_id"]))
+    with open(score_path(my_user_id_file), 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+def load_score(my_user_id_file):
+    """저장된 신뢰도 정보 로드 (없거나 손상되면 None)"""
+    try:
+        with open(score_path(my_user_id_file), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
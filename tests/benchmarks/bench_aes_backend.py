@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AES 백엔드 벤치마크: 사용 가능한 백엔드별 64바이트 CBC 복호화 시간
+
+사용법:
+    python tests/benchmarks/bench_aes_backend.py
+"""
+
+import sys
+import os
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+tests_dir = os.path.dirname(script_dir)
+client_dir = os.path.join(os.path.dirname(tests_dir), 'client')
+for path in (tests_dir, client_dir):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import aes_backend
+
+
+def benchmark():
+    for backend in aes_backend.available_backends():
+        rounds = 20 if backend.name == "pure" else 2000
+        print(f"[벤치마크] {backend.name}: {aes_backend.benchmark(backend, rounds=rounds):.2f}us/회 (64바이트 CBC)")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+attachment zero-copy 벤치마크: 기존 dict 경로(json.loads + json.dumps) 대비 복호화+직렬화 시간
+
+사용법:
+    python tests/benchmarks/bench_attachment_zero_copy.py
+"""
+
+import sys
+import os
+import json
+import timeit
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+tests_dir = os.path.dirname(script_dir)
+client_dir = os.path.join(os.path.dirname(tests_dir), 'client')
+for path in (tests_dir, client_dir):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from attachment_decrypt import decrypt_attachment, decrypt_attachment_view, dumps_payload
+from test_attachment_zero_copy import encrypt, make_attachment, MY_USER_ID
+
+
+def benchmark(number=2000):
+    attachment = encrypt(make_attachment(40))
+
+    def dict_path():
+        decrypted = decrypt_attachment(attachment, 31, MY_USER_ID)
+        return json.dumps({"json": {"attachment": json.dumps(decrypted), "attachment_decrypted": decrypted}}, ensure_ascii=False)
+
+    def view_path():
+        view = decrypt_attachment_view(attachment, 31, MY_USER_ID)
+        return dumps_payload({"json": {"attachment": view.text, "attachment_decrypted": view}})
+
+    legacy = timeit.timeit(dict_path, number=number)
+    fast = timeit.timeit(view_path, number=number)
+    print(f"[벤치마크] attachment {len(attachment)}자: dict 경로 {legacy / number * 1e6:.1f}us/회, "
+          f"zero-copy 경로 {fast / number * 1e6:.1f}us/회 (x{legacy / fast:.1f})")
+
+
+if __name__ == "__main__":
+    benchmark()
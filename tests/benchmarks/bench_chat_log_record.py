@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ChatLogRecord 벤치마크: 기존 방식(행마다 list.index + json.loads 반복) 대비 필드 추출 시간
+
+사용법:
+    python tests/benchmarks/bench_chat_log_record.py
+"""
+
+import sys
+import os
+import json
+import timeit
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+tests_dir = os.path.dirname(script_dir)
+client_dir = os.path.join(os.path.dirname(tests_dir), 'client')
+for path in (tests_dir, client_dir):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from chat_log_record import ChatLogRecord, ColumnMap
+from test_chat_log_record import make_row, COLUMNS
+
+
+def legacy_fields(msg, select_columns):
+    """기존 poll_messages 방식: 행마다 list.index, v는 isMine/origin/본문 enc/채팅방 enc에서 각각 파싱"""
+    def get_column_index(col_name):
+        try:
+            return select_columns.index(col_name)
+        except ValueError:
+            return -1
+    type_idx = get_column_index("type")
+    attachment_idx = get_column_index("attachment")
+    referer_idx = get_column_index("referer")
+    v_field = msg[5]
+    is_mine = json.loads(v_field).get("isMine", False)
+    origin = json.loads(v_field).get("origin")
+    body_enc = json.loads(v_field).get("enc")
+    room_enc = json.loads(v_field).get("enc") or None
+    return msg[type_idx], msg[attachment_idx], msg[referer_idx], is_mine, origin, body_enc, room_enc
+
+
+def record_fields(msg, column_map):
+    record = ChatLogRecord(msg, column_map)
+    return (record.msg_type, record.attachment, record.referer, record.is_mine, record.origin,
+            record.body_enc_type, record.room_enc_hint)
+
+
+def benchmark(count=20000):
+    rows = [make_row(msg_id=i) for i in range(count)]
+    column_map = ColumnMap(COLUMNS)
+    assert legacy_fields(rows[0], COLUMNS) == record_fields(rows[0], column_map)
+    legacy = timeit.timeit(lambda: [legacy_fields(r, COLUMNS) for r in rows], number=1)
+    fast = timeit.timeit(lambda: [record_fields(r, column_map) for r in rows], number=1)
+    print(f"[벤치마크] {count}행 필드 추출: 기존 {legacy / count * 1e6:.2f}us/행, "
+          f"ChatLogRecord {fast / count * 1e6:.2f}us/행 (x{legacy / fast:.1f})")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+암호문 판별기 벤치마크: 기존 문자 단위 루프 대비 판별 시간
+
+사용법:
+    python tests/benchmarks/bench_ciphertext_classifier.py
+"""
+
+import sys
+import os
+import timeit
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+tests_dir = os.path.dirname(script_dir)
+client_dir = os.path.join(os.path.dirname(tests_dir), 'client')
+for path in (tests_dir, client_dir):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from ciphertext_classifier import is_ciphertext
+from test_ciphertext_classifier import encrypt, legacy_is_base64_like
+
+
+def benchmark(number=20000):
+    samples = [encrypt("환영합니다 " * n) for n in (1, 4, 16)] + ["안녕하세요 반갑습니다", "hello world"]
+    legacy = timeit.timeit(lambda: [legacy_is_base64_like(s) for s in samples], number=number)
+    fast = timeit.timeit(lambda: [is_ciphertext(s) for s in samples], number=number)
+    per_call = number * len(samples)
+    print(f"[벤치마크] 문자 단위 루프: {legacy / per_call * 1e6:.2f}us/회, "
+          f"ciphertext_classifier: {fast / per_call * 1e6:.2f}us/회 (x{legacy / fast:.1f})")
+
+
+if __name__ == "__main__":
+    benchmark()
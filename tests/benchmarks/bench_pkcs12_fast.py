@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PKCS12 키 유도 벤치마크: pkcs12_key 대비 pkcs12_key_fast 시간
+
+사용법:
+    python tests/benchmarks/bench_pkcs12_fast.py
+"""
+
+import sys
+import os
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+tests_dir = os.path.dirname(script_dir)
+client_dir = os.path.join(os.path.dirname(tests_dir), 'client')
+for path in (tests_dir, client_dir):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from kakaodecrypt import KakaoDecrypt, KAKAO_PASSWORD
+
+
+def benchmark(rounds=300):
+    salt = KakaoDecrypt.genSalt(429744344, 31)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        KakaoDecrypt.pkcs12_key(KAKAO_PASSWORD, salt)
+    slow = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(rounds):
+        KakaoDecrypt.pkcs12_key_fast(KAKAO_PASSWORD, salt)
+    fast = time.perf_counter() - start
+    print(f"[벤치마크] pkcs12_key: {slow / rounds * 1e6:.1f}us/회, pkcs12_key_fast: {fast / rounds * 1e6:.1f}us/회 (x{slow / fast:.1f})")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+반응 카운트 추출 벤치마크: 주기당 전체 json.loads 대비 json_extract / 폴백+지문 경로
+
+사용법:
+    python tests/benchmarks/bench_reaction_counts.py
+"""
+
+import sys
+import os
+import time
+import tempfile
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+tests_dir = os.path.dirname(script_dir)
+client_dir = os.path.join(os.path.dirname(tests_dir), 'client')
+for path in (tests_dir, client_dir):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from reaction_counts import ReactionCountReader
+from reaction_window import RECENT_WINDOW_WHERE
+from helpers import quiet, kakao_db_paths
+from test_reaction_counts import make_db, legacy_counts, BASE_TIME
+
+
+def benchmark(rows=200000, limit=1200, cycles=50):
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = make_db(kakao_db_paths(tmp)[0], rows=rows)
+        cursor = conn.cursor()
+        params = (rows - 20 * 60, BASE_TIME + rows - 20 * 60, limit)
+
+        start = time.perf_counter()
+        for _ in range(cycles):
+            legacy = legacy_counts(cursor, params)
+        legacy_time = (time.perf_counter() - start) / cycles
+
+        results = {}
+        for json1 in (True, False):
+            reader = ReactionCountReader(log=quiet)
+            reader.json1 = json1
+            start = time.perf_counter()
+            for _ in range(cycles):
+                fast = reader.query(cursor, RECENT_WINDOW_WHERE, params)
+            results[json1] = ((time.perf_counter() - start) / cycles, reader.parsed / cycles)
+            assert fast == legacy
+        print(f"[벤치마크] 최근 {limit}행, {cycles}주기 평균: 전체 json.loads {legacy_time * 1000:.2f}ms, "
+              f"json_extract {results[True][0] * 1000:.2f}ms (파싱 {results[True][1]:.0f}회), "
+              f"폴백+지문 {results[False][0] * 1000:.2f}ms (파싱 {results[False][1]:.1f}회)")
+        conn.close()
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+반응 스캔 _id 하한 벤치마크: 수백만 행 chat_logs에서 created_at 정렬 쿼리 대비 _id 범위 쿼리
+
+사용법:
+    python tests/benchmarks/bench_reaction_window.py
+"""
+
+import sys
+import os
+import time
+import tempfile
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+tests_dir = os.path.dirname(script_dir)
+client_dir = os.path.join(os.path.dirname(tests_dir), 'client')
+for path in (tests_dir, client_dir):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from reaction_window import RowidWindow, RECENT_REACTION_SQL
+from helpers import kakao_db_paths
+from test_reaction_window import make_db, LEGACY_SQL, BASE_TIME
+
+
+def benchmark(rows=3000000, cycles=20):
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = make_db(kakao_db_paths(tmp)[0], rows=rows, step=2, reaction_every=50)
+        cursor = conn.cursor()
+        now = BASE_TIME + rows * 2
+        threshold = now - 20 * 60
+
+        start = time.perf_counter()
+        for _ in range(cycles):
+            cursor.execute(LEGACY_SQL, (threshold, 1200))
+            legacy = cursor.fetchall()
+        legacy_time = (time.perf_counter() - start) / cycles
+
+        window = RowidWindow()
+        start = time.perf_counter()
+        for cycle in range(cycles):
+            cycle_threshold = threshold + cycle * 20  # 20초 주기
+            cursor.execute(RECENT_REACTION_SQL, (window.lower_bound(cursor, cycle_threshold), cycle_threshold, 1200))
+            fast = cursor.fetchall()
+        fast_time = (time.perf_counter() - start) / cycles
+        assert fast[0] == legacy[0]
+        print(f"[벤치마크] chat_logs {rows:,}행, 최근 20분: created_at 정렬 {legacy_time * 1000:.1f}ms, "
+              f"_id 범위 {fast_time * 1000:.2f}ms (x{legacy_time / fast_time:.0f}), 탐색 {window.stats()}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    benchmark()
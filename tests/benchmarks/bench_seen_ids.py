@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+처리 ID 집합 벤치마크: 기존 set + min() 방식 대비 확인+삽입 시간, 고정 메모리
+
+사용법:
+    python tests/benchmarks/bench_seen_ids.py
+"""
+
+import sys
+import os
+import timeit
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+tests_dir = os.path.dirname(script_dir)
+client_dir = os.path.join(os.path.dirname(tests_dir), 'client')
+for path in (tests_dir, client_dir):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from seen_ids import SeenIds
+
+
+def legacy_insert(ids, cap=2000):
+    """기존 sent_message_ids 방식: set + 상한 초과 시 삽입마다 min() 제거"""
+    sent = set()
+    for msg_id in ids:
+        if msg_id not in sent:
+            sent.add(msg_id)
+            if len(sent) > cap:
+                sent.discard(min(sent))
+    return sent
+
+
+def seen_insert(ids):
+    seen = SeenIds()
+    for msg_id in ids:
+        if msg_id not in seen:
+            seen.add(msg_id)
+    return seen
+
+
+def benchmark(count=20000):
+    ids = list(range(1, count + 1))
+    legacy = timeit.timeit(lambda: legacy_insert(ids), number=1)
+    fast = timeit.timeit(lambda: seen_insert(ids), number=1)
+    print(f"[벤치마크] {count}개 확인+삽입: set + min() {legacy / count * 1e6:.2f}us/개, "
+          f"SeenIds {fast / count * 1e6:.2f}us/개 (x{legacy / fast:.1f}), "
+          f"메모리: SeenIds 비트맵 {len(SeenIds()._bits)}바이트 고정")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MY_USER_ID 추정 벤치마크: 채팅방별 NOT IN 쿼리 대비 단일 스트리밍 패스
+
+사용법:
+    python tests/benchmarks/bench_user_id_guess.py
+"""
+
+import sys
+import os
+import time
+import tempfile
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+tests_dir = os.path.dirname(script_dir)
+client_dir = os.path.join(os.path.dirname(tests_dir), 'client')
+for path in (tests_dir, client_dir):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from user_id_guess import guess_user_id
+from helpers import quiet
+from test_user_id_guess import make_db, legacy_guess
+
+
+def benchmark(rooms=300, messages_per_room=1000):
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = make_db(os.path.join(tmp, 'KakaoTalk.db'), rooms=rooms, messages_per_room=messages_per_room)
+        start = time.perf_counter()
+        legacy = legacy_guess(conn.cursor())
+        legacy_time = time.perf_counter() - start
+        start = time.perf_counter()
+        result = guess_user_id(conn.cursor(), log=quiet)
+        fast_time = time.perf_counter() - start
+        assert legacy.most_common(1)[0][0] == result["user_id"]
+        print(f"[벤치마크] 채팅방 {rooms}개 x {messages_per_room}행: 채팅방별 NOT IN {legacy_time:.2f}초, "
+              f"단일 패스 {fast_time:.2f}초 (x{legacy_time / fast_time:.1f})")
+        conn.close()
+
+
+if __name__ == "__main__":
+    benchmark()
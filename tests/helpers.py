@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+테스트 공용 헬퍼
+- quiet: 출력 없는 log 함수
+- create_db / make_kakao_dbs: 카카오톡 DB(KakaoTalk.db / KakaoTalk2.db) 모양의 임시 SQLite DB 생성
+- 여러 테스트가 같이 쓰는 테이블 스키마 (friends, open_chat_member, chat_logs)
+
+pytest가 테스트 파일 디렉토리(tests/)를 sys.path에 추가하므로 `from helpers import quiet, ...`로 사용합니다.
+(tests/benchmarks/의 벤치마크 스크립트는 tests/를 직접 sys.path에 추가)
+"""
+
+import os
+import re
+import itertools
+import sqlite3
+
+KAKAO_DB = 'KakaoTalk.db'
+KAKAO_DB2 = 'KakaoTalk2.db'
+
+# KakaoTalk.db
+MESSAGE_CHAT_LOGS_TABLE = 'CREATE TABLE chat_logs (_id INTEGER PRIMARY KEY, message TEXT)'
+REACTION_CHAT_LOGS_TABLE = ('CREATE TABLE chat_logs (_id INTEGER PRIMARY KEY, id INTEGER, chat_id INTEGER, '
+                            'v TEXT, created_at INTEGER)')
+# KakaoTalk2.db
+FRIENDS_TABLE = 'CREATE TABLE friends (id INTEGER, name TEXT, enc INTEGER)'
+OPEN_CHAT_MEMBER_TABLE = 'CREATE TABLE open_chat_member (user_id INTEGER, nickname TEXT, enc INTEGER)'
+
+_TABLE_NAME_RE = re.compile(r'CREATE TABLE (?:IF NOT EXISTS )?(\w+)', re.IGNORECASE)
+
+
+def quiet(*args):
+    pass
+
+
+def kakao_db_paths(directory):
+    """directory 안의 (KakaoTalk.db, KakaoTalk2.db) 경로"""
+    return os.path.join(directory, KAKAO_DB), os.path.join(directory, KAKAO_DB2)
+
+
+def create_db(path, tables=(), wal=False, timeout=5.0):
+    """
+    테스트용 SQLite DB 생성 (커밋 후 열린 연결 반환)
+
+    Args:
+        tables: [(CREATE TABLE 문, 행 목록 또는 제너레이터), ...]
+                행은 모든 컬럼 값 (INTEGER PRIMARY KEY 자리에 None이면 자동 증가)
+        wal: journal_mode=WAL (카카오톡 DB와 같은 WAL 모드)
+    """
+    conn = sqlite3.connect(path, timeout=timeout)
+    if wal:
+        conn.execute("PRAGMA journal_mode=WAL")
+    for create_sql, rows in tables:
+        conn.execute(create_sql)
+        rows = iter(rows)  # 벤치마크용 수백만 행은 제너레이터로 받아 그대로 흘려보냄
+        first = next(rows, None)
+        if first is not None:
+            table = _TABLE_NAME_RE.match(create_sql).group(1)
+            conn.executemany(f"INSERT INTO {table} VALUES ({', '.join('?' * len(first))})",
+                             itertools.chain((first,), rows))
+    conn.commit()
+    return conn
+
+
+def make_kakao_dbs(directory, tables=(), tables2=(), wal=False):
+    """directory에 KakaoTalk.db / KakaoTalk2.db 생성 (연결은 닫음) -> (db_path, db_path2)"""
+    db_path, db_path2 = kakao_db_paths(directory)
+    create_db(db_path, tables, wal=wal).close()
+    create_db(db_path2, tables2, wal=wal).close()
+    return db_path, db_path2
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AES 백엔드 테스트
+- 모든 사용 가능한 백엔드가 pycryptodome과 같은 CBC/ECB 결과를 내는지
+- 순수 파이썬 폴백 (AES-128/192/256)
+- AES_BACKEND 강제 선택, 메트릭
+- KakaoDecrypt.decrypt가 선택된 백엔드와 무관하게 같은 결과
+- 모듈 import만으로는 암호 라이브러리를 import하지 않음 (첫 복호화까지 지연)
+
+벤치마크: python tests/benchmarks/bench_aes_backend.py
+"""
+
+import sys
+import os
+import base64
+import random
+import subprocess
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from Crypto.Cipher import AES
+
+import aes_backend
+from kakaodecrypt import KakaoDecrypt, KAKAO_IV
+
+MY_USER_ID = 429744344
+SEED = 20251222
+
+
+def encrypt(plaintext, user_id=MY_USER_ID, enc=31):
+    """테스트용 암호화 (PKCS5 패딩 + AES/CBC)"""
+    pt_bytes = plaintext.encode('utf-8')
+    pad_len = 16 - (len(pt_bytes) % 16)
+    padded = pt_bytes + bytes([pad_len] * pad_len)
+    aes = AES.new(KakaoDecrypt.get_key(user_id, enc), AES.MODE_CBC, KAKAO_IV)
+    return base64.b64encode(aes.encrypt(padded)).decode('ascii')
+
+
+def test_all_backends_match_reference():
+    rng = random.Random(SEED)
+    for backend in aes_backend.available_backends():
+        for key_size in (16, 24, 32):
+            for blocks in (1, 2, 5):
+                key = bytes(rng.randrange(256) for _ in range(key_size))
+                iv = bytes(rng.randrange(256) for _ in range(16))
+                data = bytes(rng.randrange(256) for _ in range(16 * blocks))
+                assert backend.decrypt_cbc(key, iv, data) == AES.new(key, AES.MODE_CBC, iv).decrypt(data), backend.name
+                assert backend.decrypt_ecb(key, data) == AES.new(key, AES.MODE_ECB).decrypt(data), backend.name
+
+
+def test_pure_backend_rejects_unaligned():
+    backend = aes_backend.PureBackend()
+    try:
+        backend.decrypt_cbc(bytes(32), bytes(16), bytes(15))
+        assert False
+    except ValueError:
+        pass
+
+
+def test_cbc_decryptor_chains_across_calls():
+    key = bytes(range(32))
+    data = bytes(range(64))
+    decryptor = aes_backend.CbcDecryptor(key, KAKAO_IV)
+    assert decryptor.decrypt(data[:32]) + decryptor.decrypt(data[32:]) == AES.new(key, AES.MODE_CBC, KAKAO_IV).decrypt(data)
+
+
+def test_forced_selection_and_metrics():
+    previous = aes_backend.get_backend().name
+    try:
+        for backend in aes_backend.available_backends():
+            aes_backend.select_backend(backend.name)
+            metrics = aes_backend.get_metrics()
+            assert metrics["backend"] == backend.name
+            assert metrics["selected_by"] == "env"
+            assert KakaoDecrypt.decrypt(MY_USER_ID, 31, encrypt("백엔드 " + backend.name)) == "백엔드 " + backend.name
+    finally:
+        aes_backend.select_backend(previous)
+
+
+def test_unknown_backend_falls_back():
+    previous = aes_backend.get_backend().name
+    try:
+        chosen = aes_backend.select_backend("does-not-exist")
+        assert chosen.name in aes_backend.get_metrics()["available"]
+        assert chosen.name != "pure" or aes_backend.get_metrics()["available"] == ["pure"]
+    finally:
+        aes_backend.select_backend(previous)
+
+
+class FailingBackend(aes_backend.PureBackend):
+    """벤치마크에서 항상 예외를 내는 백엔드 (깨진 네이티브 라이브러리 흉내)"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def decrypt_cbc(self, key, iv, data):
+        raise OSError("broken native library")
+
+
+def test_all_benchmarks_fail_falls_back_to_pure():
+    previous = aes_backend.get_backend().name
+    original = aes_backend.available_backends
+    aes_backend.available_backends = lambda: [FailingBackend("native-a"), FailingBackend("native-b"),
+                                              aes_backend.PureBackend()]
+    try:
+        chosen = aes_backend.select_backend()
+        metrics = aes_backend.get_metrics()
+        assert chosen.name == "pure"
+        assert metrics["selected_by"] == "fallback"
+        assert metrics["benchmark_us"] == {}
+    finally:
+        aes_backend.available_backends = original
+        aes_backend.select_backend(previous)
+
+
+def test_import_does_not_load_crypto_libraries():
+    code = ("import sys, kakao_decrypt_module, kakaodecrypt; "
+            "print(sorted(m for m in ('Crypto', 'cryptography') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=client_dir, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+attachment zero-copy 복호화 테스트
+- decrypt_attachment_view()가 decrypt_attachment()와 같은 내용을 반환
+- 필드를 읽기 전까지 json.loads 하지 않음
+- dumps_payload()가 json.loads로 검증된 JSON 텍스트만 재직렬화 없이 객체로 삽입 (ensure_ascii 유지)
+
+벤치마크 (기존 dict 경로 대비): python tests/benchmarks/bench_attachment_zero_copy.py
+"""
+
+import sys
+import os
+import json
+import base64
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from Crypto.Cipher import AES
+
+from kakaodecrypt import KakaoDecrypt, KAKAO_IV
+from attachment_decrypt import decrypt_attachment, decrypt_attachment_view, attachment_view, AttachmentView, dumps_payload
+from kakao_decrypt_module import decrypt_many
+
+MY_USER_ID = 429744344
+
+
+def encrypt(plaintext, user_id=MY_USER_ID, enc=31):
+    """테스트용 암호화 (PKCS5 패딩 + AES/CBC)"""
+    pt_bytes = plaintext.encode('utf-8')
+    pad_len = 16 - (len(pt_bytes) % 16)
+    padded = pt_bytes + bytes([pad_len] * pad_len)
+    aes = AES.new(KakaoDecrypt.get_key(user_id, enc), AES.MODE_CBC, KAKAO_IV)
+    return base64.b64encode(aes.encrypt(padded)).decode('ascii')
+
+
+def make_attachment(image_count=1):
+    return json.dumps({
+        "src_logId": 3412345678901234567,
+        "imageUrls": [f"https://talk.kakaocdn.net/dn/{i}/image.jpg" for i in range(image_count)],
+        "mentions": [],
+        "설명": "사진",
+    }, ensure_ascii=False, separators=(',', ':'))
+
+
+def test_view_matches_dict_path():
+    for enc in (29, 30, 31):
+        attachment = encrypt(make_attachment(3), enc=enc)
+        view = decrypt_attachment_view(attachment, enc, MY_USER_ID)
+        assert isinstance(view, AttachmentView)
+        assert view.as_dict() == decrypt_attachment(attachment, enc, MY_USER_ID)
+
+
+def test_lazy_parse():
+    view = decrypt_attachment_view(encrypt(make_attachment()), 31, MY_USER_ID)
+    assert not view.parsed
+    assert view.may_contain('"src_logId"')
+    assert view.may_contain_url()
+    assert not view.parsed
+    assert view.get("src_logId") == 3412345678901234567
+    assert view.parsed
+    assert not AttachmentView('{"type":"text"}').may_contain_url()
+
+
+def test_already_json():
+    view = decrypt_attachment_view('  {"src_message": 12}', 31, MY_USER_ID)
+    assert view.text == '{"src_message": 12}'
+    assert view.get("src_message") == 12
+
+
+def test_failures_return_none():
+    attachment = encrypt(make_attachment())
+    assert decrypt_attachment_view(attachment, 31, MY_USER_ID + 1) is None
+    assert decrypt_attachment_view("", 31, MY_USER_ID) is None
+    assert decrypt_attachment_view("안녕하세요", 31, MY_USER_ID) is None
+    assert decrypt_attachment_view(encrypt("그냥 텍스트"), 31, MY_USER_ID) is None
+
+
+def test_line_wrapped_ciphertext():
+    """앞 100자만 검사하는 기존 조건 유지: 줄바꿈이 섞인 base64도 복호화 (base64 디코더가 줄바꿈 무시)"""
+    attachment = encrypt(make_attachment(3))
+    wrapped = "\n".join(attachment[i:i + 120] for i in range(0, len(attachment), 120))
+    expected = json.loads(make_attachment(3))
+    assert decrypt_attachment(wrapped, 31, MY_USER_ID) == expected
+    assert decrypt_attachment_view(wrapped, 31, MY_USER_ID).as_dict() == expected
+
+
+def test_batch_plaintext_requires_json():
+    """배치 선복호화(decrypt_many 평문 -> attachment_view)도 개별 경로처럼 JSON이 아니면 제외"""
+    items = [(encrypt(make_attachment()), MY_USER_ID, 31), (encrypt("그냥 텍스트"), MY_USER_ID, 31)]
+    (json_text, _), (plain_text, fail_reason) = decrypt_many(items)
+    assert plain_text == "그냥 텍스트" and fail_reason is None  # 복호화 자체는 성공
+    assert attachment_view(plain_text) is None
+    assert attachment_view(json_text).as_dict() == decrypt_attachment(items[0][0], 31, MY_USER_ID)
+    assert attachment_view(None) is None
+
+
+def test_dumps_payload_embeds_object():
+    view = decrypt_attachment_view(encrypt(make_attachment(2)), 31, MY_USER_ID)
+    payload = {"type": "message", "json": {"_id": 1, "attachment": view.text, "attachment_decrypted": view}}
+    decoded = json.loads(dumps_payload(payload))
+    assert decoded["json"]["attachment_decrypted"] == json.loads(view.text)
+    assert decoded["json"]["attachment"] == view.text
+    assert view.parsed  # 삽입 전에 json.loads로 검증 (재직렬화는 하지 않음)
+
+
+def test_dumps_payload_fallbacks():
+    plain = {"type": "message", "json": {"attachment_decrypted": {"a": 1}}}
+    assert json.loads(dumps_payload(plain)) == plain
+    view = AttachmentView('{"a": "줄\\n바꿈",\n "b": 2}')
+    decoded = json.loads(dumps_payload({"json": {"attachment_decrypted": view}}))
+    assert decoded["json"]["attachment_decrypted"] == {"a": "줄\n바꿈", "b": 2}
+    # 검증되지 않은(깨진) JSON은 삽입하지 않음 -> payload 자체는 항상 유효한 JSON
+    broken = AttachmentView('{"a": 1, broken}')
+    assert not broken.is_embeddable()
+    decoded = json.loads(dumps_payload({"json": {"attachment_decrypted": broken}}))
+    assert decoded["json"]["attachment_decrypted"] is None
+    for text in ('[1, 2]', '{"a": 1} {"b": 2}'):
+        assert json.loads(dumps_payload({"json": {"attachment_decrypted": AttachmentView(text)}}))
+
+
+def test_dumps_payload_ensure_ascii():
+    payload = {"type": "message", "json": {"attachment_decrypted": AttachmentView('{"a": "한글"}')}}
+    expected = json.dumps({"type": "message", "json": {"attachment_decrypted": {"a": "한글"}}}, ensure_ascii=True)
+    assert dumps_payload(payload, ensure_ascii=True) == expected
+    assert dumps_payload(payload).isascii() is False
+    ascii_view = AttachmentView('{"a": "abc"}')
+    assert ascii_view.is_embeddable(ensure_ascii=True)
+    assert dumps_payload({"json": {"attachment_decrypted": ascii_view}}, ensure_ascii=True) == \
+        '{"json": {"attachment_decrypted": {"a": "abc"}}}'
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+캐치업 모드 테스트
+- 백로그가 threshold를 넘으면 큰 페이지, 줄어들면 평상시 LIMIT으로 복귀
+- 키셋 페이지네이션으로 백로그 전체를 빠짐없이 조회
+- 진행률 보고 주기
+"""
+
+import sys
+import os
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from catchup import CatchupTracker
+from helpers import quiet, create_db, MESSAGE_CHAT_LOGS_TABLE
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_mode_switch():
+    logs = []
+    tracker = CatchupTracker(steady_limit=10, threshold=200, page_size=500, log=logs.append)
+    assert tracker.plan(0, 50) == 10
+    assert not tracker.active
+    assert tracker.plan(0, 20000) == 500
+    assert tracker.active
+    assert tracker.plan(19900, 20000) == 10
+    assert not tracker.active
+    assert tracker.stats()["sessions"] == 1
+    assert any("[캐치업] 시작" in line for line in logs)
+    assert any("[캐치업] 완료" in line for line in logs)
+
+
+def test_unknown_latest_id_stays_steady():
+    tracker = CatchupTracker(steady_limit=10, threshold=200, log=quiet)
+    assert tracker.plan(100, None) == 10
+    assert not tracker.active
+
+
+def test_progress_interval():
+    clock = FakeClock()
+    logs = []
+    tracker = CatchupTracker(steady_limit=10, threshold=200, page_size=500, progress_interval=5,
+                             log=logs.append, clock=clock)
+    tracker.plan(0, 5000)
+    clock.now = 1.0
+    tracker.advance(500, 500, 5000)
+    assert not any("진행" in line for line in logs)
+    clock.now = 6.0
+    tracker.advance(500, 1000, 5000)
+    progress = [line for line in logs if "진행" in line]
+    assert len(progress) == 1
+    assert "1000개 처리" in progress[0]
+    assert "4000개" in progress[0]
+
+
+def test_keyset_drains_backlog():
+    """poll_messages와 같은 방식(plan -> _id > ? LIMIT ? -> 페이지 끝으로 커서 이동)으로 전체 조회"""
+    conn = create_db(":memory:", [(MESSAGE_CHAT_LOGS_TABLE, [(i, f"m{i}") for i in range(1, 5001)])])
+    tracker = CatchupTracker(steady_limit=10, threshold=200, page_size=500, log=quiet)
+
+    last_id = 0
+    seen = []
+    queries = 0
+    while True:
+        latest_id = conn.execute("SELECT MAX(_id) FROM chat_logs").fetchone()[0]
+        limit = tracker.plan(last_id, latest_id)
+        rows = conn.execute("SELECT _id FROM chat_logs WHERE _id > ? ORDER BY _id ASC LIMIT ?", (last_id, limit)).fetchall()
+        queries += 1
+        if not rows:
+            break
+        tracker.advance(len(rows), rows[-1][0], latest_id)
+        seen.extend(r[0] for r in rows)
+        last_id = rows[-1][0]
+        if len(rows) < limit:
+            break
+    assert seen == list(range(1, 5001))
+    assert queries < 5000 // 10  # 평상시 LIMIT 10이면 500회
+    assert not tracker.active or tracker.plan(last_id, 5000) == 10
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ChatLogRecord 테스트
+- 컬럼 이름 접근 (컬럼 순서/누락과 무관)
+- v / attachment 지연 파싱 1회 + 캐시
+- enc 규칙 (encType 컬럼, v.enc 우선, 채팅방 힌트)
+- 이미지 URL 탐색
+
+벤치마크 (행마다 list.index + json.loads 반복하던 기존 방식 대비): python tests/benchmarks/bench_chat_log_record.py
+"""
+
+import sys
+import os
+import json
+from unittest import mock
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+import chat_log_record
+from chat_log_record import ChatLogRecord, ColumnMap, is_image_url, find_image_url_in_dict
+
+COLUMNS = ["_id", "chat_id", "user_id", "message", "created_at", "v", "type", "attachment", "referer", "supplement"]
+
+
+def make_row(msg_id=10, v=None, msg_type=1, attachment=None, referer=None):
+    v = json.dumps(v if v is not None else {"isMine": False, "enc": 30, "origin": "MSG"})
+    return (msg_id, 1800, 5000001, "hello", 1700000000, v, msg_type, attachment, referer, None)
+
+
+def test_named_fields():
+    column_map = ColumnMap(COLUMNS)
+    record = ChatLogRecord(make_row(referer=7), column_map)
+    assert record.msg_id == 10 and record.chat_id == 1800 and record.user_id == 5000001
+    assert record.message == "hello" and record.msg_type == 1 and record.referer == 7
+    assert record.kakao_user_id_raw is None and record.db_enc_type is None  # 없는 컬럼
+    assert "type" in column_map and "userId" not in column_map
+
+    # 컬럼 순서가 달라도 같은 값
+    reordered = ["v", "_id", "message", "chat_id", "user_id", "created_at"]
+    row = make_row()
+    record2 = ChatLogRecord(tuple(row[COLUMNS.index(c)] for c in reordered), ColumnMap(reordered))
+    assert record2.msg_id == 10 and record2.message == "hello" and record2.origin == "MSG"
+    assert record2.msg_type is None and record2.attachment is None
+
+
+def test_v_parsed_once():
+    record = ChatLogRecord(make_row(v={"isMine": True, "enc": 30, "origin": "SYNCMSG"}), ColumnMap(COLUMNS))
+    with mock.patch.object(chat_log_record.json, "loads", wraps=json.loads) as loads:
+        assert record.is_mine
+        assert record.origin == "SYNCMSG"
+        assert record.body_enc_type == 30
+        assert record.room_enc_hint == 30
+        assert loads.call_count == 1
+
+
+def test_enc_rules():
+    column_map = ColumnMap(COLUMNS + ["encType"])
+    record = ChatLogRecord(make_row(v={"enc": 0}) + (None,), column_map)
+    assert record.enc_type == 31  # encType NULL -> 기본값
+    assert record.body_enc_type == 0  # v.enc 우선 (0 포함)
+    assert record.room_enc_hint is None  # 0은 힌트 없음
+
+    record = ChatLogRecord(make_row(v={}) + (26,), column_map)
+    assert record.enc_type == 26 and record.body_enc_type == 26
+
+    broken = ChatLogRecord((1, 2, 3, "x", 4, "{not json"), ColumnMap(COLUMNS[:6]))
+    assert broken.v == {} and not broken.is_mine and broken.body_enc_type == 31
+
+
+def test_attachment_json():
+    attachment = json.dumps({"url": "https://k.kakaocdn.net/a.jpg", "src_logId": 99})
+    record = ChatLogRecord(make_row(msg_type=2, attachment=attachment), ColumnMap(COLUMNS))
+    with mock.patch.object(chat_log_record.json, "loads", wraps=json.loads) as loads:
+        assert record.attachment_json["src_logId"] == 99
+        assert record.attachment_json["url"].endswith("a.jpg")
+        assert loads.call_count == 1
+
+    encrypted = ChatLogRecord(make_row(attachment="U2FsdGVkX1+abcdefghijklmnop=="), ColumnMap(COLUMNS))
+    assert encrypted.attachment_json is None
+    assert ChatLogRecord(make_row(attachment=None), ColumnMap(COLUMNS)).attachment_json is None
+
+
+def test_from_dict():
+    record = ChatLogRecord.from_dict({"_id": 5, "chat_id": 9, "v": '{"enc": 30}', "encType": 31})
+    assert record.msg_id == 5 and record.room_enc_hint == 30 and record.enc_type == 31
+
+
+def test_image_url_helpers():
+    assert is_image_url("https://k.kakaocdn.net/dn/x.png")
+    assert is_image_url("content://media/external/images/1")
+    assert not is_image_url("hello")
+    logs = []
+    data = {"meta": {"list": [{"thumb": "file:///sdcard/a.webp"}]}}
+    assert find_image_url_in_dict(data, log=logs.append) == "file:///sdcard/a.webp"
+    assert find_image_url_in_dict({"imageUrls": ["https://x/1.jpg", "https://x/2.jpg"]}, log=logs.append) == "https://x/1.jpg"
+    assert find_image_url_in_dict({"a": 1}, log=logs.append) is None
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+체크포인트 저장소 테스트
+- 메모리 값은 즉시, 파일 커밋은 묶음 (주기 / 개수)
+- 재시작 시 커밋된 위치부터 재개
+- 기존 last_message_id.txt 가져오기
+- 뒤로 가지 않음
+- 계속 실패하는 메시지는 재시도 상한 후 포기하고 뒤 메시지 전달 (체크포인트 정체 없음)
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from checkpoint_store import CheckpointStore, SendRetryBudget
+from seen_ids import SeenIds
+from helpers import quiet
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def committed_value(path):
+    conn = sqlite3.connect(path)
+    try:
+        row = conn.execute("SELECT last_id FROM checkpoint WHERE name = 'chat_logs'").fetchone()
+        return row[0] if row else None
+    finally:
+        conn.close()
+
+
+def test_batched_commits():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "state.db")
+        clock = FakeClock()
+        store = CheckpointStore(path, commit_interval=0.5, commit_every=10, clock=clock, log=quiet)
+        assert store.last_id == 0
+        for msg_id in range(1, 6):
+            store.advance(msg_id)
+        assert store.last_id == 5
+        assert store.dirty
+        assert committed_value(path) is None
+
+        for msg_id in range(6, 11):
+            store.advance(msg_id)
+        assert committed_value(path) == 10  # commit_every 도달
+        assert not store.dirty
+
+        store.advance(11)
+        store.commit_if_due()
+        assert committed_value(path) == 10
+        clock.now = 1.0
+        store.commit_if_due()
+        assert committed_value(path) == 11
+        store.close()
+
+
+def test_resume_after_restart():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "state.db")
+        store = CheckpointStore(path, commit_interval=60, commit_every=1000, log=quiet)
+        store.advance(500, count=500)
+        store.advance(700, count=200)
+        store.close()  # 남은 값 커밋
+        assert CheckpointStore(path, log=quiet).last_id == 700
+
+        # 비정상 종료(close 없음): 마지막 커밋 위치부터 재개 (건너뛰지 않음)
+        store = CheckpointStore(path, commit_interval=60, commit_every=1000, log=quiet)
+        store.advance(900)
+        assert CheckpointStore(path, log=quiet).last_id == 700
+
+
+def test_never_moves_backwards():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CheckpointStore(os.path.join(tmp, "state.db"), log=quiet)
+        assert store.advance(100)
+        assert not store.advance(50)
+        assert not store.advance(None)
+        assert store.last_id == 100
+        store.close()
+
+
+def test_imports_legacy_state_file():
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = os.path.join(tmp, "last_message_id.txt")
+        with open(legacy, 'w') as f:
+            f.write("12345")
+        path = os.path.join(tmp, "state.db")
+        logs = []
+        store = CheckpointStore(path, legacy_file=legacy, log=logs.append)
+        assert store.last_id == 12345
+        assert committed_value(path) == 12345
+        assert any("[체크포인트]" in line for line in logs)
+        store.close()
+
+        # 이후에는 SQLite 값 우선
+        with open(legacy, 'w') as f:
+            f.write("1")
+        assert CheckpointStore(path, legacy_file=legacy, log=quiet).last_id == 12345
+
+
+def run_poll_cycles(store, seen, retries, send, total=30, fetch_limit=10, cycles=20, connected=lambda: True):
+    """poll_messages의 조회/전송/체크포인트 전진 흐름 (_id > last_id LIMIT fetch_limit)"""
+    delivered = []
+    for _ in range(cycles):
+        last_id = store.last_id
+        fetched = list(range(last_id + 1, min(last_id + fetch_limit, total) + 1))
+        if not fetched:
+            break
+        failed_ids = []
+        for msg_id in fetched:
+            if msg_id in seen:
+                continue
+            if send(msg_id):
+                seen.add(msg_id)
+                retries.succeeded(msg_id)
+                delivered.append(msg_id)
+            elif retries.failed(msg_id, counted=connected()):
+                seen.discard(msg_id)
+                failed_ids.append(msg_id)
+            else:
+                seen.add(msg_id)
+        done_upto = min(failed_ids) - 1 if failed_ids else fetched[-1]
+        if store.advance(done_upto, count=len(fetched)):
+            seen.advance_to(done_upto)
+    return delivered
+
+
+def test_poison_message_does_not_stall():
+    with tempfile.TemporaryDirectory() as tmp:
+        seen = SeenIds()
+        store = CheckpointStore(os.path.join(tmp, "state.db"), state=seen, log=quiet)
+        logs = []
+        retries = SendRetryBudget(max_retries=3, log=logs.append)
+        attempts = []
+
+        def send(msg_id):
+            attempts.append(msg_id)
+            return msg_id != 5  # 5번은 항상 실패 (예: payload 오류)
+
+        delivered = run_poll_cycles(store, seen, retries, send)
+        assert delivered == [i for i in range(1, 31) if i != 5]  # 창(1~10) 뒤 메시지도 전달
+        assert attempts.count(5) == 3 and store.last_id == 30
+        assert retries.stats()["given_up"] == 1 and retries.given_up == [5]
+        assert any("[전송 포기] msg_id=5" in line for line in logs)
+        store.close()
+
+
+def test_disconnected_failures_are_not_counted():
+    with tempfile.TemporaryDirectory() as tmp:
+        seen = SeenIds()
+        store = CheckpointStore(os.path.join(tmp, "state.db"), state=seen, log=quiet)
+        retries = SendRetryBudget(max_retries=3, log=quiet)
+        # 서버 연결이 끊긴 동안에는 포기하지 않고 체크포인트 유지
+        assert run_poll_cycles(store, seen, retries, lambda msg_id: False, cycles=10,
+                               connected=lambda: False) == []
+        assert store.last_id == 0 and retries.stats()["given_up"] == 0
+        # 다시 연결되면 처음부터 전달
+        assert run_poll_cycles(store, seen, retries, lambda msg_id: True) == list(range(1, 31))
+        store.close()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+공용 암호문 판별기 테스트
+- EMPTY / JSON / CIPHERTEXT / PLAINTEXT 분류
+- 실제 암호문(메시지/닉네임 길이)은 모두 CIPHERTEXT
+- looks_like_base64 / has_base64_prefix는 기존 발신자 이름/attachment 판별식과 같은 결과
+
+벤치마크 (기존 문자 단위 루프 대비): python tests/benchmarks/bench_ciphertext_classifier.py
+"""
+
+import sys
+import os
+import base64
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from Crypto.Cipher import AES
+
+from kakaodecrypt import KakaoDecrypt, KAKAO_IV
+from ciphertext_classifier import (classify, is_ciphertext, is_base64_text, looks_like_base64, has_base64_prefix,
+                                   EMPTY, JSON, CIPHERTEXT, PLAINTEXT)
+
+MY_USER_ID = 429744344
+BASE64_CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/='
+
+
+def encrypt(plaintext, user_id=MY_USER_ID, enc=31):
+    """테스트용 암호화 (PKCS5 패딩 + AES/CBC)"""
+    pt_bytes = plaintext.encode('utf-8')
+    pad_len = 16 - (len(pt_bytes) % 16)
+    padded = pt_bytes + bytes([pad_len] * pad_len)
+    aes = AES.new(KakaoDecrypt.get_key(user_id, enc), AES.MODE_CBC, KAKAO_IV)
+    return base64.b64encode(aes.encrypt(padded)).decode('ascii')
+
+
+def legacy_is_base64_like(value):
+    """기존 send_to_server 판별식"""
+    return (isinstance(value, str) and
+            len(value) > 10 and
+            len(value) % 4 == 0 and
+            all(c in BASE64_CHARS for c in value))
+
+
+def legacy_attachment_is_base64_like(value):
+    """기존 decrypt_attachment 판별식 (strip 후)"""
+    return (len(value) > 10 and
+            not value.startswith('{') and
+            all(c in BASE64_CHARS for c in value[:100]))
+
+
+LEGACY_SAMPLES = [
+    "", "QUJD", "안녕하세요", "hello world", "Administrator1234567890A", "ab=c" * 8, "!!!!" * 6,
+    "A" * 12, "A" * 13, '{"a": "AAAAAAAAAAAA"}', "[AAAAAAAAAAAA]",
+    "A" * 100 + "!!", "A" * 99 + "!!", encrypt("x" * 40)[:60] + "\n" + encrypt("x" * 40)[60:],
+] + [encrypt("메시지 " * i) for i in range(5)]
+
+
+def test_empty():
+    for value in (None, "", "   ", "\n"):
+        assert classify(value) == EMPTY
+
+
+def test_json():
+    assert classify('{"a": 1}') == JSON
+    assert classify('  [1, 2]') == JSON
+    assert not is_ciphertext('{"a": 1}')
+
+
+def test_real_ciphertexts():
+    for plaintext in ("a", "라이언", "x" * 15, "x" * 16, "환영합니다 " * 30):
+        for enc in (30, 31):
+            ciphertext = encrypt(plaintext, enc=enc)
+            assert classify(ciphertext) == CIPHERTEXT, ciphertext
+            assert classify(f"  {ciphertext}\n") == CIPHERTEXT
+
+
+def test_plaintexts():
+    for value in ("안녕하세요", "hello world", "abcdefgh", "ㅋㅋㅋㅋ", "https://example.com/a.jpg",
+                  "Administrator1234567890A",  # base64 문자 24자지만 디코딩 18바이트 (블록 배수 아님)
+                  "QUJD", "ab=c" * 8, "!!!!" * 6):
+        assert classify(value) == PLAINTEXT, value
+
+
+def test_agrees_with_legacy_on_ciphertexts():
+    """기존 판별식이 암호문으로 본 실제 암호문은 새 판별기도 암호문으로 판별"""
+    for i in range(50):
+        ciphertext = encrypt("메시지 " * i)
+        assert legacy_is_base64_like(ciphertext)
+        assert is_ciphertext(ciphertext)
+
+
+def test_legacy_gates_unchanged():
+    """발신자 이름/attachment 호출부는 기존 느슨한 조건 유지 (블록 길이가 안 맞아도 True)"""
+    for value in LEGACY_SAMPLES:
+        assert looks_like_base64(value) == legacy_is_base64_like(value), value
+        assert has_base64_prefix(value) == legacy_attachment_is_base64_like(value), value
+    assert looks_like_base64("Administrator1234567890A") and not is_ciphertext("Administrator1234567890A")
+    assert not looks_like_base64(None) and not has_base64_prefix(None)
+
+
+def test_is_base64_text():
+    assert is_base64_text("QUJDRA==")
+    assert not is_base64_text("안녕")
+    assert not is_base64_text("")
+    assert not is_base64_text(None)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DB 변경 감지 가드 테스트
+- 변경이 없으면 작업별로 건너뜀 (실행/건너뜀 횟수 집계)
+- main/db2 커밋(WAL 모드 포함) 시 다시 실행
+- reset() 후에는 변경이 없어도 실행
+- 스냅샷을 읽는 작업: 원본이 그대로여도 스냅샷이 갱신되면 실행
+"""
+
+import sys
+import os
+import tempfile
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from db_change_guard import DbChangeGuard
+from helpers import quiet, create_db, kakao_db_paths, REACTION_CHAT_LOGS_TABLE, FRIENDS_TABLE
+
+
+def make_dbs(directory):
+    db_path, db_path2 = kakao_db_paths(directory)
+    writer = create_db(db_path, [(REACTION_CHAT_LOGS_TABLE, [])], wal=True)
+    writer2 = create_db(db_path2, [(FRIENDS_TABLE, [])])
+    return db_path, db_path2, writer, writer2
+
+
+def test_skip_until_change():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, db_path2, writer, writer2 = make_dbs(tmp)
+        guard = DbChangeGuard(db_path, db_path2, log=quiet)
+        assert guard.should_run("reaction_scan")  # 처음은 실행
+        assert guard.should_run("reaction_backfill")  # 작업별로 따로 기억
+        for _ in range(10):
+            assert not guard.should_run("reaction_scan")
+        assert not guard.should_run("reaction_backfill")
+
+        writer.execute("INSERT INTO chat_logs (v) VALUES ('{}')")
+        writer.commit()
+        assert guard.should_run("reaction_scan")
+        assert not guard.should_run("reaction_scan")
+
+        writer2.execute("INSERT INTO friends VALUES (1, 'a', 0)")
+        writer2.commit()
+        assert guard.should_run("reaction_scan")
+        assert guard.should_run("reaction_backfill")
+
+        stats = guard.stats()
+        assert stats["reaction_scan"] == {"executed": 3, "skipped": 11}
+        assert stats["reaction_backfill"] == {"executed": 2, "skipped": 1}
+        guard.close()
+        writer.close()
+        writer2.close()
+
+
+def test_reset_forces_next_run():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, db_path2, writer, writer2 = make_dbs(tmp)
+        guard = DbChangeGuard(db_path, db_path2, log=quiet)
+        guard.should_run("reaction_scan")
+        guard.reset("reaction_scan")
+        assert guard.should_run("reaction_scan")
+        assert not guard.should_run("reaction_scan")
+        guard.close()
+        writer.close()
+        writer2.close()
+
+
+def test_snapshot_refresh_reruns():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, db_path2, writer, writer2 = make_dbs(tmp)
+        guard = DbChangeGuard(db_path, db_path2, log=quiet)
+        assert guard.should_run("reaction_scan", source=1)
+        # 반응이 기록됨 -> 아직 갱신 전인 스냅샷(1)을 읽으며 토큰을 소비
+        writer.execute("INSERT INTO chat_logs (v) VALUES ('{\"defaultEmoticonsCount\": 1}')")
+        writer.commit()
+        assert guard.should_run("reaction_scan", source=1)
+        assert not guard.should_run("reaction_scan", source=1)
+        # 스냅샷 갱신(2): 원본은 그대로지만 새 복사본에 반응이 있으므로 다시 실행
+        assert guard.should_run("reaction_scan", source=2)
+        assert not guard.should_run("reaction_scan", source=2)
+        guard.close()
+        writer.close()
+        writer2.close()
+
+
+def test_unreadable_db_always_runs():
+    with tempfile.TemporaryDirectory() as tmp:
+        guard = DbChangeGuard(os.path.join(tmp, 'missing.db'), log=quiet)
+        assert guard.should_run("reaction_scan") and guard.should_run("reaction_scan")
+        guard.close()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+읽기 전용 연결 관리자 테스트
+- 연결 재사용 + db2 1회 attach
+- 쓰기 차단 (mode=ro / query_only)
+- 반납 시 읽기 스냅샷 해제 (WAL 체크포인트를 막지 않음)
+- DB 파일 교체(inode 변경) 시 재연결
+- release_thread(): 끝난 스레드의 연결은 close() 전에 닫힘
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from db_connection import DbConnectionManager
+from helpers import quiet, create_db, kakao_db_paths, MESSAGE_CHAT_LOGS_TABLE, FRIENDS_TABLE
+
+
+def make_db(path, rows=100, wal=True):
+    return create_db(path, [(MESSAGE_CHAT_LOGS_TABLE, [(None, f"m{i}") for i in range(rows)])], wal=wal, timeout=0.1)
+
+
+def make_db2(path):
+    create_db(path, [(FRIENDS_TABLE, [(1, '라이언', 0)])]).close()
+
+
+def test_reuse_and_attach_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, db_path2 = kakao_db_paths(tmp)
+        make_db(db_path).close()
+        make_db2(db_path2)
+        db = DbConnectionManager(db_path, db_path2, log=quiet)
+        for _ in range(5):
+            conn = db.connect()
+            assert conn.db2_attached
+            cursor = conn.cursor()
+            cursor.execute("SELECT name FROM db2.friends WHERE id = ?", (1,))
+            assert cursor.fetchone()[0] == "라이언"
+            conn.close()
+        stats = db.stats()
+        assert stats["opens"] == 1
+        assert stats["attaches"] == 1
+        assert stats["leases"] == 5
+        assert stats["read_only"]
+        db.close()
+
+
+def test_writes_rejected():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = kakao_db_paths(tmp)[0]
+        make_db(db_path).close()
+        db = DbConnectionManager(db_path, log=quiet)
+        conn = db.connect()
+        assert not conn.db2_attached
+        try:
+            conn.execute("DELETE FROM chat_logs")
+            raise AssertionError("쓰기가 허용됨")
+        except sqlite3.OperationalError:
+            pass
+        conn.close()
+        db.close()
+
+
+def test_release_unblocks_checkpoint():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = kakao_db_paths(tmp)[0]
+        writer = make_db(db_path)
+        db = DbConnectionManager(db_path, log=quiet)
+        conn = db.connect()
+        cursor = conn.cursor()
+        cursor.execute("SELECT _id FROM chat_logs ORDER BY _id")
+        cursor.fetchone()  # 문장이 끝나지 않은 상태 = 읽기 스냅샷 유지
+
+        writer.execute("INSERT INTO chat_logs (message) VALUES ('new')")
+        writer.commit()
+        busy, _, _ = writer.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        assert busy == 1
+
+        conn.close()
+        busy, _, _ = writer.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        assert busy == 0
+
+        # 같은 장기 연결로 새 데이터 조회 가능
+        conn = db.connect()
+        assert conn.execute("SELECT COUNT(*) FROM chat_logs").fetchone()[0] == 101
+        conn.close()
+        writer.close()
+        db.close()
+
+
+def test_reconnect_on_inode_change():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = kakao_db_paths(tmp)[0]
+        make_db(db_path, rows=3, wal=False).close()
+        db = DbConnectionManager(db_path, log=quiet)
+        conn = db.connect()
+        assert conn.execute("SELECT COUNT(*) FROM chat_logs").fetchone()[0] == 3
+        conn.close()
+
+        replacement = os.path.join(tmp, "replacement.db")
+        make_db(replacement, rows=7, wal=False).close()
+        os.replace(replacement, db_path)
+
+        conn = db.connect()
+        assert conn.execute("SELECT COUNT(*) FROM chat_logs").fetchone()[0] == 7
+        conn.close()
+        assert db.stats()["reconnects"] == 1
+        db.close()
+
+
+def test_connection_per_thread():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = kakao_db_paths(tmp)[0]
+        make_db(db_path).close()
+        db = DbConnectionManager(db_path, log=quiet)
+        counts = []
+
+        def worker():
+            conn = db.connect()
+            counts.append(conn.execute("SELECT COUNT(*) FROM chat_logs").fetchone()[0])
+            conn.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert counts == [100, 100, 100]
+        assert db.stats()["opens"] == 3
+        db.close()
+        assert db.stats()["open"] == 0
+
+
+def test_release_thread():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = kakao_db_paths(tmp)[0]
+        make_db(db_path).close()
+        db = DbConnectionManager(db_path, log=quiet)
+        main_conn = db.connect()
+
+        def one_shot():
+            try:
+                conn = db.connect()
+                conn.execute("SELECT COUNT(*) FROM chat_logs").fetchone()
+                conn.close()
+            finally:
+                db.release_thread()
+
+        thread = threading.Thread(target=one_shot)
+        thread.start()
+        thread.join()
+        assert db.stats()["opens"] == 2
+        assert db.stats()["open"] == 1  # 다른 스레드의 연결은 유지
+        assert main_conn.execute("SELECT COUNT(*) FROM chat_logs").fetchone()[0] == 100
+        main_conn.close()
+        db.release_thread()
+        db.release_thread()  # 연결이 없으면 무시
+        assert db.stats()["open"] == 0
+        db.connect().close()  # 해제 후 다시 연결
+        assert db.stats()["opens"] == 3
+        db.close()
+
+
+def test_missing_file():
+    db = DbConnectionManager("/nonexistent/KakaoTalk.db", log=quiet)
+    try:
+        db.connect()
+        raise AssertionError("없는 파일이 열림")
+    except sqlite3.OperationalError:
+        pass
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DB 스냅샷(백업 API) 테스트
+- WAL 모드 원본을 단일 파일 복사본으로 백업 (db2 포함)
+- 원본 변경 후 갱신하면 복사본 연결이 자동으로 새 파일을 읽음
+- 복사 중 원본 변경(재시작) 시 전체 복사로 전환
+- 스냅샷 나이 / 복사 비용 통계
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from db_snapshot import DbSnapshot, backup_database
+from helpers import quiet, create_db, MESSAGE_CHAT_LOGS_TABLE, FRIENDS_TABLE
+
+
+def make_db(path, rows):
+    return create_db(path, [(MESSAGE_CHAT_LOGS_TABLE, [(None, "x" * 200)] * rows)], wal=True, timeout=0.1)
+
+
+def test_snapshot_matches_source():
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = make_db(os.path.join(tmp, "KakaoTalk.db"), 500)
+        writer2 = create_db(os.path.join(tmp, "KakaoTalk2.db"), [(FRIENDS_TABLE, [(1, 'a', 0)])], wal=True)
+
+        snapshot = DbSnapshot(os.path.join(tmp, "KakaoTalk.db"), os.path.join(tmp, "KakaoTalk2.db"),
+                              directory=os.path.join(tmp, "shm"), pages=4, step_sleep=0, log=quiet)
+        assert not snapshot.ready and snapshot.age() is None
+        assert snapshot.refresh()
+        assert snapshot.ready
+        assert not os.path.exists(snapshot.snapshot_path + "-wal")
+
+        conn = snapshot.connect()
+        assert conn.db2_attached
+        assert conn.execute("SELECT COUNT(*) FROM chat_logs").fetchone()[0] == 500
+        assert conn.execute("SELECT name FROM db2.friends WHERE id = 1").fetchone()[0] == 'a'
+        conn.close()
+
+        stats = snapshot.stats()
+        assert stats["refreshes"] == 1 and stats["failures"] == 0
+        assert stats["last_steps"] > 1  # 단계별 점진 복사
+        assert stats["last_bytes"] > 0 and stats["age_sec"] is not None
+
+        writer.close()
+        writer2.close()
+        snapshot.stop()
+        assert not os.path.exists(snapshot.snapshot_path)
+
+
+def test_refresh_picks_up_changes():
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = make_db(os.path.join(tmp, "KakaoTalk.db"), 10)
+        snapshot = DbSnapshot(os.path.join(tmp, "KakaoTalk.db"), directory=tmp, pages=-1, log=quiet)
+        snapshot.refresh()
+        conn = snapshot.connect()
+        assert conn.execute("SELECT COUNT(*) FROM chat_logs").fetchone()[0] == 10
+        conn.close()
+
+        writer.executemany("INSERT INTO chat_logs (message) VALUES (?)", [("y",)] * 5)
+        writer.commit()
+        conn = snapshot.connect()
+        assert conn.execute("SELECT COUNT(*) FROM chat_logs").fetchone()[0] == 10  # 갱신 전: 이전 스냅샷
+        conn.close()
+
+        snapshot.refresh()
+        conn = snapshot.connect()
+        assert conn.execute("SELECT COUNT(*) FROM chat_logs").fetchone()[0] == 15
+        conn.close()
+        assert snapshot.db.stats()["reconnects"] == 1
+        writer.close()
+        snapshot.stop()
+
+
+def test_restarts_fall_back_to_full_copy():
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "KakaoTalk.db")
+        writer = make_db(source, 2000)
+        original_backup = sqlite3.Connection.backup
+        writes = [0]
+
+        def busy_progress_backup(self, target, pages=-1, progress=None, **kwargs):
+            # 단계마다 다른 연결이 원본에 쓰기 -> 점진 백업은 계속 재시작됨
+            def wrapped(status, remaining, total):
+                if pages > 0 and writes[0] < 50:
+                    writes[0] += 1
+                    writer.execute("INSERT INTO chat_logs (message) VALUES ('z')")
+                    writer.commit()
+                progress(status, remaining, total)
+            return original_backup(self, target, pages=pages, progress=wrapped, **kwargs)
+
+        class PatchedConnection(sqlite3.Connection):
+            backup = busy_progress_backup
+
+        def connect(*args, **kwargs):
+            kwargs.setdefault('factory', PatchedConnection)
+            return real_connect(*args, **kwargs)
+
+        real_connect = sqlite3.connect
+        sqlite3.connect = connect
+        try:
+            info = backup_database(source, os.path.join(tmp, "copy.db"), pages=8, step_sleep=0, max_restarts=2)
+        finally:
+            sqlite3.connect = real_connect
+        assert info["restarts"] > 2
+        assert info["full_copy"]
+        copy = sqlite3.connect(os.path.join(tmp, "copy.db"))
+        count = copy.execute("SELECT COUNT(*) FROM chat_logs").fetchone()[0]
+        copy.close()
+        assert count == 2000 + writes[0]
+        writer.close()
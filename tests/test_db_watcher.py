@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DB 변경 감시 테스트
+- WAL 파일 쓰기 시 즉시 깨어남 (감지 지연 측정)
+- 연속 쓰기는 한 번만 깨움 (디바운스)
+- 감시 대상이 아닌 파일(-shm)은 무시
+- inotify를 사용할 수 없으면 고정 간격 대기
+
+벤치마크 (감지 지연): python tests/benchmarks/bench_db_watcher.py
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from db_watcher import DbWatcher, CHANGE, TIMEOUT
+from helpers import quiet, kakao_db_paths
+
+
+def write_later(path, delay, count=1, interval=0.0):
+    def run():
+        time.sleep(delay)
+        for _ in range(count):
+            with open(path, 'ab') as f:
+                f.write(b'x' * 4096)
+            if interval:
+                time.sleep(interval)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def make_watcher(tmp):
+    db_path = kakao_db_paths(tmp)[0]
+    open(db_path, 'wb').close()
+    return db_path, DbWatcher([db_path, db_path + "-wal"], log=quiet)
+
+
+def test_wakes_on_wal_write():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, watcher = make_watcher(tmp)
+        if not watcher.available:
+            return
+        writer = write_later(db_path + "-wal", 0.05)
+        start = time.monotonic()
+        assert watcher.wait(timeout=5.0) == CHANGE
+        assert time.monotonic() - start < 1.0
+        writer.join()
+        watcher.close()
+
+
+def test_debounces_bursts():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, watcher = make_watcher(tmp)
+        if not watcher.available:
+            return
+        writer = write_later(db_path + "-wal", 0.02, count=20, interval=0.002)
+        assert watcher.wait(timeout=5.0) == CHANGE
+        writer.join()
+        watcher.wait(timeout=0.2)  # 디바운스 상한 이후 남은 이벤트가 있으면 한 번 더 깨어날 수 있음
+        assert watcher.wait(timeout=0.1) == TIMEOUT
+        assert watcher.stats()["changes"] <= 2
+        watcher.close()
+
+
+def test_ignores_other_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, watcher = make_watcher(tmp)
+        if not watcher.available:
+            return
+        writer = write_later(db_path + "-shm", 0.01)
+        assert watcher.wait(timeout=0.3) == TIMEOUT
+        writer.join()
+        watcher.close()
+
+
+def test_timer_fallback():
+    watcher = DbWatcher(["/nonexistent/dir/KakaoTalk.db"], poll_interval=0.05, log=quiet)
+    assert not watcher.available
+    assert watcher.backend == "timer"
+    start = time.monotonic()
+    assert watcher.wait(timeout=5.0) == TIMEOUT
+    assert time.monotonic() - start < 1.0  # poll_interval만큼만 대기
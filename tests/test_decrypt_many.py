@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+일괄 복호화 API 테스트
+- decrypt_many: 입력 순서 유지, (user_id, enc)별 키 1회 유도, 항목별 실패 사유
+- 결과가 KakaoDecrypt.decrypt 단건 결과와 동일한지 확인
+"""
+
+import sys
+import os
+import base64
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from Crypto.Cipher import AES
+
+from kakaodecrypt import KakaoDecrypt, KAKAO_IV
+from kakao_decrypt_module import decrypt_many, DECRYPT_MANY_FAIL_REASON
+
+MY_USER_ID = 429744344
+OTHER_USER_ID = 1234567890
+
+
+def encrypt(plaintext, user_id, enc=31):
+    """테스트용 암호화 (PKCS5 패딩 + AES/CBC)"""
+    pt_bytes = plaintext.encode('utf-8') if isinstance(plaintext, str) else plaintext
+    pad_len = 16 - (len(pt_bytes) % 16)
+    padded = pt_bytes + bytes([pad_len] * pad_len)
+    aes = AES.new(KakaoDecrypt.get_key(user_id, enc), AES.MODE_CBC, KAKAO_IV)
+    return base64.b64encode(aes.encrypt(padded)).decode('ascii')
+
+
+def test_decrypt_many_preserves_order_across_groups():
+    plaintexts = ["안녕하세요", "a" * 16, "의운모", "환영하는 라이언" * 20, "x", "멀티 블록 메시지 " * 7]
+    encs = [31, 30, 31, 29, 30, 31]
+    user_ids = [MY_USER_ID, MY_USER_ID, OTHER_USER_ID, MY_USER_ID, OTHER_USER_ID, MY_USER_ID]
+    items = [(encrypt(p, u, e), u, e) for p, u, e in zip(plaintexts, user_ids, encs)]
+
+    results = decrypt_many(items)
+
+    assert [r[0] for r in results] == plaintexts
+    assert all(r[1] is None for r in results)
+    # 단건 API와 동일
+    for (ciphertext, user_id, enc), (plaintext, _) in zip(items, results):
+        assert KakaoDecrypt.decrypt(user_id, enc, ciphertext) == plaintext
+
+
+def test_decrypt_many_derives_each_key_once():
+    KakaoDecrypt.clear_key_cache()
+    items = [(encrypt(f"메시지 {i}", MY_USER_ID, 31), MY_USER_ID, 31) for i in range(50)]
+    KakaoDecrypt.clear_key_cache()
+    results = decrypt_many(items)
+    assert [r[0] for r in results] == [f"메시지 {i}" for i in range(50)]
+    stats = KakaoDecrypt.key_cache_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 0
+
+
+def test_decrypt_many_failure_reasons():
+    good = encrypt("정상", MY_USER_ID, 31)
+    items = [
+        ("", MY_USER_ID, 31),
+        (good, None, 31),
+        (good, MY_USER_ID, 99),
+        (good, MY_USER_ID, None),                      # v.enc 없음/이상한 값도 그 항목만 실패
+        (good, MY_USER_ID, "abc"),
+        (good, MY_USER_ID, "31"),
+        ("QUJD", MY_USER_ID, 31),                      # 3바이트: 블록 길이 아님
+        ("!!!!", MY_USER_ID, 31),
+        (encrypt("정상", OTHER_USER_ID, 31), MY_USER_ID, 31),  # 잘못된 키
+        (encrypt(b'\xff\xfe\xfd', MY_USER_ID, 31), MY_USER_ID, 31),
+        (good, MY_USER_ID, 31),
+    ]
+    results = decrypt_many(items)
+    assert results[0] == (None, DECRYPT_MANY_FAIL_REASON["EMPTY"])
+    assert results[1] == (None, DECRYPT_MANY_FAIL_REASON["NO_USER_ID"])
+    assert results[2] == (None, DECRYPT_MANY_FAIL_REASON["INVALID_ENC"])
+    assert results[3] == (None, DECRYPT_MANY_FAIL_REASON["INVALID_ENC"])
+    assert results[4] == (None, DECRYPT_MANY_FAIL_REASON["INVALID_ENC"])
+    assert results[5] == ("정상", None)
+    assert results[6] == (None, DECRYPT_MANY_FAIL_REASON["BAD_LENGTH"])
+    assert results[7][0] is None
+    assert results[8][0] is None
+    assert results[8][1] in (DECRYPT_MANY_FAIL_REASON["BAD_PADDING"], DECRYPT_MANY_FAIL_REASON["NOT_UTF8"])
+    assert results[9] == (None, DECRYPT_MANY_FAIL_REASON["NOT_UTF8"])
+    assert results[10] == ("정상", None)
+
+
+def test_decrypt_many_accepts_raw_bytes():
+    raw = base64.b64decode(encrypt("바이트 입력", MY_USER_ID, 31))
+    assert decrypt_many([(raw, MY_USER_ID, 31)]) == [("바이트 입력", None)]
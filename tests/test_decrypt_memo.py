@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+복호화 결과 메모 테스트
+- 같은 (암호문, user_id, enc)는 한 번만 복호화
+- 실패 결과는 TTL 동안만 기억
+- LRU 상한, 통계
+"""
+
+import sys
+import os
+import base64
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from Crypto.Cipher import AES
+
+from kakaodecrypt import KakaoDecrypt, KAKAO_IV
+from decrypt_memo import DecryptMemo
+
+MY_USER_ID = 429744344
+
+
+def encrypt(plaintext, user_id=MY_USER_ID, enc=31):
+    """테스트용 암호화 (PKCS5 패딩 + AES/CBC)"""
+    pt_bytes = plaintext.encode('utf-8')
+    pad_len = 16 - (len(pt_bytes) % 16)
+    padded = pt_bytes + bytes([pad_len] * pad_len)
+    aes = AES.new(KakaoDecrypt.get_key(user_id, enc), AES.MODE_CBC, KAKAO_IV)
+    return base64.b64encode(aes.encrypt(padded)).decode('ascii')
+
+
+class CountingDecrypt:
+    def __init__(self, func=KakaoDecrypt.decrypt):
+        self.func = func
+        self.calls = 0
+
+    def __call__(self, user_id, enc, ciphertext):
+        self.calls += 1
+        return self.func(user_id, enc, ciphertext)
+
+
+def test_positive_results_memoized():
+    memo = DecryptMemo()
+    decrypt = CountingDecrypt()
+    nickname = encrypt("라이언")
+    for _ in range(10):
+        assert memo.decrypt(nickname, MY_USER_ID, 31, decrypt) == "라이언"
+    assert decrypt.calls == 1
+    stats = memo.stats()
+    assert stats["hits"] == 9
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.9
+
+
+def test_key_includes_user_id_and_enc():
+    memo = DecryptMemo()
+    decrypt = CountingDecrypt()
+    nickname = encrypt("어피치")
+    memo.decrypt(nickname, MY_USER_ID, 31, decrypt)
+    memo.decrypt(nickname, MY_USER_ID, 30, decrypt)
+    memo.decrypt(nickname, MY_USER_ID + 1, 31, decrypt)
+    assert decrypt.calls == 3
+
+
+def test_negative_results_expire():
+    now = [1000.0]
+    memo = DecryptMemo(negative_ttl=60, clock=lambda: now[0])
+
+    def failing(user_id, enc, ciphertext):
+        failing.calls += 1
+        raise ValueError("bad padding")
+    failing.calls = 0
+
+    for _ in range(5):
+        assert memo.decrypt("QUJDREVGR0hJSktMTU5PUA==", MY_USER_ID, 31, failing) is None
+    assert failing.calls == 1
+    assert memo.stats()["negative_hits"] == 4
+
+    now[0] += 61
+    assert memo.decrypt("QUJDREVGR0hJSktMTU5PUA==", MY_USER_ID, 31, failing) is None
+    assert failing.calls == 2
+
+
+def test_bounded_lru():
+    memo = DecryptMemo(max_size=3)
+    for i in range(5):
+        memo.put(f"ct{i}", MY_USER_ID, 31, f"pt{i}")
+    assert memo.stats()["size"] == 3
+    assert memo.get("ct0", MY_USER_ID, 31) == (False, None)
+    assert memo.get("ct4", MY_USER_ID, 31) == (True, "pt4")
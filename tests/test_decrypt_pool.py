@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+복호화 프로세스 풀 테스트
+- threshold 미만: 인라인 decrypt_many
+- threshold 이상: 프로세스 풀 분산, 입력 순서 유지
+- 프로세스 풀 생성 실패 시 인라인 폴백
+- 선복호화 본문 검증: 패딩은 맞았지만 텍스트가 아닌 결과는 사용하지 않음
+"""
+
+import sys
+import os
+import base64
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from Crypto.Cipher import AES
+
+from kakaodecrypt import KakaoDecrypt, KAKAO_IV
+from decrypt_pool import DecryptPool
+from kakao_decrypt_module import decrypt_many, is_valid_plaintext
+from helpers import quiet
+
+MY_USER_ID = 429744344
+
+
+def encrypt(plaintext, user_id, enc=31):
+    """테스트용 암호화 (PKCS5 패딩 + AES/CBC)"""
+    pt_bytes = plaintext.encode('utf-8')
+    pad_len = 16 - (len(pt_bytes) % 16)
+    padded = pt_bytes + bytes([pad_len] * pad_len)
+    aes = AES.new(KakaoDecrypt.get_key(user_id, enc), AES.MODE_CBC, KAKAO_IV)
+    return base64.b64encode(aes.encrypt(padded)).decode('ascii')
+
+
+def make_items(count):
+    plaintexts = [f"백로그 메시지 {i}" for i in range(count)]
+    items = [(encrypt(p, MY_USER_ID, 31 if i % 3 else 30), MY_USER_ID, 31 if i % 3 else 30)
+             for i, p in enumerate(plaintexts)]
+    return plaintexts, items
+
+
+def test_inline_below_threshold():
+    pool = DecryptPool(max_workers=2, threshold=100, log=quiet)
+    plaintexts, items = make_items(10)
+    assert [r[0] for r in pool.decrypt(items)] == plaintexts
+    stats = pool.stats()
+    assert stats["inline_batches"] == 1
+    assert stats["pool_batches"] == 0
+    assert not stats["active"]
+
+
+def test_pool_preserves_order():
+    pool = DecryptPool(max_workers=2, threshold=20, chunk_size=7, log=quiet)
+    try:
+        plaintexts, items = make_items(50)
+        results = pool.decrypt(items)
+        assert [r[0] for r in results] == plaintexts
+        assert all(r[1] is None for r in results)
+        stats = pool.stats()
+        # sem_open 미지원 환경에서는 인라인 폴백
+        assert stats["pool_items"] + stats["inline_items"] == 50
+    finally:
+        pool.shutdown()
+
+
+def test_fallback_when_executor_unavailable():
+    pool = DecryptPool(max_workers=2, threshold=1, log=quiet)
+    pool._disabled_reason = "OSError: sem_open"
+    plaintexts, items = make_items(5)
+    assert [r[0] for r in pool.decrypt(items)] == plaintexts
+    assert pool.stats()["inline_items"] == 5
+
+
+def test_plaintext_validation():
+    # 패딩과 UTF-8은 통과하지만 제어 문자뿐인 결과 (잘못된 키로 우연히 맞은 경우와 같은 모양)
+    items = [(encrypt("\x01\x02\x03\x04", MY_USER_ID), MY_USER_ID, 31), (encrypt("정상 메시지", MY_USER_ID), MY_USER_ID, 31)]
+    (garbage, _), (text, _) = decrypt_many(items)
+    assert garbage == "\x01\x02\x03\x04"
+    assert not is_valid_plaintext(garbage)
+    assert is_valid_plaintext(text)
+    assert is_valid_plaintext("줄\n바꿈\t탭")
+    assert not is_valid_plaintext("")
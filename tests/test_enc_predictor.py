@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+enc 타입 예측기 테스트
+- 같은 키가 되는 후보(enc 0/1, 2/7)와 무효 후보 제거
+- enc 32(0 salt 폴백)는 메시지 본문 후보에만 포함
+- 출처/채팅방별 마지막 성공 enc 우선
+- 첫 번째 후보 적중률 통계
+"""
+
+import sys
+import os
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from enc_predictor import EncPredictor, ENC_TYPE_COUNT, ZERO_SALT_ENC
+from kakao_decrypt_module import get_secret_key
+from kakaodecrypt import KAKAO_PREFIXES
+
+MY_USER_ID = 429744344
+
+
+def test_enc_range_matches_prefixes():
+    assert ENC_TYPE_COUNT == len(KAKAO_PREFIXES)
+
+
+def test_candidates_dedupe_and_drop_invalid():
+    predictor = EncPredictor()
+    assert predictor.candidates("message", hint=31) == [31, 30, 32]
+    assert predictor.candidates("message", hint=32) == [32, 31, 30]
+    assert predictor.candidates("message", hint=None) == [31, 30, 32]
+    assert predictor.candidates("message", hint=99) == [31, 30, 32]
+    # KakaoDecrypt.decrypt를 쓰는 출처는 0 salt 폴백이 없으므로 enc 32 제외
+    assert predictor.candidates("nickname", hint=29) == [29, 31, 30]
+    assert predictor.candidates("nickname", hint=32) == [31, 30]
+
+
+def test_same_key_candidates_collapsed():
+    predictor = EncPredictor(default_candidates=(1, 7, 31))
+    assert predictor.candidates("room", hint=0) == [0, 7, 31]  # enc 1 = enc 0 (prefix "")
+    assert predictor.candidates("room", hint=2) == [2, 1, 31]  # enc 7 = enc 2 (prefix "12")
+    assert get_secret_key(MY_USER_ID, 0) == get_secret_key(MY_USER_ID, 1)
+    assert get_secret_key(MY_USER_ID, 2) == get_secret_key(MY_USER_ID, 7)
+    # enc 32 이상은 모두 0 salt 키 하나 (user_id와 무관)
+    assert get_secret_key(MY_USER_ID, ZERO_SALT_ENC) == get_secret_key(MY_USER_ID + 1, 40)
+
+
+def test_learned_enc_tried_first():
+    predictor = EncPredictor()
+    predictor.record("room", 100, 29)
+    assert predictor.candidates("room", room=100)[0] == 29
+    # 다른 출처에는 영향 없음
+    assert predictor.candidates("nickname")[0] == 31
+    # hint가 있으면 hint 우선, 학습된 값은 두 번째
+    assert predictor.candidates("room", room=100, hint=30) == [30, 29, 31]
+
+
+def test_room_specific_over_source():
+    predictor = EncPredictor()
+    predictor.record("message", 1, 30)
+    predictor.record("message", 2, 29)
+    assert predictor.candidates("message", room=1)[:2] == [30, 29]
+    assert predictor.candidates("message", room=2)[0] == 29
+
+
+def test_room_entries_bounded():
+    predictor = EncPredictor(max_room_entries=3)
+    for room in range(10):
+        predictor.record("room", room, 31)
+    assert predictor.stats()["rooms"] == 3
+
+
+def test_stats():
+    predictor = EncPredictor()
+    predictor.record("message", 1, 31, first_try=True)
+    predictor.record("message", 1, 31, first_try=True)
+    predictor.record("message", 1, 30, first_try=False)
+    predictor.record_failure("message", 1)
+    predictor.record("message", 1, 99)  # 무효 enc는 무시
+    stats = predictor.stats()
+    assert stats["attempts"] == 4
+    assert stats["first_try_hits"] == 2
+    assert stats["failures"] == 1
+    assert stats["hits"] == {"message:30": 1, "message:31": 2}
+
+
+def try_candidates(predictor, source, room, succeeds_with):
+    """poller의 후보 루프: 성공하면 record, 모든 후보가 실패했을 때만 record_failure 한 번"""
+    candidates = predictor.candidates(source, room=room)
+    for enc in candidates:
+        if enc == succeeds_with:
+            predictor.record(source, room, enc, first_try=(enc == candidates[0]))
+            return enc
+    predictor.record_failure(source, room)
+    return None
+
+
+def test_stats_fail_then_succeed():
+    predictor = EncPredictor(default_candidates=(31, 30))
+    assert try_candidates(predictor, "room", 7, succeeds_with=30) == 30  # 31 실패 -> 30 성공
+    stats = predictor.stats()
+    assert stats["attempts"] == 1 and stats["failures"] == 0 and stats["first_try_hits"] == 0
+    assert try_candidates(predictor, "room", 7, succeeds_with=30) == 30  # 학습 후 첫 후보로 성공
+    assert try_candidates(predictor, "room", 7, succeeds_with=None) is None  # 모든 후보 실패
+    stats = predictor.stats()
+    assert stats["attempts"] == 3 and stats["failures"] == 1 and stats["first_try_hits"] == 1
+    assert stats["first_try_rate"] == 1 / 3
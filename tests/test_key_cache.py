@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+파생 키 캐시 테스트
+- KakaoDecrypt.get_key / new_cipher 캐시 동작 (hit/miss, LRU 상한)
+- kakao_decrypt_module.get_secret_key는 KakaoDecrypt 키 캐시를 공유 (유도 1회)
+- 캐시 사용 전후 복호화 결과 동일성
+"""
+
+import sys
+import os
+import base64
+import threading
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from Crypto.Cipher import AES
+
+import kakaodecrypt
+import kakao_decrypt_module
+from kakaodecrypt import KakaoDecrypt, KAKAO_PASSWORD, KAKAO_IV
+
+MY_USER_ID = 429744344
+
+
+def encrypt(plaintext, user_id, enc=31):
+    """테스트용 암호화 (PKCS5 패딩 + AES/CBC)"""
+    salt = KakaoDecrypt.genSalt(user_id, enc)
+    key = KakaoDecrypt.pkcs12_key(KAKAO_PASSWORD, salt, iterations=2, dkeySize=32)
+    pt_bytes = plaintext.encode('utf-8')
+    pad_len = 16 - (len(pt_bytes) % 16)
+    padded = pt_bytes + bytes([pad_len] * pad_len)
+    return base64.b64encode(AES.new(key, AES.MODE_CBC, KAKAO_IV).encrypt(padded)).decode('ascii')
+
+
+def test_get_key_matches_reference():
+    KakaoDecrypt.clear_key_cache()
+    for enc in (29, 30, 31):
+        expected = KakaoDecrypt.pkcs12_key(KAKAO_PASSWORD, KakaoDecrypt.genSalt(MY_USER_ID, enc))
+        assert KakaoDecrypt.get_key(MY_USER_ID, enc) == expected
+        assert KakaoDecrypt.get_key(MY_USER_ID, enc) == expected
+    stats = KakaoDecrypt.key_cache_stats()
+    assert stats["misses"] == 3
+    assert stats["hits"] == 3
+    assert stats["size"] == 3
+
+
+def test_decrypt_uses_cache():
+    KakaoDecrypt.clear_key_cache()
+    ciphertext = encrypt("환영하는 라이언", MY_USER_ID, 31)
+    for _ in range(5):
+        assert KakaoDecrypt.decrypt(MY_USER_ID, 31, ciphertext) == "환영하는 라이언"
+    stats = KakaoDecrypt.key_cache_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 4
+
+
+def test_new_cipher_is_fresh_per_call():
+    KakaoDecrypt.clear_key_cache()
+    ciphertext = base64.b64decode(encrypt("의운모", MY_USER_ID, 31))
+    first = KakaoDecrypt.new_cipher(MY_USER_ID, 31).decrypt(ciphertext)
+    second = KakaoDecrypt.new_cipher(MY_USER_ID, 31).decrypt(ciphertext)
+    assert first == second
+
+
+def test_cache_is_bounded():
+    cache = kakaodecrypt._KeyCache(max_size=4)
+    for user_id in range(10):
+        cache.get(user_id, 31, lambda: b'k' * 32)
+    assert cache.stats()["size"] == 4
+    # 가장 최근 4개만 유지
+    cache.get(9, 31, lambda: b'x' * 32)
+    assert cache.stats()["hits"] == 1
+
+
+def test_cache_thread_safety():
+    KakaoDecrypt.clear_key_cache()
+    errors = []
+
+    def worker():
+        try:
+            for enc in (29, 30, 31) * 20:
+                KakaoDecrypt.get_key(MY_USER_ID, enc)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    stats = KakaoDecrypt.key_cache_stats()
+    assert stats["size"] == 3
+    assert stats["hits"] + stats["misses"] == 8 * 60
+
+
+def test_module_secret_key_cache():
+    KakaoDecrypt.clear_key_cache()
+    key1 = kakao_decrypt_module.get_secret_key(MY_USER_ID, 31)
+    key2 = KakaoDecrypt.get_key(MY_USER_ID, 31)
+    key3 = kakao_decrypt_module.get_secret_key(MY_USER_ID, 31)
+    assert key1 == key2 == key3 == kakao_decrypt_module.generate_secret_key(kakao_decrypt_module.generate_salt(MY_USER_ID, 31))
+    # 모듈과 kakaodecrypt가 같은 캐시를 공유: 유도는 한 번
+    stats = kakao_decrypt_module.key_cache_stats()
+    assert stats == KakaoDecrypt.key_cache_stats()
+    assert stats["misses"] == 1 and stats["hits"] == 2 and stats["size"] == 1
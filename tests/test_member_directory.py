@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+멤버 디렉터리 테스트
+- 시작 시 전체 미리 읽기 후 평상시 조회는 SQL 없이 dict 조회
+- db2.data_version이 바뀌면 바뀐 행만 다시 복호화
+- 없는 user_id는 TTL 동안 기억, db2 변경 시 즉시 무효
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from db_connection import DbConnectionManager
+from member_directory import MemberDirectory
+from helpers import quiet, make_kakao_dbs, MESSAGE_CHAT_LOGS_TABLE, FRIENDS_TABLE, OPEN_CHAT_MEMBER_TABLE
+
+
+def make_dbs(directory):
+    return make_kakao_dbs(directory, [(MESSAGE_CHAT_LOGS_TABLE, [])], [
+        (FRIENDS_TABLE, [(1001, "enc:철수", 31), (1002, "영희", 0)]),
+        (OPEN_CHAT_MEMBER_TABLE, [(1003, "enc:오픈닉", 30)]),
+    ])
+
+
+class FakeDecrypt:
+    """'enc:' 접두사를 떼는 가짜 복호화 (호출된 user_id 기록)"""
+
+    def __init__(self):
+        self.decrypted = []
+
+    def __call__(self, rows):
+        names = {}
+        for user_id, (name, enc) in rows.items():
+            if name.startswith("enc:"):
+                self.decrypted.append(user_id)
+                name = name[4:]
+            names[user_id] = name
+        return names, []
+
+
+def test_preload_then_dict_lookup():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DbConnectionManager(*make_dbs(tmp), log=quiet)
+        decrypt = FakeDecrypt()
+        directory = MemberDirectory(db, decrypt, log=quiet)
+        assert directory.load()
+        assert len(directory) == 3 and sorted(decrypt.decrypted) == ["1001", "1003"]
+
+        statements = []
+        conn = db.connect()
+        conn._connection.set_trace_callback(statements.append)
+        conn.close()
+        for _ in range(50):
+            names = directory.resolve([1001, 1002, "1003"])
+        assert names == {"1001": "철수", "1002": "영희", "1003": "오픈닉"}
+        # 배치당 data_version 확인 1회만 (이름 조회 SQL 없음)
+        assert all(s.startswith("PRAGMA db2.data_version") for s in statements) and len(statements) == 50
+        stats = directory.stats()
+        assert stats["entries"] == 3 and stats["hits"] == 150 and stats["hit_rate"] == 1.0
+        db.close()
+
+
+def test_incremental_refresh():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, db_path2 = make_dbs(tmp)
+        db = DbConnectionManager(db_path, db_path2, log=quiet)
+        decrypt = FakeDecrypt()
+        directory = MemberDirectory(db, decrypt, log=quiet)
+        directory.load()
+        assert not directory.refresh_if_changed()  # 변경 없음
+
+        writer = sqlite3.connect(db_path2)
+        writer.execute("UPDATE friends SET name = 'enc:민수' WHERE id = 1001")
+        writer.execute("INSERT INTO open_chat_member VALUES (1004, 'enc:새멤버', 31)")
+        writer.commit()
+        decrypt.decrypted.clear()
+        assert directory.resolve([1001, 1004]) == {"1001": "민수", "1004": "새멤버"}
+        assert sorted(decrypt.decrypted) == ["1001", "1004"]  # 바뀐 행만 복호화
+        assert directory.stats()["refreshes"] == 1 and directory.stats()["last_refresh_changed"] == 2
+
+        writer.execute("DELETE FROM friends WHERE id = 1002")
+        writer.commit()
+        assert directory.resolve([1002]) == {"1002": None}
+        writer.close()
+        db.close()
+
+
+def test_negative_entries():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, db_path2 = make_dbs(tmp)
+        db = DbConnectionManager(db_path, db_path2, log=quiet)
+        now = [100.0]
+        directory = MemberDirectory(db, FakeDecrypt(), negative_ttl=60, clock=lambda: now[0], log=quiet)
+        directory.load()
+
+        assert directory.resolve([9999]) == {"9999": None}
+        assert directory.lookup(9999) == (True, None)  # TTL 동안 DB 조회 없이 "없음"
+        now[0] += 61
+        assert directory.lookup(9999) == (False, None)  # 만료
+
+        directory.resolve([9999])
+        writer = sqlite3.connect(db_path2)
+        writer.execute("INSERT INTO friends VALUES (9999, '새친구', 0)")
+        writer.commit()
+        writer.close()
+        assert directory.resolve([9999]) == {"9999": "새친구"}  # db2 변경 시 즉시 무효
+        assert directory.stats()["negative_hits"] == 1
+        db.close()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+고속 PKCS12 키 유도 동일성 테스트
+- KakaoDecrypt.pkcs12_key_fast == KakaoDecrypt.pkcs12_key
+- kakao_decrypt_module.get_secret_key (KakaoDecrypt.pkcs12_key_fast 사용) == generate_secret_key
+- 랜덤 user_id x KAKAO_PREFIXES의 모든 enc 인덱스에 대해 비트 단위 비교
+
+벤치마크: python tests/benchmarks/bench_pkcs12_fast.py
+"""
+
+import sys
+import os
+import random
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+import kakao_decrypt_module
+from kakaodecrypt import KakaoDecrypt, KAKAO_PASSWORD, KAKAO_PREFIXES
+
+SEED = 20251221
+RANDOM_USER_IDS = 40
+
+
+def random_user_ids(rng, count):
+    """짧은 ID, 일반 ID, 16자 초과(salt 잘림) ID, 0/음수(zero salt)를 섞어서 생성"""
+    user_ids = [0, -1, 1, 429744344, 9223372036854775807]
+    while len(user_ids) < count:
+        digits = rng.choice([3, 9, 10, 13, 19])
+        user_ids.append(rng.randrange(10 ** (digits - 1), 10 ** digits))
+    return user_ids
+
+
+def test_kakaodecrypt_fast_matches_reference():
+    rng = random.Random(SEED)
+    for user_id in random_user_ids(rng, RANDOM_USER_IDS):
+        for enc in range(len(KAKAO_PREFIXES)):
+            salt = KakaoDecrypt.genSalt(user_id, enc)
+            expected = KakaoDecrypt.pkcs12_key(KAKAO_PASSWORD, salt, iterations=2, dkeySize=32)
+            actual = KakaoDecrypt.pkcs12_key_fast(KAKAO_PASSWORD, salt, iterations=2, dkeySize=32)
+            assert actual == expected, f"user_id={user_id}, enc={enc}"
+
+
+def test_module_fast_matches_reference():
+    rng = random.Random(SEED + 1)
+    KakaoDecrypt.clear_key_cache()
+    for user_id in random_user_ids(rng, RANDOM_USER_IDS):
+        for enc in [-1] + list(range(len(KAKAO_PREFIXES))) + [len(KAKAO_PREFIXES)]:  # 범위 밖 enc는 zero salt
+            salt = kakao_decrypt_module.generate_salt(user_id, enc)
+            expected = kakao_decrypt_module.generate_secret_key(salt)
+            actual = kakao_decrypt_module.get_secret_key(user_id, enc)
+            assert actual == expected, f"user_id={user_id}, enc={enc}"
+    KakaoDecrypt.clear_key_cache()
+
+
+def test_fast_matches_reference_for_arbitrary_parameters():
+    """salt 길이, 반복 횟수, 키 길이가 달라도 동일 (블록 경계/캐리 검증)"""
+    rng = random.Random(SEED + 2)
+    for _ in range(60):
+        salt = bytes(rng.randrange(256) for _ in range(rng.choice([1, 8, 16, 63, 64, 65, 130])))
+        iterations = rng.choice([1, 2, 3])
+        dkey_size = rng.choice([16, 20, 24, 32, 40, 64])
+        expected = KakaoDecrypt.pkcs12_key(KAKAO_PASSWORD, salt, iterations=iterations, dkeySize=dkey_size)
+        actual = KakaoDecrypt.pkcs12_key_fast(KAKAO_PASSWORD, salt, iterations=iterations, dkeySize=dkey_size)
+        assert actual == expected
+
+
+def test_carry_propagation_all_ff():
+    """0xff로 가득 찬 salt에서 블록 전체 캐리가 발생해도 동일"""
+    salt = b'\xff' * 64
+    assert KakaoDecrypt.pkcs12_key_fast(KAKAO_PASSWORD, salt) == KakaoDecrypt.pkcs12_key(KAKAO_PASSWORD, salt)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+반응 카운트 추출 테스트
+- json_extract 경로가 기존 Python json.loads 결과와 같음 (카운트 > 0인 행만, 깨진 JSON/문자열 카운트)
+- JSON1 없는 폴백 경로: 같은 결과, v가 그대로면 지문으로 파싱 생략, 바뀌면 다시 파싱
+
+벤치마크 (주기당 Python 작업 비교): python tests/benchmarks/bench_reaction_counts.py
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from reaction_counts import ReactionCountReader, reaction_count_sql
+from reaction_window import RECENT_WINDOW_WHERE, RECENT_REACTION_SQL, query_plan
+from helpers import quiet, create_db, kakao_db_paths, REACTION_CHAT_LOGS_TABLE
+
+BASE_TIME = 1700000000
+
+
+def make_v(i):
+    if i % 97 == 0:
+        return '{"defaultEmoticonsCount": 2, broken'
+    if i % 50 == 0:
+        return json.dumps({"enc": 31, "defaultEmoticonsCount": i % 7})  # 0도 섞임
+    if i % 61 == 0:
+        return json.dumps({"enc": 31, "defaultEmoticonsCount": "3"})
+    return json.dumps({"enc": 31, "origin": "MSG"}) if i % 3 else ''
+
+
+def make_db(path, rows=3000):
+    return create_db(path, [(REACTION_CHAT_LOGS_TABLE,
+                             ((i, 9000000 + i, i % 5, make_v(i), BASE_TIME + i) for i in range(1, rows + 1)))])
+
+
+def legacy_counts(cursor, params):
+    """기존 poll_reaction_updates: 모든 행 json.loads 후 defaultEmoticonsCount"""
+    cursor.execute(RECENT_REACTION_SQL, params)
+    result = []
+    for msg_id, chat_id, v_field, created_at in cursor.fetchall():
+        try:
+            v_data = json.loads(v_field)
+            count = int(v_data.get('defaultEmoticonsCount', 0) or 0) if isinstance(v_data, dict) else 0
+        except (json.JSONDecodeError, TypeError, ValueError):
+            continue
+        if count > 0:
+            result.append((msg_id, chat_id, created_at, count))
+    return result
+
+
+def test_json_extract_matches_legacy():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = make_db(kakao_db_paths(tmp)[0])
+        cursor = conn.cursor()
+        params = (0, BASE_TIME, 100000)
+        reader = ReactionCountReader(log=quiet)
+        rows = reader.query(cursor, RECENT_WINDOW_WHERE, params)
+        assert reader.json1
+        assert rows == legacy_counts(cursor, params) and rows
+        assert any(count == 3 and (msg_id - 9000000) % 61 == 0 for msg_id, _, _, count in rows)  # 문자열 "3"
+        assert reader.parsed == 0 and reader.last_row_count == len(rows)
+
+        plan = ' / '.join(query_plan(cursor, reaction_count_sql(RECENT_WINDOW_WHERE), params))
+        assert 'INTEGER PRIMARY KEY' in plan and 'TEMP B-TREE' not in plan, plan
+        conn.close()
+
+
+def test_fallback_fingerprint_skip():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = make_db(kakao_db_paths(tmp)[0])
+        cursor = conn.cursor()
+        params = (0, BASE_TIME, 100000)
+        reader = ReactionCountReader(log=quiet)
+        reader.json1 = False  # JSON1 없는 SQLite
+        expected = legacy_counts(cursor, params)
+        assert reader.query(cursor, RECENT_WINDOW_WHERE, params) == expected
+        first_parsed = reader.parsed
+        assert first_parsed == reader.last_row_count  # instr 사전 필터: 키가 있는 행만 파싱
+        assert reader.last_parse_failed == len(range(97, 3001, 97))
+
+        # 두 번째 주기: v가 그대로면 파싱 없음 (깨진 JSON은 지문을 남기지 않으므로 다시 시도)
+        assert reader.query(cursor, RECENT_WINDOW_WHERE, params) == expected
+        assert reader.parsed == first_parsed + reader.last_parse_failed
+        assert reader.fingerprint_hits == first_parsed - reader.last_parse_failed
+
+        # 반응이 바뀐 행만 다시 파싱
+        cursor.execute("UPDATE chat_logs SET v = ? WHERE _id = 100", (json.dumps({"defaultEmoticonsCount": 9}),))
+        parsed = reader.parsed
+        rows = reader.query(cursor, RECENT_WINDOW_WHERE, params)
+        assert (9000100, 0, BASE_TIME + 100, 9) in rows
+        assert reader.parsed - parsed == 1 + reader.last_parse_failed
+        conn.close()
+
+
+def test_fingerprint_size_bound():
+    reader = ReactionCountReader(max_fingerprints=10, log=quiet)
+    rows = [(i, 1, BASE_TIME, None, json.dumps({"defaultEmoticonsCount": 1})) for i in range(50)]
+    assert len(reader.counts(rows)) == 50
+    assert reader.stats()["fingerprints"] == 10
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+반응 스캔 _id 하한 테스트
+- 이진 탐색 결과가 created_at 선형 탐색과 같음 (_id 구멍, 빈 테이블, 범위 밖 시각)
+- 지난 결과에서 시작하는 탐색, DB가 바뀌면 전체 탐색
+- 새 쿼리가 기존 created_at 정렬 쿼리와 같은 행을 반환, EXPLAIN QUERY PLAN에 임시 정렬 없음
+
+벤치마크 (수백만 행 기준): python tests/benchmarks/bench_reaction_window.py
+"""
+
+import sys
+import os
+import tempfile
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from reaction_window import RowidWindow, RECENT_REACTION_SQL, RANGE_REACTION_SQL, query_plan
+from helpers import create_db, kakao_db_paths, REACTION_CHAT_LOGS_TABLE
+
+BASE_TIME = 1700000000
+
+LEGACY_SQL = """
+    SELECT id, chat_id, v, created_at
+    FROM chat_logs
+    WHERE v IS NOT NULL
+      AND v != ''
+      AND created_at > ?
+    ORDER BY created_at DESC
+    LIMIT ?
+"""
+
+
+def make_db(path, rows=5000, step=10, reaction_every=7):
+    """카카오톡 chat_logs처럼 _id는 INTEGER PRIMARY KEY, created_at에는 인덱스 없음"""
+    return create_db(path, [(REACTION_CHAT_LOGS_TABLE, (
+        (i * 2, 9000000 + i, i % 13, '{"defaultEmoticonsCount":1}' if i % reaction_every == 0 else '',
+         BASE_TIME + i * step) for i in range(1, rows + 1)))])  # _id는 짝수만 (구멍)
+
+
+def linear_lower_bound(cursor, target):
+    cursor.execute('SELECT MIN(_id) FROM chat_logs WHERE created_at >= ?', (target,))
+    row = cursor.fetchone()[0]
+    if row is not None:
+        return row
+    cursor.execute('SELECT MAX(_id) FROM chat_logs')
+    return (cursor.fetchone()[0] or -1) + 1
+
+
+def test_lower_bound_matches_linear():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = make_db(kakao_db_paths(tmp)[0])
+        cursor = conn.cursor()
+        for target in (0, BASE_TIME, BASE_TIME + 10, BASE_TIME + 15, BASE_TIME + 25000,
+                       BASE_TIME + 50000, BASE_TIME + 50001, BASE_TIME * 2):
+            assert RowidWindow(slack=0).lower_bound(cursor, target) == linear_lower_bound(cursor, target), target
+        window = RowidWindow(slack=600)
+        assert window.lower_bound(cursor, BASE_TIME + 30000) == linear_lower_bound(cursor, BASE_TIME + 29400)
+        assert window.probes <= 14  # log2(10000) 안쪽
+        conn.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = make_db(kakao_db_paths(tmp)[0], rows=0)
+        assert RowidWindow(slack=0).lower_bound(conn.cursor(), BASE_TIME) == 0
+        conn.close()
+
+
+def test_cached_start_and_invalidation():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = make_db(kakao_db_paths(tmp)[0])
+        cursor = conn.cursor()
+        window = RowidWindow(slack=0)
+        window.lower_bound(cursor, BASE_TIME + 40000)
+        full_probes = window.probes
+        # 20초 뒤 다음 주기: 지난 결과부터 탐색
+        assert window.lower_bound(cursor, BASE_TIME + 40020) == linear_lower_bound(cursor, BASE_TIME + 40020)
+        assert window.cached_searches == 1
+        assert window.probes - full_probes < full_probes
+
+        # DB가 통째로 바뀌어 지난 _id 앞 행이 이미 기준 이후이면 지난 결과를 쓰지 않음
+        cursor.execute('UPDATE chat_logs SET created_at = created_at + 100000')
+        assert window.lower_bound(cursor, BASE_TIME + 100030) == linear_lower_bound(cursor, BASE_TIME + 100030)
+        assert window.cached_searches == 1
+        conn.close()
+
+
+def test_query_matches_legacy_and_plan():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = make_db(kakao_db_paths(tmp)[0])
+        cursor = conn.cursor()
+        threshold = BASE_TIME + 45000
+        for limit in (10, 1200):
+            cursor.execute(LEGACY_SQL, (threshold, limit))
+            legacy = cursor.fetchall()
+            params = (RowidWindow().lower_bound(cursor, threshold), threshold, limit)
+            cursor.execute(RECENT_REACTION_SQL, params)
+            assert cursor.fetchall() == legacy and legacy
+
+        plan = ' / '.join(query_plan(cursor, RECENT_REACTION_SQL, params))
+        assert 'INTEGER PRIMARY KEY' in plan and 'TEMP B-TREE' not in plan, plan
+        legacy_plan = ' / '.join(query_plan(cursor, LEGACY_SQL, (threshold, 10)))
+        assert 'TEMP B-TREE' in legacy_plan  # 기존 쿼리는 created_at 정렬용 임시 B-트리
+
+        # 백필 구간: 하한/상한 모두 여유를 두고 created_at으로 자른 결과가 같음
+        window = RowidWindow()
+        start, end = BASE_TIME + 20000, BASE_TIME + 30000
+        low_id, high_id = window.lower_bound(cursor, start), window.lower_bound(cursor, end, slack=-window.slack)
+        cursor.execute(RANGE_REACTION_SQL, (low_id, high_id, start, end, 100000))
+        ranged = cursor.fetchall()
+        cursor.execute("SELECT id, chat_id, v, created_at FROM chat_logs WHERE v IS NOT NULL AND v != '' "
+                       "AND created_at >= ? AND created_at < ? ORDER BY created_at DESC", (start, end))
+        assert ranged == cursor.fetchall() and ranged
+        assert 'TEMP B-TREE' not in ' / '.join(query_plan(cursor, RANGE_REACTION_SQL, (low_id, high_id, start, end, 10)))
+        conn.close()
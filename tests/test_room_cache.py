@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+채팅방 캐시 테스트
+- chat_rooms 전체(+ db2.open_link 이름)를 조회 1회로 로드, 이후 조회는 SQL 없이 dict 조회
+- 이름 규칙: private_meta.name -> db2.open_link.name -> chat_rooms.name
+- data_version이 바뀌어도 private_meta가 바뀐 채팅방만 다시 파싱/복호화
+- 새 채팅방은 그 채팅방만 조회
+"""
+
+import sys
+import os
+import json
+import sqlite3
+import tempfile
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from db_connection import DbConnectionManager
+from room_cache import RoomCache, parse_private_meta
+from helpers import quiet, make_kakao_dbs, MESSAGE_CHAT_LOGS_TABLE
+
+# is_ciphertext가 암호문으로 보는 base64 (16바이트 배수)
+CIPHER_NAME = "QUJDREVGR0hJSktMTU5PUA=="
+
+
+def make_dbs(directory):
+    return make_kakao_dbs(directory, [
+        ('CREATE TABLE chat_rooms (id INTEGER PRIMARY KEY, private_meta TEXT, link_id INTEGER, name TEXT)', [
+            (1, json.dumps({"name": CIPHER_NAME, "enc": 31}), None, None),
+            (2, None, 900, None),
+            (3, json.dumps({"name": {"content": "가족방"}}), None, None),
+            (4, '{broken', None, "이름 컬럼"),
+            (5, None, None, None),
+        ]),
+    ], [('CREATE TABLE open_link (id INTEGER PRIMARY KEY, name TEXT)', [(900, '오픈채팅방')])])
+
+
+class FakeDecrypt:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, name, chat_id, enc):
+        self.calls.append((chat_id, enc))
+        return "복호화된 방" if enc == 31 else None
+
+
+def test_parse_private_meta():
+    assert parse_private_meta('{"name": "방", "enc": 30}') == ("방", 30)
+    assert parse_private_meta('{"name": {"value": "v"}}') == ("v", None)
+    assert parse_private_meta('{"enc": 0}') == (None, None)
+    assert parse_private_meta("not json") == (None, None)
+    assert parse_private_meta("  ") == (None, None)
+
+
+def test_bulk_load_and_dict_lookup():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DbConnectionManager(*make_dbs(tmp), log=quiet)
+        decrypt = FakeDecrypt()
+        rooms = RoomCache(db, decrypt, check_interval=60, log=quiet)
+        assert rooms.load() and len(rooms) == 4
+
+        statements = []
+        conn = db.connect()
+        conn._connection.set_trace_callback(statements.append)
+        conn.close()
+        for _ in range(100):
+            entry = rooms.resolve(1)
+        assert entry["name"] == CIPHER_NAME and entry["enc"] == 31 and entry["name_decrypted"] == "복호화된 방"
+        assert rooms.resolve("2")["name_column"] == "db2.open_link.name"
+        assert rooms.resolve(3)["name_decrypted"] == "가족방"  # 평문은 그대로
+        assert rooms.resolve(4)["name"] == "이름 컬럼"
+        assert rooms.resolve(5) is None
+        assert statements == []  # 확인 주기 안에서는 SQL 없음
+        assert decrypt.calls == [("1", 31)]  # 복호화는 로드 시 1회
+        db.close()
+
+
+def test_refresh_only_changed_rooms():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, db_path2 = make_dbs(tmp)
+        db = DbConnectionManager(db_path, db_path2, log=quiet)
+        decrypt = FakeDecrypt()
+        now = [0.0]
+        rooms = RoomCache(db, decrypt, check_interval=1.0, clock=lambda: now[0], log=quiet)
+        rooms.load()
+        reparsed = rooms.reparsed
+
+        writer = sqlite3.connect(db_path)
+        writer.execute(MESSAGE_CHAT_LOGS_TABLE)
+        writer.execute("INSERT INTO chat_logs (message) VALUES ('x')")  # 같은 DB의 다른 테이블 변경
+        writer.commit()
+        now[0] = 2.0
+        assert rooms.refresh_if_changed() == 0  # data_version은 바뀌었지만 채팅방 행은 그대로
+        assert rooms.reparsed == reparsed and len(decrypt.calls) == 1
+
+        writer.execute("UPDATE chat_rooms SET private_meta = ? WHERE id = 3", (json.dumps({"name": "새 이름"}),))
+        writer.execute("DELETE FROM chat_rooms WHERE id = 4")
+        writer.commit()
+        assert rooms.resolve(3)["name"] == "가족방"  # 확인 주기 전
+        now[0] = 4.0
+        assert rooms.resolve(3)["name"] == "새 이름"
+        assert rooms.resolve(4) is None
+        assert rooms.reparsed == reparsed + 1
+
+        # 새 채팅방: 그 채팅방만 조회
+        writer.execute("INSERT INTO chat_rooms VALUES (6, ?, NULL, NULL)", (json.dumps({"name": "새 방"}),))
+        writer.commit()
+        assert rooms.resolve(6)["name"] == "새 방"
+        assert rooms.stats()["misses"] >= 1
+        writer.close()
+        db.close()
+
+
+def test_retry_with_message_enc_hint():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, db_path2 = make_dbs(tmp)
+        writer = sqlite3.connect(db_path)
+        writer.execute("UPDATE chat_rooms SET private_meta = ? WHERE id = 1", (json.dumps({"name": CIPHER_NAME}),))
+        writer.commit()
+        writer.close()
+        db = DbConnectionManager(db_path, db_path2, log=quiet)
+        decrypt = FakeDecrypt()
+        rooms = RoomCache(db, decrypt, check_interval=60, log=quiet)
+        rooms.load()
+        assert rooms.resolve(1)["name_decrypted"] is None
+        assert rooms.resolve(1, enc_hint=31)["name_decrypted"] == "복호화된 방"  # v.enc 힌트로 재시도
+        assert rooms.resolve(1)["name_decrypted"] == "복호화된 방"
+        db.close()
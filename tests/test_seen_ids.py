@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+처리 ID 집합(워터마크 + 비트맵) 테스트
+- set과 같은 포함 결과 (순서 어긋난 삽입, discard, 체크포인트 전진)
+- 고정 메모리, 창 초과 시 강제 전진
+- 직렬화 / 체크포인트 저장소와 함께 복원
+
+벤치마크 (기존 set + min() 방식 대비): python tests/benchmarks/bench_seen_ids.py
+"""
+
+import sys
+import os
+import random
+import tempfile
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from seen_ids import SeenIds
+from checkpoint_store import CheckpointStore
+from helpers import quiet
+
+
+def test_in_order_compacts_to_watermark():
+    seen = SeenIds(watermark=100, window=64)
+    for msg_id in range(101, 1101):
+        assert msg_id not in seen
+        seen.add(msg_id)
+        assert msg_id in seen
+    assert seen.watermark == 1100
+    assert len(seen) == 0
+    assert 5 in seen
+    assert 1101 not in seen
+
+
+def test_out_of_order_matches_set():
+    rng = random.Random(7)
+    seen = SeenIds(watermark=0, window=256)
+    reference = set()
+    ids = list(range(1, 201))
+    rng.shuffle(ids)
+    for msg_id in ids:
+        seen.add(msg_id)
+        reference.add(msg_id)
+        for probe in range(1, 220):
+            assert (probe in seen) == (probe in reference)
+    assert seen.watermark == 200
+
+
+def test_gap_after_failure():
+    """첫 메시지 전송 실패, 나머지는 성공 -> 실패 ID만 미처리"""
+    seen = SeenIds(watermark=1000, window=64)
+    for msg_id in range(1002, 1011):
+        seen.add(msg_id)
+    assert 1001 not in seen
+    assert all(i in seen for i in range(1002, 1011))
+    assert seen.watermark == 1000
+    assert seen.pending_ids() == list(range(1002, 1011))
+    seen.add(1001)
+    assert seen.watermark == 1010
+    assert len(seen) == 0
+
+
+def test_discard_and_advance():
+    seen = SeenIds(watermark=0, window=64)
+    seen.add(5)
+    seen.discard(5)
+    assert 5 not in seen
+    seen.add(10)
+    seen.add(20)
+    seen.advance_to(15)
+    assert seen.watermark == 15
+    assert 12 in seen
+    assert 20 in seen and 19 not in seen
+    assert len(seen) == 1
+    seen.discard(3)  # 워터마크 이하는 그대로
+    assert 3 in seen
+
+
+def test_fixed_window_forces_advance():
+    seen = SeenIds(watermark=0, window=64)
+    seen.add(10)
+    seen.add(200)
+    assert seen.forced_advances == 1
+    assert seen.watermark == 200 - 64
+    assert 200 in seen
+    assert len(seen._bits) == 8
+
+
+def test_serialization_roundtrip():
+    seen = SeenIds(watermark=5000, window=128)
+    for msg_id in (5002, 5003, 5050, 5128):
+        seen.add(msg_id)
+    restored = SeenIds.from_bytes(seen.to_bytes())
+    assert restored.watermark == 5000
+    assert restored.pending_ids() == [5002, 5003, 5050, 5128]
+    resized = SeenIds.from_bytes(seen.to_bytes(), window=4096)
+    assert resized.window == 4096
+    assert resized.pending_ids() == [5002, 5003, 5050, 5128]
+
+
+def test_persisted_with_checkpoint():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "state.db")
+        seen = SeenIds()
+        store = CheckpointStore(path, state=seen, log=quiet)
+        assert store.last_id == 0
+        store.advance(100)
+        seen.add(102)
+        seen.add(103)
+        assert store.dirty
+        store.close()
+
+        seen2 = SeenIds()
+        store2 = CheckpointStore(path, state=seen2, log=quiet)
+        assert store2.last_id == 100
+        assert 101 not in seen2
+        assert 102 in seen2 and 103 in seen2
+        assert not store2.dirty
+        store2.close()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+배치 발신자 이름 조회 테스트
+- 배치당 SQL 조회 2회 (open_chat_member / friends 각각 IN (...) 1회)
+- get_name_of_user_id와 같은 선택 규칙 (더 긴 문자열, 구 DB는 friends만)
+- 닉네임 일괄 복호화 (첫 후보는 배치 복호화 1회, 실패 이름만 다음 후보)
+"""
+
+import sys
+import os
+import base64
+import sqlite3
+import tempfile
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from Crypto.Cipher import AES
+
+from kakaodecrypt import KakaoDecrypt, KAKAO_IV
+from kakao_decrypt_module import decrypt_many
+from decrypt_memo import DecryptMemo
+from enc_predictor import EncPredictor
+from sender_names import fetch_sender_rows, decrypt_sender_names
+from helpers import create_db, kakao_db_paths, FRIENDS_TABLE, OPEN_CHAT_MEMBER_TABLE
+
+MY_USER_ID = 429744344
+
+
+def encrypt(plaintext, user_id, enc=31):
+    """테스트용 암호화 (PKCS5 패딩 + AES/CBC)"""
+    pt_bytes = plaintext.encode('utf-8')
+    pad_len = 16 - (len(pt_bytes) % 16)
+    padded = pt_bytes + bytes([pad_len] * pad_len)
+    aes = AES.new(KakaoDecrypt.get_key(user_id, enc), AES.MODE_CBC, KAKAO_IV)
+    return base64.b64encode(aes.encrypt(padded)).decode('ascii')
+
+
+def make_db(directory, with_open_chat_member=True):
+    path2 = kakao_db_paths(directory)[1]
+    tables = [(FRIENDS_TABLE, [
+        (1001, encrypt("친구1", MY_USER_ID, 31), 31),
+        (1002, "짧음", 0),
+        (1003, encrypt("친구3", MY_USER_ID, 30), None),
+    ])]
+    if with_open_chat_member:
+        tables.append((OPEN_CHAT_MEMBER_TABLE, [
+            (1002, encrypt("오픈채팅 닉네임", MY_USER_ID, 30), 30),
+            (1004, "평문닉네임", 0),
+        ]))
+    create_db(path2, tables).close()
+    conn = sqlite3.connect(':memory:')
+    conn.execute('ATTACH DATABASE ? AS db2', (path2,))
+    return conn
+
+
+def test_two_queries_per_batch():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = make_db(tmp)
+        statements = []
+        conn.set_trace_callback(statements.append)
+        user_ids = [1001, 1002, 1002, "1003", 1004, 9999] * 20
+        rows = fetch_sender_rows(conn.cursor(), user_ids, has_open_chat_member=True)
+        assert len([s for s in statements if s.startswith("SELECT")]) == 2
+        assert set(rows) == {"1001", "1002", "1003", "1004"}
+        assert rows["1002"][1] == 30  # open_chat_member가 더 긴 문자열
+        assert rows["1003"][1] == 0  # enc NULL -> 0
+        assert rows["1004"] == ("평문닉네임", 0)
+
+        statements.clear()
+        fetch_sender_rows(conn.cursor(), range(1, 1200), has_open_chat_member=True, chunk_size=500)
+        assert len([s for s in statements if s.startswith("SELECT")]) == 6  # 테이블당 ceil(1199/500)회
+        conn.close()
+
+
+def test_old_db_friends_only():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = make_db(tmp, with_open_chat_member=False)
+        rows = fetch_sender_rows(conn.cursor(), [1001, 1002, 1004], has_open_chat_member=False)
+        assert set(rows) == {"1001", "1002"} and rows["1002"] == ("짧음", 0)
+        conn.close()
+
+
+def test_bulk_decrypt():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = make_db(tmp)
+        rows = fetch_sender_rows(conn.cursor(), [1001, 1002, 1003, 1004], has_open_chat_member=True)
+        rows["1005"] = (encrypt("다른 키", 12345, 31), 31)  # 복호화 불가
+        conn.close()
+
+    batches = []
+    single_calls = []
+
+    def batch_decrypt(items):
+        batches.append(list(items))
+        return decrypt_many(items)
+
+    def decrypt_func(user_id, enc, ciphertext):
+        single_calls.append(enc)
+        return KakaoDecrypt.decrypt(user_id, enc, ciphertext)
+
+    predictor = EncPredictor()
+    names, failed = decrypt_sender_names(rows, MY_USER_ID, decrypt_func, DecryptMemo(), predictor,
+                                         batch_decrypt=batch_decrypt)
+    assert names["1001"] == "친구1"
+    assert names["1002"] == "오픈채팅 닉네임"
+    assert names["1003"] == "친구3"  # enc 힌트 없음: 31 실패 후 30
+    assert names["1004"] == "평문닉네임"
+    assert failed == ["1005"] and names["1005"] == rows["1005"][0]
+    assert len(batches) == 1 and len(batches[0]) == 4  # 첫 후보는 한 번에
+    assert len(single_calls) == 2  # 1003, 1005의 두 번째 후보만 개별 AES
+
+    # MY_USER_ID가 없으면 복호화하지 않고 원본 그대로
+    names, failed = decrypt_sender_names(rows, None, decrypt_func, DecryptMemo(), predictor)
+    assert names["1001"] == rows["1001"][0] and failed == []
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+시작 캐시 테스트
+- schema_version이 같으면 저장된 DB 구조 사용
+- 스키마 변경(ALTER TABLE 등) 시 캐시 무효
+- 깨진/다른 형식의 캐시 파일은 무시
+- 시작 시간 보고 형식
+"""
+
+import sys
+import os
+import tempfile
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from startup_cache import StartupCache, StartupTimer, schema_key
+from helpers import quiet, create_db, kakao_db_paths, FRIENDS_TABLE
+
+
+def make_db(tmp):
+    path, path2 = kakao_db_paths(tmp)
+    conn = create_db(path, [("CREATE TABLE chat_logs (_id INTEGER PRIMARY KEY, chat_id, user_id, message, created_at, v)", [])])
+    create_db(path2, [(FRIENDS_TABLE, [])]).close()
+    conn.execute("ATTACH DATABASE ? AS db2", (path2,))
+    return path, conn
+
+
+def test_hit_when_schema_unchanged():
+    with tempfile.TemporaryDirectory() as tmp:
+        path, conn = make_db(tmp)
+        cache = StartupCache(os.path.join(tmp, "startup.json"), log=quiet)
+        key = schema_key(conn, db2_attached=True)
+        assert key[1] is not None
+        assert cache.load(path, key) is None
+        schema = {"chat_logs_columns": ["_id", "chat_id", "v"], "has_open_chat_member": False}
+        assert cache.save(path, key, schema)
+
+        restarted = StartupCache(os.path.join(tmp, "startup.json"), log=quiet)
+        assert restarted.load(path, schema_key(conn, db2_attached=True)) == schema
+        assert restarted.hits == 1
+        assert restarted.load(os.path.join(tmp, "other.db"), key) is None
+        conn.close()
+
+
+def test_miss_after_schema_change():
+    with tempfile.TemporaryDirectory() as tmp:
+        path, conn = make_db(tmp)
+        cache = StartupCache(os.path.join(tmp, "startup.json"), log=quiet)
+        cache.save(path, schema_key(conn, True), {"chat_logs_columns": ["_id"], "has_open_chat_member": False})
+
+        conn.execute("ALTER TABLE chat_logs ADD COLUMN attachment TEXT")
+        conn.commit()
+        assert cache.load(path, schema_key(conn, True)) is None
+
+        # db2 변경 (예: open_chat_member 추가)도 무효
+        cache.save(path, schema_key(conn, True), {"chat_logs_columns": ["_id"], "has_open_chat_member": False})
+        conn.execute("CREATE TABLE db2.open_chat_member (user_id INTEGER, nickname TEXT, enc INTEGER)")
+        conn.commit()
+        assert cache.load(path, schema_key(conn, True)) is None
+        conn.close()
+
+
+def test_corrupt_cache_ignored():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, "startup.json")
+        with open(cache_path, 'w') as f:
+            f.write("{not json")
+        cache = StartupCache(cache_path, log=quiet)
+        assert cache.load("x.db", [1, None]) is None
+        assert cache.save("x.db", [1, None], {"chat_logs_columns": [], "has_open_chat_member": True})
+        assert cache.load("x.db", [1, None]) == {"chat_logs_columns": [], "has_open_chat_member": True}
+
+
+def test_timer_report():
+    now = [10.0]
+    timer = StartupTimer(start=10.0, clock=lambda: now[0])
+    now[0] = 10.1
+    timer.mark("모듈 import")
+    now[0] = 10.35
+    timer.mark("첫 폴링 완료")
+    lines = []
+    timer.report(lines.append)
+    timer.report(lines.append)  # 1회만
+    assert len(lines) == 3
+    assert "모듈 import: 100.0ms (100.0ms)" in lines[1]
+    assert "첫 폴링 완료: 250.0ms (350.0ms)" in lines[2]
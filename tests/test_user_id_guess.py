@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MY_USER_ID 빈도 기반 추정 테스트
+- isMine 빠른 경로 (json_extract, 깨진 v 무시)
+- 멤버 비교 스트리밍 패스가 기존 채팅방별 NOT IN 쿼리와 같은 결과
+- 시간 예산 초과 시 최근 행 기준으로 결정, 진행 보고
+
+벤치마크 (기존 방식 대비): python tests/benchmarks/bench_user_id_guess.py
+"""
+
+import sys
+import os
+import json
+import tempfile
+from collections import Counter
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from user_id_guess import guess_user_id, guess_from_is_mine, count_non_member_senders, load_room_members
+from helpers import quiet, create_db
+
+MY_USER_ID = 429744344
+
+
+def make_db(path, rooms=20, messages_per_room=200, is_mine=False):
+    """채팅방 멤버 목록에는 자신이 없고(카카오톡 DB 특성), 다른 멤버가 메시지를 더 많이 보냄"""
+    chat_rooms = []
+    rows = []
+    for room in range(1, rooms + 1):
+        members = [1000 + room, 2000 + room, 3000]
+        chat_rooms.append((room, json.dumps(members)))
+        for i in range(messages_per_room):
+            sender = MY_USER_ID if i % 5 == 0 else members[i % 3]
+            if room == 1 and i == 1:
+                sender = 777  # 멤버 목록에 없는 다른 사람 (나간 멤버)
+            v = json.dumps({"isMine": sender == MY_USER_ID and is_mine, "enc": 31})
+            rows.append((None, room, sender, v if i % 7 else "{broken"))
+    return create_db(path, [
+        ('CREATE TABLE chat_rooms (id INTEGER PRIMARY KEY, members TEXT)', chat_rooms),
+        ('CREATE TABLE chat_logs (_id INTEGER PRIMARY KEY, chat_id INTEGER, user_id INTEGER, v TEXT)', rows),
+    ])
+
+
+def legacy_guess(cursor):
+    """기존 guess_my_user_id 방법 2 (채팅방마다 NOT IN 쿼리)"""
+    cursor.execute('SELECT id, members FROM chat_rooms')
+    chat_members = {chat_id: json.loads(members) for chat_id, members in cursor.fetchall()}
+    found = []
+    for chat_id, members in chat_members.items():
+        exclude = ','.join(str(m) for m in members)
+        cursor.execute(f'SELECT DISTINCT user_id FROM chat_logs WHERE chat_id = {chat_id} AND user_id NOT IN ({exclude})')
+        found.extend(row[0] for row in cursor.fetchall())
+    return Counter(found)
+
+
+def test_is_mine_fast_path():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = make_db(os.path.join(tmp, 'KakaoTalk.db'), is_mine=True)
+        result = guess_user_id(conn.cursor(), log=quiet)
+        assert result["method"] == "isMine" and result["user_id"] == MY_USER_ID
+        assert result["rows"] == 0  # 전체 스캔 없음
+        conn.close()
+
+
+def test_members_pass_matches_legacy():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = make_db(os.path.join(tmp, 'KakaoTalk.db'))
+        assert guess_from_is_mine(conn.cursor()) is None  # isMine 행 없음
+        result = guess_user_id(conn.cursor(), log=quiet)
+        assert result["method"] == "members" and result["user_id"] == MY_USER_ID
+        assert Counter(dict(result["candidates"])) == legacy_guess(conn.cursor())
+        assert result["complete"] and result["rows"] == 20 * 200
+        assert result["top_senders"][0][0] == 3000  # 메시지 수로는 다른 멤버가 1위
+        conn.close()
+
+
+def test_time_budget_and_progress():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = make_db(os.path.join(tmp, 'KakaoTalk.db'), rooms=10, messages_per_room=2000)
+        cursor = conn.cursor()
+        logs = []
+        now = [0.0]
+
+        def clock():
+            now[0] += 0.5  # fetchmany 배치마다 0.5초
+            return now[0]
+
+        scan = count_non_member_senders(cursor, load_room_members(cursor), time_budget=1.0,
+                                        progress_every=5000, clock=clock, log=logs.append)
+        assert not scan["complete"] and scan["rows"] == 10000  # 5000행 x 2배치
+        assert scan["counter"].most_common(1)[0][0] == MY_USER_ID  # 최근 행만으로도 결정
+        assert any("진행: 5,000행, 25%" in line for line in logs)
+        assert any("시간 예산" in line for line in logs)
+        conn.close()
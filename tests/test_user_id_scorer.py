@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MY_USER_ID 시험 복호화 스코어러 테스트
+- 임시 KakaoTalk.db / KakaoTalk2.db를 만들어 실제 user_id를 찾는지 확인
+- 메시지 수가 더 많은 다른 user_id가 있어도 시험 복호화 결과로 선택
+- 후보는 최근 행에서만 수집 (전체 테이블 GROUP BY 없음)
+- MY_USER_ID_FILE은 user_id만, 신뢰도는 옆 파일에 저장
+"""
+
+import sys
+import os
+import json
+import base64
+import sqlite3
+import tempfile
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+client_dir = os.path.join(os.path.dirname(script_dir), 'client')
+if client_dir not in sys.path:
+    sys.path.insert(0, client_dir)
+
+from Crypto.Cipher import AES
+
+from kakaodecrypt import KakaoDecrypt, KAKAO_IV
+import user_id_scorer
+from helpers import quiet, make_kakao_dbs, FRIENDS_TABLE, OPEN_CHAT_MEMBER_TABLE
+
+MY_USER_ID = 429744344
+CHATTY_USER_ID = 1234567890
+
+
+def encrypt(plaintext, user_id, enc=31):
+    """테스트용 암호화 (PKCS5 패딩 + AES/CBC)"""
+    pt_bytes = plaintext.encode('utf-8')
+    pad_len = 16 - (len(pt_bytes) % 16)
+    padded = pt_bytes + bytes([pad_len] * pad_len)
+    aes = AES.new(KakaoDecrypt.get_key(user_id, enc), AES.MODE_CBC, KAKAO_IV)
+    return base64.b64encode(aes.encrypt(padded)).decode('ascii')
+
+
+CHAT_LOGS_TABLE = 'CREATE TABLE chat_logs (_id INTEGER PRIMARY KEY, chat_id INTEGER, user_id INTEGER, message TEXT, v TEXT)'
+
+
+def make_db(directory):
+    # 다른 사용자가 메시지를 더 많이 보냈지만, 모든 메시지는 MY_USER_ID 키로 암호화됨
+    chat_logs = []
+    for i in range(40):
+        sender = CHATTY_USER_ID if i % 4 else MY_USER_ID
+        enc = 31 if i % 2 else 30
+        chat_logs.append((None, 1, sender, encrypt(f"메시지 {i}", MY_USER_ID, enc), json.dumps({"enc": enc, "origin": "MSG"})))
+    members = [(i, encrypt(f"닉네임{i}", MY_USER_ID, 31), 31) for i in range(5)]
+    return make_kakao_dbs(
+        directory,
+        [(CHAT_LOGS_TABLE, chat_logs)],
+        [(OPEN_CHAT_MEMBER_TABLE, members), (FRIENDS_TABLE, [])],
+    )
+
+
+def test_scorer_picks_decrypting_user_id():
+    with tempfile.TemporaryDirectory() as directory:
+        db_path, db_path2 = make_db(directory)
+        result = user_id_scorer.find_my_user_id(db_path, db_path2, log=quiet)
+    assert result["user_id"] == MY_USER_ID
+    assert result["accepted"]
+    assert result["success_rate"] == 1.0
+    assert result["confidence"] > 0.9
+    assert result["candidate_count"] == 2
+    assert result["runner_up"][0]["user_id"] == CHATTY_USER_ID
+
+
+def test_candidates_from_recent_rows_only():
+    with tempfile.TemporaryDirectory() as directory:
+        # 오래된 행은 OLD_USER_ID가 대부분, 최근 10행은 CHATTY_USER_ID / MY_USER_ID
+        rows = [(None, 1, 555, "old", None) for _ in range(100)]
+        rows += [(None, 1, CHATTY_USER_ID if i % 3 else MY_USER_ID, "new", None) for i in range(10)]
+        db_path, _ = make_kakao_dbs(directory, [(CHAT_LOGS_TABLE, rows)])
+        conn = sqlite3.connect(db_path)
+        statements = []
+        conn.set_trace_callback(statements.append)
+        candidates = user_id_scorer.collect_candidates(conn.cursor(), limit=5, scan_rows=10)
+        conn.close()
+    assert candidates == [CHATTY_USER_ID, MY_USER_ID]
+    assert any("ORDER BY _id DESC" in s for s in statements)
+
+
+def test_scorer_rejects_when_no_candidate_decrypts():
+    samples = [(encrypt(f"x{i}", 42, 31), 31, "message") for i in range(8)]
+    scores = user_id_scorer.score_candidates([MY_USER_ID, CHATTY_USER_ID], samples)
+    assert all(rate < user_id_scorer.MIN_SUCCESS_RATE for _, rate, _ in scores)
+
+
+def test_save_and_load_score():
+    with tempfile.TemporaryDirectory() as directory:
+        my_user_id_file = os.path.join(directory, 'my_user_id.txt')
+        result = {"user_id": MY_USER_ID, "confidence": 0.98, "success_rate": 1.0}
+        user_id_scorer.save_score(my_user_id_file, result)
+        with open(my_user_id_file) as f:
+            assert f.read() == str(MY_USER_ID)
+        assert user_id_scorer.score_path(my_user_id_file).endswith('my_user_id.score.json')
+        assert user_id_scorer.load_score(my_user_id_file) == result
+        assert user_id_scorer.load_score(os.path.join(directory, 'missing.txt')) is None